@@ -2,14 +2,16 @@
 Chat API routes with streaming support
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 from models.base import get_db
 from models.conversation import Conversation, Message
+from services import model_router, prompt_enhancement
 from services.chat_service import chat_service
+from services.generation_control import ResumeGap, generation_control
 
 router = APIRouter()
 
@@ -26,10 +28,11 @@ class ChatRequest(BaseModel):
 
     conversation_id: Optional[str] = None
     messages: List[ChatMessage]
-    model: str = "llama3.2:3b"
+    model: Optional[str] = None  # None: picked from the LLM performance ledger
     personality: str = "assistant"
     use_tools: bool = True
     enhance_prompts: bool = False
+    request_id: Optional[str] = None  # key for POST /chat/stop/{request_id}
 
 
 class NewConversationRequest(BaseModel):
@@ -38,24 +41,76 @@ class NewConversationRequest(BaseModel):
     title: str = "New Chat"
     personality: str = "assistant"
     model: str = "llama3.2:3b"
+    pinned_model: Optional[str] = None  # None: model routed per turn
+
+
+class ModelPinRequest(BaseModel):
+    """Pin or unpin a conversation's model"""
+
+    model: Optional[str] = None  # None: back to per-turn routing
 
 
 @router.post("/chat/stream")
-async def chat_stream(request: ChatRequest):
-    """Stream chat responses"""
+async def chat_stream(request: ChatRequest, raw_request: Request):
+    """
+    Stream chat responses
+
+    Events carry a ``seq`` number; after a dropped connection, GET
+    /chat/stream/{request_id}?after=<last seq> resumes the same answer.
+    Generation stops on POST /chat/stop/{request_id} or when no client has
+    been attached for a while. The id is the request's ``request_id`` or a
+    generated one, returned in the X-Request-Id header. With a
+    ``conversation_id`` the exchange is saved to the conversation.
+    """
     messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
+    request_id = request.request_id or generation_control.new_id()
+    prompt = (
+        messages[-1]["content"] if messages and messages[-1]["role"] == "user" else ""
+    )
+
+    source = chat_service.chat_stream(
+        messages=messages,
+        model=request.model,
+        personality=request.personality,
+        use_tools=request.use_tools,
+        enhance_prompts=request.enhance_prompts,
+        conversation_id=request.conversation_id,
+    )
+    try:
+        generation_control.start(request_id, source, request.conversation_id, prompt)
+    except ValueError:
+        raise HTTPException(status_code=409, detail="Request id already in use")
+    return StreamingResponse(
+        generation_control.subscribe(request_id, 0, raw_request.is_disconnected),
+        media_type="application/x-ndjson",
+        headers={"X-Request-Id": request_id},
+    )
+
+
+@router.get("/chat/stream/{request_id}")
+async def resume_chat_stream(request_id: str, raw_request: Request, after: int = 0):
+    """Resume a chat stream after the event with sequence number ``after``"""
+    try:
+        events = generation_control.subscribe(
+            request_id, after, raw_request.is_disconnected
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Stream not found or expired")
+    except ResumeGap:
+        raise HTTPException(
+            status_code=410, detail="Stream buffer no longer reaches back that far"
+        )
+    return StreamingResponse(
+        events,
+        media_type="application/x-ndjson",
+        headers={"X-Request-Id": request_id},
+    )
 
-    async def generate():
-        async for chunk in chat_service.chat_stream(
-            messages=messages,
-            model=request.model,
-            personality=request.personality,
-            use_tools=request.use_tools,
-            enhance_prompts=request.enhance_prompts,
-        ):
-            yield chunk
 
-    return StreamingResponse(generate(), media_type="application/x-ndjson")
+@router.post("/chat/stop/{request_id}")
+async def stop_chat_stream(request_id: str):
+    """Stop a running chat generation"""
+    return {"request_id": request_id, "stopped": generation_control.stop(request_id)}
 
 
 @router.post("/chat/conversations")
@@ -64,7 +119,10 @@ async def create_conversation(
 ):
     """Create a new conversation"""
     conversation = Conversation(
-        title=request.title, personality=request.personality, model_name=request.model
+        title=request.title,
+        personality=request.personality,
+        model_name=request.model,
+        pinned_model=request.pinned_model,
     )
     db.add(conversation)
     db.commit()
@@ -107,6 +165,21 @@ async def get_conversation(conversation_id: str, db: Session = Depends(get_db)):
     }
 
 
+@router.put("/chat/conversations/{conversation_id}/model")
+async def pin_conversation_model(
+    conversation_id: str, request: ModelPinRequest, db: Session = Depends(get_db)
+):
+    """Pin a model for every turn of a conversation, or unpin with null"""
+    conversation = (
+        db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    )
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    conversation.pinned_model = request.model or None
+    db.commit()
+    return conversation.to_dict()
+
+
 @router.delete("/chat/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str, db: Session = Depends(get_db)):
     """Archive a conversation"""
@@ -148,6 +221,18 @@ async def get_personalities():
     return {"personalities": chat_service.get_personalities()}
 
 
+@router.get("/chat/enhancement/stats")
+async def get_enhancement_stats():
+    """Prompt enhancement cache hits and latency added per message"""
+    return prompt_enhancement.enhancement_cache.stats()
+
+
+@router.get("/chat/router/stats")
+async def get_router_stats():
+    """Model routing: turns, models and latency per route"""
+    return model_router.router_stats.stats()
+
+
 @router.get("/chat/tools")
 async def get_tools():
     """Get available tools"""
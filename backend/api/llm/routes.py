@@ -3,11 +3,14 @@ LLM API Routes
 Support for Ollama (local) and cloud LLM providers (OpenAI, Anthropic)
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 from services.ollama_service import ollama_service
+from services import llm_ledger
+from services.llm_scheduler import scheduler
 from services.cloud_llm_service import cloud_llm_service, LLMProvider
 from services.settings_service import settings_service
 from models.base import get_db
@@ -92,7 +95,26 @@ async def list_models():
             "message": "No models found. Pull a model with: ollama pull llama3.2:3b",
         }
 
-    return {"models": models, "default_model": ollama_service.default_model}
+    return {"models": models, "default_model": await ollama_service.select_model()}
+
+
+@router.get("/ledger")
+async def get_llm_ledger(days: float = 7, by_task: bool = False):
+    """Recorded LLM performance per model, plus the model picked per task"""
+    selection = {
+        task: await ollama_service.select_model(task) for task in llm_ledger.TASK_TIERS
+    }
+    return {
+        "days": days,
+        "models": llm_ledger.summaries(days, by_task),
+        "selection": selection,
+    }
+
+
+@router.get("/scheduler")
+async def get_llm_scheduler():
+    """Slots in use, queue depth per priority class and queue wait times"""
+    return scheduler.stats()
 
 
 @router.post("/models/{model_name}/load")
@@ -108,14 +130,53 @@ async def load_model(model_name: str):
 
 @router.post("/models/{model_name}/unload")
 async def unload_model(model_name: str):
-    """Unload a model from memory (informational - Ollama manages automatically)"""
+    """Unload a model from memory now (``success`` false if Ollama is down)"""
     result = await ollama_service.unload_model(model_name)
     return result
 
 
+@router.post("/models/{model_name}/pin")
+async def pin_model(model_name: str):
+    """Load a model and keep it in memory until unpinned or unloaded"""
+    result = await ollama_service.residency.pin(model_name)
+
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+
+    return result
+
+
+@router.post("/models/{model_name}/unpin")
+async def unpin_model(model_name: str):
+    """Let a pinned model expire like any other"""
+    result = await ollama_service.residency.unpin(model_name)
+
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+
+    return result
+
+
+@router.get("/residency")
+async def get_model_residency():
+    """Each model's state (resident/on disk), memory use, expiry and pin"""
+    return await ollama_service.residency.state()
+
+
+@router.post("/residency/evict")
+async def evict_cold_models():
+    """Unload unpinned models that have been idle too long"""
+    return {"evicted": await ollama_service.residency.evict_cold()}
+
+
 @router.post("/models/{model_name}/pull")
 async def pull_model(model_name: str):
-    """Download a model from Ollama library"""
+    """
+    Start downloading a model from the Ollama library
+
+    Returns at once with the background job; follow it with GET
+    /pulls/{job_id}/events.
+    """
     result = await ollama_service.pull_model(model_name)
 
     if not result.get("success"):
@@ -124,6 +185,41 @@ async def pull_model(model_name: str):
     return result
 
 
+@router.get("/pulls")
+async def list_pulls():
+    """Queued, running and recently finished model pulls"""
+    return {"pulls": ollama_service.pulls.jobs()}
+
+
+@router.get("/pulls/{job_id}")
+async def get_pull(job_id: str):
+    """Progress of one model pull"""
+    job = ollama_service.pulls.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Pull job not found")
+    return job.to_dict()
+
+
+@router.get("/pulls/{job_id}/events")
+async def pull_events(job_id: str, request: Request):
+    """Server-sent events: ``progress`` while pulling, then done/failed/cancelled"""
+    try:
+        events = ollama_service.pulls.events(job_id, request.is_disconnected)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Pull job not found")
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/pulls/{job_id}/cancel")
+async def cancel_pull(job_id: str):
+    """Cancel a queued or running model pull"""
+    return {"id": job_id, "cancelled": ollama_service.pulls.cancel(job_id)}
+
+
 @router.delete("/models/{model_name}")
 async def delete_model(model_name: str):
     """Delete a model"""
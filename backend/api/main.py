@@ -5,6 +5,7 @@ Main application entry point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 # Import routers
@@ -17,6 +18,7 @@ from api.expenses.routes import router as expenses_router
 from api.chat.routes import router as chat_router
 from api.mcp.integration import router as mcp_router
 from api.journal.routes import router as journal_router
+from api.http_cache import ConditionalGetMiddleware, offers_version, todos_version
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -63,10 +65,25 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f">>> Ollama check failed (optional): {e}")
 
+    # Write LLM performance ledger rows in batches
+    from services import llm_ledger
+    ledger_writer = asyncio.create_task(llm_ledger.flush_loop())
+    # Write finished chat answers in batches
+    from services.generation_control import generation_control
+    message_writer = asyncio.create_task(generation_control.flush_loop())
+    # Preload and pin the interactive model, then evict cold models
+    from services.ollama_service import ollama_service
+    residency = asyncio.create_task(ollama_service.residency.residency_loop())
+
     print(">>> Vienna Life Assistant ready!")
     yield
     # Shutdown
     print(">>> Vienna Life Assistant shutting down...")
+    ledger_writer.cancel()
+    llm_ledger.flush()
+    message_writer.cancel()
+    generation_control.flush()
+    residency.cancel()
 
 app = FastAPI(
     title="Vienna Life Assistant API",
@@ -75,6 +92,16 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Conditional GET + gzip/brotli for polled reads (inner to CORS so 304s keep
+# their CORS headers)
+app.add_middleware(
+    ConditionalGetMiddleware,
+    versions={
+        "/api/todos/stats": todos_version,
+        "/api/shopping/offers": offers_version,
+    },
+)
+
 # CORS middleware - Updated for multiple ports and Tailscale access
 tailscale_hostname = os.getenv("TAILSCALE_HOSTNAME", "goliath")
 tailscale_frontend_port = os.getenv("TAILSCALE_FRONTEND_PORT", "7333")
@@ -86,6 +113,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-Id"],  # chat stream id for /api/chat/stop
 )
 
 # Health check
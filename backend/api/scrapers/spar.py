@@ -8,6 +8,8 @@ import httpx
 from bs4 import BeautifulSoup
 import logging
 
+from services import http_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +18,9 @@ class SparScraper:
     
     BASE_URL = "https://www.spar.at"
     OFFERS_URL = f"{BASE_URL}/angebote"
+    # Weekly offers: re-check hourly, serve up to a day old while re-checking
+    CACHE_MAX_AGE = 3600
+    CACHE_STALE = 86400
     
     def __init__(self):
         self.headers = {
@@ -31,10 +36,15 @@ class SparScraper:
         """
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.OFFERS_URL, headers=self.headers)
-                response.raise_for_status()
+                html = await http_cache.shared().get_text(
+                    self.OFFERS_URL,
+                    max_age=self.CACHE_MAX_AGE,
+                    stale_while_revalidate=self.CACHE_STALE,
+                    headers=self.headers,
+                    client=client,
+                )
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(html, 'html.parser')
                 offers = []
                 
                 # Parse offers (structure may need adjustment based on actual site)
@@ -10,6 +10,7 @@ from datetime import date
 from models import get_db, StoreOffer, Store
 from api.scrapers.spar import SparScraper
 from api.scrapers.billa import BillaScraper
+from services import http_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -137,6 +138,12 @@ async def scrape_offers(
     }
 
 
+@router.get("/scrape/cache")
+def get_scrape_cache_stats():
+    """Hit rate of the on-disk page cache shared by the store scrapers"""
+    return http_cache.shared().stats()
+
+
 @router.get("/stats")
 async def get_store_stats(
     db: Session = Depends(get_db)
@@ -0,0 +1,109 @@
+"""Server CPU per streamed chat answer, with and without token coalescing.
+
+Replays a fake Ollama token stream through the real server path - chat event
+lines, the generation_control event buffer and Starlette's StreamingResponse
+into a counting ASGI ``send`` - once with one event per token (the previous
+behaviour) and once through stream_coalescer at a few latency budgets.
+
+Usage (from backend/):
+    python benchmarks/bench_chat_stream.py [answers] [tokens] [tokens_per_s]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from starlette.responses import StreamingResponse
+
+from services import stream_coalescer
+from services.generation_control import GenerationControl
+
+
+async def _ollama(tokens: int, rate: float):
+    """Ollama-like chunks at ``rate`` tokens per second"""
+    start = time.monotonic()
+    for i in range(tokens):
+        delay = start + i / rate - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield {"response": f" wort{i % 50}", "done": False}
+
+
+async def _legacy_lines(tokens: int, rate: float):
+    async for chunk in _ollama(tokens, rate):
+        yield json.dumps({"type": "text", "content": chunk["response"]}) + "\n"
+    yield json.dumps({"type": "done"}) + "\n"
+
+
+async def _coalesced_lines(tokens: int, rate: float, flush_ms: float):
+    deltas = (
+        {"type": "text", "content": c["response"]} async for c in _ollama(tokens, rate)
+    )
+    async for event in stream_coalescer.coalesce(deltas, flush_ms=flush_ms):
+        yield stream_coalescer.event_line(event)
+    yield json.dumps({"type": "done"}) + "\n"
+
+
+async def _serve(control: GenerationControl, request_id: str, lines) -> int:
+    """Run one answer through the event buffer and StreamingResponse"""
+    control.start(request_id, lines)
+    response = StreamingResponse(
+        control.subscribe(request_id), media_type="application/x-ndjson"
+    )
+    chunks = 0
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal chunks
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks += 1
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "headers": []}
+    await response(scope, receive, send)
+    return chunks
+
+
+async def _run(answers: int, tokens: int, rate: float, flush_ms: float | None):
+    control = GenerationControl()
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    streams = [
+        _legacy_lines(tokens, rate)
+        if flush_ms is None
+        else _coalesced_lines(tokens, rate, flush_ms)
+        for _ in range(answers)
+    ]
+    chunks = await asyncio.gather(
+        *(_serve(control, f"a{i}", s) for i, s in enumerate(streams))
+    )
+    cpu = time.process_time() - cpu0
+    return cpu / answers * 1000, sum(chunks) / answers, time.perf_counter() - wall0
+
+
+def main() -> None:
+    answers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 300.0
+    print(f"answers={answers} tokens/answer={tokens} tokens/s={rate:g}")
+    for name, flush_ms in (
+        ("per token (legacy)", None),
+        ("coalesced 20 ms", 20.0),
+        ("coalesced 40 ms", 40.0),
+        ("coalesced 100 ms", 100.0),
+    ):
+        cpu_ms, chunks, wall = asyncio.run(_run(answers, tokens, rate, flush_ms))
+        print(
+            f"  {name:20s} CPU {cpu_ms:7.2f} ms/answer   "
+            f"{chunks:6.0f} HTTP chunks/answer   wall {wall:5.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -40,4 +40,28 @@ def get_db():
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+
+
+def add_missing_columns(bind):
+    """Add model columns that an existing table predates.
+
+    create_all() never alters existing tables and there are no migrations,
+    so nullable/defaulted columns added to a model later are appended here.
+    """
+    from sqlalchemy import inspect
+
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or column.primary_key:
+                    continue
+                ddl = column.type.compile(dialect=bind.dialect)
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {ddl}'
+                )
 
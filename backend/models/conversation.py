@@ -18,6 +18,11 @@ class Conversation(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     message_count = Column(Integer, default=0)
     is_archived = Column(Boolean, default=False)
+    # Rolling summary of the oldest `summarized_count` messages (chat memory)
+    summary = Column(Text, nullable=True)
+    summarized_count = Column(Integer, default=0)
+    # Model every turn uses instead of the complexity router's pick
+    pinned_model = Column(String(100), nullable=True)
     
     def to_dict(self):
         """Convert to dictionary"""
@@ -29,7 +34,10 @@ class Conversation(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "message_count": self.message_count,
-            "is_archived": self.is_archived
+            "is_archived": self.is_archived,
+            "summary": self.summary,
+            "summarized_count": self.summarized_count or 0,
+            "pinned_model": self.pinned_model,
         }
 
 
@@ -0,0 +1,29 @@
+"""
+LLM call model
+One row per LLM call in the performance ledger (services/llm_ledger.py)
+"""
+from sqlalchemy import Column, Integer, String, Float, Boolean
+from models.base import Base
+
+
+class LlmCall(Base):
+    """Timing and outcome of one LLM call"""
+    __tablename__ = "llm_calls"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    at = Column(String(19), index=True)  # ISO datetime
+    model = Column(String(120), index=True)
+    endpoint = Column(String(200), default="")
+    task = Column(String(40), default="chat")
+    ok = Column(Boolean, default=True)
+    ttft_ms = Column(Float, nullable=True)
+    total_ms = Column(Float, default=0.0)
+    load_ms = Column(Float, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    tok_s = Column(Float, nullable=True)
+    error = Column(String(300), default="")
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
@@ -0,0 +1,295 @@
+"""Token-budgeted chat history with a rolling summary of older turns.
+
+The chat UIs resend the whole conversation on every turn. Past a few dozen
+messages that costs more prompt processing than the answer itself and
+finally overflows the model's context window. ``bounded_history`` keeps the
+prompt size flat:
+
+* Recent turns stay verbatim while they fit the model's history budget.
+* Older turns are folded, in fixed steps of ``FOLD_STEP`` messages, into a
+  rolling summary. Folding in steps keeps the folded prefix identical for
+  several turns, so the summary for it is computed once and reused.
+* Each summary extends the previous one (summary of 0..16 = summary of
+  0..8 + messages 8..16), so the summariser only ever sees one step.
+
+Token counts use tiktoken when installed and a chars/3.5 estimate
+otherwise — local models all tokenize differently; the budget only has to
+be roughly right.
+
+web_sota keeps its own copy in vienna_life_assistant/chat_memory.py, because
+its MCPB bundle ships without this backend. ``conversation_history`` adds this
+API's persistence of the summary on the ``Conversation`` row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+try:  # pragma: no cover - exercised once tiktoken is installed
+    import tiktoken  # type: ignore
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # noqa: BLE001  # pragma: no cover - optional, may need a download
+    _ENCODING = None
+
+FOLD_STEP = 8
+MESSAGE_OVERHEAD = 4  # role + separators per chat message
+SUMMARY_MAX_TOKENS = 400
+
+# Context window per model family (prefix match, first hit wins).
+_MODEL_CONTEXT: list[tuple[str, int]] = [
+    ("gpt-4o", 128_000),
+    ("gpt-4.1", 128_000),
+    ("o3", 128_000),
+    ("o4", 128_000),
+    ("qwen", 32_768),
+    ("gemma", 8_192),
+    ("llama3.1", 32_768),
+    ("llama3.2", 8_192),
+]
+DEFAULT_CONTEXT = 8_192
+
+Summarizer = Callable[[str, list[dict[str, Any]]], Awaitable[str | None]]
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return int(len(text) / 3.5) + 1
+
+
+def message_tokens(message: dict[str, Any]) -> int:
+    return count_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD
+
+
+def context_window(model: str | None) -> int:
+    """Context size for ``model`` — ``CHAT_CONTEXT_TOKENS`` overrides."""
+    if override := os.environ.get("CHAT_CONTEXT_TOKENS"):
+        return int(override)
+    name = (model or "").lower()
+    for prefix, size in _MODEL_CONTEXT:
+        if name.startswith(prefix):
+            return size
+    return DEFAULT_CONTEXT
+
+
+def history_budget(model: str | None) -> int:
+    """Tokens the verbatim history may use — a third of the window.
+
+    The rest is left for the system prompt, life context, tool schemas and
+    the answer itself.
+    """
+    return context_window(model) // 3
+
+
+def fold_point(messages: list[dict[str, Any]], budget: int) -> int:
+    """How many leading messages to fold so the rest fits ``budget``.
+
+    Always a multiple of FOLD_STEP, and the latest message is never folded.
+    """
+    total = sum(message_tokens(m) for m in messages)
+    fold = 0
+    while total > budget and fold + FOLD_STEP < len(messages):
+        total -= sum(message_tokens(m) for m in messages[fold : fold + FOLD_STEP])
+        fold += FOLD_STEP
+    return fold
+
+
+def digest(previous: str, messages: list[dict[str, Any]]) -> str:
+    """Extractive fallback summary — first line of each folded message."""
+    lines = [previous] if previous else []
+    for m in messages:
+        text = " ".join(str(m.get("content") or "").split())
+        if text:
+            lines.append(f"- {m.get('role', 'user')}: {text[:160]}")
+    return trim_summary("\n".join(lines))
+
+
+def trim_summary(text: str, max_tokens: int = SUMMARY_MAX_TOKENS) -> str:
+    """Keep the newest part of a summary when it outgrows its budget."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    lines = text.splitlines()
+    while len(lines) > 1 and count_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)[-max_tokens * 4 :]
+
+
+def _prefix_key(messages: list[dict[str, Any]]) -> str:
+    raw = json.dumps(
+        [(m.get("role"), m.get("content")) for m in messages], ensure_ascii=False
+    )
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class SummaryCache:
+    """LRU of rolling summaries keyed by the folded message prefix."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        if key in self._data:
+            self._data.move_to_end(key)
+            return self._data[key]
+        return None
+
+    def put(self, key: str, summary: str) -> None:
+        self._data[key] = summary
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+summary_cache = SummaryCache()
+
+
+async def rolling_summary(
+    messages: list[dict[str, Any]],
+    fold: int,
+    summarize: Summarizer | None = None,
+    start: int = 0,
+    previous: str = "",
+) -> str:
+    """Summary of ``messages[:fold]``, built FOLD_STEP messages at a time.
+
+    ``start``/``previous`` resume from a summary that already covers
+    ``messages[:start]`` (the backend persists those on the conversation).
+    """
+    summary = previous
+    for end in range(start + FOLD_STEP, fold + 1, FOLD_STEP):
+        key = _prefix_key(messages[:end])
+        cached = summary_cache.get(key)
+        if cached is None:
+            chunk = messages[end - FOLD_STEP : end]
+            if summarize is not None:
+                try:
+                    cached = await summarize(summary, chunk)
+                except Exception:  # noqa: BLE001 - fall back to the digest
+                    cached = None
+            cached = trim_summary(cached.strip()) if cached else digest(summary, chunk)
+            summary_cache.put(key, cached)
+        summary = cached
+    return summary
+
+
+async def bounded_history(
+    messages: list[dict[str, Any]],
+    model: str | None = None,
+    summarize: Summarizer | None = None,
+    budget: int | None = None,
+) -> tuple[str, list[dict[str, Any]]]:
+    """Return ``(summary, recent_messages)`` for a prompt of bounded size.
+
+    ``summary`` is empty while the whole history fits the budget.
+    """
+    budget = budget if budget is not None else history_budget(model)
+    fold = fold_point(messages, budget)
+    recent = messages[fold:]
+    if sum(message_tokens(m) for m in recent) > budget:
+        recent = [clip(m, budget // FOLD_STEP) for m in recent[:-1]] + recent[-1:]
+    if not fold:
+        return "", recent
+    return await rolling_summary(messages, fold, summarize), recent
+
+
+def clip(message: dict[str, Any], max_tokens: int) -> dict[str, Any]:
+    """Shorten one oversized history message to ``max_tokens``.
+
+    A pasted document or a very long answer among the last few verbatim
+    turns would otherwise still blow the budget.
+    """
+    content = str(message.get("content") or "")
+    if count_tokens(content) <= max_tokens:
+        return message
+    keep = int(max_tokens * 3.5)
+    return {**message, "content": content[:keep] + " […]"}
+
+
+SUMMARY_PROMPT = (
+    "You maintain the running memory of a chat between Sandra and her assistant. "
+    "Update the summary with the new messages: keep names, dates, numbers, "
+    "decisions and open questions; drop small talk. At most 12 short bullet "
+    "points. Output only the updated summary."
+)
+
+
+def summary_request(previous: str, messages: list[dict[str, Any]]) -> str:
+    """User prompt for an LLM summariser (shared by the PA and chat paths)."""
+    turns = "\n".join(
+        f"{m.get('role', 'user')}: {str(m.get('content') or '')[:1500]}"
+        for m in messages
+    )
+    return f"Current summary:\n{previous or '(empty)'}\n\nNew messages:\n{turns}"
+
+
+# --- Conversation persistence -------------------------------------------------
+
+
+def load_summary(conversation_id: str | None) -> tuple[str, int]:
+    """Persisted ``(summary, summarized_count)`` of a conversation."""
+    if not conversation_id:
+        return "", 0
+    from models.base import SessionLocal
+    from models.conversation import Conversation
+
+    with SessionLocal() as db:
+        conv = db.get(Conversation, conversation_id)
+        if conv is None:
+            return "", 0
+        return conv.summary or "", conv.summarized_count or 0
+
+
+def save_summary(conversation_id: str | None, summary: str, count: int) -> None:
+    if not conversation_id:
+        return
+    from models.base import SessionLocal
+    from models.conversation import Conversation
+
+    with SessionLocal() as db:
+        conv = db.get(Conversation, conversation_id)
+        if conv is None:
+            return
+        conv.summary = summary
+        conv.summarized_count = count
+        db.commit()
+
+
+async def conversation_history(
+    messages: list[dict[str, Any]],
+    conversation_id: str | None,
+    model: str | None = None,
+    summarize: Summarizer | None = None,
+    budget: int | None = None,
+) -> tuple[str, list[dict[str, Any]]]:
+    """bounded_history that resumes from and updates the stored summary.
+
+    The stored summary covers the first ``summarized_count`` messages, so
+    after a restart (empty LRU) only the newly overflowing step is sent to
+    the summariser.
+    """
+    budget = budget if budget is not None else history_budget(model)
+    fold = fold_point(messages, budget)
+    previous, start = load_summary(conversation_id)
+    if start > fold or start % FOLD_STEP:
+        previous, start = "", 0  # history was edited/truncated client-side
+    recent = messages[fold:]
+    if sum(message_tokens(m) for m in recent) > budget:
+        recent = [clip(m, budget // FOLD_STEP) for m in recent[:-1]] + recent[-1:]
+    if not fold:
+        return "", recent
+    summary = await rolling_summary(messages, fold, summarize, start, previous)
+    if fold != start:
+        save_summary(conversation_id, summary, fold)
+    return summary, recent
@@ -2,10 +2,17 @@
 Chat service with streaming, tool use, web search, and prompt enhancement
 """
 
-import json
 import re
+import time
 from datetime import datetime
-from typing import Any, AsyncGenerator, Dict, List
+from typing import Any, AsyncGenerator, Dict, List, Optional
+from services import (
+    chat_memory,
+    llm_ledger,
+    model_router,
+    prompt_enhancement,
+    stream_coalescer,
+)
 from services.ollama_service import ollama_service
 from services.mcp_clients import mcp_clients
 
@@ -436,13 +443,19 @@ class ChatService:
         Uses intent analysis, strategy selection, and cost-aware optimization.
 
         Promptomatix features implemented:
-        - Intent analysis for user queries
+        - Intent analysis for user queries (local classifier, no LLM call)
         - Strategy selection (instructional, few-shot, chain-of-thought)
         - Cost-aware optimization for cloud LLMs (OpenAI, Anthropic)
         - Modular design with extensible strategies
         """
-        # Step 1: Analyze user intent (inspired by Promptomatix)
-        intent_analysis = await self._analyze_intent(user_prompt, model)
+        # Fast path: repeated prompts come straight from the cache
+        key = prompt_enhancement.cache_key(user_prompt, model, llm_provider)
+        cached = prompt_enhancement.enhancement_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Step 1: Classify intent locally - no LLM round trip
+        intent_analysis = prompt_enhancement.classify_intent(user_prompt)
 
         # Step 2: Select optimal prompting strategy (cost-aware)
         strategy = self._select_prompting_strategy(
@@ -470,70 +483,19 @@ Enhance this prompt to be clearer, more specific, and more likely to get a high-
 Only output the enhanced prompt, nothing else."""
 
         try:
-            response = await ollama_service.generate(
-                model=model, prompt=enhancement_prompt, stream=False
-            )
+            with llm_ledger.task("enhance"):
+                response = await ollama_service.generate(
+                    model=model, prompt=enhancement_prompt, stream=False
+                )
             enhanced = response.get("response", "").strip()
             # If enhancement is too long or empty, return original
             if len(enhanced) > len(user_prompt) * 3 or not enhanced:
-                return user_prompt
+                enhanced = user_prompt
+            prompt_enhancement.enhancement_cache.put(key, enhanced)
             return enhanced
         except Exception:
             return user_prompt
 
-    async def _analyze_intent(self, user_prompt: str, model: str) -> Dict[str, Any]:
-        """
-        Analyze user intent using Promptomatix-inspired approach.
-        Returns intent classification and context.
-        """
-        intent_prompt = f"""Analyze this user query and classify its intent:
-
-Query: "{user_prompt}"
-
-Classify into one of these categories:
-- QUESTION: Asking for information or explanation
-- INSTRUCTION: Requesting the AI to perform a task
-- CREATIVE: Requesting creative content (stories, poems, designs)
-- ANALYSIS: Requesting analysis or evaluation
-- CONVERSATION: Casual chat or opinion
-- TECHNICAL: Programming, technical, or specialized knowledge
-
-Also identify:
-- Topic domain (e.g., technology, history, science, daily life)
-- Complexity level (simple, moderate, complex)
-- Required expertise level (basic, intermediate, expert)
-
-Output in JSON format:
-{{"intent": "CATEGORY", "domain": "TOPIC", "complexity": "LEVEL", "expertise": "LEVEL"}}"""
-
-        try:
-            response = await ollama_service.generate(
-                model=model, prompt=intent_prompt, stream=False
-            )
-            response_text = response.get("response", "").strip()
-
-            # Try to parse JSON
-            try:
-                import json
-
-                intent_data = json.loads(response_text)
-                return intent_data
-            except Exception:
-                # Fallback to basic analysis
-                return {
-                    "intent": "QUESTION" if "?" in user_prompt else "INSTRUCTION",
-                    "domain": "general",
-                    "complexity": "moderate",
-                    "expertise": "basic",
-                }
-        except Exception:
-            return {
-                "intent": "QUESTION" if "?" in user_prompt else "INSTRUCTION",
-                "domain": "general",
-                "complexity": "moderate",
-                "expertise": "basic",
-            }
-
     def _select_prompting_strategy(
         self,
         intent_analysis: Dict[str, Any],
@@ -1914,25 +1876,53 @@ Make it practical and evidence-based."""
     async def chat_stream(
         self,
         messages: List[Dict[str, str]],
-        model: str = "llama3.2:3b",
+        model: Optional[str] = None,
         personality: str = "assistant",
         use_tools: bool = True,
         enhance_prompts: bool = False,
-    ) -> AsyncGenerator[str, None]:
+        conversation_id: Optional[str] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Stream chat responses with tool use support
-        Yields JSON strings: {"type": "text|tool|done", "content": "...", "tool": {...}}
+        Yields event dicts: {"type": "text|tool|done", "content": "...", "tool": {...}}
+
+        Events are not encoded here: generation_control numbers each one and
+        encodes it once, when it is buffered for the client.
+
+        History is capped to the model's token budget: recent turns stay
+        verbatim, older ones are folded into a rolling summary (persisted on
+        the conversation when ``conversation_id`` is given).
+
+        The model is the conversation's pinned model, else ``model``, else
+        the model router's pick for the request's complexity (the fastest
+        installed model of that tier in the LLM performance ledger).
         """
+        started = time.perf_counter()
+        model, route = await self._route_model(
+            messages[-1]["content"] if messages else "",
+            model,
+            conversation_id,
+            use_tools,
+        )
         # Add personality system prompt
         system_prompt = self.personalities.get(
             personality, self.personalities["assistant"]
         )["system_prompt"]
 
+        summary, recent = await chat_memory.conversation_history(
+            messages,
+            conversation_id,
+            model=model,
+            summarize=self._summarize,
+        )
+        if summary:
+            system_prompt += f"\n\nEarlier in this conversation (summary):\n{summary}"
+
         # Build context
         context_messages = [{"role": "system", "content": system_prompt}]
 
         # Add conversation history
-        for msg in messages[:-1]:  # All but last message
+        for msg in recent[:-1]:  # All but last message
             context_messages.append(msg)
 
         # Get last user message
@@ -1948,17 +1938,16 @@ Make it practical and evidence-based."""
             elif model.startswith("claude"):
                 llm_provider = "anthropic"
 
+            enh_started = time.perf_counter()
             enhanced = await self.enhance_prompt(user_content, model, llm_provider)
-            yield (
-                json.dumps(
-                    {
-                        "type": "enhancement",
-                        "original": user_content,
-                        "enhanced": enhanced,
-                    }
-                )
-                + "\n"
-            )
+            added_ms = (time.perf_counter() - enh_started) * 1000
+            prompt_enhancement.enhancement_cache.observe(added_ms)
+            yield {
+                "type": "enhancement",
+                "original": user_content,
+                "enhanced": enhanced,
+                "latency_ms": round(added_ms, 1),
+            }
             user_content = enhanced
 
         # Detect and execute tools
@@ -1970,12 +1959,7 @@ Make it practical and evidence-based."""
                     tool_call["name"], tool_call["parameters"]
                 )
                 tool_results.append({"tool": tool_call["name"], "result": result})
-                yield (
-                    json.dumps(
-                        {"type": "tool", "tool": tool_call["name"], "result": result}
-                    )
-                    + "\n"
-                )
+                yield {"type": "tool", "tool": tool_call["name"], "result": result}
 
         # Add tool results to context
         if tool_results:
@@ -1993,13 +1977,58 @@ Make it practical and evidence-based."""
         )
         prompt += "\n\nASSISTANT: "
 
-        # Stream response
-        async for chunk in ollama_service.generate_stream(model=model, prompt=prompt):
-            if chunk.get("response"):
-                yield json.dumps({"type": "text", "content": chunk["response"]}) + "\n"
+        # Stream response, token deltas merged within the latency budget
+        deltas = (
+            {"type": "text", "content": chunk["response"]}
+            async for chunk in ollama_service.generate_stream(
+                model=model, prompt=prompt
+            )
+            if chunk.get("response")
+        )
+        ttft_ms = None
+        async for event in stream_coalescer.coalesce(deltas):
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            yield event
+        model_router.router_stats.observe(
+            route["route"], (time.perf_counter() - started) * 1000, ttft_ms
+        )
 
         # Done
-        yield json.dumps({"type": "done"}) + "\n"
+        yield {"type": "done", "model": model, "route": route["route"]}
+
+    async def _route_model(
+        self,
+        prompt: str,
+        model: Optional[str],
+        conversation_id: Optional[str],
+        use_tools: bool,
+    ) -> tuple[str, Dict[str, Any]]:
+        """Model for one turn: conversation pin, explicit model, else the router"""
+        pinned = model_router.pinned_model(conversation_id)
+        if pinned or model:
+            route = model_router.pinned(
+                pinned or model, "conversation pin" if pinned else "requested"
+            )
+            model = pinned or model
+        else:
+            tool_calls = len(self._detect_tool_calls(prompt)) if use_tools else 0
+            route = model_router.route(prompt, tool_calls)
+            model = await ollama_service.select_model(route["task"])
+        model_router.router_stats.decided(route, model)
+        return model, route
+
+    async def _summarize(
+        self, previous: str, messages: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Fold chat turns into the conversation's rolling summary."""
+        with llm_ledger.task("summary"):
+            response = await ollama_service.generate(
+                model=await ollama_service.select_model("summary"),
+                prompt=chat_memory.summary_request(previous, messages),
+                system=chat_memory.SUMMARY_PROMPT,
+            )
+        return response.get("response") if response.get("success") else None
 
     def get_personalities(self) -> List[Dict]:
         """Get available personalities"""
@@ -1,9 +1,20 @@
 """
 Cloud LLM Service
 Supports OpenAI, Anthropic, and other cloud LLM providers
+
+``stream`` gives every provider (OpenAI, Anthropic, Ollama) one async
+iterator of text chunks. A provider that times out, drops the connection or
+answers 429/5xx is retried with jittered exponential backoff; once its
+retries are used up the next configured provider takes over. Optionally a
+hedged request goes to the next provider when the first has not produced a
+token after ``hedge_after_s``, and whichever answers first wins.
 """
+import asyncio
 import httpx
-from typing import List, Dict, Any, Optional
+import json
+import os
+import random
+from typing import List, Dict, Any, Optional, AsyncIterator
 import logging
 from enum import Enum
 
@@ -14,6 +25,26 @@ class LLMProvider(Enum):
     """Supported LLM providers"""
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
+    OLLAMA = "ollama"
+
+
+class CloudLLMError(Exception):
+    """A provider call failed; retryable errors may succeed on retry or failover"""
+
+    def __init__(self, provider: str, message: str, status: Optional[int] = None,
+                 retryable: bool = False):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status = status
+        self.retryable = retryable
+
+
+async def _first_chunk(stream: AsyncIterator[str]) -> Optional[str]:
+    """First chunk of a stream (None if it is empty)"""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
 
 
 class CloudLLMService:
@@ -21,23 +52,42 @@ class CloudLLMService:
 
     def __init__(self):
         self.timeout = 60.0
-        self.providers = {}
-
-    def configure_provider(self, provider: LLMProvider, api_key: str, base_url: Optional[str] = None):
-        """Configure a cloud LLM provider"""
+        self.providers = {}  # failover order is configuration order
+
+        # Streaming resilience (see stream)
+        self.retries = int(os.getenv("CLOUD_LLM_RETRIES", "2"))
+        self.backoff_s = float(os.getenv("CLOUD_LLM_BACKOFF_S", "0.5"))
+        self.backoff_max_s = 8.0
+        hedge = os.getenv("CLOUD_LLM_HEDGE_AFTER_S")
+        self.hedge_after_s = float(hedge) if hedge else None
+
+    def configure_provider(self, provider: LLMProvider, api_key: str = "",
+                           base_url: Optional[str] = None, model: Optional[str] = None):
+        """Configure a cloud LLM provider (``model`` is used when failing over to it)"""
         self.providers[provider.value] = {
             "api_key": api_key,
-            "base_url": base_url or self._get_default_base_url(provider)
+            "base_url": base_url or self._get_default_base_url(provider),
+            "model": model or self._get_default_model(provider)
         }
 
     def _get_default_base_url(self, provider: LLMProvider) -> str:
         """Get default base URL for provider"""
         urls = {
             LLMProvider.OPENAI: "https://api.openai.com/v1",
-            LLMProvider.ANTHROPIC: "https://api.anthropic.com"
+            LLMProvider.ANTHROPIC: "https://api.anthropic.com",
+            LLMProvider.OLLAMA: "http://localhost:11434"
         }
         return urls.get(provider, "")
 
+    def _get_default_model(self, provider: LLMProvider) -> str:
+        """Get default model for provider"""
+        models = {
+            LLMProvider.OPENAI: "gpt-4o-mini",
+            LLMProvider.ANTHROPIC: "claude-3-5-haiku-20241022",
+            LLMProvider.OLLAMA: "llama3.2:3b"
+        }
+        return models.get(provider, "")
+
     async def check_connection(self, provider: LLMProvider) -> bool:
         """Check if provider API is accessible"""
         if provider.value not in self.providers:
@@ -203,6 +253,269 @@ class CloudLLMService:
                     "error": f"Anthropic API error: {response.status_code} - {response.text}"
                 }
 
+    # --- Streaming with retries and failover ---------------------------------
+
+    async def stream(self, prompt: str, system: Optional[str] = None,
+                     provider: Optional[LLMProvider] = None, model: Optional[str] = None,
+                     hedge_after_s: Optional[float] = None,
+                     **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion, failing over between configured providers
+
+        Args:
+            prompt: User prompt
+            system: System prompt (optional)
+            provider: Provider to try first (default: the first configured)
+            model: Model for the first provider; the others use their own
+            hedge_after_s: Start the next provider as well when no token has
+                arrived by then (default: CLOUD_LLM_HEDGE_AFTER_S, off if unset)
+            **kwargs: temperature, max_tokens
+
+        Yields:
+            {"type": "token", "content": ...} chunks, then {"type": "done",
+            "provider", "model", "hedged", "failures"}
+
+        Failover only happens before the first token; an error after it, a
+        4xx other than 429, or all providers failing raises CloudLLMError.
+        """
+        order = self._failover_order(provider)
+        models = {name: self.providers[name]["model"] for name in order}
+        if model:
+            models[order[0]] = model
+        if hedge_after_s is None:
+            hedge_after_s = self.hedge_after_s
+
+        candidates = iter(order)
+        pending: Dict[asyncio.Task, Any] = {}
+        failures: List[Dict[str, Any]] = []
+
+        def launch() -> bool:
+            name = next(candidates, None)
+            if name is None:
+                return False
+            chunks = self._stream_with_retries(name, prompt, system, models[name], **kwargs)
+            pending[asyncio.ensure_future(_first_chunk(chunks))] = (name, chunks)
+            return True
+
+        if not launch():
+            raise CloudLLMError("cloud", "no provider configured")
+        hedge_armed = hedge_after_s is not None
+        hedged = False
+        winner = None
+        spare = []  # streams that answered after the winner
+        try:
+            while pending and winner is None:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_after_s if hedge_armed else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedge_armed = False
+                    hedged = launch()
+                    if hedged:
+                        logger.info(f"Hedging cloud LLM request after {hedge_after_s}s")
+                    continue
+                for task in done:
+                    name, chunks = pending.pop(task)
+                    try:
+                        first = task.result()
+                    except CloudLLMError as e:
+                        failures.append({"provider": name, "error": str(e)})
+                        if not e.retryable:
+                            raise
+                        logger.warning(f"Cloud LLM {name} failed, failing over: {e}")
+                        continue
+                    if winner is None:
+                        winner = (name, chunks, first)
+                    else:
+                        spare.append(chunks)
+                if winner is None and not pending and not launch():
+                    raise CloudLLMError(
+                        "cloud", "all providers failed: "
+                        + "; ".join(f["error"] for f in failures)
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for chunks in spare + [chunks for _, chunks in pending.values()]:
+                await chunks.aclose()
+
+        name, chunks, first = winner
+        try:
+            if first:
+                yield {"type": "token", "content": first}
+            async for delta in chunks:
+                yield {"type": "token", "content": delta}
+        finally:
+            await chunks.aclose()
+        yield {
+            "type": "done",
+            "provider": name,
+            "model": models[name],
+            "hedged": hedged,
+            "failures": failures
+        }
+
+    def _failover_order(self, provider: Optional[LLMProvider]) -> List[str]:
+        """Configured providers, ``provider`` first"""
+        order = list(self.providers)
+        if provider is not None:
+            if provider.value not in self.providers:
+                raise CloudLLMError(provider.value, "not configured")
+            order.remove(provider.value)
+            order.insert(0, provider.value)
+        return order
+
+    async def _stream_with_retries(self, name: str, prompt: str, system: Optional[str],
+                                   model: str, **kwargs) -> AsyncIterator[str]:
+        """Text chunks from one provider, retried with backoff until the first chunk"""
+        for attempt in range(self.retries + 1):
+            started = False
+            try:
+                async for delta in self._stream_provider(name, prompt, system, model, **kwargs):
+                    started = True
+                    yield delta
+                return
+            except CloudLLMError as e:
+                if started or not e.retryable or attempt == self.retries:
+                    raise
+                # Full jitter keeps retries of many clients from lining up
+                delay = random.uniform(0, min(self.backoff_max_s, self.backoff_s * 2 ** attempt))
+                logger.info(f"Retrying cloud LLM {name} in {delay:.2f}s: {e}")
+            await asyncio.sleep(delay)
+
+    async def _stream_provider(self, name: str, prompt: str, system: Optional[str],
+                               model: str, **kwargs) -> AsyncIterator[str]:
+        """Text chunks from one provider request; transport errors become CloudLLMError"""
+        streams = {
+            "openai": self._stream_openai,
+            "anthropic": self._stream_anthropic,
+            "ollama": self._stream_ollama
+        }
+        config = self.providers[name]
+        try:
+            async for delta in streams[name](config, prompt, system, model, **kwargs):
+                yield delta
+        except httpx.TimeoutException as e:
+            raise CloudLLMError(name, f"timeout ({type(e).__name__})", retryable=True) from e
+        except httpx.TransportError as e:
+            raise CloudLLMError(name, f"connection failed: {e}", retryable=True) from e
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)))
+
+    async def _check_status(self, name: str, response: httpx.Response):
+        """Raise CloudLLMError for non-200 answers (429 and 5xx are retryable)"""
+        if response.status_code == 200:
+            return
+        body = (await response.aread()).decode(errors="replace")[:500]
+        status = response.status_code
+        raise CloudLLMError(
+            name, f"API error: {status} - {body}", status=status,
+            retryable=status == 429 or status >= 500
+        )
+
+    def _messages(self, prompt: str, system: Optional[str]) -> List[Dict[str, str]]:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def _stream_openai(self, config: Dict[str, Any], prompt: str, system: Optional[str],
+                             model: str, **kwargs) -> AsyncIterator[str]:
+        """Server-sent chat.completion.chunk events"""
+        async with self._client() as client, client.stream(
+            "POST",
+            f"{config['base_url']}/chat/completions",
+            headers={"Authorization": f"Bearer {config['api_key']}"},
+            json={
+                "model": model,
+                "messages": self._messages(prompt, system),
+                "temperature": kwargs.get("temperature", 0.7),
+                "max_tokens": kwargs.get("max_tokens", 1000),
+                "stream": True
+            }
+        ) as response:
+            await self._check_status("openai", response)
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                choices = json.loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
+    async def _stream_anthropic(self, config: Dict[str, Any], prompt: str, system: Optional[str],
+                                model: str, **kwargs) -> AsyncIterator[str]:
+        """Server-sent Messages API events (content_block_delta carries the text)"""
+        async with self._client() as client, client.stream(
+            "POST",
+            f"{config['base_url']}/v1/messages",
+            headers={
+                "x-api-key": config['api_key'],
+                "anthropic-version": "2023-06-01"
+            },
+            json={
+                "model": model,
+                "max_tokens": kwargs.get("max_tokens", 1000),
+                "temperature": kwargs.get("temperature", 0.7),
+                "system": system or "You are a helpful assistant.",
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": True
+            }
+        ) as response:
+            await self._check_status("anthropic", response)
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                if event.get("type") == "content_block_delta":
+                    text = event.get("delta", {}).get("text")
+                    if text:
+                        yield text
+                elif event.get("type") == "error":
+                    error = event.get("error", {})
+                    raise CloudLLMError(
+                        "anthropic", error.get("message", "stream error"),
+                        retryable=error.get("type") == "overloaded_error"
+                    )
+                elif event.get("type") == "message_stop":
+                    return
+
+    async def _stream_ollama(self, config: Dict[str, Any], prompt: str, system: Optional[str],
+                             model: str, **kwargs) -> AsyncIterator[str]:
+        """Newline-delimited JSON from /api/chat"""
+        async with self._client() as client, client.stream(
+            "POST",
+            f"{config['base_url']}/api/chat",
+            json={
+                "model": model,
+                "messages": self._messages(prompt, system),
+                "stream": True,
+                "options": {
+                    "temperature": kwargs.get("temperature", 0.7),
+                    "num_predict": kwargs.get("max_tokens", 1000)
+                }
+            }
+        ) as response:
+            await self._check_status("ollama", response)
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise CloudLLMError("ollama", data["error"])
+                content = data.get("message", {}).get("content")
+                if content:
+                    yield content
+                if data.get("done"):
+                    return
+
     async def list_models(self, provider: LLMProvider) -> List[Dict[str, Any]]:
         """List available models for provider"""
         try:
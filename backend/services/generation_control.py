@@ -0,0 +1,336 @@
+"""
+Generation control
+Runs chat generations independently of the HTTP connection that started them:
+every NDJSON event is numbered and kept in a bounded per-stream buffer, so a
+client whose connection dropped can resume from the last sequence it got
+instead of regenerating. Generation stops when POST /chat/stop is called or
+when no client has been attached for ``resume_grace_s``. Finished answers are
+written to the Message table by a write-behind batch writer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from services import chat_memory, stream_coalescer
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENTS = 4000  # buffered events per stream (a token is one event)
+MAX_FINISHED = 64  # finished streams kept for late resumes
+RETAIN_S = 300.0  # ... and for how long
+RESUME_GRACE_S = 30.0  # generation keeps going this long without a client
+MAX_PENDING = 2000  # unwritten message rows kept while the database is failing
+
+
+class ResumeGap(LookupError):
+    """The events after the requested sequence are no longer buffered"""
+
+
+class _Generation:
+    """One chat generation: event buffer, subscribers and answer so far"""
+
+    def __init__(self, request_id: str, conversation_id: str | None, prompt: str):
+        self.request_id = request_id
+        self.conversation_id = conversation_id
+        self.prompt = prompt
+        self.events: deque[tuple[int, str]] = deque(maxlen=MAX_EVENTS)
+        self.seq = 0
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.subscribers = 0
+        self.grace: asyncio.TimerHandle | None = None
+        self.stopped = False
+        self.finished_at: float | None = None
+        self.text: list[str] = []
+        self.tools: list[dict[str, Any]] = []
+        self.enhanced: str | None = None
+
+    def append(self, event: dict[str, Any]) -> None:
+        self.seq += 1
+        self.events.append((self.seq, stream_coalescer.event_line(event, self.seq)))
+        if event["type"] == "text":
+            self.text.append(event.get("content") or "")
+        elif event["type"] == "tool":
+            self.tools.append(
+                {"tool": event.get("tool"), "result": event.get("result")}
+            )
+        elif event["type"] == "enhancement":
+            self.enhanced = event.get("enhanced")
+        self.notify()
+
+    def notify(self) -> None:
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def since(self, after: int) -> list[tuple[int, str]]:
+        if self.events and self.events[0][0] > after + 1:
+            raise ResumeGap(
+                f"stream {self.request_id}: events after {after} were dropped"
+            )
+        return [(seq, line) for seq, line in self.events if seq > after]
+
+
+class GenerationControl:
+    """
+    Registry of running and recently finished chat generations
+
+    ``start`` runs the chat generator in its own task; ``subscribe`` follows
+    its events from a sequence number on and may be called again after a
+    dropped connection. Cancelling the task unwinds the generator and closes
+    the upstream Ollama stream - Ollama stops generating when its client
+    connection closes - which also frees the LLM scheduler slot.
+    """
+
+    def __init__(self, poll_s: float = 0.25, resume_grace_s: float = RESUME_GRACE_S):
+        self.poll_s = poll_s
+        self.resume_grace_s = resume_grace_s
+        self._streams: dict[str, _Generation] = {}
+        self._pending: list[dict[str, Any]] = []
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def active(self) -> list[str]:
+        return sorted(k for k, g in self._streams.items() if g.finished_at is None)
+
+    # --- Producing ------------------------------------------------------------
+
+    def start(
+        self,
+        request_id: str,
+        source: AsyncIterator[dict[str, Any]],
+        conversation_id: str | None = None,
+        prompt: str = "",
+    ) -> None:
+        """
+        Run ``source`` (event dicts) in the background under ``request_id``
+
+        Each event is encoded once, with its ``seq``, when it is buffered.
+        """
+        self._prune()
+        if request_id in self._streams:
+            raise ValueError(f"stream {request_id} already exists")
+        gen = _Generation(request_id, conversation_id, prompt)
+        self._streams[request_id] = gen
+        gen.task = asyncio.ensure_future(self._produce(gen, source))
+        self._arm_grace(gen)
+
+    async def _produce(
+        self, gen: _Generation, source: AsyncIterator[dict[str, Any]]
+    ) -> None:
+        try:
+            async for event in source:
+                gen.append(event)
+        except asyncio.CancelledError:
+            if gen.stopped:
+                gen.append({"type": "stopped", "request_id": gen.request_id})
+            else:
+                logger.info(f"No client for stream {gen.request_id}, stopped")
+        except Exception as e:  # noqa: BLE001 - reported to the client as an event
+            logger.error(f"Chat stream {gen.request_id} failed: {e}")
+            gen.append({"type": "error", "error": str(e)})
+        finally:
+            gen.finished_at = time.monotonic()
+            if gen.grace is not None:
+                gen.grace.cancel()
+            self._queue_messages(gen)
+            gen.notify()
+
+    def stop(self, request_id: str) -> bool:
+        """
+        Cancel a running generation; False if it is unknown or finished
+
+        Safe to call from other threads and event loops.
+        """
+        gen = self._streams.get(request_id)
+        if gen is None or gen.task is None or gen.task.done():
+            return False
+        gen.stopped = True
+        gen.task.get_loop().call_soon_threadsafe(gen.task.cancel)
+        return True
+
+    def _arm_grace(self, gen: _Generation) -> None:
+        """Stop generating if no client attaches within ``resume_grace_s``"""
+        if gen.finished_at is not None or gen.task is None:
+            return
+        if gen.grace is not None:
+            gen.grace.cancel()
+        gen.grace = asyncio.get_running_loop().call_later(
+            self.resume_grace_s,
+            lambda: gen.subscribers or gen.task.cancel(),
+        )
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        finished = sorted(
+            (g.finished_at, k)
+            for k, g in self._streams.items()
+            if g.finished_at is not None and not g.subscribers
+        )
+        for i, (at, key) in enumerate(finished):
+            if now - at > RETAIN_S or len(finished) - i > MAX_FINISHED:
+                del self._streams[key]
+
+    # --- Consuming ------------------------------------------------------------
+
+    def subscribe(
+        self,
+        request_id: str,
+        after: int = 0,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Events of ``request_id`` with a sequence number above ``after``
+
+        Raises KeyError for unknown (or expired) streams and ResumeGap when
+        the buffer no longer reaches back to ``after``. The iterator ends
+        with the stream or when ``is_disconnected`` reports the client gone.
+        """
+        gen = self._streams[request_id]
+        gen.since(after)
+        return self._follow(gen, after, is_disconnected)
+
+    async def _follow(
+        self,
+        gen: _Generation,
+        after: int,
+        is_disconnected: Callable[[], Awaitable[bool]] | None,
+    ) -> AsyncIterator[str]:
+        gen.subscribers += 1
+        if gen.grace is not None:
+            gen.grace.cancel()
+        next_check = time.monotonic() + self.poll_s
+        try:
+            while True:
+                changed = gen.changed
+                for seq, line in gen.since(after):
+                    yield line
+                    after = seq
+                if gen.finished_at is not None and after >= gen.seq:
+                    return
+                if not changed.is_set():
+                    try:
+                        await asyncio.wait_for(changed.wait(), self.poll_s)
+                    except TimeoutError:
+                        pass
+                if is_disconnected is not None and time.monotonic() >= next_check:
+                    next_check = time.monotonic() + self.poll_s
+                    if await is_disconnected():
+                        logger.info(f"Client left stream {gen.request_id} at {after}")
+                        return
+        finally:
+            gen.subscribers -= 1
+            if not gen.subscribers:
+                self._arm_grace(gen)
+
+    async def relay(
+        self,
+        request_id: str,
+        source: AsyncIterator[dict[str, Any]],
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncIterator[str]:
+        """``start`` + ``subscribe`` from the beginning"""
+        self.start(request_id, source)
+        async for line in self.subscribe(request_id, 0, is_disconnected):
+            yield line
+
+    # --- Write-behind ---------------------------------------------------------
+
+    def _queue_messages(self, gen: _Generation) -> None:
+        """Queue the finished exchange for the next batch write"""
+        answer = "".join(gen.text)
+        if not gen.conversation_id or not (answer or gen.tools):
+            return
+        self._pending.append(
+            {
+                "conversation_id": gen.conversation_id,
+                "role": "user",
+                "content": gen.enhanced or gen.prompt,
+                "original_prompt": gen.prompt if gen.enhanced else None,
+                "enhanced_prompt": gen.enhanced,
+            }
+        )
+        self._pending.append(
+            {
+                "conversation_id": gen.conversation_id,
+                "role": "assistant",
+                "content": answer,
+                "tool_results": json.dumps(gen.tools) if gen.tools else None,
+                "tokens_used": chat_memory.count_tokens(answer),
+            }
+        )
+
+    def flush(self) -> int:
+        """Write queued messages in one transaction
+
+        On failure the rows go back to the front of the queue for the next
+        ``flush_loop`` tick; past ``MAX_PENDING`` the oldest are dropped.
+        """
+        rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        try:
+            self._write(rows)
+        except Exception as e:  # noqa: BLE001 - never break the writer loop
+            self._requeue(rows, e)
+            return 0
+        return len(rows)
+
+    @staticmethod
+    def _write(rows: list[dict[str, Any]]) -> None:
+        """Insert ``rows`` and bump message counts; touches no shared state"""
+        from models.base import SessionLocal
+        from models.conversation import Conversation, Message
+
+        counts: dict[str, int] = {}
+        for row in rows:
+            counts[row["conversation_id"]] = counts.get(row["conversation_id"], 0) + 1
+        db = SessionLocal()
+        try:
+            db.add_all(Message(**row) for row in rows)
+            for conv in db.query(Conversation).filter(Conversation.id.in_(counts)):
+                conv.message_count = (conv.message_count or 0) + counts[conv.id]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _requeue(self, rows: list[dict[str, Any]], error: Exception) -> None:
+        self._pending[:0] = rows
+        dropped = max(0, len(self._pending) - MAX_PENDING)
+        del self._pending[:dropped]
+        logger.error(
+            f"Chat message write-behind failed ({len(rows)} rows, "
+            f"{dropped} dropped), retrying next tick: {error}"
+        )
+
+    async def flush_loop(self, interval: float = 2.0) -> None:
+        """
+        Background writer started by the app lifespan
+
+        The queue is swapped on the event loop; the transaction runs in a
+        worker thread, so a slow or locked database never stalls the streams.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            rows, self._pending = self._pending, []
+            if rows:
+                try:
+                    await asyncio.to_thread(self._write, rows)
+                except Exception as e:  # noqa: BLE001 - never break the writer loop
+                    self._requeue(rows, e)
+            self._prune()
+
+# Global generation registry
+generation_control = GenerationControl()
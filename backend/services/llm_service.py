@@ -6,6 +6,7 @@ This integrates with both local Ollama and cloud LLM providers.
 """
 
 import logging
+from services import llm_scheduler
 from services.ollama_service import ollama_service
 from services.settings_service import settings_service
 from models.base import SessionLocal
@@ -27,7 +28,9 @@ class LLMService:
 
         Args:
             prompt: The input prompt
-            **kwargs: Additional parameters (model, temperature, etc.)
+            **kwargs: Additional parameters (model, temperature, etc.);
+                ``priority`` is the LLM scheduler class, "background" by
+                default since this serves the worker tasks
 
         Returns:
             str: Generated response
@@ -50,11 +53,12 @@ class LLMService:
                         self.logger.warning(f"{provider} API key not configured, falling back to Ollama")
 
                 # Fall back to Ollama (local LLM)
-                result = await ollama_service.generate(
-                    prompt=prompt,
-                    model=kwargs.get('model', 'llama3.2:3b'),
-                    system=kwargs.get('system', '')
-                )
+                with llm_scheduler.priority(kwargs.get('priority', 'background')):
+                    result = await ollama_service.generate(
+                        prompt=prompt,
+                        model=kwargs.get('model'),
+                        system=kwargs.get('system', '')
+                    )
                 return result.get('response', 'No response generated')
 
             finally:
@@ -0,0 +1,239 @@
+"""
+Model pulls
+Downloads Ollama models in background jobs instead of inside the HTTP
+request.
+
+A pull used to be one non-streaming POST /api/pull that blocked the request
+for up to 300 s and then timed out on big models. Each pull is now a job
+that reads Ollama's streamed progress (one JSON line per layer update:
+``status``, ``digest``, ``total``, ``completed``), so the download can take
+as long as it needs. Progress is published as server-sent events (GET
+/api/llm/pulls/{id}/events). Cancelling a job closes the stream, which makes
+Ollama stop the download; the layers it already has are reused by the next
+pull of the same model. Jobs beyond ``LLM_PULL_CONCURRENCY`` (default 1)
+wait in FIFO order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from services.ollama_service import OllamaService
+
+logger = logging.getLogger(__name__)
+
+PULL_CONCURRENCY = int(os.getenv("LLM_PULL_CONCURRENCY", "1"))
+IDLE_TIMEOUT_S = 300.0  # max gap between progress lines (slow registry)
+MAX_FINISHED = 50  # finished jobs kept for status queries
+FINISHED = ("done", "failed", "cancelled")
+
+
+class PullJob:
+    """One model download and its aggregated progress"""
+
+    def __init__(self, model: str):
+        self.id = uuid.uuid4().hex
+        self.model = model
+        self.status = "queued"  # queued, pulling, done, failed, cancelled
+        self.detail = "queued"  # Ollama's status line
+        self.layers: dict[str, tuple[int, int]] = {}  # digest -> (completed, total)
+        self.error: str | None = None
+        self.queued_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.seq = 0
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def update(self, line: dict[str, Any]) -> None:
+        """Fold one progress line from /api/pull into the job"""
+        if line.get("error"):
+            self.error = str(line["error"])
+            return
+        self.detail = line.get("status") or self.detail
+        if line.get("digest") and line.get("total"):
+            self.layers[line["digest"]] = (
+                int(line.get("completed") or 0),
+                int(line["total"]),
+            )
+
+    def notify(self) -> None:
+        self.seq += 1
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def to_dict(self) -> dict[str, Any]:
+        completed = sum(c for c, _ in self.layers.values())
+        total = sum(t for _, t in self.layers.values())
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "id": self.id,
+            "model": self.model,
+            "status": self.status,
+            "detail": self.detail,
+            "completed": completed,
+            "total": total,
+            "percent": round(100 * completed / total, 1) if total else None,
+            "bytes_per_s": round(completed / elapsed) if elapsed > 0 else None,
+            "error": self.error,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ModelPulls:
+    """Queue of background pull jobs with a concurrency limit"""
+
+    def __init__(self, service: OllamaService, concurrency: int = PULL_CONCURRENCY):
+        self.service = service
+        self.concurrency = max(1, concurrency)
+        self._jobs: dict[str, PullJob] = {}
+        self._queue: deque[PullJob] = deque()
+        self._running = 0
+
+    def start(self, model: str) -> PullJob:
+        """Queue a pull of ``model``; an unfinished pull of it is reused"""
+        for job in self._jobs.values():
+            if job.model == model and job.status not in FINISHED:
+                return job
+        self._prune()
+        job = PullJob(model)
+        self._jobs[job.id] = job
+        self._queue.append(job)
+        self._next()
+        return job
+
+    def get(self, job_id: str) -> PullJob | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[dict[str, Any]]:
+        return [job.to_dict() for job in self._jobs.values()]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running pull; False if unknown or finished"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return False
+        if job.status == "queued":
+            self._queue.remove(job)
+            self._finish(job, "cancelled")
+        elif job.task is not None:
+            job.task.cancel()
+        return True
+
+    # --- Running --------------------------------------------------------------
+
+    def _next(self) -> None:
+        while self._queue and self._running < self.concurrency:
+            job = self._queue.popleft()
+            self._running += 1
+            job.status = job.detail = "pulling"
+            job.started_at = time.time()
+            job.notify()
+            job.task = asyncio.ensure_future(self._run(job))
+            job.task.add_done_callback(lambda _, job=job: self._done(job))
+
+    async def _run(self, job: PullJob) -> None:
+        try:
+            await self._pull(job)
+        except asyncio.CancelledError:
+            self._finish(job, "cancelled")
+            logger.info(f"Pull of {job.model} cancelled")
+        except Exception as e:  # noqa: BLE001 - reported on the job
+            job.error = str(e) or type(e).__name__
+            self._finish(job, "failed")
+            logger.error(f"Pull of {job.model} failed: {job.error}")
+        else:
+            self._finish(job, "done")
+            self.service._installed_at = 0.0  # new tag for select_model
+            logger.info(f"Pulled model {job.model}")
+
+    def _done(self, job: PullJob) -> None:
+        if job.status not in FINISHED:  # cancelled before it started
+            self._finish(job, "cancelled")
+        self._running -= 1
+        self._next()
+
+    async def _pull(self, job: PullJob) -> None:
+        timeout = httpx.Timeout(10.0, read=IDLE_TIMEOUT_S)
+        async with (
+            httpx.AsyncClient(timeout=timeout) as client,
+            client.stream(
+                "POST",
+                f"{self.service.api_url}/pull",
+                json={"model": job.model, "stream": True},
+            ) as response,
+        ):
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                job.update(json.loads(line))
+                job.notify()
+                if job.error:
+                    raise RuntimeError(job.error)
+
+    def _finish(self, job: PullJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        job.notify()
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status in FINISHED]
+        for job in finished[: max(0, len(finished) - MAX_FINISHED + 1)]:
+            del self._jobs[job.id]
+
+    # --- Progress events ------------------------------------------------------
+
+    def events(
+        self,
+        job_id: str,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+        interval_s: float = 0.25,
+        keepalive_s: float = 15.0,
+    ) -> AsyncIterator[str]:
+        """
+        Server-sent events of a job's progress
+
+        A ``progress`` event (the job as JSON) at most every ``interval_s``
+        while it changes, then one event named after the final status.
+        Raises KeyError for unknown jobs.
+        """
+        job = self._jobs[job_id]
+        return self._follow(job, is_disconnected, interval_s, keepalive_s)
+
+    async def _follow(
+        self,
+        job: PullJob,
+        is_disconnected: Callable[[], Awaitable[bool]] | None,
+        interval_s: float,
+        keepalive_s: float,
+    ) -> AsyncIterator[str]:
+        while True:
+            changed = job.changed
+            event = job.status if job.status in FINISHED else "progress"
+            data = json.dumps(job.to_dict())
+            yield f"id: {job.seq}\nevent: {event}\ndata: {data}\n\n"
+            if job.status in FINISHED:
+                return
+            await asyncio.sleep(interval_s)  # one line per layer chunk is too many
+            while not changed.is_set():
+                try:
+                    await asyncio.wait_for(changed.wait(), keepalive_s)
+                except TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
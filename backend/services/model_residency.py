@@ -0,0 +1,237 @@
+"""
+Model residency
+Decides which Ollama models stay in memory, using the endpoints Ollama
+offers for that instead of throwaway generations.
+
+- GET /api/ps lists the resident models with their memory use and expiry.
+- POST /api/generate with a model and ``keep_alive`` but no prompt loads
+  the model without generating anything.
+- ``keep_alive: -1`` keeps a model loaded until it is unloaded;
+  ``keep_alive: 0`` unloads it at once.
+
+Pinned models (the interactive chat model, or ``LLM_PINNED_MODELS``) are
+preloaded in the background at startup and stay resident. Every generation
+passes the model's ``keep_alive``, because a request without one resets a
+pinned model to Ollama's default expiry. ``evict_cold`` unloads unpinned
+models that have not been used for ``LLM_COLD_AFTER_S`` seconds, so they
+free VRAM for the pinned ones. ``LLM_KEEP_ALIVE`` overrides Ollama's default
+expiry for unpinned models.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from services.llm_scheduler import scheduler
+
+if TYPE_CHECKING:
+    from services.ollama_service import OllamaService
+
+logger = logging.getLogger(__name__)
+
+KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE") or None  # None: Ollama's default
+COLD_AFTER_S = float(os.getenv("LLM_COLD_AFTER_S", "900"))
+LOAD_TIMEOUT_S = 300.0  # a big GGUF can take minutes to load from disk
+
+
+def _env_pins() -> list[str]:
+    return [
+        m.strip() for m in os.getenv("LLM_PINNED_MODELS", "").split(",") if m.strip()
+    ]
+
+
+class ModelResidency:
+    """Preload, pin, unload and evict Ollama models"""
+
+    def __init__(self, service: OllamaService, cold_after_s: float = COLD_AFTER_S):
+        self.service = service
+        self.cold_after_s = cold_after_s
+        self.pinned: set[str] = set(_env_pins())
+        self._last_used: dict[str, float] = {}
+        self._first_seen: dict[str, float] = {}
+        self._load_ms: dict[str, float] = {}
+
+    # --- Generation hooks -----------------------------------------------------
+
+    def keep_alive(self, model: str) -> int | str | None:
+        """``keep_alive`` for a generation with ``model`` (None: omit it)"""
+        return -1 if model in self.pinned else KEEP_ALIVE
+
+    def touch(self, model: str) -> None:
+        """Mark ``model`` as used just now"""
+        self._last_used[model] = time.monotonic()
+
+    # --- Ollama calls ---------------------------------------------------------
+
+    async def resident(self) -> list[dict[str, Any]]:
+        """Models in memory according to /api/ps"""
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(f"{self.service.api_url}/ps")
+            response.raise_for_status()
+        models = response.json().get("models", [])
+        now = time.monotonic()
+        for m in models:
+            self._first_seen.setdefault(m.get("name", ""), now)
+        for name in set(self._first_seen) - {m.get("name") for m in models}:
+            del self._first_seen[name]
+        return models
+
+    async def _set_keep_alive(self, model: str, keep_alive: int | str | None) -> None:
+        """Prompt-less generate: loads the model and sets its expiry"""
+        payload: dict[str, Any] = {"model": model}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        async with httpx.AsyncClient(timeout=LOAD_TIMEOUT_S) as client:
+            response = await client.post(
+                f"{self.service.api_url}/generate", json=payload
+            )
+            response.raise_for_status()
+
+    async def preload(
+        self, model: str, keep_alive: int | str | None = None
+    ) -> dict[str, Any]:
+        """Load ``model`` into memory without generating"""
+        keep_alive = keep_alive if keep_alive is not None else self.keep_alive(model)
+        started = time.perf_counter()
+        try:
+            await self._set_keep_alive(model, keep_alive)
+        except Exception as e:  # noqa: BLE001 - reported to the caller
+            logger.error(f"Failed to load model {model}: {e}")
+            return {"success": False, "model": model, "error": str(e)}
+        load_ms = round((time.perf_counter() - started) * 1000, 1)
+        self._load_ms[model] = load_ms
+        self.touch(model)
+        logger.info(f"Loaded model {model} in {load_ms} ms (keep_alive={keep_alive})")
+        return {
+            "success": True,
+            "model": model,
+            "load_ms": load_ms,
+            "pinned": model in self.pinned,
+            "message": f"Model {model} loaded",
+        }
+
+    async def pin(self, model: str) -> dict[str, Any]:
+        """Load ``model`` and keep it resident until unpinned"""
+        self.pinned.add(model)
+        result = await self.preload(model, -1)
+        if not result["success"]:
+            self.pinned.discard(model)
+        return result
+
+    async def unpin(self, model: str) -> dict[str, Any]:
+        """Let ``model`` expire like any other model"""
+        self.pinned.discard(model)
+        return await self.preload(model)
+
+    async def unload(self, model: str) -> dict[str, Any]:
+        """Unload ``model`` from memory now (also unpins it)"""
+        self.pinned.discard(model)
+        try:
+            await self._set_keep_alive(model, 0)
+        except Exception as e:  # noqa: BLE001 - reported to the caller
+            logger.error(f"Failed to unload model {model}: {e}")
+            return {"success": False, "model": model, "error": str(e)}
+        self._first_seen.pop(model, None)
+        logger.info(f"Unloaded model {model}")
+        return {"success": True, "model": model, "message": f"Model {model} unloaded"}
+
+    # --- Policy ---------------------------------------------------------------
+
+    async def interactive_model(self) -> str:
+        """The model chat turns use by default"""
+        return await self.service.select_model("chat")
+
+    async def warmup(self) -> list[dict[str, Any]]:
+        """
+        Pin and preload the interactive model (or ``LLM_PINNED_MODELS``)
+
+        Meant to run in the background at startup; a no-op without Ollama.
+        """
+        if not await self.service.check_connection():
+            return []
+        if not self.pinned:
+            self.pinned.add(await self.interactive_model())
+        results = [await self.pin(model) for model in sorted(self.pinned)]
+        for r in results:
+            if not r["success"]:
+                logger.warning(f"Warmup of {r['model']} failed: {r.get('error')}")
+        return results
+
+    async def evict_cold(self) -> list[str]:
+        """Unload unpinned, idle models; returns the evicted names"""
+        try:
+            resident = await self.resident()
+        except Exception as e:  # noqa: BLE001 - Ollama down: nothing to evict
+            logger.debug(f"Residency check failed: {e}")
+            return []
+        busy = {
+            name
+            for name, lane in scheduler.stats()["models"].items()
+            if lane["active"] or sum(lane["queued"].values())
+        }
+        now = time.monotonic()
+        evicted = []
+        for m in resident:
+            name = m.get("name", "")
+            if name in self.pinned or name in busy:
+                continue
+            used = self._last_used.get(name, self._first_seen.get(name, now))
+            if now - used < self.cold_after_s:
+                continue
+            if (await self.unload(name))["success"]:
+                evicted.append(name)
+        return evicted
+
+    async def residency_loop(self, interval: float = 60.0) -> None:
+        """Warm up, then evict cold models periodically (app lifespan)"""
+        await self.warmup()
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_cold()
+
+    # --- Reporting ------------------------------------------------------------
+
+    async def state(self) -> dict[str, Any]:
+        """Every installed model with residency, memory use and pin state"""
+        try:
+            resident = {m.get("name"): m for m in await self.resident()}
+        except Exception as e:  # noqa: BLE001 - reported in the response
+            return {"connected": False, "error": str(e), "models": []}
+        installed = await self.service.list_models()
+        now = time.monotonic()
+        models = []
+        names = [m.get("name", "") for m in installed]
+        for name in names + sorted(set(resident) - set(names)):
+            ps = resident.get(name)
+            disk = next(
+                (m.get("size") for m in installed if m.get("name") == name), None
+            )
+            last_used = self._last_used.get(name)
+            models.append(
+                {
+                    "name": name,
+                    "state": "resident" if ps else "on_disk",
+                    "pinned": name in self.pinned,
+                    "disk_bytes": disk,
+                    "memory_bytes": ps.get("size") if ps else None,
+                    "vram_bytes": ps.get("size_vram") if ps else None,
+                    "expires_at": ps.get("expires_at") if ps else None,
+                    "idle_s": round(now - last_used, 1) if last_used else None,
+                    "last_load_ms": self._load_ms.get(name),
+                }
+            )
+        return {
+            "connected": True,
+            "models": models,
+            "resident": len(resident),
+            "memory_bytes": sum(m.get("size") or 0 for m in resident.values()),
+            "vram_bytes": sum(m.get("size_vram") or 0 for m in resident.values()),
+            "pinned": sorted(self.pinned),
+            "cold_after_s": self.cold_after_s,
+        }
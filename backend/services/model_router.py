@@ -0,0 +1,176 @@
+"""
+Model router
+Sends each chat turn to a small, standard or large model by how demanding
+the request is.
+
+Every turn used to go to the one model the ledger picks for "chat". The
+router reads signals that are already computed for free - the complexity
+from ``prompt_enhancement.classify_intent``, how many tools the turn
+triggers and the prompt length in tokens - and maps short simple turns to
+a small resident model and complex or multi-tool turns to the largest
+adequate one. Routes map to ledger tasks (``chat_small``, ``chat``,
+``chat_large``) so ``ollama_service.select_model`` still picks the fastest
+installed model of the tier.
+
+A conversation can pin a model (``Conversation.pinned_model``, set with PUT
+/chat/conversations/{id}/model), which skips routing. ``CHAT_MODEL_ROUTER=0``
+sends every turn to the standard route. Decisions are logged and ``stats``
+reports turns, models and latency per route (GET /chat/router/stats).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import Counter, deque
+from typing import Any
+
+from services import chat_memory, prompt_enhancement
+from services.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+SMALL_MAX_TOKENS = int(os.getenv("CHAT_ROUTER_SMALL_TOKENS", "24"))
+LARGE_MIN_TOKENS = int(os.getenv("CHAT_ROUTER_LARGE_TOKENS", "160"))
+ROUTE_TASKS = {"small": "chat_small", "standard": "chat", "large": "chat_large"}
+
+
+def enabled() -> bool:
+    return os.getenv("CHAT_MODEL_ROUTER", "1") != "0"
+
+
+def _decision(route: str, reason: str, signals: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "route": route,
+        "task": ROUTE_TASKS.get(route, "chat"),
+        "reason": reason,
+        "signals": signals,
+    }
+
+
+def route(prompt: str, tool_calls: int = 0) -> dict[str, Any]:
+    """
+    Route for a user prompt that triggers ``tool_calls`` tools
+
+    Returns ``{route, task, reason, signals}``; ``task`` is the ledger task
+    whose quality tier the model must meet.
+    """
+    intent = prompt_enhancement.classify_intent(prompt)
+    signals = {
+        "complexity": intent["complexity"],
+        "intent": intent["intent"],
+        "tool_calls": tool_calls,
+        "tokens": chat_memory.count_tokens(prompt),
+    }
+    if not enabled():
+        return _decision("standard", "router disabled", signals)
+    if signals["complexity"] == "complex":
+        return _decision("large", "complex request", signals)
+    if signals["tokens"] >= LARGE_MIN_TOKENS:
+        return _decision("large", f"long prompt ({signals['tokens']} tokens)", signals)
+    if tool_calls >= 2:
+        return _decision("large", f"{tool_calls} tool calls", signals)
+    if signals["intent"] == "ANALYSIS":
+        return _decision("large", "analysis request", signals)
+    if (
+        signals["complexity"] == "simple"
+        and signals["tokens"] <= SMALL_MAX_TOKENS
+        and tool_calls <= 1
+    ):
+        return _decision("small", "simple request", signals)
+    return _decision("standard", "default", signals)
+
+
+def pinned(model: str, reason: str = "conversation pin") -> dict[str, Any]:
+    """Decision for a turn whose model was chosen by the user"""
+    return {
+        "route": "pinned",
+        "task": "chat",
+        "reason": f"{reason}: {model}",
+        "signals": {},
+    }
+
+
+def pinned_model(conversation_id: str | None) -> str | None:
+    """Model pinned on a conversation, if any"""
+    if not conversation_id:
+        return None
+    from models.base import SessionLocal
+    from models.conversation import Conversation
+
+    with SessionLocal() as db:
+        conv = db.get(Conversation, conversation_id)
+        return conv.pinned_model if conv is not None else None
+
+
+# --- Statistics ---------------------------------------------------------------
+
+
+class RouterStats:
+    """Turns, models and latency per route since start"""
+
+    def __init__(self, window: int = 500) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._turns: Counter[str] = Counter()
+        self._models: dict[str, Counter[str]] = {}
+        self._total_ms: dict[str, deque[float]] = {}
+        self._ttft_ms: dict[str, deque[float]] = {}
+
+    def decided(self, decision: dict[str, Any], model: str) -> None:
+        """Count and log one routing decision"""
+        name = decision["route"]
+        with self._lock:
+            self._turns[name] += 1
+            self._models.setdefault(name, Counter())[model] += 1
+        logger.info(
+            f"Chat route {name} -> {model} ({decision['reason']}) {decision['signals']}"
+        )
+
+    def observe(
+        self, route_name: str, total_ms: float, ttft_ms: float | None = None
+    ) -> None:
+        """Record the latency of one finished answer"""
+        with self._lock:
+            self._total_ms.setdefault(route_name, deque(maxlen=self.window)).append(
+                total_ms
+            )
+            if ttft_ms is not None:
+                self._ttft_ms.setdefault(route_name, deque(maxlen=self.window)).append(
+                    ttft_ms
+                )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = sum(self._turns.values())
+            routes = {}
+            for name, turns in self._turns.items():
+                latencies = list(self._total_ms.get(name, ()))
+                ttft = list(self._ttft_ms.get(name, ()))
+                routes[name] = {
+                    "turns": turns,
+                    "share": round(turns / total, 3),
+                    "models": dict(self._models.get(name, {})),
+                    "total_ms_p50": percentile(latencies, 0.5),
+                    "total_ms_p95": percentile(latencies, 0.95),
+                    "ttft_ms_p50": percentile(ttft, 0.5),
+                    "samples": len(latencies),
+                }
+        return {
+            "enabled": enabled(),
+            "small_max_tokens": SMALL_MAX_TOKENS,
+            "large_min_tokens": LARGE_MIN_TOKENS,
+            "tasks": ROUTE_TASKS,
+            "routes": routes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns.clear()
+            self._models.clear()
+            self._total_ms.clear()
+            self._ttft_ms.clear()
+
+
+router_stats = RouterStats()
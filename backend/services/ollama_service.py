@@ -4,9 +4,15 @@ Manages local LLM models via Ollama
 """
 
 import httpx
+import time
 from typing import List, Dict, Any, Optional
 import logging
 
+from services import llm_ledger
+from services.llm_scheduler import scheduler
+from services.model_pulls import ModelPulls
+from services.model_residency import ModelResidency
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,8 +34,15 @@ class OllamaService:
 
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
-        self.default_model = "llama3.2:3b"  # Reasonable default - fast and capable
+        # Fallback only — select_model() picks per task from the ledger
+        self.default_model = "llama3.2:3b"
         self.timeout = 60.0
+        self._installed: List[str] = []
+        self._installed_at = 0.0
+        # Preload, pin and eviction of resident models (/api/ps, keep_alive)
+        self.residency = ModelResidency(self)
+        # Background downloads with streamed progress
+        self.pulls = ModelPulls(self)
 
     async def check_connection(self) -> bool:
         """Check if Ollama is running and accessible"""
@@ -72,45 +85,27 @@ class OllamaService:
 
     async def load_model(self, model_name: str) -> Dict[str, Any]:
         """
-        Load a model into memory
+        Load a model into memory without generating
 
         Args:
             model_name: Name of the model to load
 
         Returns:
-            Status dictionary
+            Status dictionary with the load time
         """
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Generate a simple prompt to load the model
-                payload = {"model": model_name, "prompt": "Hello", "stream": False}
-
-                response = await client.post(f"{self.api_url}/generate", json=payload)
-                response.raise_for_status()
-
-                logger.info(f"Loaded model: {model_name}")
-                return {
-                    "success": True,
-                    "model": model_name,
-                    "message": f"Model {model_name} loaded successfully",
-                }
-
-        except Exception as e:
-            logger.error(f"Failed to load model {model_name}: {e}")
-            return {"success": False, "model": model_name, "error": str(e)}
+        return await self.residency.preload(model_name)
 
     async def unload_model(self, model_name: str) -> Dict[str, Any]:
         """
-        Unload a model from memory
+        Unload a model from memory now (keep_alive 0)
 
-        Note: Ollama doesn't have explicit unload API, but we can try to free memory
+        Args:
+            model_name: Name of the model to unload
+
+        Returns:
+            Status dictionary
         """
-        # Ollama automatically manages memory, so this is informational
-        return {
-            "success": True,
-            "model": model_name,
-            "message": f"Model {model_name} will be unloaded by Ollama automatically when needed",
-        }
+        return await self.residency.unload(model_name)
 
     async def get_running_models(self) -> List[Dict[str, Any]]:
         """
@@ -135,33 +130,22 @@ class OllamaService:
 
     async def pull_model(self, model_name: str) -> Dict[str, Any]:
         """
-        Pull/download a model from Ollama library
+        Start pulling a model from the Ollama library in the background
 
         Args:
             model_name: Name of the model to pull (e.g., "llama3.2:3b")
 
         Returns:
-            Status dictionary
+            Status dictionary with the pull job (progress via self.pulls)
         """
-        try:
-            async with httpx.AsyncClient(
-                timeout=300.0
-            ) as client:  # Long timeout for downloads
-                payload = {"name": model_name}
-
-                response = await client.post(f"{self.api_url}/pull", json=payload)
-                response.raise_for_status()
-
-                logger.info(f"Pulled model: {model_name}")
-                return {
-                    "success": True,
-                    "model": model_name,
-                    "message": f"Model {model_name} pulled successfully",
-                }
-
-        except Exception as e:
-            logger.error(f"Failed to pull model {model_name}: {e}")
-            return {"success": False, "model": model_name, "error": str(e)}
+        job = self.pulls.start(model_name)
+        logger.info(f"Pull of {model_name} queued as job {job.id}")
+        return {
+            "success": True,
+            "model": model_name,
+            "job": job.to_dict(),
+            "message": f"Pulling {model_name} in the background",
+        }
 
     async def delete_model(self, model_name: str) -> Dict[str, Any]:
         """
@@ -212,6 +196,26 @@ class OllamaService:
                 "message": "Default model already available",
             }
 
+    async def installed_models(self, max_age: float = 60.0) -> List[str]:
+        """Installed model names, cached for ``max_age`` seconds"""
+        if time.monotonic() - self._installed_at > max_age:
+            self._installed = [m.get("name", "") for m in await self.list_models()]
+            self._installed_at = time.monotonic()
+        return self._installed
+
+    async def select_model(self, task: str = "chat") -> str:
+        """
+        Pick the model for a task type from the performance ledger
+
+        The fastest installed model that meets the task's quality tier
+        (see services/llm_ledger.py); default_model when nothing is installed.
+        """
+        installed = await self.installed_models()
+        return (
+            llm_ledger.pick_model(installed, task, [self.default_model])
+            or self.default_model
+        )
+
     async def generate_stream(
         self, prompt: str, model: Optional[str] = None, system: Optional[str] = None
     ):
@@ -220,30 +224,45 @@ class OllamaService:
 
         Args:
             prompt: The prompt to generate from
-            model: Model to use (defaults to default_model)
+            model: Model to use (defaults to select_model())
             system: System prompt
 
         Yields:
             Chunks of generation result
         """
+        meter = None
         try:
-            model_name = model or self.default_model
+            model_name = model or await self.select_model()
 
             payload = {"model": model_name, "prompt": prompt, "stream": True}
 
             if system:
                 payload["system"] = system
-
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                async with client.stream("POST", f"{self.api_url}/generate", json=payload) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if line.strip():
-                            import json
-                            yield json.loads(line)
+            keep_alive = self.residency.keep_alive(model_name)
+            if keep_alive is not None:
+                payload["keep_alive"] = keep_alive
+            self.residency.touch(model_name)
+
+            # The scheduler slot is held until the stream ends
+            async with scheduler.slot(model_name):
+                meter = llm_ledger.CallMeter(model_name, self.base_url, None)
+                async with httpx.AsyncClient(timeout=120.0) as client:
+                    async with client.stream("POST", f"{self.api_url}/generate", json=payload) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if line.strip():
+                                import json
+                                chunk = json.loads(line)
+                                if chunk.get("response"):
+                                    meter.token()
+                                if chunk.get("done"):
+                                    meter.done(**ollama_timings(chunk))
+                                yield chunk
 
         except Exception as e:
             logger.error(f"Stream generation failed: {e}")
+            if meter is not None:
+                meter.fail(e)
             yield {"success": False, "error": str(e)}
 
     async def generate(
@@ -254,26 +273,33 @@ class OllamaService:
 
         Args:
             prompt: The prompt to generate from
-            model: Model to use (defaults to default_model)
+            model: Model to use (defaults to select_model())
             system: System prompt
             stream: Whether to stream the response
 
         Returns:
             Generation result
         """
+        meter = None
         try:
-            model_name = model or self.default_model
+            model_name = model or await self.select_model()
 
             payload = {"model": model_name, "prompt": prompt, "stream": stream}
 
             if system:
                 payload["system"] = system
-
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(f"{self.api_url}/generate", json=payload)
-                response.raise_for_status()
-
-                data = response.json()
+            keep_alive = self.residency.keep_alive(model_name)
+            if keep_alive is not None:
+                payload["keep_alive"] = keep_alive
+            self.residency.touch(model_name)
+
+            async with scheduler.slot(model_name):
+                meter = llm_ledger.CallMeter(model_name, self.base_url, None)
+                async with httpx.AsyncClient(timeout=120.0) as client:
+                    response = await client.post(f"{self.api_url}/generate", json=payload)
+                    response.raise_for_status()
+                    data = response.json()
+                meter.done(**ollama_timings(data))
 
                 return {
                     "success": True,
@@ -284,8 +310,30 @@ class OllamaService:
 
         except Exception as e:
             logger.error(f"Generation failed: {e}")
+            if meter is not None:
+                meter.fail(e)
             return {"success": False, "error": str(e)}
 
 
+def ollama_timings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ledger fields from Ollama's native timing counters (nanoseconds)
+
+    Server-side time to first token is model load + prompt evaluation.
+    """
+    ns = 1e6
+    load = data.get("load_duration")
+    prefill = data.get("prompt_eval_duration")
+    eval_ns = data.get("eval_duration")
+    eval_count = data.get("eval_count")
+    return {
+        "prompt_tokens": data.get("prompt_eval_count"),
+        "completion_tokens": eval_count,
+        "load_ms": load / ns if load is not None else None,
+        "ttft_ms": ((load or 0) + prefill) / ns if prefill is not None else None,
+        "tok_s": eval_count / (eval_ns / 1e9) if eval_count and eval_ns else None,
+    }
+
+
 # Global Ollama service instance
 ollama_service = OllamaService()
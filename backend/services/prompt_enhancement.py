@@ -0,0 +1,188 @@
+"""
+Prompt enhancement support
+Local intent classifier, enhancement cache and latency statistics for
+``chat_service.enhance_prompt``.
+
+Enhancement used to cost two sequential LLM round trips before the answer
+could start - one to classify the intent as JSON, one to rewrite the prompt.
+The intent now comes from ``classify_intent``, a keyword heuristic that runs
+in microseconds (English and German cues), so only the rewrite needs the
+model. Rewrites are cached by a hash of model, provider and prompt; repeated
+prompts ("what's on today?") cost nothing. ``stats`` reports how much latency
+the mode adds per message.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Any
+
+from services.stats import percentile
+
+# --- Intent classifier --------------------------------------------------------
+
+_TECHNICAL = re.compile(
+    r"\b(python|javascript|typescript|code|script|function|bug|error|exception|"
+    r"api|sql|regex|docker|linux|windows|install|compile|server|database|git)\b"
+    r"|`",
+    re.IGNORECASE,
+)
+_CREATIVE = re.compile(
+    r"\b(poem|story|song|lyrics|haiku|imagine|invent|design|creative|slogan|"
+    r"gedicht|geschichte|lied|erfinde|kreativ)\b",
+    re.IGNORECASE,
+)
+_ANALYSIS = re.compile(
+    r"\b(analy[sz]e|analysis|compare|comparison|evaluate|assess|review|pros and "
+    r"cons|trade-?offs?|vergleiche?|analysiere|bewerte|vor- und nachteile)\b",
+    re.IGNORECASE,
+)
+_QUESTION = re.compile(
+    r"^(what|why|how|when|where|who|which|is|are|can|could|should|do|does|"
+    r"explain|describe|tell me|was|warum|wieso|wie|wann|wo|wer|welche[rsn]?|ist|"
+    r"sind|kann|soll|erkläre|beschreibe)\b",
+    re.IGNORECASE,
+)
+_SMALL_TALK = re.compile(
+    r"^(hi|hey|hello|hallo|servus|grüß gott|moin|thanks|thank you|danke|ok|okay|"
+    r"cool|nice|good (morning|night)|guten (morgen|abend))\b",
+    re.IGNORECASE,
+)
+_EXPERT = re.compile(
+    r"\b(expert|advanced|in depth|in-depth|detailed|rigorous|ausführlich|"
+    r"detailliert|fortgeschritten)\b",
+    re.IGNORECASE,
+)
+_COMPLEX = re.compile(
+    r"\b(step by step|explain in detail|strategy|schritt für schritt|"
+    r"erkläre ausführlich)\b",
+    re.IGNORECASE,
+)
+
+# Domain keywords; first match wins, ordered from specific to broad.
+_DOMAIN_WORDS: list[tuple[str, str]] = [
+    ("writing", "poem story essay letter email gedicht aufsatz"),
+    ("art", "art paint drawing music kunst malen musik"),
+    ("cooking", "recipe cook bake dinner rezept kochen backen"),
+    ("finance", "budget expense money price cost geld kosten kostet preis"),
+    ("health", "health doctor fitness sleep arzt gesundheit schlaf"),
+    ("travel", "travel trip flight hotel reise urlaub flug"),
+    ("history", "history historical century geschichte jahrhundert"),
+    ("science", "physics chemistry biology science physik chemie"),
+]
+_DOMAINS: list[tuple[str, re.Pattern]] = [("technology", _TECHNICAL)] + [
+    (name, re.compile(rf"\b({'|'.join(words.split())})\b", re.IGNORECASE))
+    for name, words in _DOMAIN_WORDS
+]
+
+
+def classify_intent(user_prompt: str) -> dict[str, Any]:
+    """
+    Intent, domain, complexity and expertise of a prompt - no LLM call
+
+    Returns the same keys the LLM classifier produced, so the strategy
+    selection and enhancement templates are unchanged.
+    """
+    text = user_prompt.strip()
+    words = len(text.split())
+    if _CREATIVE.search(text):
+        intent = "CREATIVE"
+    elif _ANALYSIS.search(text):
+        intent = "ANALYSIS"
+    elif _TECHNICAL.search(text):
+        intent = "TECHNICAL"
+    elif text.endswith("?") or _QUESTION.match(text):
+        intent = "QUESTION"
+    elif _SMALL_TALK.match(text) or words <= 2:
+        intent = "CONVERSATION"
+    else:
+        intent = "INSTRUCTION"
+
+    domain = next((name for name, rx in _DOMAINS if rx.search(text)), "general")
+
+    sentences = len(re.findall(r"[.!?](\s|$)", text))
+    if words > 40 or sentences > 2 or _COMPLEX.search(text):
+        complexity = "complex"
+    elif words < 8:
+        complexity = "simple"
+    else:
+        complexity = "moderate"
+
+    if _EXPERT.search(text):
+        expertise = "expert"
+    elif intent in ("TECHNICAL", "ANALYSIS"):
+        expertise = "intermediate"
+    else:
+        expertise = "basic"
+
+    return {
+        "intent": intent,
+        "domain": domain,
+        "complexity": complexity,
+        "expertise": expertise,
+    }
+
+
+# --- Cache and latency --------------------------------------------------------
+
+
+def cache_key(user_prompt: str, model: str, llm_provider: str) -> str:
+    raw = f"{llm_provider}\x00{model}\x00{user_prompt.strip()}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+class EnhancementCache:
+    """LRU of enhanced prompts plus the latency the mode added per message"""
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.added_ms: deque[float] = deque(maxlen=500)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, enhanced: str) -> None:
+        with self._lock:
+            self._data[key] = enhanced
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def observe(self, ms: float) -> None:
+        """Record the latency enhancement added in front of one answer"""
+        self.added_ms.append(ms)
+
+    def stats(self) -> dict[str, Any]:
+        added = list(self.added_ms)
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "added_ms_p50": percentile(added, 0.5),
+            "added_ms_p95": percentile(added, 0.95),
+            "samples": len(added),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+            self.added_ms.clear()
+
+
+enhancement_cache = EnhancementCache()
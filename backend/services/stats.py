@@ -0,0 +1,14 @@
+"""
+Stats
+Small aggregation helpers shared by the latency reports
+"""
+
+from __future__ import annotations
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank ``q`` quantile of ``values`` rounded to 0.1, None if empty"""
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 1)
@@ -16,8 +16,8 @@ class TestChatStreaming:
         with patch('services.chat_service.chat_service.chat_stream') as mock_stream:
             # Mock the streaming generator
             async def mock_generator():
-                yield json.dumps({"type": "text", "content": "Hello"}) + "\n"
-                yield json.dumps({"type": "done"}) + "\n"
+                yield {"type": "text", "content": "Hello"}
+                yield {"type": "done"}
 
             mock_stream.return_value = mock_generator()
 
@@ -56,8 +56,8 @@ class TestChatStreaming:
     def _create_mock_stream(self, content):
         """Helper to create mock streaming response"""
         async def generator():
-            yield json.dumps({"type": "text", "content": content}) + "\n"
-            yield json.dumps({"type": "done"}) + "\n"
+            yield {"type": "text", "content": content}
+            yield {"type": "done"}
         return generator()
 
     @pytest.mark.asyncio
@@ -72,9 +72,9 @@ class TestChatStreaming:
             }]
 
             async def mock_generator():
-                yield json.dumps({"type": "tool", "tool": "calculator", "result": "Result: 4"}) + "\n"
-                yield json.dumps({"type": "text", "content": "The answer is 4"}) + "\n"
-                yield json.dumps({"type": "done"}) + "\n"
+                yield {"type": "tool", "tool": "calculator", "result": "Result: 4"}
+                yield {"type": "text", "content": "The answer is 4"}
+                yield {"type": "done"}
 
             mock_stream.return_value = mock_generator()
 
@@ -185,3 +185,19 @@ def test_filter_by_completed(client, sample_todo_data):
     data = response.json()
     assert all(todo["completed"] is False for todo in data["todos"])
 
+
+
+def test_list_todos_conditional_get(client, sample_todo_data):
+    """Unchanged polls get 304; a write changes the ETag"""
+    client.post("/api/todos/", json=sample_todo_data)
+    first = client.get("/api/todos/")
+    etag = first.headers["etag"]
+
+    again = client.get("/api/todos/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    client.post("/api/todos/", json={**sample_todo_data, "title": "Another"})
+    changed = client.get("/api/todos/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["total"] == 2
@@ -10,6 +10,9 @@ from api.main import app
 import tempfile
 import os
 
+# Scraper page cache in a temp dir, never the user's ~/.cache
+os.environ["HTTP_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "http_cache.sqlite3")
+
 
 @pytest.fixture(scope="function")
 def test_db():
@@ -0,0 +1,131 @@
+"""
+Chat memory tests - token budget, rolling summary, persistence on Conversation
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models.conversation import Conversation
+from services import chat_memory
+from services.chat_service import chat_service
+
+
+def _history(n, words=60):
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"turn {i} " + "wien " * words,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    chat_memory.summary_cache.clear()
+    yield
+    chat_memory.summary_cache.clear()
+
+
+class TestBudget:
+    """Fold point and bounded prompt size"""
+
+    def test_short_history_is_untouched(self):
+        messages = _history(4)
+        assert chat_memory.fold_point(messages, budget=10_000) == 0
+
+    def test_fold_point_is_step_aligned_and_keeps_latest(self):
+        messages = _history(30)
+        fold = chat_memory.fold_point(messages, budget=600)
+        assert fold % chat_memory.FOLD_STEP == 0
+        assert 0 < fold < len(messages)
+
+    @pytest.mark.asyncio
+    async def test_prompt_size_stays_flat_as_history_grows(self):
+        sizes = []
+        for n in (20, 60, 120):
+            summary, recent = await chat_memory.bounded_history(_history(n), budget=800)
+            sizes.append(
+                chat_memory.count_tokens(summary)
+                + sum(chat_memory.message_tokens(m) for m in recent)
+            )
+        assert max(sizes) <= 800 + chat_memory.SUMMARY_MAX_TOKENS + 200
+
+    @pytest.mark.asyncio
+    async def test_summaries_are_computed_once_per_step(self):
+        summarize = AsyncMock(return_value="- Sandra likes Melange")
+        messages = _history(40)
+        await chat_memory.bounded_history(messages, budget=800, summarize=summarize)
+        calls = summarize.await_count
+        assert calls >= 1
+        # next turn: same folded prefix -> no new summariser calls
+        messages.append({"role": "user", "content": "and now?"})
+        summary, _ = await chat_memory.bounded_history(
+            messages, budget=800, summarize=summarize
+        )
+        assert summarize.await_count == calls
+        assert summary == "- Sandra likes Melange"
+
+    @pytest.mark.asyncio
+    async def test_summarizer_failure_falls_back_to_digest(self):
+        summarize = AsyncMock(side_effect=RuntimeError("ollama down"))
+        summary, _ = await chat_memory.bounded_history(
+            _history(40), budget=800, summarize=summarize
+        )
+        # extractive digest, trimmed to its budget from the oldest end
+        assert summary.startswith("- ")
+        assert chat_memory.count_tokens(summary) <= chat_memory.SUMMARY_MAX_TOKENS
+
+
+class TestConversationPersistence:
+    """Rolling summary stored on Conversation"""
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_persists_and_resumes_summary(self, test_db):
+        conv = Conversation(title="long chat")
+        test_db.add(conv)
+        test_db.commit()
+        session_factory = sessionmaker(bind=test_db.get_bind())
+
+        async def fake_stream(model, prompt):
+            yield {"response": "ok"}
+
+        messages = _history(60, words=200)
+        with (
+            patch("models.base.SessionLocal", session_factory),
+            patch(
+                "services.ollama_service.ollama_service.generate",
+                new=AsyncMock(return_value={"success": True, "response": "- summary"}),
+            ) as generate,
+            patch(
+                "services.ollama_service.ollama_service.generate_stream",
+                side_effect=fake_stream,
+            ) as stream,
+        ):
+            chunks = [
+                c
+                async for c in chat_service.chat_stream(
+                    messages, use_tools=False, conversation_id=conv.id
+                )
+            ]
+            assert any(c["type"] == "done" for c in chunks)
+            prompt = stream.call_args.kwargs["prompt"]
+            assert "Earlier in this conversation (summary)" in prompt
+            assert "turn 0 " not in prompt
+            first_calls = generate.await_count
+
+            test_db.expire_all()
+            stored = test_db.get(Conversation, conv.id)
+            assert stored.summary == "- summary"
+            assert stored.summarized_count % chat_memory.FOLD_STEP == 0
+            assert stored.summarized_count > 0
+
+            # After a restart (empty LRU) the stored summary is reused.
+            chat_memory.summary_cache.clear()
+            async for _ in chat_service.chat_stream(
+                messages, use_tools=False, conversation_id=conv.id
+            ):
+                pass
+            assert generate.await_count == first_calls
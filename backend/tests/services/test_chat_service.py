@@ -420,7 +420,7 @@ class TestChatStreaming:
 
             assert len(chunks) > 0
             # Check for done signal
-            assert any('"type": "done"' in chunk for chunk in chunks)
+            assert any(chunk["type"] == "done" for chunk in chunks)
 
     @pytest.mark.asyncio
     async def test_chat_stream_with_enhancement(self):
@@ -438,7 +438,7 @@ class TestChatStreaming:
                 chunks.append(chunk)
 
             # Should include enhancement info
-            enhancement_chunks = [c for c in chunks if '"type": "enhancement"' in c]
+            enhancement_chunks = [c for c in chunks if c["type"] == "enhancement"]
             assert len(enhancement_chunks) > 0
 
     @pytest.mark.asyncio
@@ -459,7 +459,7 @@ class TestChatStreaming:
                 chunks.append(chunk)
 
             # Should include tool result
-            tool_chunks = [c for c in chunks if '"type": "tool"' in c]
+            tool_chunks = [c for c in chunks if c["type"] == "tool"]
             assert len(tool_chunks) > 0
 
     @pytest.mark.asyncio
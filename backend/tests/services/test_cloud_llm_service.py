@@ -0,0 +1,184 @@
+"""
+Cloud LLM streaming tests - per-provider streams, retries, failover and
+hedging against a local stub speaking the OpenAI, Anthropic and Ollama
+streaming protocols
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.cloud_llm_service import CloudLLMError, CloudLLMService, LLMProvider
+
+WORDS = ["Servus", " from", " Vienna"]
+
+
+def _openai(words):
+    for word in words:
+        chunk = {"choices": [{"delta": {"content": word}}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def _anthropic(words):
+    yield f"event: message_start\ndata: {json.dumps({'type': 'message_start'})}\n\n"
+    for word in words:
+        event = {
+            "type": "content_block_delta",
+            "delta": {"type": "text_delta", "text": word},
+        }
+        yield f"event: content_block_delta\ndata: {json.dumps(event)}\n\n"
+    yield f"event: message_stop\ndata: {json.dumps({'type': 'message_stop'})}\n\n"
+
+
+def _ollama(words):
+    for word in words:
+        yield json.dumps({"message": {"content": word}, "done": False}) + "\n"
+    yield json.dumps({"message": {"content": ""}, "done": True}) + "\n"
+
+
+class _StubProviders(BaseHTTPRequestHandler):
+    """/<provider>/... answers in that provider's streaming format"""
+
+    def do_POST(self):
+        server = self.server
+        provider = self.path.split("/")[1]
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.hits.append((provider, payload["model"]))
+        time.sleep(server.delay.get(provider, 0))
+        status = server.fail[provider].pop(0) if server.fail.get(provider) else 200
+        try:
+            if status != 200:
+                body = b'{"error": "stub failure"}'
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            stream = {"openai": _openai, "anthropic": _anthropic, "ollama": _ollama}
+            for part in stream[provider](WORDS):
+                self.wfile.write(part.encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout or lost hedge)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubProviders)
+    server.hits = []
+    server.fail = {}
+    server.delay = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(stub):
+    url = f"http://127.0.0.1:{stub.server_port}"
+    service = CloudLLMService()
+    service.backoff_s = 0.01
+    service.retries = 2
+    service.hedge_after_s = None
+    service.configure_provider(LLMProvider.OPENAI, "sk-test", f"{url}/openai/v1")
+    service.configure_provider(LLMProvider.ANTHROPIC, "sk-ant", f"{url}/anthropic")
+    service.configure_provider(LLMProvider.OLLAMA, base_url=f"{url}/ollama")
+    return service
+
+
+async def _collect(service, **kwargs):
+    chunks = [c async for c in service.stream("Hi", **kwargs)]
+    text = "".join(c["content"] for c in chunks if c["type"] == "token")
+    return text, chunks[-1]
+
+
+class TestStreaming:
+    """One iterator over every provider"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("provider", list(LLMProvider))
+    async def test_each_provider_streams(self, service, stub, provider):
+        text, done = await _collect(service, provider=provider, model="m-1")
+        assert text == "Servus from Vienna"
+        assert done == {
+            "type": "done",
+            "provider": provider.value,
+            "model": "m-1",
+            "hedged": False,
+            "failures": [],
+        }
+        assert stub.hits == [(provider.value, "m-1")]
+
+
+class TestResilience:
+    """Retries, failover, hedging"""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, service, stub):
+        stub.fail["openai"] = [503, 429]
+        text, done = await _collect(service)
+        assert text == "Servus from Vienna"
+        assert done["provider"] == "openai"
+        assert [p for p, _ in stub.hits] == ["openai"] * 3
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_5xx(self, service, stub):
+        stub.fail["openai"] = [500, 502, 503]
+        text, done = await _collect(service)
+        assert text == "Servus from Vienna"
+        assert done["provider"] == "anthropic"
+        assert done["model"] == "claude-3-5-haiku-20241022"
+        assert "503" in done["failures"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_timeout(self, service, stub):
+        service.timeout = 0.2
+        service.retries = 0
+        stub.delay["openai"] = 1.0
+        _, done = await _collect(service)
+        assert done["provider"] == "anthropic"
+        assert "timeout" in done["failures"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_fail_over(self, service, stub):
+        stub.fail["openai"] = [401]
+        with pytest.raises(CloudLLMError) as exc:
+            await _collect(service)
+        assert exc.value.status == 401
+        assert [p for p, _ in stub.hits] == ["openai"]
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_raises(self, service, stub):
+        service.retries = 0
+        stub.fail = {"openai": [500], "anthropic": [503], "ollama": [502]}
+        with pytest.raises(CloudLLMError, match="all providers failed"):
+            await _collect(service)
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins(self, service, stub):
+        stub.delay["openai"] = 0.8
+        started = time.perf_counter()
+        text, done = await _collect(service, hedge_after_s=0.1)
+        assert time.perf_counter() - started < 0.6
+        assert text == "Servus from Vienna"
+        assert done["provider"] == "anthropic"
+        assert done["hedged"] is True
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, service, stub):
+        _, done = await _collect(service, hedge_after_s=0.5)
+        assert done["provider"] == "openai"
+        assert done["hedged"] is False
+        assert [p for p, _ in stub.hits] == ["openai"]
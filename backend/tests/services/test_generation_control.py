@@ -0,0 +1,348 @@
+"""
+Generation control tests - client disconnect and explicit stop close the
+upstream stream (against a stub streaming Ollama server), resumable event
+buffer and write-behind of finished answers
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from api.main import app
+from models.conversation import Conversation, Message
+from services import chat_memory
+from services.generation_control import (
+    GenerationControl,
+    ResumeGap,
+    generation_control,
+)
+from services.ollama_service import OllamaService
+
+TOTAL_CHUNKS = 400
+CHUNK_DELAY_S = 0.02  # a full generation would take ~8s
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Streams /api/generate NDJSON slowly and records when the client leaves"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        server = self.server
+        try:
+            for i in range(TOTAL_CHUNKS):
+                line = json.dumps({"response": f"tok{i} ", "done": False}) + "\n"
+                self.wfile.write(line.encode())
+                self.wfile.flush()
+                server.written += 1
+                time.sleep(CHUNK_DELAY_S)
+            self.wfile.write(
+                json.dumps({"response": "", "done": True}).encode() + b"\n"
+            )
+        except (BrokenPipeError, ConnectionResetError):
+            server.aborted.set()
+        finally:
+            server.finished.set()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ollama():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    server.written = 0
+    server.aborted = threading.Event()
+    server.finished = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _ndjson_stream(server):
+    """chat_service.chat_stream stand-in that relays the stub's tokens"""
+    service = OllamaService(base_url=f"http://127.0.0.1:{server.server_port}")
+
+    async def stream(**kwargs):
+        async for chunk in service.generate_stream(prompt="hi", model="stub"):
+            if chunk.get("response"):
+                yield {"type": "text", "content": chunk["response"]}
+        yield {"type": "done"}
+
+    return stream
+
+
+class TestGenerationControl:
+    """Relay, disconnect and stop"""
+
+    @pytest.mark.asyncio
+    async def test_relay_forwards_everything(self):
+        async def source():
+            for i in range(3):
+                yield {"type": "text", "content": str(i)}
+
+        control = GenerationControl(poll_s=0.01)
+        chunks = [json.loads(c) async for c in control.relay("r1", source())]
+        assert [(c["seq"], c["content"]) for c in chunks] == [
+            (1, "0"),
+            (2, "1"),
+            (3, "2"),
+        ]
+        assert control.active() == []
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_upstream(self, stub_ollama):
+        control = GenerationControl(poll_s=0.05, resume_grace_s=0)
+        received = []
+
+        async def is_disconnected():
+            return len(received) >= 3
+
+        started = time.monotonic()
+        source = _ndjson_stream(stub_ollama)()
+        async for chunk in control.relay("r2", source, is_disconnected):
+            received.append(chunk)
+
+        assert await asyncio.to_thread(stub_ollama.aborted.wait, 2.0)
+        assert time.monotonic() - started < 2.0
+        assert stub_ollama.written < TOTAL_CHUNKS
+        assert control.active() == []
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_upstream_and_reports(self, stub_ollama):
+        control = GenerationControl(poll_s=0.05)
+        assert control.stop("unknown") is False
+        received = []
+        source = _ndjson_stream(stub_ollama)()
+        async for chunk in control.relay("r3", source):
+            received.append(json.loads(chunk))
+            if len(received) == 2:
+                assert control.stop("r3") is True
+
+        assert received[-1] == {"type": "stopped", "request_id": "r3", "seq": 3}
+        assert not any(c["type"] == "done" for c in received)
+        assert await asyncio.to_thread(stub_ollama.aborted.wait, 2.0)
+        assert stub_ollama.written < TOTAL_CHUNKS
+
+
+def _events(n, delay=0.0):
+    """chat_service.chat_stream stand-in: ``n`` text events, then done"""
+
+    async def stream(**kwargs):
+        for i in range(n):
+            await asyncio.sleep(delay)
+            yield {"type": "text", "content": f"w{i} "}
+        yield {"type": "done"}
+
+    return stream
+
+
+class TestResume:
+    """Event buffer, resume, grace period and write-behind"""
+
+    @pytest.mark.asyncio
+    async def test_resume_after_drop(self):
+        control = GenerationControl(poll_s=0.02, resume_grace_s=5)
+        control.start("s1", _events(30, delay=0.005)())
+        first = []
+        async for line in control.subscribe("s1"):
+            first.append(json.loads(line))
+            if len(first) == 5:
+                break  # connection dropped
+
+        await asyncio.sleep(0.05)  # generation goes on without a client
+        rest = [json.loads(line) async for line in control.subscribe("s1", after=5)]
+        seqs = [e["seq"] for e in first + rest]
+        assert seqs == list(range(1, 32))
+        assert rest[-1]["type"] == "done"
+        assert "".join(e.get("content", "") for e in first + rest).count("w") == 30
+
+    @pytest.mark.asyncio
+    async def test_unknown_stream_and_gap(self):
+        control = GenerationControl(poll_s=0.02)
+        with pytest.raises(KeyError):
+            control.subscribe("nope")
+        with patch("services.generation_control.MAX_EVENTS", 10):
+            control.start("s2", _events(20)())
+            async for _ in control.subscribe("s2", after=15):
+                pass
+        with pytest.raises(ResumeGap):
+            control.subscribe("s2", after=2)
+        assert len([line async for line in control.subscribe("s2", after=19)]) == 2
+
+    @pytest.mark.asyncio
+    async def test_generation_stops_without_client(self):
+        control = GenerationControl(poll_s=0.02, resume_grace_s=0.1)
+        control.start("s3", _events(1000, delay=0.01)())
+        await asyncio.sleep(0.4)
+        assert control.active() == []
+        assert len(control._streams["s3"].events) < 100
+
+    @pytest.mark.asyncio
+    async def test_finished_exchange_written_in_one_batch(self, test_db):
+        conv = Conversation(title="resume", message_count=0)
+        test_db.add(conv)
+        test_db.commit()
+        control = GenerationControl(poll_s=0.02)
+        control.start("s4", _events(3)(), conversation_id=conv.id, prompt="Servus")
+        async for _ in control.subscribe("s4"):
+            pass
+        assert test_db.query(Message).count() == 0  # not on the streaming path
+
+        session_factory = sessionmaker(bind=test_db.get_bind())
+        with patch("models.base.SessionLocal", session_factory):
+            assert control.flush() == 2
+            assert control.flush() == 0
+
+        test_db.expire_all()
+        rows = test_db.query(Message).order_by(Message.role.desc()).all()
+        assert [(m.role, m.content) for m in rows] == [
+            ("user", "Servus"),
+            ("assistant", "w0 w1 w2 "),
+        ]
+        assert test_db.get(Conversation, conv.id).message_count == 2
+        assert rows[1].tokens_used == chat_memory.count_tokens("w0 w1 w2 ")
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_next_flush(self, test_db):
+        conv = Conversation(title="retry", message_count=0)
+        test_db.add(conv)
+        test_db.commit()
+        control = GenerationControl(poll_s=0.02)
+        control.start("s5", _events(3)(), conversation_id=conv.id, prompt="Servus")
+        async for _ in control.subscribe("s5"):
+            pass
+
+        session_factory = sessionmaker(bind=test_db.get_bind())
+
+        def locked():
+            raise RuntimeError("database is locked")
+
+        def failing_session():
+            db = session_factory()
+            db.commit = locked
+            return db
+
+        with patch("models.base.SessionLocal", failing_session):
+            assert control.flush() == 0
+        assert len(control._pending) == 2  # kept for the next tick
+
+        with patch("models.base.SessionLocal", session_factory):
+            assert control.flush() == 2
+        test_db.expire_all()
+        assert test_db.query(Message).count() == 2
+
+        control._pending = [{"conversation_id": conv.id}] * 3
+        with (
+            patch("services.generation_control.MAX_PENDING", 2),
+            patch("models.base.SessionLocal", failing_session),
+        ):
+            assert control.flush() == 0
+        assert len(control._pending) == 2  # bounded
+
+    @pytest.mark.asyncio
+    async def test_flush_loop_writes_off_the_event_loop(self, test_db):
+        conv = Conversation(title="slow", message_count=0)
+        test_db.add(conv)
+        test_db.commit()
+        control = GenerationControl(poll_s=0.02)
+        control.start("s6", _events(3)(), conversation_id=conv.id, prompt="Servus")
+        async for _ in control.subscribe("s6"):
+            pass
+
+        session_factory = sessionmaker(bind=test_db.get_bind())
+
+        def slow_session():
+            db = session_factory()
+            commit = db.commit
+
+            def slow_commit():
+                time.sleep(0.3)  # a database held by another writer
+                commit()
+
+            db.commit = slow_commit
+            return db
+
+        loop = asyncio.get_running_loop()
+        gaps = []
+        with patch("models.base.SessionLocal", slow_session):
+            writer = asyncio.create_task(control.flush_loop(interval=0.01))
+            last = loop.time()
+            async with asyncio.timeout(5):
+                while not test_db.query(Message).count():
+                    await asyncio.sleep(0.01)
+                    gaps.append(loop.time() - last)
+                    last = loop.time()
+            writer.cancel()
+        assert max(gaps) < 0.2
+        assert control._pending == []
+
+
+class TestStreamEndpoints:
+    """POST /api/chat/stop/{request_id} and GET /api/chat/stream/{request_id}"""
+
+    def test_resume_finished_stream(self, client):
+        body = {
+            "messages": [{"role": "user", "content": "Hallo"}],
+            "request_id": "r-fin",
+        }
+        with patch(
+            "services.chat_service.chat_service.chat_stream", side_effect=_events(4)
+        ):
+            first = client.post("/api/chat/stream", json=body)
+        assert [json.loads(line)["seq"] for line in first.text.splitlines()] == [
+            1,
+            2,
+            3,
+            4,
+            5,
+        ]
+
+        resumed = client.get("/api/chat/stream/r-fin", params={"after": 3})
+        assert resumed.status_code == 200
+        assert [json.loads(line)["seq"] for line in resumed.text.splitlines()] == [4, 5]
+        assert client.get("/api/chat/stream/unknown").status_code == 404
+
+    def test_stop_unknown_request(self, client):
+        response = client.post("/api/chat/stop/nope")
+        assert response.status_code == 200
+        assert response.json() == {"request_id": "nope", "stopped": False}
+
+    def test_stop_running_stream(self, client, stub_ollama):
+        body = {"messages": [{"role": "user", "content": "Hallo"}], "request_id": "abc"}
+
+        # TestClient buffers the whole response, so stop from another thread
+        def stop():
+            time.sleep(0.3)
+            stopper.result = TestClient(app).post("/api/chat/stop/abc")
+
+        stopper = threading.Thread(target=stop)
+        stopper.start()
+        with (
+            patch(
+                "services.chat_service.chat_service.chat_stream",
+                side_effect=_ndjson_stream(stub_ollama),
+            ),
+            client.stream("POST", "/api/chat/stream", json=body) as response,
+        ):
+            assert response.headers["x-request-id"] == "abc"
+            lines = [json.loads(line) for line in response.iter_lines() if line]
+        stopper.join()
+
+        assert stopper.result.json()["stopped"] is True
+        assert lines[0]["type"] == "text"
+        assert lines[-1]["type"] == "stopped"
+        assert stub_ollama.aborted.wait(2.0)
+        assert stub_ollama.written < TOTAL_CHUNKS
+        assert "abc" not in generation_control.active()
@@ -0,0 +1,209 @@
+"""
+HTTP cache tests - disk persistence, ETag/Last-Modified revalidation,
+stale-while-revalidate and failure fallback against a stub site
+"""
+
+import asyncio
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from api.scrapers.spar import SparScraper
+from services import http_cache
+from services.http_cache import HttpCache
+
+OFFERS = """<html><body>
+<div class="product-card"><h3>Bio Vollmilch</h3><span class="price">1,29</span></div>
+</body></html>"""
+
+
+class _Site(BaseHTTPRequestHandler):
+    """Serves one page with an ETag and/or Last-Modified and honours them"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers)
+        if server.down:
+            self.send_error(503)
+            return
+        etag = f'"v{server.version}"'
+        modified = f"Mon, 0{server.version} Jun 2026 08:00:00 GMT"
+        if self.path == "/etag" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path == "/dated" and self.headers.get("If-Modified-Since") == modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = (
+            OFFERS if server.version == 1 else OFFERS.replace("1,29", "0,99")
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path in ("/etag", "/angebote"):
+            self.send_header("ETag", etag)
+        if self.path == "/dated":
+            self.send_header("Last-Modified", modified)
+        if self.path == "/private":
+            self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    server.requests = []
+    server.version = 1
+    server.down = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HttpCache(tmp_path / "http_cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_fresh_pages_come_from_disk(cache, site):
+    url = f"{site.url}/etag"
+    assert await cache.get(url, max_age=60) == (OFFERS, "miss")
+    assert await cache.get(url, max_age=60) == (OFFERS, "hit")
+    assert len(site.requests) == 1
+
+    restarted = HttpCache(cache.path)  # new process, same file
+    assert await restarted.get(url, max_age=60) == (OFFERS, "hit")
+    assert len(site.requests) == 1
+    restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation(cache, site):
+    url = f"{site.url}/etag"
+    await cache.get_text(url, max_age=0)
+    assert await cache.get(url, max_age=0) == (OFFERS, "revalidated")
+    assert site.requests[-1]["If-None-Match"] == '"v1"'
+
+    site.version = 2
+    text, outcome = await cache.get(url, max_age=0)
+    assert outcome == "miss"
+    assert "0,99" in text
+    assert await cache.get(url, max_age=0) == (text, "revalidated")
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert (stats["miss"], stats["revalidated"]) == (2, 2)
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_saved"] == 2 * len(OFFERS)
+
+
+@pytest.mark.asyncio
+async def test_last_modified_revalidation(cache, site):
+    url = f"{site.url}/dated"
+    await cache.get_text(url, max_age=0)
+    assert (await cache.get(url, max_age=0))[1] == "revalidated"
+    assert site.requests[-1]["If-Modified-Since"] == "Mon, 01 Jun 2026 08:00:00 GMT"
+    assert "If-None-Match" not in site.requests[-1]
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(cache, site):
+    url = f"{site.url}/etag"
+    await cache.get_text(url, max_age=0)
+    site.version = 2
+
+    async with httpx.AsyncClient(headers={"User-Agent": "ViLife/1.0"}) as client:
+        text, outcome = await cache.get(
+            url, max_age=0, stale_while_revalidate=60, client=client
+        )
+        assert (text, outcome) == (OFFERS, "stale")  # no waiting on the site
+        # joins the revalidation already running, no second fetch
+        await cache.get(url, max_age=0, stale_while_revalidate=60, client=client)
+    await asyncio.gather(*cache._revalidating.values())
+
+    assert len(site.requests) == 2
+    assert site.requests[-1]["If-None-Match"] == '"v1"'
+    assert site.requests[-1]["User-Agent"] == "ViLife/1.0"  # the caller's client
+    assert "0,99" in await cache.get_text(url, max_age=60)
+
+    stats = cache.stats()  # background fetches are not lookups
+    assert (stats["miss"], stats["stale"], stats["hit"]) == (1, 2, 1)
+    assert stats["hit_rate"] == 0.75
+    assert stats["background"] == {"revalidated": 0, "miss": 1, "error": 0}
+
+
+@pytest.mark.asyncio
+async def test_locked_file_does_not_block_the_loop(cache, site):
+    url = f"{site.url}/etag"
+    await cache.get_text(url, max_age=0)
+    other = sqlite3.connect(cache.path, isolation_level=None)  # the other app
+    other.execute("BEGIN IMMEDIATE")
+    asyncio.get_running_loop().call_later(0.3, other.execute, "COMMIT")
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        assert await cache.get(url, max_age=0) == (OFFERS, "revalidated")
+    finally:
+        ticking.cancel()
+        other.close()
+    assert ticks >= 10  # the loop kept running while the write waited
+
+
+@pytest.mark.asyncio
+async def test_failures_serve_the_stored_copy(cache, site):
+    url = f"{site.url}/etag"
+    await cache.get_text(url, max_age=0)
+    site.down = True
+
+    assert await cache.get(url, max_age=0) == (OFFERS, "stale_error")
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get(f"{site.url}/unknown", max_age=0)
+    assert cache.stats()["error"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_store_is_not_persisted(cache, site):
+    await cache.get_text(f"{site.url}/private", max_age=60)
+    await cache.get_text(f"{site.url}/private", max_age=60)
+    assert len(site.requests) == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_store_scrapers_share_the_cache(cache, site, monkeypatch):
+    monkeypatch.setattr(http_cache, "_shared", cache)
+    monkeypatch.setattr(SparScraper, "OFFERS_URL", f"{site.url}/angebote")
+
+    await SparScraper().scrape_offers()
+    await SparScraper().scrape_offers()
+    assert len(site.requests) == 1
+    assert site.requests[0]["User-Agent"].startswith("Mozilla/5.0")
+    assert cache.stats()["hit"] == 1
+
+
+def test_cache_stats_endpoint(client):
+    response = client.get("/api/shopping/scrape/cache")
+    assert response.status_code == 200
+    assert {"entries", "hit", "miss", "hit_rate"} <= set(response.json())
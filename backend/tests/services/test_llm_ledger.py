@@ -0,0 +1,107 @@
+"""
+LLM performance ledger tests - recording, summaries, model selection
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from services import llm_ledger
+from services.ollama_service import OllamaService
+
+
+@pytest.fixture
+def ledger_db(test_db):
+    """Point the ledger at the per-test database"""
+    factory = sessionmaker(bind=test_db.get_bind())
+    llm_ledger._pending.clear()  # rows queued by other tests
+    with patch("models.base.SessionLocal", factory):
+        llm_ledger._stats["expires"] = 0.0
+        yield
+    llm_ledger._pending.clear()
+
+
+def _calls(model, n, ttft_ms, tok_s, ok=True):
+    for _ in range(n):
+        llm_ledger.record(
+            model=model,
+            endpoint="http://test",
+            task="chat",
+            ok=ok,
+            ttft_ms=ttft_ms,
+            total_ms=ttft_ms + 1000,
+            tok_s=tok_s,
+        )
+
+
+class TestSelection:
+    """Per-task model choice"""
+
+    def test_quality_tiers(self):
+        assert llm_ledger.quality_tier("llama3.2:3b") == 1
+        assert llm_ledger.quality_tier("llama3.1:8b") == 2
+        assert llm_ledger.quality_tier("qwen2.5:32b") == 3
+
+    def test_fastest_adequate_model_wins(self, ledger_db):
+        _calls("llama3.2:3b", 5, ttft_ms=80, tok_s=150)
+        _calls("llama3.1:8b", 5, ttft_ms=250, tok_s=60)
+        _calls("gemma3:12b", 5, ttft_ms=400, tok_s=30)
+        installed = ["llama3.2:3b", "llama3.1:8b", "gemma3:12b"]
+        assert llm_ledger.pick_model(installed, "chat") == "llama3.1:8b"
+        assert llm_ledger.pick_model(installed, "summary") == "llama3.2:3b"
+
+    def test_error_prone_model_is_skipped(self, ledger_db):
+        _calls("fast-but-broken:8b", 5, ttft_ms=10, tok_s=500, ok=False)
+        _calls("llama3.1:8b", 5, ttft_ms=250, tok_s=60)
+        installed = ["fast-but-broken:8b", "llama3.1:8b"]
+        assert llm_ledger.pick_model(installed, "chat") == "llama3.1:8b"
+
+    @pytest.mark.asyncio
+    async def test_select_model_falls_back_to_default(self, ledger_db):
+        service = OllamaService(base_url="http://ollama.test")
+        with patch.object(service, "list_models", new=AsyncMock(return_value=[])):
+            assert await service.select_model("chat") == service.default_model
+
+
+class TestRecording:
+    """OllamaService generations land in the ledger"""
+
+    @pytest.mark.asyncio
+    async def test_generate_records_native_timings(self, ledger_db):
+        service = OllamaService(base_url="http://ollama.test")
+        response = MagicMock()
+        response.json.return_value = {
+            "response": "Servus",
+            "done": True,
+            "load_duration": 1_500_000_000,
+            "prompt_eval_duration": 500_000_000,
+            "prompt_eval_count": 40,
+            "eval_count": 60,
+            "eval_duration": 2_000_000_000,
+        }
+        with patch("httpx.AsyncClient.post", new=AsyncMock(return_value=response)):
+            result = await service.generate("hi", model="llama3.1:8b")
+        assert result["success"] is True
+
+        [row] = [s for s in llm_ledger.summaries() if s["model"] == "llama3.1:8b"]
+        assert row["calls"] == 1
+        assert row["load_ms_avg"] == 1500
+        assert row["ttft_ms_p50"] == 2000
+        assert row["tok_s_p50"] == 30
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_counts_as_error(self, ledger_db):
+        service = OllamaService(base_url="http://ollama.test")
+        with (
+            patch(
+                "httpx.AsyncClient.post", new=AsyncMock(side_effect=OSError("refused"))
+            ),
+            llm_ledger.task("summary"),
+        ):
+            result = await service.generate("hi", model="llama3.1:8b")
+        assert result["success"] is False
+
+        [row] = llm_ledger.summaries(by_task=True)
+        assert row["task"] == "summary"
+        assert row["error_rate"] == 1.0
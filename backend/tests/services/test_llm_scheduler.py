@@ -0,0 +1,63 @@
+"""
+LLM scheduler tests - priorities, deadlines, backpressure
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services import llm_scheduler
+from services.llm_scheduler import LLMScheduler, SchedulerBusy, SchedulerTimeout
+from services.ollama_service import OllamaService
+
+
+async def _job(sched, order, name, cls):
+    async with sched.slot("m", cls):
+        order.append(name)
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_interactive_runs_before_queued_background():
+    sched = LLMScheduler(slots=1)
+    order = []
+    async with sched.slot("m", "standard"):
+        jobs = [
+            asyncio.ensure_future(_job(sched, order, "report", "background")),
+            asyncio.ensure_future(_job(sched, order, "insights", "background")),
+        ]
+        await asyncio.sleep(0)
+        jobs.append(asyncio.ensure_future(_job(sched, order, "chat", "interactive")))
+        await asyncio.sleep(0)
+    await asyncio.gather(*jobs)
+    assert order == ["chat", "report", "insights"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_and_backpressure(monkeypatch):
+    monkeypatch.setitem(llm_scheduler.MAX_QUEUED, "background", 0)
+    sched = LLMScheduler(slots=1)
+    async with sched.slot("m"):
+        with pytest.raises(SchedulerTimeout):
+            async with sched.slot("m", deadline_s=0.05):
+                pass
+        with pytest.raises(SchedulerBusy):
+            async with sched.slot("m", "background"):
+                pass
+    stats = sched.stats()["models"]["m"]
+    assert (stats["timed_out"], stats["rejected"], stats["active"]) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_releases_its_slot():
+    service = OllamaService(base_url="http://ollama.test")
+    sched = LLMScheduler(slots=1)
+    with (
+        patch("services.ollama_service.scheduler", sched),
+        patch("httpx.AsyncClient.post", new=AsyncMock(side_effect=OSError("refused"))),
+    ):
+        result = await service.generate("hi", model="llama3.2:3b")
+    assert result["success"] is False
+    assert sched.stats()["active"] == 0
+    assert sched.stats()["models"]["llama3.2:3b"]["granted"] == 1
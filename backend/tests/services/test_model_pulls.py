@@ -0,0 +1,199 @@
+"""
+Model pull tests - background jobs, progress, cancel and queueing against a
+stub Ollama server that streams /api/pull progress
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from services.model_pulls import ModelPulls
+from services.ollama_service import OllamaService, ollama_service
+
+MB = 1_000_000
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Streams pull progress lines the way Ollama does"""
+
+    def _line(self, body):
+        self.wfile.write(json.dumps(body).encode() + b"\n")
+        self.wfile.flush()
+
+    def _progress(self, model):
+        yield {"status": "pulling manifest"}
+        if model.startswith("missing"):
+            yield {"error": "pull model manifest: file does not exist"}
+            return
+        steps = 200 if model.startswith("slow") else 4
+        for digest, total in (("sha256:aa", 40 * MB), ("sha256:bb", 8 * MB)):
+            for step in range(1, steps + 1):
+                yield {
+                    "status": f"pulling {digest[7:]}",
+                    "digest": digest,
+                    "total": total,
+                    "completed": total * step // steps,
+                }
+        yield {"status": "verifying sha256 digest"}
+        yield {"status": "writing manifest"}
+        yield {"status": "success"}
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = payload["model"]
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for line in self._progress(model):
+                self._line(line)
+                time.sleep(server.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            server.aborted.append(model)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ollama():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    server.lock = threading.Lock()
+    server.active = server.max_active = 0
+    server.aborted = []
+    server.delay = 0.005
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(stub_ollama):
+    return OllamaService(base_url=f"http://127.0.0.1:{stub_ollama.server_port}")
+
+
+async def _wait(job, timeout=10.0):
+    if job.task is None:  # still queued
+        deadline = time.monotonic() + timeout
+        while job.task is None and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(asyncio.shield(job.task), timeout)
+    return job.to_dict()
+
+
+class TestPulls:
+    """Jobs, progress, failures, cancel and concurrency"""
+
+    @pytest.mark.asyncio
+    async def test_pull_returns_at_once_and_completes(self, service):
+        result = await service.pull_model("llama3.2:3b")
+        assert result["success"] is True
+        assert result["job"]["status"] in ("queued", "pulling")
+
+        job = await _wait(service.pulls.get(result["job"]["id"]))
+        assert job["status"] == "done"
+        assert job["detail"] == "success"
+        assert job["completed"] == job["total"] == 48 * MB
+        assert job["percent"] == 100.0
+        assert job["error"] is None
+
+    @pytest.mark.asyncio
+    async def test_error_line_fails_the_job(self, service):
+        job = await _wait(service.pulls.start("missing:1b"))
+        assert job["status"] == "failed"
+        assert "does not exist" in job["error"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_the_download(self, service, stub_ollama):
+        stub_ollama.delay = 0.02
+        job = service.pulls.start("slow:1b")
+        while not job.layers:
+            await asyncio.sleep(0.01)
+        assert service.pulls.cancel(job.id) is True
+        assert (await _wait(job))["status"] == "cancelled"
+        assert service.pulls.cancel(job.id) is False
+
+        deadline = time.monotonic() + 5
+        while not stub_ollama.aborted and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        assert stub_ollama.aborted == ["slow:1b"]
+
+    @pytest.mark.asyncio
+    async def test_queue_respects_concurrency(self, service, stub_ollama):
+        pulls = ModelPulls(service, concurrency=1)
+        jobs = [pulls.start(m) for m in ("a:1b", "b:1b", "c:1b")]
+        assert [j.status for j in jobs] == ["pulling", "queued", "queued"]
+        assert pulls.cancel(jobs[2].id) is True
+        assert jobs[2].status == "cancelled"
+
+        results = [await _wait(j) for j in jobs[:2]]
+        assert [r["status"] for r in results] == ["done", "done"]
+        assert stub_ollama.max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pull_reuses_the_job(self, service):
+        first = service.pulls.start("llama3.2:3b")
+        assert service.pulls.start("llama3.2:3b") is first
+        await _wait(first)
+        assert service.pulls.start("llama3.2:3b") is not first
+
+    @pytest.mark.asyncio
+    async def test_events_end_with_final_status(self, service):
+        job = service.pulls.start("llama3.2:3b")
+        events = [e async for e in service.pulls.events(job.id, interval_s=0.01)]
+        names = [e.split("\n")[1] for e in events if not e.startswith(":")]
+        assert names[0] == "event: progress"
+        assert names[-1] == "event: done"
+        final = json.loads(events[-1].split("data: ", 1)[1])
+        assert final["percent"] == 100.0
+        with pytest.raises(KeyError):
+            service.pulls.events("nope")
+
+
+class TestRoutes:
+    """/api/llm pull endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_pull_and_follow_events(self, stub_ollama):
+        from api.main import app
+
+        url = f"http://127.0.0.1:{stub_ollama.server_port}/api"
+        with (
+            patch.object(ollama_service, "api_url", url),
+            patch.object(ollama_service, "pulls", ModelPulls(ollama_service)),
+        ):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                started = await client.post("/api/llm/models/llama3.2:3b/pull")
+                assert started.status_code == 200
+                job_id = started.json()["job"]["id"]
+
+                events = await client.get(f"/api/llm/pulls/{job_id}/events")
+                assert events.headers["content-type"].startswith("text/event-stream")
+                assert "event: done" in events.text
+
+                job = (await client.get(f"/api/llm/pulls/{job_id}")).json()
+                assert job["status"] == "done"
+                listed = (await client.get("/api/llm/pulls")).json()["pulls"]
+                assert [p["id"] for p in listed] == [job_id]
+                cancel = await client.post(f"/api/llm/pulls/{job_id}/cancel")
+                assert cancel.json() == {"id": job_id, "cancelled": False}
+                missing = await client.get("/api/llm/pulls/nope/events")
+                assert missing.status_code == 404
@@ -0,0 +1,177 @@
+"""
+Model residency tests - preload, pin, unload and cold eviction against a
+stub Ollama server that implements /api/ps and keep_alive
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from services.model_residency import ModelResidency
+from services.ollama_service import OllamaService, ollama_service
+
+GB = 1_000_000_000
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    """Tracks resident models the way Ollama does: keep_alive 0 unloads"""
+
+    def _reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/api/ps":
+            self._reply(
+                {
+                    "models": [
+                        {
+                            "name": name,
+                            "size": 3 * GB,
+                            "size_vram": 2 * GB,
+                            "expires_at": "2099-01-01T00:00:00Z",
+                        }
+                        for name in sorted(server.resident)
+                    ]
+                }
+            )
+        else:
+            self._reply(
+                {"models": [{"name": n, "size": GB} for n in sorted(server.installed)]}
+            )
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.requests.append(payload)
+        if payload.get("keep_alive") == 0:
+            server.resident.discard(payload["model"])
+        else:
+            server.resident.add(payload["model"])
+        self._reply(
+            {
+                "model": payload["model"],
+                "response": "hi" if payload.get("prompt") else "",
+                "done": True,
+            }
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ollama():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    server.installed = {"llama3.2:3b", "llama3.1:8b", "qwen2.5:32b"}
+    server.resident = set()
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service(stub_ollama):
+    return OllamaService(base_url=f"http://127.0.0.1:{stub_ollama.server_port}")
+
+
+class TestResidency:
+    """Preload, pin, unload, eviction"""
+
+    @pytest.mark.asyncio
+    async def test_preload_does_not_generate(self, service, stub_ollama):
+        result = await service.load_model("llama3.1:8b")
+        assert result["success"] is True
+        assert result["load_ms"] >= 0
+        assert stub_ollama.requests == [{"model": "llama3.1:8b"}]
+        assert stub_ollama.resident == {"llama3.1:8b"}
+
+    @pytest.mark.asyncio
+    async def test_pinned_model_keeps_its_keep_alive(self, service, stub_ollama):
+        await service.residency.pin("llama3.2:3b")
+        assert stub_ollama.requests[-1] == {"model": "llama3.2:3b", "keep_alive": -1}
+        await service.generate(prompt="hi", model="llama3.2:3b")
+        await service.generate(prompt="hi", model="llama3.1:8b")
+        pinned_call, other_call = stub_ollama.requests[-2:]
+        assert pinned_call["keep_alive"] == -1
+        assert "keep_alive" not in other_call
+
+        await service.residency.unpin("llama3.2:3b")
+        assert stub_ollama.requests[-1] == {"model": "llama3.2:3b"}
+        assert "llama3.2:3b" not in service.residency.pinned
+
+    @pytest.mark.asyncio
+    async def test_unload(self, service, stub_ollama):
+        await service.residency.pin("llama3.2:3b")
+        result = await service.unload_model("llama3.2:3b")
+        assert result["success"] is True
+        assert stub_ollama.requests[-1] == {"model": "llama3.2:3b", "keep_alive": 0}
+        assert stub_ollama.resident == set()
+        assert service.residency.pinned == set()
+
+    @pytest.mark.asyncio
+    async def test_evicts_only_cold_unpinned_models(self, service, stub_ollama):
+        service.residency.cold_after_s = 0.5
+        await service.residency.pin("llama3.2:3b")
+        await service.load_model("qwen2.5:32b")
+        await service.load_model("llama3.1:8b")
+        await asyncio.sleep(0.6)
+        service.residency.touch("llama3.1:8b")  # used just now
+        assert await service.residency.evict_cold() == ["qwen2.5:32b"]
+        assert stub_ollama.resident == {"llama3.2:3b", "llama3.1:8b"}
+
+    @pytest.mark.asyncio
+    async def test_warmup_pins_interactive_model(self, service, stub_ollama):
+        results = await service.residency.warmup()
+        chat_model = await service.select_model("chat")
+        assert [r["model"] for r in results] == [chat_model]
+        assert service.residency.pinned == {chat_model}
+        assert stub_ollama.resident == {chat_model}
+
+    @pytest.mark.asyncio
+    async def test_warmup_without_ollama_is_a_noop(self):
+        residency = ModelResidency(OllamaService(base_url="http://127.0.0.1:9"))
+        assert await residency.warmup() == []
+
+    @pytest.mark.asyncio
+    async def test_state_reports_memory_and_pins(self, service, stub_ollama):
+        await service.residency.pin("llama3.2:3b")
+        state = await service.residency.state()
+        assert state["connected"] is True
+        assert state["resident"] == 1
+        assert state["vram_bytes"] == 2 * GB
+        models = {m["name"]: m for m in state["models"]}
+        assert models["llama3.2:3b"]["state"] == "resident"
+        assert models["llama3.2:3b"]["pinned"] is True
+        assert models["llama3.2:3b"]["memory_bytes"] == 3 * GB
+        assert models["qwen2.5:32b"]["state"] == "on_disk"
+        assert models["qwen2.5:32b"]["disk_bytes"] == GB
+
+
+class TestRoutes:
+    """/api/llm residency endpoints"""
+
+    def test_pin_residency_and_unload(self, client, stub_ollama):
+        url = f"http://127.0.0.1:{stub_ollama.server_port}/api"
+        with (
+            patch.object(ollama_service, "api_url", url),
+            patch.object(ollama_service.residency, "pinned", set()),
+        ):
+            assert client.post("/api/llm/models/llama3.2:3b/pin").json()["pinned"]
+            state = client.get("/api/llm/residency").json()
+            assert state["pinned"] == ["llama3.2:3b"]
+            assert client.post("/api/llm/models/llama3.2:3b/unload").status_code == 200
+            assert client.post("/api/llm/residency/evict").json() == {"evicted": []}
+            assert stub_ollama.resident == set()
@@ -0,0 +1,146 @@
+"""
+Model router tests - complexity routes, conversation pin, route stats
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models.conversation import Conversation
+from services import llm_ledger, model_router
+from services.chat_service import chat_service
+
+INSTALLED = ["llama3.2:3b", "llama3.1:8b", "qwen2.5:32b"]
+
+
+@pytest.fixture
+def router_db(test_db):
+    """Ledger and pin lookups against the per-test database"""
+    factory = sessionmaker(bind=test_db.get_bind())
+    llm_ledger._pending.clear()
+    model_router.router_stats.clear()
+    with (
+        patch("models.base.SessionLocal", factory),
+        patch(
+            "services.ollama_service.ollama_service.installed_models",
+            new=AsyncMock(return_value=INSTALLED),
+        ),
+    ):
+        llm_ledger._stats["expires"] = 0.0
+        yield test_db
+    model_router.router_stats.clear()
+
+
+async def _answer(messages, **kwargs):
+    models = []
+
+    async def fake_stream(model, prompt):
+        models.append(model)
+        yield {"response": "ok"}
+
+    with patch(
+        "services.ollama_service.ollama_service.generate_stream", new=fake_stream
+    ):
+        chunks = [c async for c in chat_service.chat_stream(messages, **kwargs)]
+    return models[0], chunks[-1]
+
+
+class TestRoutes:
+    """Signals to route"""
+
+    @pytest.mark.parametrize(
+        "prompt,tools,route",
+        [
+            ("Servus!", 0, "small"),
+            ("What time is it?", 1, "small"),
+            ("Explain step by step how Vienna rent control works", 0, "large"),
+            ("Compare U-Bahn and bike for my commute", 0, "large"),
+            ("What is the weather and what is 2+2?", 2, "large"),
+            (
+                "Which restaurants near the Naschmarkt are open on Sunday?",
+                0,
+                "standard",
+            ),
+        ],
+    )
+    def test_route(self, prompt, tools, route):
+        assert model_router.route(prompt, tools)["route"] == route
+
+    def test_long_prompt_goes_large(self):
+        decision = model_router.route("word " * 200)
+        assert decision["route"] == "large"
+        assert decision["task"] == "chat_large"
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("CHAT_MODEL_ROUTER", "0")
+        assert model_router.route("Compare A and B")["route"] == "standard"
+
+
+class TestChatStream:
+    """chat_stream picks the model per route"""
+
+    @pytest.mark.asyncio
+    async def test_routes_to_small_and_large_models(self, router_db):
+        small, done = await _answer([{"role": "user", "content": "Hi!"}])
+        assert small == "llama3.2:3b"
+        assert done["route"] == "small"
+        large, done = await _answer(
+            [{"role": "user", "content": "Compare Billa and Spar prices for me"}]
+        )
+        assert large == "qwen2.5:32b"
+        assert done == {"type": "done", "model": "qwen2.5:32b", "route": "large"}
+
+        stats = model_router.router_stats.stats()["routes"]
+        assert stats["small"]["models"] == {"llama3.2:3b": 1}
+        assert stats["large"]["samples"] == 1
+        assert stats["large"]["ttft_ms_p50"] is not None
+
+    @pytest.mark.asyncio
+    async def test_conversation_pin_wins(self, router_db):
+        conv = Conversation(title="Pinned", pinned_model="llama3.1:8b")
+        router_db.add(conv)
+        router_db.commit()
+        model, done = await _answer(
+            [{"role": "user", "content": "Compare Billa and Spar prices"}],
+            model="qwen2.5:32b",
+            conversation_id=conv.id,
+        )
+        assert model == "llama3.1:8b"
+        assert done["route"] == "pinned"
+
+    @pytest.mark.asyncio
+    async def test_explicit_model_skips_routing(self, router_db):
+        model, done = await _answer(
+            [{"role": "user", "content": "Hi!"}], model="qwen2.5:32b"
+        )
+        assert model == "qwen2.5:32b"
+        assert done["route"] == "pinned"
+
+
+class TestEndpoints:
+    """Pin endpoint and stats"""
+
+    def test_pin_and_unpin(self, client):
+        conv = client.post("/api/chat/conversations", json={"title": "T"}).json()
+        assert conv["pinned_model"] is None
+        pinned = client.put(
+            f"/api/chat/conversations/{conv['id']}/model",
+            json={"model": "qwen2.5:32b"},
+        ).json()
+        assert pinned["pinned_model"] == "qwen2.5:32b"
+        unpinned = client.put(
+            f"/api/chat/conversations/{conv['id']}/model", json={"model": None}
+        ).json()
+        assert unpinned["pinned_model"] is None
+        missing = client.put("/api/chat/conversations/nope/model", json={})
+        assert missing.status_code == 404
+
+    def test_stats(self, client):
+        model_router.router_stats.clear()
+        model_router.router_stats.decided(model_router.route("Hi!"), "llama3.2:3b")
+        model_router.router_stats.observe("small", 300.0, 90.0)
+        stats = client.get("/api/chat/router/stats").json()
+        assert stats["routes"]["small"]["turns"] == 1
+        assert stats["routes"]["small"]["total_ms_p50"] == 300.0
+        model_router.router_stats.clear()
@@ -0,0 +1,110 @@
+"""
+Prompt enhancement tests - local intent classifier, single LLM call, cache
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services import prompt_enhancement
+from services.chat_service import chat_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    prompt_enhancement.enhancement_cache.clear()
+    yield
+    prompt_enhancement.enhancement_cache.clear()
+
+
+class TestClassifier:
+    """Heuristic intent classification"""
+
+    @pytest.mark.parametrize(
+        "prompt,intent,domain",
+        [
+            ("Write a poem about Vienna in autumn", "CREATIVE", "writing"),
+            ("Compare U-Bahn and bike for my commute", "ANALYSIS", "general"),
+            ("Why does my python script throw a KeyError?", "TECHNICAL", "technology"),
+            ("Was kostet ein Jahresticket?", "QUESTION", "finance"),
+            ("explain ML", "QUESTION", "general"),
+            ("Servus!", "CONVERSATION", "general"),
+            ("Add oat milk and apples to the shopping list", "INSTRUCTION", "general"),
+        ],
+    )
+    def test_intent_and_domain(self, prompt, intent, domain):
+        result = prompt_enhancement.classify_intent(prompt)
+        assert (result["intent"], result["domain"]) == (intent, domain)
+        assert set(result) == {"intent", "domain", "complexity", "expertise"}
+
+    def test_complexity_and_expertise(self):
+        simple = prompt_enhancement.classify_intent("weather tomorrow?")
+        deep = prompt_enhancement.classify_intent(
+            "Explain step by step and in depth how Vienna's rent control works"
+        )
+        assert simple["complexity"] == "simple"
+        assert (deep["complexity"], deep["expertise"]) == ("complex", "expert")
+
+
+class TestEnhancePrompt:
+    """One LLM call per new prompt, none for repeats"""
+
+    @pytest.mark.asyncio
+    async def test_single_llm_call_then_cache(self):
+        generate = AsyncMock(return_value={"response": "Explain ML algorithms clearly"})
+        with patch("services.ollama_service.ollama_service.generate", new=generate):
+            first = await chat_service.enhance_prompt("explain ML", "llama3.2:3b")
+            again = await chat_service.enhance_prompt("explain ML ", "llama3.2:3b")
+            other = await chat_service.enhance_prompt("explain ML", "qwen2.5:7b")
+
+        assert first == again == other == "Explain ML algorithms clearly"
+        assert generate.await_count == 2  # one per model, no intent call
+        stats = prompt_enhancement.enhancement_cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        generate = AsyncMock(
+            side_effect=[RuntimeError("ollama down"), {"response": "Better prompt"}]
+        )
+        with patch("services.ollama_service.ollama_service.generate", new=generate):
+            assert await chat_service.enhance_prompt("prompt", "m") == "prompt"
+            assert await chat_service.enhance_prompt("prompt", "m") == "Better prompt"
+
+    @pytest.mark.asyncio
+    async def test_stream_reports_added_latency(self):
+        async def fake_stream(model, prompt):
+            yield {"response": "ok"}
+
+        generate = AsyncMock(return_value={"response": "What is on today in Vienna?"})
+        with (
+            patch("services.ollama_service.ollama_service.generate", new=generate),
+            patch(
+                "services.ollama_service.ollama_service.generate_stream",
+                side_effect=fake_stream,
+            ),
+        ):
+            for _ in range(2):
+                chunks = [
+                    c
+                    async for c in chat_service.chat_stream(
+                        [{"role": "user", "content": "whats on today"}],
+                        model="llama3.2:3b",
+                        use_tools=False,
+                        enhance_prompts=True,
+                    )
+                ]
+                event = next(c for c in chunks if c["type"] == "enhancement")
+                assert event["enhanced"] == "What is on today in Vienna?"
+                assert event["latency_ms"] >= 0
+
+        assert generate.await_count == 1
+        stats = prompt_enhancement.enhancement_cache.stats()
+        assert stats["samples"] == 2
+        assert stats["hit_rate"] == 0.5
+
+
+def test_stats_endpoint(client):
+    response = client.get("/api/chat/enhancement/stats")
+    assert response.status_code == 200
+    assert {"hits", "misses", "added_ms_p50", "added_ms_p95"} <= set(response.json())
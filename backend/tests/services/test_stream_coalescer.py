@@ -0,0 +1,120 @@
+"""
+Stream coalescer tests - merged token deltas, latency budget, event order
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from services import stream_coalescer
+
+
+async def _tokens(n, delay=0.0, tail=()):
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        yield {"type": "text", "content": f"t{i} "}
+    for event in tail:
+        yield event
+
+
+async def _collect(events, **kwargs):
+    return [e async for e in stream_coalescer.coalesce(events, **kwargs)]
+
+
+class TestEncoding:
+    """Fast text line encoder"""
+
+    def test_text_line_matches_json_dumps(self):
+        for content in ("Servus", 'Grüß "Gott" ☕\n', "\\", ""):
+            event = {"type": "text", "content": content}
+            assert stream_coalescer.text_line(content) == json.dumps(event) + "\n"
+            assert stream_coalescer.event_line(event) == json.dumps(event) + "\n"
+
+    def test_other_events_use_json(self):
+        event = {"type": "tool", "tool": "weather", "result": "12°C"}
+        assert stream_coalescer.event_line(event) == json.dumps(event) + "\n"
+
+    def test_seq_is_appended_as_last_key(self):
+        for event in (
+            {"type": "text", "content": 'Grüß "Gott"'},
+            {"type": "done", "model": "llama3.2:3b"},
+        ):
+            expected = json.dumps({**event, "seq": 7}) + "\n"
+            assert stream_coalescer.event_line(event, 7) == expected
+            assert "seq" not in event
+
+
+class TestCoalesce:
+    """Merging within the latency budget"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_merged_and_text_preserved(self):
+        events = await _collect(_tokens(500), flush_ms=40, max_bytes=10_000)
+        assert events[0] == {"type": "text", "content": "t0 "}  # first token at once
+        assert len(events) <= 3
+        assert "".join(e["content"] for e in events) == "".join(
+            f"t{i} " for i in range(500)
+        )
+
+    @pytest.mark.asyncio
+    async def test_size_limit_flushes(self):
+        events = await _collect(_tokens(200), flush_ms=10_000, max_bytes=100)
+        assert all(len(e["content"]) < 110 for e in events)
+        assert len(events) > 5
+
+    @pytest.mark.asyncio
+    async def test_no_token_held_longer_than_budget(self):
+        sent = {}
+
+        async def timed():
+            async for event in _tokens(40, delay=0.005):
+                sent[event["content"]] = time.monotonic()
+                yield event
+
+        worst = 0.0
+        async for event in stream_coalescer.coalesce(timed(), flush_ms=30):
+            now = time.monotonic()
+            for token in event["content"].split():
+                worst = max(worst, now - sent[token + " "])
+        assert worst < 0.030 + 0.025
+        assert len(sent) == 40
+
+    @pytest.mark.asyncio
+    async def test_quiet_source_flushes_on_timer(self):
+        flushed = []
+
+        async def stalls():
+            yield {"type": "text", "content": "a"}
+            yield {"type": "text", "content": "b"}
+            await asyncio.sleep(0.3)
+            flushed.append(len(seen))
+            yield {"type": "done"}
+
+        seen = []
+        async for event in stream_coalescer.coalesce(stalls(), flush_ms=20):
+            seen.append(event)
+        assert flushed == [2]  # "b" went out before the stall ended
+        assert seen == [
+            {"type": "text", "content": "a"},
+            {"type": "text", "content": "b"},
+            {"type": "done"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_other_events_flush_and_keep_order(self):
+        tail = [
+            {"type": "tool", "tool": "weather", "result": "sunny"},
+            {"type": "text", "content": "ok"},
+            {"type": "done"},
+        ]
+        events = await _collect(_tokens(3, tail=tail), flush_ms=1000)
+        assert [e["type"] for e in events] == ["text", "text", "tool", "text", "done"]
+        assert events[1]["content"] == "t1 t2 "
+
+    @pytest.mark.asyncio
+    async def test_zero_budget_passes_through(self):
+        events = await _collect(_tokens(5), flush_ms=0)
+        assert len(events) == 5
@@ -135,7 +135,7 @@ def process_long_ai_analysis(self, query: str, context: Dict[str, Any]):
         3. Predictive analysis where applicable
         """
 
-        result = llm_service.generate_response(analysis_prompt)
+        result = llm_service.generate_sync_response(analysis_prompt)
         logger.info(f"AI analysis completed for query: {query[:50]}...")
 
         return {
@@ -184,7 +184,7 @@ def generate_weekly_report(self, user_id: str, report_type: str = "comprehensive
             4. Recommendations for next week
             """
 
-            report_content = llm_service.generate_response(analysis_prompt)
+            report_content = llm_service.generate_sync_response(analysis_prompt)
 
             # TODO: Store report in database or send via email
             logger.info(f"Weekly report generated for user {user_id}")
@@ -300,7 +300,7 @@ def personalize_recommendations(self, user_id: str):
         4. Vienna-specific recommendations
         """
 
-        recommendations = llm_service.generate_response(personalization_prompt)
+        recommendations = llm_service.generate_sync_response(personalization_prompt)
 
         # TODO: Store recommendations for user
         logger.info(f"Personalized recommendations generated for user {user_id}")
@@ -57,6 +57,7 @@ interface Conversation {
   title: string;
   personality: string;
   updated_at: string;
+  pinned_model?: string | null;
 }
 
 export const ChatBot: React.FC = () => {
@@ -67,7 +68,8 @@ export const ChatBot: React.FC = () => {
   const [conversations, setConversations] = useState<Conversation[]>([]);
   const [personalities, setPersonalities] = useState<Personality[]>([]);
   const [selectedPersonality, setSelectedPersonality] = useState('assistant');
-  const [selectedModel, setSelectedModel] = useState('llama3.2:3b');
+  // '' = auto: the server routes each turn to a small or large model
+  const [selectedModel, setSelectedModel] = useState('');
   const [models, setModels] = useState<any[]>([]);
   const [useTools, setUseTools] = useState(true);
   const [enhancePrompts, setEnhancePrompts] = useState(false);
@@ -122,7 +124,7 @@ export const ChatBot: React.FC = () => {
       const response = await api.post('/api/chat/conversations', {
         title: 'New Chat',
         personality: selectedPersonality,
-        model: selectedModel,
+        pinned_model: selectedModel || null,
       });
       setCurrentConversation(response.data.id);
       setMessages([]);
@@ -136,6 +138,7 @@ export const ChatBot: React.FC = () => {
     try {
       const response = await api.get(`/api/chat/conversations/${conversationId}`);
       setCurrentConversation(conversationId);
+      setSelectedModel(response.data.conversation?.pinned_model || '');
       const loadedMessages = response.data.messages.map((m: any) => ({
         ...m,
         timestamp: new Date(m.created_at),
@@ -147,6 +150,19 @@ export const ChatBot: React.FC = () => {
     }
   };
 
+  // Picking a model pins it to the open conversation; Auto unpins it
+  const changeModel = async (model: string) => {
+    setSelectedModel(model);
+    if (!currentConversation) return;
+    try {
+      await api.put(`/api/chat/conversations/${currentConversation}/model`, {
+        model: model || null,
+      });
+    } catch (error) {
+      console.error('Failed to pin model:', error);
+    }
+  };
+
   const deleteConversation = async (conversationId: string) => {
     try {
       await api.delete(`/api/chat/conversations/${conversationId}`);
@@ -189,26 +205,8 @@ export const ChatBot: React.FC = () => {
 
       // Stream response - use the configured API base URL
       const apiBaseUrl = import.meta.env.VITE_API_URL || 'http://localhost:7334';
-      
-      const response = await fetch(`${apiBaseUrl}/api/chat/stream`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          conversation_id: currentConversation,
-          messages: messageHistory,
-          model: selectedModel,
-          personality: selectedPersonality,
-          use_tools: useTools,
-          enhance_prompts: enhancePrompts,
-        }),
-      });
+      const requestId = crypto.randomUUID();
 
-      if (!response.ok || !response.body) {
-        throw new Error('Stream failed');
-      }
-
-      const reader = response.body.getReader();
-      const decoder = new TextDecoder();
       let assistantMessage: Message = {
         id: (Date.now() + 1).toString(),
         role: 'assistant',
@@ -216,56 +214,92 @@ export const ChatBot: React.FC = () => {
         timestamp: new Date(),
         toolCalls: [],
       };
-
       setMessages((prev) => [...prev, assistantMessage]);
 
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-
-        const chunk = decoder.decode(value);
-        const lines = chunk.split('\n').filter((l) => l.trim());
-
-        for (const line of lines) {
-          try {
-            const data = JSON.parse(line);
-
-            if (data.type === 'enhancement') {
-              // Show prompt enhancement
-              assistantMessage.enhanced = true;
-            } else if (data.type === 'tool') {
-              // Tool call result
-              if (!assistantMessage.toolCalls) assistantMessage.toolCalls = [];
-              assistantMessage.toolCalls.push(data);
-            } else if (data.type === 'text') {
-              // Stream text
-              assistantMessage.content += data.content;
-              setMessages((prev) => {
-                const newMessages = [...prev];
-                newMessages[newMessages.length - 1] = { ...assistantMessage };
-                return newMessages;
-              });
-            } else if (data.type === 'done') {
-              // Done streaming
-              break;
+      let lastSeq = 0;
+      let finished = false;
+
+      const handleEvent = (data: any) => {
+        if (data.type === 'enhancement') {
+          // Show prompt enhancement
+          assistantMessage.enhanced = true;
+        } else if (data.type === 'tool') {
+          // Tool call result
+          if (!assistantMessage.toolCalls) assistantMessage.toolCalls = [];
+          assistantMessage.toolCalls.push(data);
+        } else if (data.type === 'text') {
+          // Stream text
+          assistantMessage.content += data.content;
+          setMessages((prev) => {
+            const newMessages = [...prev];
+            newMessages[newMessages.length - 1] = { ...assistantMessage };
+            return newMessages;
+          });
+        } else if (data.type === 'done' || data.type === 'stopped' || data.type === 'error') {
+          finished = true;
+        }
+      };
+
+      // The server keeps generating for a while after a dropped connection,
+      // so resume the same answer from the last event instead of starting over.
+      // The server also saves the exchange to the conversation.
+      for (let attempt = 0; !finished && attempt < 4; attempt++) {
+        let response: Response;
+        try {
+          response =
+            attempt === 0
+              ? await fetch(`${apiBaseUrl}/api/chat/stream`, {
+                  method: 'POST',
+                  headers: { 'Content-Type': 'application/json' },
+                  body: JSON.stringify({
+                    conversation_id: currentConversation,
+                    messages: messageHistory,
+                    model: selectedModel || null,
+                    personality: selectedPersonality,
+                    use_tools: useTools,
+                    enhance_prompts: enhancePrompts,
+                    request_id: requestId,
+                  }),
+                })
+              : await fetch(`${apiBaseUrl}/api/chat/stream/${requestId}?after=${lastSeq}`);
+        } catch (e) {
+          if (attempt === 0) throw e;
+          await new Promise((resolve) => setTimeout(resolve, 1000 * attempt));
+          continue;
+        }
+
+        if (!response.ok || !response.body) {
+          throw new Error('Stream failed');
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        try {
+          while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop() ?? '';
+
+            for (const line of lines) {
+              if (!line.trim()) continue;
+              try {
+                const data = JSON.parse(line);
+                if (data.seq <= lastSeq) continue;
+                lastSeq = data.seq;
+                handleEvent(data);
+              } catch (e) {
+                console.error('Failed to parse chunk:', e);
+              }
             }
-          } catch (e) {
-            console.error('Failed to parse chunk:', e);
           }
+        } catch (e) {
+          console.warn('Chat stream interrupted, resuming:', e);
         }
       }
-
-      // Save messages
-      if (currentConversation) {
-        await api.post(`/api/chat/conversations/${currentConversation}/messages`, {
-          role: 'user',
-          content: input,
-        });
-        await api.post(`/api/chat/conversations/${currentConversation}/messages`, {
-          role: 'assistant',
-          content: assistantMessage.content,
-        });
-      }
     } catch (error) {
       console.error('Failed to send message:', error);
       setMessages((prev) => [
@@ -298,7 +332,7 @@ export const ChatBot: React.FC = () => {
           <Typography variant="h6">AI Chatbot</Typography>
           <Typography variant="caption" color="text.secondary">
             {personalities.find((p) => p.id === selectedPersonality)?.name || 'Assistant'} •{' '}
-            {selectedModel}
+            {selectedModel || 'Auto model'}
           </Typography>
         </Box>
         <Tooltip title="Conversations">
@@ -454,9 +488,10 @@ export const ChatBot: React.FC = () => {
             <InputLabel>Model</InputLabel>
             <Select
               value={selectedModel}
-              onChange={(e) => setSelectedModel(e.target.value)}
+              onChange={(e) => changeModel(e.target.value)}
               label="Model"
             >
+              <MenuItem value="">Auto (small or large model per message)</MenuItem>
               {models.map((m) => (
                 <MenuItem key={m.name} value={m.name}>
                   {m.name} ({(m.size / 1e9).toFixed(1)} GB)
@@ -11,6 +11,7 @@ import {
   IconButton,
   Chip,
   CircularProgress,
+  LinearProgress,
   Alert,
   Dialog,
   DialogTitle,
@@ -38,6 +39,15 @@ interface Model {
   modified_at?: string;
 }
 
+interface PullJob {
+  id: string;
+  model: string;
+  status: string;
+  detail: string;
+  percent: number | null;
+  error: string | null;
+}
+
 interface RecommendedModel {
   name: string;
   size: string;
@@ -55,6 +65,7 @@ export default function LLMManager() {
   const [pullDialog, setPullDialog] = useState(false);
   const [modelToPull, setModelToPull] = useState('');
   const [pulling, setPulling] = useState(false);
+  const [pullJob, setPullJob] = useState<PullJob | null>(null);
 
   useEffect(() => {
     loadData();
@@ -98,17 +109,47 @@ export default function LLMManager() {
     
     try {
       setPulling(true);
-      await llmApi.pullModel(modelToPull);
-      setPullDialog(false);
-      setModelToPull('');
-      await loadData();
+      const res = await llmApi.pullModel(modelToPull);
+      const job: PullJob = res.data.job;
+      setPullJob(job);
+      
+      // The pull runs in the background; follow its progress
+      const events = llmApi.pullEvents(job.id);
+      const update = (e: MessageEvent) => setPullJob(JSON.parse(e.data));
+      const finish = (e: MessageEvent) => {
+        events.close();
+        const final: PullJob = JSON.parse(e.data);
+        setPullJob(null);
+        setPulling(false);
+        if (final.status === 'failed') {
+          setError(final.error || `Failed to pull ${final.model}`);
+        } else if (final.status === 'done') {
+          setPullDialog(false);
+          setModelToPull('');
+        }
+        loadData();
+      };
+      events.addEventListener('progress', update);
+      ['done', 'failed', 'cancelled'].forEach(name => events.addEventListener(name, finish as EventListener));
+      events.onerror = () => {
+        events.close();
+        setPullJob(null);
+        setPulling(false);
+      };
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to pull model');
-    } finally {
       setPulling(false);
     }
   };
 
+  const handleCancelPull = async () => {
+    if (pullJob) {
+      await llmApi.cancelPull(pullJob.id);
+    } else {
+      setPullDialog(false);
+    }
+  };
+
   const handleDeleteModel = async (modelName: string) => {
     if (!confirm(`Delete model ${modelName}?`)) return;
     
@@ -347,7 +388,7 @@ export default function LLMManager() {
       </Grid>
 
       {/* Pull Model Dialog */}
-      <Dialog open={pullDialog} onClose={() => setPullDialog(false)} maxWidth="sm" fullWidth>
+      <Dialog open={pullDialog} onClose={() => !pulling && setPullDialog(false)} maxWidth="sm" fullWidth>
         <DialogTitle>Pull Ollama Model</DialogTitle>
         <DialogContent>
           <TextField
@@ -358,11 +399,23 @@ export default function LLMManager() {
             autoFocus
             placeholder="e.g., llama3.2:3b"
             helperText="This may take several minutes depending on model size"
+            disabled={pulling}
             sx={{ mt: 1 }}
           />
+          {pullJob && (
+            <Box sx={{ mt: 2 }}>
+              <LinearProgress
+                variant={pullJob.percent === null ? 'indeterminate' : 'determinate'}
+                value={pullJob.percent ?? 0}
+              />
+              <Typography variant="caption" color="text.secondary">
+                {pullJob.detail}{pullJob.percent !== null && ` - ${pullJob.percent}%`}
+              </Typography>
+            </Box>
+          )}
         </DialogContent>
         <DialogActions>
-          <Button onClick={() => setPullDialog(false)} disabled={pulling}>
+          <Button onClick={handleCancelPull}>
             Cancel
           </Button>
           <Button
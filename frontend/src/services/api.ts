@@ -134,8 +134,21 @@ export const llmApi = {
   
   unloadModel: (modelName: string) => api.post(`/api/llm/models/${modelName}/unload`),
   
+  pinModel: (modelName: string) => api.post(`/api/llm/models/${modelName}/pin`),
+  
+  unpinModel: (modelName: string) => api.post(`/api/llm/models/${modelName}/unpin`),
+  
+  getResidency: () => api.get('/api/llm/residency'),
+  
   pullModel: (modelName: string) => api.post(`/api/llm/models/${modelName}/pull`),
   
+  listPulls: () => api.get('/api/llm/pulls'),
+  
+  cancelPull: (jobId: string) => api.post(`/api/llm/pulls/${jobId}/cancel`),
+  
+  // Server-sent progress of a pull job (events: progress, done, failed, cancelled)
+  pullEvents: (jobId: string) => new EventSource(`${API_BASE_URL}/api/llm/pulls/${jobId}/events`),
+  
   deleteModel: (modelName: string) => api.delete(`/api/llm/models/${modelName}`),
   
   getRunningModels: () => api.get('/api/llm/models/running'),
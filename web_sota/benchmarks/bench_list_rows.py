@@ -0,0 +1,95 @@
+"""Throughput of the CRUD list path: ORM + inspect() vs Core tuples + fast JSON.
+
+Seeds 10k calendar rows into a throwaway SQLite file and times the full
+"query → dicts → JSON bytes" pipeline both ways.
+
+Usage (from web_sota/):
+    uv run python benchmarks/bench_list_rows.py [rows] [repeats]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_TMP = Path(tempfile.mkdtemp(prefix="vilife-bench-"))
+os.environ["VILIFE_DB_PATH"] = str(_TMP / "bench.db")
+
+from sqlalchemy import inspect
+
+from vienna_life_assistant import fast_json, life_db
+from vienna_life_assistant.db import Base, SessionLocal, engine
+from vienna_life_assistant.models import CalendarEvent
+
+
+def _legacy_to_dict(obj) -> dict:
+    """The pre-compiled serializer: one mapper walk per row."""
+    state = inspect(obj)
+    return {c.key: getattr(obj, c.key) for c in state.mapper.column_attrs}
+
+
+def _seed(n: int) -> None:
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add_all(
+            CalendarEvent(
+                date=f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                time="09:00",
+                title=f"Event {i}",
+                location="Alsergrund",
+                category="general",
+                notes="x" * 40,
+            )
+            for i in range(n)
+        )
+        db.commit()
+
+
+def _orm_path(n: int) -> bytes:
+    with SessionLocal() as db:
+        rows = life_db.list_rows(
+            db, CalendarEvent, order_by=CalendarEvent.date, limit=n
+        )
+        items = [_legacy_to_dict(r) for r in rows]
+    return json.dumps({"ok": True, "count": len(items), "items": items}).encode()
+
+
+def _core_path(n: int) -> bytes:
+    with SessionLocal() as db:
+        items = life_db.list_dicts(
+            db, CalendarEvent, order_by=CalendarEvent.date, limit=n
+        )
+    return fast_json.dumps({"ok": True, "count": len(items), "items": items})
+
+
+def _best(fn, n: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn(n)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    _seed(n)
+    assert json.loads(_orm_path(n)) == json.loads(_core_path(n))
+
+    orm = _best(_orm_path, n, repeats)
+    core = _best(_core_path, n, repeats)
+    print(f"rows={n} repeats={repeats} encoder={fast_json.BACKEND}")
+    print(f"  ORM + inspect + json : {orm * 1000:8.1f} ms  {n / orm:10.0f} rows/s")
+    print(f"  Core + fast_json     : {core * 1000:8.1f} ms  {n / core:10.0f} rows/s")
+    print(f"  speedup              : {orm / core:8.2f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
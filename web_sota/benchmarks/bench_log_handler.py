@@ -0,0 +1,82 @@
+"""Per-call logging overhead of ActivityLogHandler under concurrent load.
+
+Compares the previous synchronous handler (global lock + dict + two clock
+calls inside emit) with the queue-based handler, from N threads that each
+emit M INFO lines — roughly "one log line per request" across a threadpool.
+
+Usage (from web_sota/):
+    uv run python benchmarks/bench_log_handler.py [threads] [lines_per_thread]
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vienna_life_assistant import activity_log
+
+
+class LegacyHandler(logging.Handler):
+    """The pre-queue handler: all work happens inside emit()."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        activity_log.log_activity(
+            kind="server",
+            detail=record.getMessage(),
+            level=record.levelname,
+            meta={"logger": record.name},
+        )
+
+
+def _run(handler: logging.Handler, threads: int, lines: int) -> tuple[float, float]:
+    """Return (mean emit overhead per call in µs, time until fully stored in s)."""
+    log = logging.getLogger(f"bench.{type(handler).__name__}")
+    log.handlers = [handler]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    per_thread: list[float] = []
+    barrier = threading.Barrier(threads)
+
+    def worker() -> None:
+        barrier.wait()
+        t0 = time.perf_counter()
+        for i in range(lines):
+            log.info("GET /api/life/overview %d 200 %.1fms", i, 3.2)
+        per_thread.append(time.perf_counter() - t0)
+
+    activity_log.clear_logs()
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    handler.flush()
+    stored = time.perf_counter() - start
+    emit_us = sum(per_thread) / (threads * lines) * 1e6
+    log.handlers = []
+    return emit_us, stored
+
+
+def main() -> None:
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    print(f"threads={threads} lines/thread={lines}")
+    for name, handler in (
+        ("legacy (lock in emit)", LegacyHandler()),
+        ("queue (enqueue only)", activity_log.ActivityLogHandler()),
+    ):
+        emit_us, stored = _run(handler, threads, lines)
+        handler.close()
+        print(
+            f"  {name:24s} emit {emit_us:6.2f} µs/call   all stored after {stored:6.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Render time of a JS calendar page: browser per render vs the browser pool.
+
+Serves a Staatsoper-like fixture (slots rendered by JS after 300 ms, plus a
+poster image, a web font and a tag-manager script) from a local stub server
+and renders it N times:
+
+* legacy — the old ``_render_spa``: launch Chromium, fixed 5 s wait, close.
+* pool — ``browser_pool.BrowserPool`` with a selector wait and blocking.
+
+Reports wall time per render and the requests the stub server saw.
+
+Usage (from web_sota/, needs ``playwright install chromium``):
+    uv run python benchmarks/bench_render_spa.py [renders]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vienna_life_assistant.browser_pool import USER_AGENT, BrowserPool
+
+FIXTURE = """<!doctype html>
+<html><head>
+<link rel="preload" as="font" href="/font.woff2" crossorigin>
+<script src="https://www.googletagmanager.com/gtag/js"></script>
+</head><body>
+<img src="/poster.jpg"><img src="/stage.jpg">
+<div id="app">Loading…</div>
+<script>
+setTimeout(() => {
+  document.getElementById("app").innerText = Array.from({length: 40}, (_, i) =>
+    `19:00—22:15\\nGiuseppe Verdi\\nLa traviata ${i}\\nTickets`).join("\\n");
+}, 300);
+</script>
+</body></html>"""
+READY = r"text=/\d{2}:\d{2}—\d{2}:\d{2}/"
+
+
+class _Site(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        body = FIXTURE.encode() if self.path == "/kalender/" else b"\0" * 200_000
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _legacy(url: str) -> str:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            page = browser.new_context(user_agent=USER_AGENT).new_page()
+            page.goto(url, wait_until="domcontentloaded", timeout=25000)
+            page.wait_for_timeout(5000)
+            return page.inner_text("body")
+        finally:
+            browser.close()
+
+
+def _time(label: str, render, url: str, n: int, server) -> None:
+    server.requested.clear()
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        body = render(url)
+        times.append(time.perf_counter() - t0)
+        if not body or "La traviata" not in body:
+            raise SystemExit(f"{label}: render failed (is Chromium installed?)")
+    print(
+        f"  {label:30s} first {times[0] * 1000:7.0f} ms   "
+        f"median {statistics.median(times) * 1000:7.0f} ms   "
+        f"requests/render {len(server.requested) / n:4.1f}"
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    server.requested = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/kalender/"
+    print(f"renders={n}")
+
+    pool = BrowserPool(size=2)
+    try:
+        _time("legacy (launch + 5 s sleep)", _legacy, url, n, server)
+        _time(
+            "pool (selector wait, blocking)",
+            lambda u: pool.render(u, wait_for=READY),
+            url,
+            n,
+            server,
+        )
+        print(f"  pool stats: {pool.stats()}")
+    finally:
+        pool.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
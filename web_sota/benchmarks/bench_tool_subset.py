@@ -0,0 +1,88 @@
+"""Prompt cost of the agent's tool list: all tools vs the per-message subset.
+
+Offline it reports the serialized schema size and a ~4 chars/token estimate
+for a set of typical PA messages. With ``--live`` it also sends each message
+once with every tool and once with the subset to the configured LLM
+(non-streamed, tool_choice=none) and prints the reported prompt_tokens and
+wall time — the number that matters on a local GPU.
+
+Usage (from web_sota/):
+    uv run python benchmarks/bench_tool_subset.py [--live]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vienna_life_assistant import llm_http, pa_agent
+
+MESSAGES = [
+    "Add a todo: buy Sachertorte for Ingrid",
+    "When is my next Arzt appointment?",
+    "Is the internet down? The WLAN keeps dropping.",
+    "Next U-Bahn departures from Rossauer Lände?",
+    "Log an expense: Billa 23.40 EUR",
+    "Whose birthday is coming up?",
+    "Servus, how are you?",
+]
+
+
+def _tokens(tools: list) -> int:
+    return len(json.dumps(tools)) // 4
+
+
+async def _live(llm: dict, message: str, tools: list) -> tuple[int, float]:
+    payload = {
+        "model": llm["model"],
+        "messages": [{"role": "user", "content": message}],
+        "max_tokens": 1,
+        "tools": tools,
+        "tool_choice": "none",
+    }
+    t0 = time.perf_counter()
+    data = await llm_http.post_json(
+        f"{llm['url_base'].rstrip('/')}/chat/completions",
+        {**payload, "stream": False},
+        llm["headers"],
+    )
+    return data.get("usage", {}).get("prompt_tokens", 0), time.perf_counter() - t0
+
+
+async def main(live: bool) -> None:
+    full = pa_agent._tool_schemas()
+    print(f"all tools: {len(full)} schemas, ~{_tokens(full)} prompt tokens")
+    llm = pa_agent.resolve_llm() if live else None
+    if live and llm is None:
+        print("--live: no LLM reachable, offline numbers only")
+    for message in MESSAGES:
+        tools = pa_agent._tool_schemas(pa_agent.select_tools([{"content": message}]))
+        line = (
+            f"  {message[:44]:44s} {len(tools):2d} tools  "
+            f"~{_tokens(tools):5d} tok ({1 - _tokens(tools) / _tokens(full):4.0%} saved)"
+        )
+        if llm is not None:
+            full_tok, full_s = await _live(llm, message, full)
+            sub_tok, sub_s = await _live(llm, message, tools)
+            line += f"  live {full_tok}->{sub_tok} tok, {full_s:.2f}s->{sub_s:.2f}s"
+        print(line)
+
+    t0 = time.perf_counter()
+    for _ in range(10_000):
+        pa_agent._tool_schemas.__wrapped__()
+    rebuilt = (time.perf_counter() - t0) / 10_000 * 1e6
+    t0 = time.perf_counter()
+    for _ in range(10_000):
+        pa_agent._tool_schemas()
+    cached = (time.perf_counter() - t0) / 10_000 * 1e6
+    print(f"schema list: rebuilt {rebuilt:.1f} µs/call, cached {cached:.2f} µs/call")
+    await llm_http.aclose_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main("--live" in sys.argv))
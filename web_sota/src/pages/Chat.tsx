@@ -21,6 +21,7 @@ import {
 
 const LS_HISTORY = "vilife-chat-history";
 const LS_PERSONALITY = "vilife-chat-personality";
+const LS_MODEL_PIN = "vilife-chat-model-pin";
 const MAX_HISTORY = 100;
 
 type ChatMessage = {
@@ -127,6 +128,11 @@ export default function Chat() {
 	const [personality, setPersonality] = useState(
 		() => localStorage.getItem(LS_PERSONALITY) || "vienna-guide",
 	);
+	// "" = routed per turn by request complexity; otherwise pinned
+	const [modelPin, setModelPin] = useState(
+		() => localStorage.getItem(LS_MODEL_PIN) || "",
+	);
+	const [models, setModels] = useState<string[]>([]);
 	const scrollRef = useRef<HTMLDivElement>(null);
 
 	useEffect(() => {
@@ -144,6 +150,10 @@ export default function Chat() {
 		localStorage.setItem(LS_PERSONALITY, personality);
 	}, [personality]);
 
+	useEffect(() => {
+		localStorage.setItem(LS_MODEL_PIN, modelPin);
+	}, [modelPin]);
+
 	useEffect(() => {
 		const local = loadLlmLocal();
 		apiGet<LlmSettings>(API.settings)
@@ -166,6 +176,9 @@ export default function Chat() {
 		apiGet<LlmStatus>(API.llmStatus)
 			.then(setLlmStatus)
 			.catch(() => setLlmStatus(null));
+		apiGet<{ models: string[] }>(API.llmModels())
+			.then((d) => setModels(d.models || []))
+			.catch(() => setModels([]));
 		apiGet<{ preprompts: Preprompt[] }>(API.llmPreprompts)
 			.then((d) => setPreprompts(d.preprompts || []))
 			.catch(() => setPreprompts([]));
@@ -202,6 +215,7 @@ export default function Chat() {
 						personality: persona
 							? { label: persona.label, prompt: persona.prompt }
 							: undefined,
+						model: modelPin || undefined,
 					}),
 				});
 				const data = (await res.json()) as PaChatResponse;
@@ -235,7 +249,7 @@ export default function Chat() {
 				setSending(false);
 			}
 		},
-		[sending, messages, personality],
+		[sending, messages, personality, modelPin],
 	);
 
 	const handleClear = useCallback(() => {
@@ -290,6 +304,20 @@ export default function Chat() {
 							</option>
 						))}
 					</select>
+					<select
+						data-testid="model-pin-select"
+						value={modelPin}
+						onChange={(e) => setModelPin(e.target.value)}
+						title="Auto routes each turn to a small or large model"
+						className="bg-slate-800 text-sm text-slate-300 border border-slate-700 rounded px-2 py-1"
+					>
+						<option value="">Auto model</option>
+						{models.map((m) => (
+							<option key={m} value={m}>
+								{m}
+							</option>
+						))}
+					</select>
 					{llmStatus && (
 						<div className="flex items-center gap-1 text-sm font-black uppercase tracking-widest">
 							<Cpu
@@ -23,13 +23,24 @@ os.environ["VILIFE_DB_PATH"] = str(_TMP / "test.db")
 os.environ["PA_STATE_FILE"] = str(_TMP / "pa_state.json")
 os.environ["PA_AUTOBRIEF"] = "0"  # no LLM calls from the scheduler in tests
 os.environ["PA_BRIEF_EMAIL"] = "0"
+os.environ["VILIFE_LLM_REFRESH_S"] = "0"  # no background provider probing
+os.environ["VILIFE_SCRAPE_REFRESH"] = "0"  # no background scraping of live sites
+os.environ["VILIFE_HTTP_CACHE_PATH"] = str(_TMP / "http_cache.sqlite3")  # scraped pages
 
 
 def pytest_sessionfinish(session, exitstatus):
     from vienna_life_assistant.db import engine
 
     engine.dispose()
-    for key in ("VILIFE_DB_PATH", "PA_STATE_FILE", "PA_AUTOBRIEF", "PA_BRIEF_EMAIL"):
+    for key in (
+        "VILIFE_DB_PATH",
+        "PA_STATE_FILE",
+        "PA_AUTOBRIEF",
+        "PA_BRIEF_EMAIL",
+        "VILIFE_LLM_REFRESH_S",
+        "VILIFE_SCRAPE_REFRESH",
+        "VILIFE_HTTP_CACHE_PATH",
+    ):
         os.environ.pop(key, None)
 
 
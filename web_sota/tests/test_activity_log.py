@@ -0,0 +1,197 @@
+"""Activity log store tests — ids, filters, paging, ring eviction."""
+
+from __future__ import annotations
+
+from vienna_life_assistant import activity_log
+from vienna_life_assistant.activity_log import clear_logs, log_activity, query_logs
+
+
+def _fill() -> list[dict]:
+    clear_logs()
+    return [
+        log_activity("agent", "tool call weather", level="INFO"),
+        log_activity("server", "disk almost full", level="WARNING"),
+        log_activity("agent", "LLM timeout", level="ERROR", meta={"model": "Qwen3"}),
+        log_activity("system", "startup", level="DEBUG"),
+    ]
+
+
+def test_ids_are_monotonic_and_survive_clear():
+    first = _fill()
+    ids = [int(e["id"]) for e in first]
+    assert ids == sorted(ids)
+    clear_logs()
+    assert int(log_activity("system", "after clear")["id"]) > ids[-1]
+
+
+def test_after_id_returns_only_newer_entries():
+    entries = _fill()
+    res = query_logs(after_id=entries[1]["id"], sort="asc")
+    assert [e["detail"] for e in res["entries"]] == ["LLM timeout", "startup"]
+    assert query_logs(after_id="not-a-number")["total"] == 4
+
+
+def test_level_kind_and_search_filters():
+    _fill()
+    assert query_logs(level="warning")["total"] == 2
+    assert [e["detail"] for e in query_logs(kind="agent")["entries"]] == [
+        "LLM timeout",
+        "tool call weather",
+    ]
+    assert query_logs(kind="agent", level="ERROR")["total"] == 1
+    assert query_logs(search="qwen3")["entries"][0]["detail"] == "LLM timeout"
+    assert query_logs(kind="nope")["total"] == 0
+
+
+def test_paging_both_directions():
+    _fill()
+    desc = query_logs(limit=2, offset=1)
+    assert desc["total"] == 4
+    assert [e["detail"] for e in desc["entries"]] == ["LLM timeout", "disk almost full"]
+    asc = query_logs(limit=2, offset=1, sort="asc")
+    assert [e["detail"] for e in asc["entries"]] == ["disk almost full", "LLM timeout"]
+
+
+def test_ring_evicts_oldest_and_keeps_indices_consistent():
+    store = activity_log._LogStore(100)
+    for i in range(250):
+        kind = "even" if i % 2 == 0 else "odd"
+        store.append(
+            {"level": "INFO", "kind": kind, "detail": str(i), "meta": {}}, str(i)
+        )
+    assert len(store) == 100
+    assert store.oldest()["detail"] == "150"
+    assert len(store.by_kind["even"]) == 50
+    ids, _ = store.candidates(store.first, 0, "odd")
+    assert [store.entry(s)["detail"] for s in ids][:2] == ["151", "153"]
+
+
+def test_export_is_not_capped_at_page_limit():
+    clear_logs()
+    for i in range(600):
+        log_activity("bulk", f"line {i}")
+    chunks, media_type, _ = activity_log.export_logs(format="csv", kind="bulk")
+    assert media_type == "text/csv"
+    chunks = list(chunks)
+    assert len(chunks) > 1  # streamed, not one big string
+    assert "".join(chunks).count("\n") == 601  # header + every entry
+
+
+def test_json_export_streams_valid_document():
+    import json
+
+    _fill()
+    chunks, media_type, _ = activity_log.export_logs(format="json", sort="asc")
+    body = json.loads("".join(chunks))
+    assert media_type == "application/json"
+    assert next(iter(body["entries"]))["detail"] == "tool call weather"
+
+
+def test_spool_keeps_history_across_restart(tmp_path):
+    from vienna_life_assistant.log_spool import LogSpool
+
+    _fill()
+    spool = LogSpool(tmp_path, flush_interval_s=0.05)
+    activity_log.install_log_spool(spool)
+    try:
+        for i in range(30):
+            last_id = int(log_activity("spooled", f"history {i}")["id"])
+        activity_log.uninstall_log_spool()  # flushes + closes the segment
+        clear_logs()  # simulate the restart: the ring is empty again
+
+        restarted = LogSpool(tmp_path)
+        activity_log.install_log_spool(restarted)
+        fresh = log_activity("spooled", "after restart")
+        assert int(fresh["id"]) > last_id  # ids continue across the restart
+
+        ring_only = query_logs(kind="spooled")
+        assert ring_only["total"] == 1
+        read = 0
+        iter_entries = restarted.iter_entries
+
+        def counting(**kwargs):
+            nonlocal read
+            for entry in iter_entries(**kwargs):
+                read += 1
+                yield entry
+
+        restarted.iter_entries = counting
+        page = query_logs(kind="spooled", history=True, limit=5)
+        assert (page["total"], page["has_more"]) == (None, True)
+        assert [e["detail"] for e in page["entries"]][:2] == [
+            "after restart",
+            "history 29",
+        ]
+        assert read == 5  # four for the page, one to see there is more
+        full = query_logs(kind="spooled", history=True, limit=50)
+        assert (full["total"], full["has_more"]) == (31, False)
+        oldest = query_logs(kind="spooled", history=True, sort="asc", limit=1)
+        assert oldest["entries"][0]["detail"] == "history 0"
+
+        chunks, _, _ = activity_log.export_logs(format="csv", kind="spooled")
+        assert "".join(chunks).count("history ") == 30
+    finally:
+        activity_log.uninstall_log_spool()
+
+
+def test_spool_rotates_segments_by_size(tmp_path):
+    from vienna_life_assistant.log_spool import LogSpool
+
+    spool = LogSpool(tmp_path, segment_bytes=512)
+    for i in range(1, 41):
+        spool.append({"id": str(i), "kind": "k", "detail": "x" * 40, "meta": {}})
+    spool.flush()
+    assert len(spool.segments()) > 1
+    assert spool.last_seq() == 40
+    ids = [int(e["id"]) for e in spool.iter_entries(reverse=True, after_seq=35)]
+    assert ids == [40, 39, 38, 37, 36]
+    spool.stop()
+
+
+def test_log_handler_formats_before_enqueueing():
+    import logging
+
+    clear_logs()
+    handler = activity_log.ActivityLogHandler()
+    log = logging.getLogger("vilife.test.queue")
+    log.addHandler(handler)
+    log.propagate = False
+    try:
+        for i in range(3):
+            log.warning("queued %s of %d", "line", i)
+        log.error("bad %d format", "x")  # formatting error must not drop it
+        handler.flush()
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+    res = query_logs(kind="server", sort="asc")
+    details = [e["detail"] for e in res["entries"]]
+    assert details[:3] == ["queued line of 0", "queued line of 1", "queued line of 2"]
+    assert details[3].startswith("bad %d format")
+    assert res["entries"][0]["meta"] == {"logger": "vilife.test.queue"}
+    assert res["entries"][0]["level"] == "WARNING"
+
+
+
+def test_log_handler_formats_on_the_calling_thread():
+    """Args may change once the caller moves on, so emit formats them."""
+    import logging
+    import threading
+
+    class Caller:
+        def __str__(self) -> str:
+            return threading.current_thread().name
+
+    clear_logs()
+    handler = activity_log.ActivityLogHandler()
+    log = logging.getLogger("vilife.test.snapshot")
+    log.addHandler(handler)
+    log.propagate = False
+    try:
+        log.warning("formatted on %s", Caller())
+        handler.flush()
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+    detail = query_logs(kind="server")["entries"][0]["detail"]
+    assert detail == f"formatted on {threading.current_thread().name}"
@@ -96,3 +96,123 @@ def test_vienna_static_endpoints_declare_mock(client):
     r = client.get("/api/vienna/transport")
     assert r.status_code == 200
     assert r.json().get("mock") is True
+
+
+def test_crud_list_uses_fast_encoder(client):
+    r = client.get("/api/life/calendar?limit=5")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/json")
+    body = r.json()
+    assert body["ok"] is True
+    assert body["count"] == len(body["items"]) <= 5
+
+
+def test_life_changes_delta_sync(client):
+    head = client.get("/api/life/changes?since=0&limit=1").json()
+    assert head["ok"] is True and "version" in head
+    cursor = client.get("/api/life/changes?since=0&limit=5000").json()["version"]
+
+    r = client.post("/api/life/todos", json={"title": "Delta sync me"})
+    tid = r.json()["item"]["id"]
+    delta = client.get(f"/api/life/changes?since={cursor}").json()
+    assert delta["version"] > cursor
+    assert {"table": "todos", "id": tid, "op": "upsert"}.items() <= delta["changes"][
+        -1
+    ].items()
+
+
+def test_life_changes_stream_emits_hello_then_changes():
+    import asyncio
+
+    from vienna_life_assistant import life_db
+    from vienna_life_assistant.db import SessionLocal
+    from vienna_life_assistant.life_db_routes import change_events
+    from vienna_life_assistant.models import Todo
+
+    with SessionLocal() as db:
+        since = life_db.current_version(db)
+        life_db.add_row(db, Todo, {"title": "Streamed"})
+
+    async def first_two() -> list[str]:
+        async def connected() -> bool:
+            return False
+
+        gen = change_events(since, {"todos"}, connected, keepalive_s=0.1)
+        frames = [await gen.__anext__(), await gen.__anext__()]
+        await gen.aclose()
+        return frames
+
+    loop = asyncio.new_event_loop()
+    try:
+        hello, changes = loop.run_until_complete(first_two())
+    finally:
+        loop.close()
+    assert "event: hello" in hello
+    assert "event: changes" in changes and "Streamed" in changes
+
+
+def test_dashboard_conditional_get_returns_304(client):
+    first = client.get("/api/dashboard")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"v')
+    again = client.get("/api/dashboard", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    client.post("/api/life/todos", json={"title": "Invalidate the dashboard"})
+    changed = client.get("/api/dashboard", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_unversioned_get_uses_body_hash_etag(client):
+    first = client.get("/api/life/contacts")
+    etag = first.headers["etag"]
+    again = client.get("/api/life/contacts", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+
+def test_large_json_is_gzip_encoded(client):
+    r = client.get("/api/life/overview", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers.get("content-encoding") in ("gzip", "br")
+    assert r.json()["ok"] is True
+
+
+def test_server_imports_without_the_backend_checkout(tmp_path):
+    """The MCPB bundle ships web_sota alone (``.mcpbignore`` drops backend/)."""
+    import os
+    import shutil
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    package = Path(__file__).resolve().parent.parent / "vienna_life_assistant"
+    bundle = tmp_path / "bundle"
+    shutil.copytree(
+        package,
+        bundle / "vienna_life_assistant",
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    code = (
+        "import sys\n"
+        "import vienna_life_assistant.pa_routes\n"
+        "import vienna_life_assistant.server\n"
+        "leaked = {'api', 'services'} & set(sys.modules)\n"
+        "assert not leaked, leaked\n"
+    )
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(bundle),
+        "VILIFE_DB_PATH": str(tmp_path / "standalone.db"),
+    }
+    r = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=bundle,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=False,
+    )
+    assert r.returncode == 0, r.stderr
@@ -0,0 +1,149 @@
+"""Browser pool — resource blocking, selector waits, recycling, bounded
+contexts. Renders run against HTML fixtures served by a local stub server
+and are skipped when Chromium is not installed."""
+
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vienna_life_assistant import browser_pool
+from vienna_life_assistant.browser_pool import BrowserPool
+
+# A calendar that renders its slots from JS, like the Staatsoper SPA.
+CALENDAR = """<!doctype html>
+<html><head>
+<link rel="stylesheet" href="https://fonts.example.org/font.woff2">
+<script src="https://www.googletagmanager.com/gtag/js"></script>
+</head><body>
+<img src="/poster.jpg">
+<div id="app">Loading…</div>
+<script>
+setTimeout(() => {
+  document.getElementById("app").innerText =
+    "19:00—22:15\\nGiuseppe Verdi\\nLa traviata\\nTickets";
+}, 300);
+</script>
+</body></html>"""
+
+
+class _Fixtures(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requested.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path == "/slow":
+                time.sleep(0.4)
+            body = CALENDAR.encode() if self.path != "/poster.jpg" else b"\xff\xd8"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Fixtures)
+    server.lock = threading.Lock()
+    server.requested = []
+    server.active = server.max_active = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool():
+    pool = BrowserPool(size=2, restart_after=2)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def chromium(pool, site):
+    """Skip unless the pool can actually launch Chromium here."""
+    url, _ = site
+    if pool.render(f"{url}/warmup", timeout_ms=5000) is None:
+        pytest.skip("Chromium not installed (playwright install chromium)")
+    return pool
+
+
+@pytest.mark.parametrize(
+    "url,resource_type,expected",
+    [
+        ("https://www.wiener-staatsoper.at/kalender/", "document", False),
+        ("https://www.wiener-staatsoper.at/app.js", "script", False),
+        ("https://www.wiener-staatsoper.at/poster.jpg", "image", True),
+        ("https://fonts.gstatic.com/x.woff2", "font", True),
+        ("https://www.googletagmanager.com/gtag/js", "script", True),
+        ("https://region1.google-analytics.com/g/collect", "fetch", True),
+        ("https://notgoogle-analytics.com/x.js", "script", False),
+    ],
+)
+def test_blocked(url, resource_type, expected):
+    assert browser_pool.blocked(url, resource_type) is expected
+
+
+def test_missing_chromium_returns_none(pool, site, monkeypatch, tmp_path):
+    monkeypatch.setenv("PLAYWRIGHT_BROWSERS_PATH", str(tmp_path))
+    url, _ = site
+    assert pool.render(f"{url}/calendar", timeout_ms=5000) is None
+    assert pool.stats()["failures"] == 1
+    assert pool.stats()["renders"] == 0
+
+
+def test_selector_wait_and_blocking(chromium, site):
+    url, server = site
+    started = time.perf_counter()
+    body = chromium.render(f"{url}/calendar", wait_for=r"text=/\d{2}:\d{2}—/")
+    assert "19:00—22:15" in body
+    assert "La traviata" in body
+    assert time.perf_counter() - started < 5  # no fixed 5 s sleep
+    assert "/poster.jpg" not in server.requested
+    assert chromium.stats()["blocked_requests"] >= 2
+
+
+def test_missing_selector_still_returns_body(chromium, site):
+    url, _ = site
+    body = chromium.render(f"{url}/calendar", wait_for="#never", timeout_ms=1000)
+    assert body is not None
+
+
+def test_browser_is_recycled(chromium, site):
+    url, _ = site
+    for _ in range(3):
+        assert chromium.render(f"{url}/calendar", timeout_ms=5000) is not None
+    stats = chromium.stats()
+    assert stats["renders"] == 4  # with the warmup render
+    assert stats["launches"] == 2
+    assert stats["uses_since_launch"] == 2
+
+
+def test_contexts_are_bounded(chromium, site):
+    url, server = site
+    server.max_active = 0
+    results: list[str | None] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(chromium.render(f"{url}/slow")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 4 and all(results)
+    assert server.max_active <= 2
@@ -0,0 +1,101 @@
+"""Chat memory tests — token budget and rolling summary for the PA chat."""
+
+from __future__ import annotations
+
+import asyncio
+
+from vienna_life_assistant import chat_memory, pa_agent
+
+
+def _history(n: int, words: int = 60) -> list[dict[str, str]]:
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"turn {i} " + "Melange " * words,
+        }
+        for i in range(n)
+    ]
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _prompt_tokens(summary: str, recent: list[dict]) -> int:
+    return chat_memory.count_tokens(summary) + sum(
+        chat_memory.message_tokens(m) for m in recent
+    )
+
+
+def test_context_window_by_model_and_override(monkeypatch):
+    assert chat_memory.context_window("qwen2.5:32b") == 32_768
+    assert chat_memory.context_window("whatever") == chat_memory.DEFAULT_CONTEXT
+    monkeypatch.setenv("VILIFE_CONTEXT_TOKENS", "4096")
+    assert chat_memory.history_budget("gpt-4o") == 4096 // 3
+
+
+def test_prompt_size_stays_flat_and_summary_is_reused():
+    chat_memory.summary_cache.clear()
+    calls: list[int] = []
+
+    async def summarize(previous, messages):
+        calls.append(len(messages))
+        return "- Sandra orders a Melange every morning"
+
+    sizes = []
+    for n in (10, 40, 120):
+        summary, recent = _run(
+            chat_memory.bounded_history(_history(n), budget=900, summarize=summarize)
+        )
+        sizes.append(_prompt_tokens(summary, recent))
+    assert max(sizes) <= 900 + chat_memory.SUMMARY_MAX_TOKENS
+    assert all(n == chat_memory.FOLD_STEP for n in calls)
+
+    # A turn that keeps the same folded prefix makes no new summariser calls.
+    history = _history(121)
+    _run(chat_memory.bounded_history(history, budget=900, summarize=summarize))
+    before = len(calls)
+    longer = [*history, {"role": "user", "content": "und jetzt?"}]
+    assert chat_memory.fold_point(longer, 900) == chat_memory.fold_point(history, 900)
+    _run(chat_memory.bounded_history(longer, budget=900, summarize=summarize))
+    assert len(calls) == before
+
+
+def test_oversized_recent_message_is_clipped():
+    messages = [
+        {"role": "user", "content": "Wien " * 5000},
+        {"role": "user", "content": "what did I paste?"},
+    ]
+    summary, recent = _run(chat_memory.bounded_history(messages, budget=500))
+    assert summary == ""
+    assert recent[-1]["content"] == "what did I paste?"
+    assert _prompt_tokens(summary, recent) <= 500
+
+
+def test_pa_chat_folds_long_history_into_system_prompt(client, monkeypatch):
+    chat_memory.summary_cache.clear()
+    seen: dict = {}
+
+    async def fake_run_agent(messages, system_prompt=None, **kwargs):
+        seen["messages"] = messages
+        seen["system"] = system_prompt
+        return {"ok": True, "response": "passt"}
+
+    async def fake_summarize(previous, messages):
+        return "- Ingrid's birthday is on 3 May"
+
+    monkeypatch.setenv("VILIFE_CONTEXT_TOKENS", "3000")
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: None)
+    monkeypatch.setattr(pa_agent, "run_agent", fake_run_agent)
+    monkeypatch.setattr(pa_agent, "summarize_turns", fake_summarize)
+    history = _history(80)
+    r = client.post("/api/pa/chat", json={"messages": history})
+    assert r.json()["response"] == "passt"
+    assert len(seen["messages"]) < len(history)
+    assert seen["messages"][-1] == history[-1]
+    assert "Earlier in this conversation (summary)" in seen["system"]
+    assert "Ingrid's birthday" in seen["system"]
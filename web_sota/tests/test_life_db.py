@@ -9,6 +9,7 @@ from vienna_life_assistant.models import (
     DoctorVisit,
     Medication,
     Subscription,
+    Todo,
     Trip,
 )
 
@@ -68,3 +69,69 @@ def test_upcoming_birthdays_shape(db):
     for b in hits:
         assert "days_until" in b
         assert "age_turning" in b
+
+
+def test_list_dicts_matches_orm_serialization(db):
+    orm = [
+        r.to_dict()
+        for r in life_db.list_rows(db, CalendarEvent, order_by=CalendarEvent.id)
+    ]
+    core = life_db.list_dicts(db, CalendarEvent, order_by=CalendarEvent.id)
+    assert core == orm
+    assert all(isinstance(r["done"], bool) for r in core)
+
+
+def test_to_dict_uses_cached_serializer(db):
+    from vienna_life_assistant.models import column_keys, row_serializer
+
+    row = life_db.list_rows(db, Contact, limit=1)[0]
+    assert row_serializer(Contact) is row_serializer(Contact)
+    assert tuple(row.to_dict()) == column_keys(Contact)
+
+
+def test_change_feed_records_and_compacts_writes(db):
+    since = life_db.current_version(db)
+    row = life_db.add_row(db, Contact, {"name": "Feed Person"})
+    life_db.update_row(db, Contact, row.id, {"phone": "+43 1 111"})
+    life_db.update_row(db, Contact, row.id, {"phone": "+43 1 222"})
+
+    delta = life_db.changes_since(db, since)
+    mine = [c for c in delta["changes"] if c["table"] == "contacts"]
+    assert len(mine) == 1  # three writes compacted into one upsert
+    assert mine[0]["op"] == "upsert"
+    assert mine[0]["item"]["phone"] == "+43 1 222"
+    assert delta["version"] > since
+
+    life_db.delete_row(db, Contact, row.id)
+    after = life_db.changes_since(db, delta["version"])
+    assert after["changes"] == [
+        {"table": "contacts", "id": row.id, "op": "delete", "version": after["version"]}
+    ]
+
+
+def test_change_feed_catches_direct_orm_mutation(db):
+    since = life_db.current_version(db)
+    todo = life_db.add_row(db, Todo, {"title": "Feed toggle"})
+    todo.status = "done"
+    db.commit()
+    delta = life_db.changes_since(db, since, tables={"todos"})
+    assert delta["changes"][-1]["item"]["status"] == "done"
+    assert life_db.changes_since(db, since, tables={"contacts"})["changes"] == []
+
+
+def test_change_notifier_wakes_waiter():
+    import asyncio
+    import threading
+
+    notifier = life_db.ChangeNotifier()
+
+    async def run() -> int:
+        seq = notifier.seq
+        threading.Timer(0.05, notifier.notify).start()
+        return await notifier.wait(seq, timeout=5)
+
+    loop = asyncio.new_event_loop()  # asyncio.run() would unset the test loop
+    try:
+        assert loop.run_until_complete(run()) == 1
+    finally:
+        loop.close()
@@ -0,0 +1,179 @@
+"""Pooled async LLM transport — exercised against a local stub server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+
+from vienna_life_assistant import llm_http
+
+
+class _StubLLM(BaseHTTPRequestHandler):
+    """OpenAI-compatible /v1/chat/completions + Ollama /api/chat."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real server
+    peers: ClassVar[list[int]] = []
+
+    def log_message(self, *args) -> None:  # keep pytest output clean
+        pass
+
+    def do_POST(self) -> None:
+        type(self).peers.append(self.client_address[1])
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.startswith("/slow"):
+            time.sleep(1.0)
+        if self.path.endswith("/api/chat"):
+            self._json({"message": {"role": "assistant", "content": "ollama says hi"}})
+        elif body.get("stream"):
+            self._stream(["Hallo", " Wien"])
+        else:
+            reply = f"echo {body['messages'][-1]['content']}"
+            self._json(
+                {"choices": [{"message": {"role": "assistant", "content": reply}}]}
+            )
+
+    def _json(self, obj: dict) -> None:
+        data = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, tokens: list[str]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        frames = [
+            "data: " + json.dumps({"choices": [{"delta": {"content": t}}]}) + "\n\n"
+            for t in tokens
+        ] + ["data: [DONE]\n\n"]
+        for frame in frames:
+            raw = frame.encode()
+            self.wfile.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubLLM)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _msgs(text: str) -> dict:
+    return {"model": "stub", "messages": [{"role": "user", "content": text}]}
+
+
+def test_completions_reuse_one_keepalive_connection(stub_url):
+    async def two_calls():
+        first = await llm_http.chat_completion(f"{stub_url}/v1", _msgs("eins"), {})
+        second = await llm_http.chat_completion(f"{stub_url}/v1", _msgs("zwei"), {})
+        await llm_http.aclose_clients()
+        return first, second
+
+    _StubLLM.peers = []
+    first, second = _run(two_calls())
+    assert first["content"] == "echo eins"
+    assert second["content"] == "echo zwei"
+    assert len(set(_StubLLM.peers)) == 1  # same client port -> pooled
+
+
+def test_stream_chat_completion_yields_chunks(stub_url):
+    async def collect():
+        out = [
+            chunk["choices"][0]["delta"]["content"]
+            async for chunk in llm_http.stream_chat_completion(
+                f"{stub_url}/v1", _msgs("x"), {}
+            )
+        ]
+        await llm_http.aclose_clients()
+        return out
+
+    assert _run(collect()) == ["Hallo", " Wien"]
+
+
+def test_first_token_timeout_fires_before_total(stub_url):
+    async def slow():
+        async for _ in llm_http.stream_chat_completion(
+            f"{stub_url}/slow/v1", _msgs("x"), {}, ttft_timeout=0.2
+        ):
+            pass
+
+    t0 = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        _run(slow())
+    assert time.perf_counter() - t0 < 0.9
+
+
+def test_cancelling_the_caller_abandons_the_request(stub_url):
+    async def cancel_midway():
+        task = asyncio.ensure_future(
+            llm_http.chat_completion(f"{stub_url}/slow/v1", _msgs("x"), {})
+        )
+        await asyncio.sleep(0.1)
+        task.cancel()
+        t0 = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - t0
+
+    assert _run(cancel_midway()) < 0.5
+
+
+def test_llm_chat_ollama_branch_uses_async_transport(client, stub_url):
+    r = client.post(
+        "/api/llm/chat",
+        json={"provider": "ollama", "ollama_url": stub_url, "message": "Servus"},
+    )
+    assert r.json() == {"ok": True, "response": "ollama says hi"}
+    r = client.post(
+        "/api/llm/chat",
+        json={
+            "provider": "lmstudio",
+            "lmstudio_url": f"{stub_url}/v1",
+            "message": "hi",
+        },
+    )
+    assert r.json() == {"ok": True, "response": "echo hi"}
+
+
+def test_calls_are_recorded_in_the_ledger(stub_url):
+    from vienna_life_assistant import llm_ledger
+
+    async def calls():
+        await llm_http.chat_completion(
+            f"{stub_url}/v1", {**_msgs("x"), "model": "ledger-stub"}, {}
+        )
+        with llm_ledger.task("brief"):
+            async for _ in llm_http.stream_chat_completion(
+                f"{stub_url}/v1", {**_msgs("x"), "model": "ledger-stub"}, {}
+            ):
+                pass
+        await llm_http.aclose_clients()
+
+    _run(calls())
+    rows = [r for r in llm_ledger._pending if r["model"] == "ledger-stub"]
+    assert [r["task"] for r in rows] == ["chat", "brief"]
+    assert all(r["ok"] for r in rows)
+    assert rows[1]["ttft_ms"] is not None
+    assert rows[1]["completion_tokens"] == 2
@@ -0,0 +1,113 @@
+"""LLM performance ledger — recording, summaries and per-task model choice."""
+
+from __future__ import annotations
+
+import pytest
+
+from vienna_life_assistant import llm_http, llm_ledger
+
+
+@pytest.fixture(autouse=True)
+def _tables(db):
+    """The ledger writes to the session test DB — make sure it exists."""
+
+
+def _calls(model: str, n: int, *, ttft_ms: float, tok_s: float, ok: bool = True):
+    for _ in range(n):
+        llm_ledger.record(
+            model=model,
+            endpoint="http://test",
+            task="chat",
+            ok=ok,
+            ttft_ms=ttft_ms,
+            total_ms=ttft_ms + 1000,
+            tok_s=tok_s,
+            error="" if ok else "boom",
+        )
+    llm_ledger.flush()
+
+
+def test_quality_tier_from_tag_and_overrides(monkeypatch):
+    assert llm_ledger.quality_tier("llama3.2:3b") == 1
+    assert llm_ledger.quality_tier("gemma4:12b") == 2
+    assert llm_ledger.quality_tier("qwen3:30b-a3b") == 3
+    assert llm_ledger.quality_tier("gpt-4o-mini") == 3
+    assert llm_ledger.quality_tier("mistral:latest") == 2
+    monkeypatch.setenv("VILIFE_MODEL_TIERS", "llama3.2:3b=2")
+    monkeypatch.setenv("VILIFE_TASK_TIERS", "agent=3")
+    assert llm_ledger.quality_tier("llama3.2:3b") == 2
+    assert llm_ledger.task_tier("agent") == 3
+    assert llm_ledger.task_tier("summary") == 1
+
+
+def test_pick_model_prefers_fastest_adequate_measured_model():
+    installed = ["tiny-t:1b", "mid-a:8b", "mid-b:14b", "flaky-c:12b", "big-d:32b"]
+    _calls("tiny-t:1b", 5, ttft_ms=50, tok_s=200)
+    _calls("mid-a:8b", 5, ttft_ms=400, tok_s=40)
+    _calls("mid-b:14b", 5, ttft_ms=300, tok_s=90)
+    _calls("flaky-c:12b", 5, ttft_ms=10, tok_s=500, ok=False)
+    _calls("big-d:32b", 5, ttft_ms=900, tok_s=20)
+
+    assert llm_ledger.pick_model(installed, "agent") == "mid-b:14b"
+    # Summaries only need tier 1: the small model wins on speed.
+    assert llm_ledger.pick_model(installed, "summary") == "tiny-t:1b"
+
+
+def test_pick_model_without_numbers_falls_back_to_preference():
+    installed = ["new-x:7b", "new-y:9b", "new-z:2b", "qwen3-coder:cloud"]
+    assert llm_ledger.pick_model(installed, "chat", ["new-y:9b"]) == "new-y:9b"
+    assert llm_ledger.pick_model(installed, "chat") in ("new-x:7b", "new-y:9b")
+    assert llm_ledger.pick_model(["new-z:2b"], "agent") == "new-z:2b"  # best we have
+    assert llm_ledger.pick_model(["qwen3-coder:cloud"], "chat") == "qwen3-coder:cloud"
+    assert llm_ledger.pick_model([], "chat") is None
+
+
+def test_summaries_aggregate_per_model_and_task():
+    _calls("sum-m:8b", 4, ttft_ms=200, tok_s=50)
+    _calls("sum-m:8b", 1, ttft_ms=0, tok_s=0, ok=False)
+    [row] = [s for s in llm_ledger.summaries() if s["model"] == "sum-m:8b"]
+    assert row["calls"] == 5
+    assert row["errors"] == 1
+    assert row["error_rate"] == 0.2
+    assert row["ttft_ms_p50"] == 200
+    assert row["tok_s_p50"] == 50
+    assert row["tier"] == 2
+    by_task = llm_ledger.summaries(by_task=True)
+    assert any(s["model"] == "sum-m:8b" and s["task"] == "chat" for s in by_task)
+
+
+def test_ollama_native_timings_map_to_ledger_fields():
+    fields = llm_http.ollama_timings(
+        {
+            "load_duration": 2_000_000_000,
+            "prompt_eval_duration": 500_000_000,
+            "prompt_eval_count": 120,
+            "eval_count": 100,
+            "eval_duration": 4_000_000_000,
+        }
+    )
+    assert fields["load_ms"] == 2000
+    assert fields["ttft_ms"] == 2500
+    assert fields["tok_s"] == 25
+    assert fields["prompt_tokens"] == 120
+
+
+def test_ledger_route_reports_models(client, monkeypatch):
+    from vienna_life_assistant import pa_agent
+
+    _calls("route-r:8b", 3, ttft_ms=100, tok_s=60)
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: None)
+    body = client.get("/api/llm/ledger").json()
+    assert body["ok"] is True
+    assert any(m["model"] == "route-r:8b" for m in body["models"])
+    assert body["selection"] == {}
+
+
+def test_ledger_writes_stay_out_of_the_change_feed(db):
+    from vienna_life_assistant import life_db
+
+    before, etag_seed = life_db.current_version(db), life_db.data_version()
+    _calls("feed-probe:3b", 3, ttft_ms=200, tok_s=40)
+    db.expire_all()
+    assert life_db.current_version(db) == before
+    assert life_db.data_version() == etag_seed
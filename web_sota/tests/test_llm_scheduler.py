@@ -0,0 +1,152 @@
+"""LLM scheduler — priorities, per-model slots, deadlines and backpressure."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from vienna_life_assistant import llm_scheduler
+from vienna_life_assistant.llm_scheduler import (
+    LLMScheduler,
+    SchedulerBusy,
+    SchedulerTimeout,
+)
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _job(sched: LLMScheduler, order: list[str], name: str, cls: str) -> None:
+    async with sched.slot("m", cls):
+        order.append(name)
+        await asyncio.sleep(0.01)
+
+
+def test_interactive_jumps_the_background_queue():
+    async def scenario():
+        sched = LLMScheduler(slots=1)
+        order: list[str] = []
+        async with sched.slot("m", "standard"):
+            jobs = [
+                asyncio.ensure_future(_job(sched, order, f"bg{i}", "background"))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0)
+            jobs.append(
+                asyncio.ensure_future(_job(sched, order, "chat", "interactive"))
+            )
+            await asyncio.sleep(0)
+            assert sched.stats()["models"]["m"]["queued"]["background"] == 3
+        await asyncio.gather(*jobs)
+        return order
+
+    assert _run(scenario()) == ["chat", "bg0", "bg1", "bg2"]
+
+
+def test_background_leaves_a_slot_for_interactive():
+    async def scenario():
+        sched = LLMScheduler(slots=2)
+        async with sched.slot("m", "background"):
+            second = asyncio.ensure_future(_job(sched, [], "bg", "background"))
+            await asyncio.sleep(0)
+            assert sched.stats()["models"]["m"]["queued"]["background"] == 1
+            t0 = time.perf_counter()
+            async with sched.slot("m", "interactive"):
+                waited = time.perf_counter() - t0
+        await second
+        return waited
+
+    assert _run(scenario()) < 0.05
+
+
+def test_waiters_age_into_higher_classes():
+    async def scenario():
+        sched = LLMScheduler(slots=1, aging_s=0.02)
+        order: list[str] = []
+        async with sched.slot("m", "interactive"):
+            old = asyncio.ensure_future(_job(sched, order, "old-bg", "background"))
+            await asyncio.sleep(0.1)  # ages past both class steps
+            new = asyncio.ensure_future(_job(sched, order, "new-chat", "interactive"))
+            await asyncio.sleep(0)
+        await asyncio.gather(old, new)
+        return order
+
+    assert _run(scenario()) == ["old-bg", "new-chat"]
+
+
+def test_deadline_and_full_queue_fail_fast(monkeypatch):
+    monkeypatch.setitem(llm_scheduler.MAX_QUEUED, "background", 1)
+
+    async def scenario():
+        sched = LLMScheduler(slots=1)
+        async with sched.slot("m", "interactive"):
+            with pytest.raises(SchedulerTimeout):
+                async with sched.slot("m", "interactive", deadline_s=0.05):
+                    pass
+            queued = asyncio.ensure_future(_job(sched, [], "bg", "background"))
+            await asyncio.sleep(0)
+            with pytest.raises(SchedulerBusy):
+                async with sched.slot("m", "background"):
+                    pass
+        await queued
+        return sched.stats()["models"]["m"]
+
+    stats = _run(scenario())
+    assert stats["timed_out"] == 1
+    assert stats["rejected"] == 1
+    assert stats["active"] == 0
+    assert stats["queued"] == {"interactive": 0, "standard": 0, "background": 0}
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        sched = LLMScheduler(slots=1)
+        async with sched.slot("m"):
+            waiter = asyncio.ensure_future(_job(sched, [], "x", "interactive"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert sched.stats()["queued"] == 0
+        async with sched.slot("m", deadline_s=0.05):  # the slot is free again
+            pass
+
+    _run(scenario())
+
+
+def test_slot_sync_limits_threads_per_model():
+    sched = LLMScheduler(slots=2)
+    lock = threading.Lock()
+    peak = {"now": 0, "max": 0}
+
+    def work() -> None:
+        with sched.slot_sync("embed"):
+            with lock:
+                peak["now"] += 1
+                peak["max"] = max(peak["max"], peak["now"])
+            time.sleep(0.02)
+            with lock:
+                peak["now"] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak["max"] == 2
+    assert sched.stats()["models"]["embed"]["granted"] == 6
+
+
+def test_scheduler_route(client):
+    body = client.get("/api/llm/scheduler").json()
+    assert body["ok"] is True
+    assert "models" in body
+    assert "queued" in body
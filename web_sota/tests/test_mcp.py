@@ -144,3 +144,31 @@ def test_unknown_operation_returns_error():
     res = run(vienna_life(operation="nonsense"))  # type: ignore[arg-type]
     assert res["success"] is False
     assert "error" in res
+
+
+def test_vienna_log_semantic_search_does_not_block_the_loop(monkeypatch):
+    import time
+
+    from vienna_life_assistant import rag
+    from vienna_life_assistant.vienna_life_mcp import vienna_log
+
+    def slow_embed(text):  # waiting for a scheduler slot, then Ollama
+        time.sleep(0.3)
+
+    monkeypatch.setattr(rag, "embed", slow_embed)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    async def search():
+        task = asyncio.create_task(ticker())
+        res = await vienna_log(operation="search_semantic", query="Heuriger")
+        task.cancel()
+        return res
+
+    assert asyncio.run(search())["entries"] == []
+    assert ticks >= 5
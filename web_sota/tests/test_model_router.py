@@ -0,0 +1,141 @@
+"""Model router — complexity routes, per-conversation pin and route stats."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from vienna_life_assistant import model_router, pa_agent
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats(db):
+    """Routing picks models through the ledger, which reads the test DB."""
+    model_router.router_stats.clear()
+    yield
+    model_router.router_stats.clear()
+
+
+def _fake_llm(monkeypatch):
+    monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+    monkeypatch.setattr(
+        pa_agent,
+        "resolve_llm",
+        lambda: {
+            "url_base": "http://mock",
+            "model": "mid:12b",
+            "headers": {},
+            "provider": "ollama",
+            "installed": ["tiny:3b", "mid:12b", "big:32b"],
+        },
+    )
+
+
+def test_route_by_complexity():
+    assert model_router.route("what's on today?", 1)["route"] == "small"
+    assert model_router.route("hi")["route"] == "small"
+    planning = model_router.route("Plan my weekend around the Naschmarkt")
+    assert planning["route"] == "large"
+    assert planning["task"] == "chat_large"
+    assert model_router.route("check wifi, calendar and mail", 3)["route"] == "large"
+    assert model_router.route("word " * 200)["route"] == "large"
+    standard = model_router.route(
+        "Which of my open todos are about the apartment? And anything from "
+        "the landlord?",
+        1,
+    )
+    assert standard["route"] == "standard"
+    assert standard["task"] == "agent"
+
+
+def test_router_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("VILIFE_MODEL_ROUTER", "0")
+    decision = model_router.route("Plan my weekend")
+    assert decision["route"] == "standard"
+    assert decision["reason"] == "router disabled"
+
+
+def test_llm_for_turn_picks_model_per_route(monkeypatch):
+    _fake_llm(monkeypatch)
+
+    def model_for(text: str) -> str:
+        llm, _ = asyncio.run(pa_agent.llm_for_turn([{"role": "user", "content": text}]))
+        return llm["model"]
+
+    assert model_for("hi") == "tiny:3b"
+    assert model_for("Compare my grocery spending with last month") == "big:32b"
+    assert (
+        model_for("Tell me about the Kaffeehaus culture around Alsergrund. Briefly.")
+        == "mid:12b"
+    )
+    stats = model_router.router_stats.stats()["routes"]
+    assert stats["small"]["models"] == {"tiny:3b": 1}
+    assert stats["large"]["models"] == {"big:32b": 1}
+
+
+def test_pinned_model_skips_routing(monkeypatch):
+    _fake_llm(monkeypatch)
+    llm, decision = asyncio.run(
+        pa_agent.llm_for_turn(
+            [{"role": "user", "content": "Plan my weekend"}], model="tiny:3b"
+        )
+    )
+    assert llm["model"] == "tiny:3b"
+    assert decision["route"] == "pinned"
+
+
+def test_run_agent_reports_route_and_latency(monkeypatch):
+    _fake_llm(monkeypatch)
+
+    async def fake_chat_message(url_base, payload, headers, timeout=90):
+        assert payload["model"] == "tiny:3b"
+        return {"role": "assistant", "content": "Servus!"}
+
+    monkeypatch.setattr(pa_agent, "_chat_message", fake_chat_message)
+    result = asyncio.run(pa_agent.run_agent([{"role": "user", "content": "hi"}]))
+    assert result["route"] == "small"
+    assert result["model"] == "tiny:3b"
+    assert model_router.router_stats.stats()["routes"]["small"]["samples"] == 1
+
+
+def test_tool_turn_latency_covers_the_whole_turn(monkeypatch):
+    _fake_llm(monkeypatch)
+    replies = iter(
+        [
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {"id": "1", "function": {"name": "noop", "arguments": "{}"}}
+                ],
+            },
+            {"role": "assistant", "content": "Done."},
+        ]
+    )
+
+    async def slow_chat_message(url_base, payload, headers, timeout=90):
+        await asyncio.sleep(0.2)
+        return next(replies)
+
+    async def fast_tool(name, args):
+        return {"success": True}
+
+    monkeypatch.setattr(pa_agent, "_chat_message", slow_chat_message)
+    monkeypatch.setattr(pa_agent, "execute_tool", fast_tool)
+    asyncio.run(pa_agent.run_agent([{"role": "user", "content": "hi"}]))
+    small = model_router.router_stats.stats()["routes"]["small"]
+    assert small["total_ms_p50"] >= 400  # both LLM calls, not just the last one
+
+
+def test_router_route_reports_stats(client, monkeypatch):
+    model_router.router_stats.decided(model_router.route("hi"), "tiny:3b")
+    model_router.router_stats.observe("small", 120.0, 40.0)
+    r = client.get("/api/llm/router")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["ok"] is True
+    small = body["routes"]["small"]
+    assert small["turns"] == 1
+    assert small["total_ms_p50"] == 120.0
+    assert small["ttft_ms_p50"] == 40.0
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+import json
+
 from vienna_life_assistant import life_db, pa_agent
-from vienna_life_assistant.models import JournalEntry
+from vienna_life_assistant.models import JournalEntry, Todo
+
+
+def _returns(value):
+    async def fake(*args, **kwargs):
+        return value
+
+    return fake
 
 
 def life_db_add(db, i: int, title: str, body: str) -> None:
@@ -80,14 +89,76 @@ def test_pa_ask_requires_question(client):
 
 
 def test_pa_ask_answers_with_mocked_llm(client, monkeypatch):
-    monkeypatch.setattr(
-        pa_agent, "answer_question", lambda q, ctx: f"Answer about: {q}"
-    )
+    async def fake_answer(q, ctx):
+        return f"Answer about: {q}"
+
+    monkeypatch.setattr(pa_agent, "answer_question", fake_answer)
     r = client.post("/api/pa/ask", json={"question": "next doctor visit?"})
     assert r.status_code == 200
     assert r.json()["answer"] == "Answer about: next doctor visit?"
 
 
+_MOCK_LLM = {"url_base": "http://mock", "model": "m", "headers": {}, "provider": "x"}
+
+
+# --- Provider resolution cache -------------------------------------------------
+
+
+def _counting_resolver(monkeypatch, value):
+    probes = {"n": 0}
+
+    def fake():
+        probes["n"] += 1
+        return value
+
+    pa_agent.invalidate_llm_cache()
+    monkeypatch.setattr(pa_agent, "_resolve_uncached", fake)
+    return probes
+
+
+def test_resolve_llm_caches_and_invalidates(monkeypatch):
+    llm = {"url_base": "http://mock/v1", "model": "m", "headers": {}, "provider": "x"}
+    probes = _counting_resolver(monkeypatch, llm)
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    assert pa_agent.resolve_llm() == llm
+    assert pa_agent.resolve_llm() == llm
+    assert probes["n"] == 1
+    assert pa_agent.llm_cache_info()["model"] == "m"
+
+    monkeypatch.setenv("OLLAMA_MODEL", "other")  # settings change -> re-probe
+    pa_agent.resolve_llm()
+    assert probes["n"] == 2
+    pa_agent.invalidate_llm_cache()
+    pa_agent.resolve_llm()
+    assert probes["n"] == 3
+    pa_agent.invalidate_llm_cache()
+
+
+def test_resolve_llm_caches_failures_briefly(monkeypatch):
+    probes = _counting_resolver(monkeypatch, None)
+    monkeypatch.setattr(pa_agent, "LLM_NEGATIVE_TTL", 60.0)
+    assert pa_agent.resolve_llm() is None
+    assert pa_agent.resolve_llm() is None
+    assert probes["n"] == 1
+    monkeypatch.setattr(pa_agent, "LLM_NEGATIVE_TTL", 0.0)
+    assert pa_agent.resolve_llm(refresh=True) is None
+    assert pa_agent.resolve_llm() is None  # expired immediately
+    assert probes["n"] == 3
+    pa_agent.invalidate_llm_cache()
+
+
+def test_llm_settings_update_invalidates_cache(client, monkeypatch):
+    llm = {"url_base": "http://mock/v1", "model": "m", "headers": {}, "provider": "x"}
+    probes = _counting_resolver(monkeypatch, llm)
+    pa_agent.resolve_llm()
+    monkeypatch.setenv("OLLAMA_URL", "http://127.0.0.1:11434")
+    r = client.post("/api/settings/llm", json={"ollama_url": "http://127.0.0.1:11434"})
+    assert r.json()["ok"] is True
+    pa_agent.resolve_llm()
+    assert probes["n"] == 2
+    pa_agent.invalidate_llm_cache()
+
+
 # --- Agent loop ---------------------------------------------------------------
 
 
@@ -122,7 +193,7 @@ def test_run_agent_executes_tool_and_reflects(monkeypatch, db):
             "provider": "ollama",
         }
 
-    def fake_chat_message(url_base, payload, headers, timeout=90):
+    async def fake_chat_message(url_base, payload, headers, timeout=90):
         calls["n"] += 1
         if calls["n"] == 1:
             return {
@@ -173,7 +244,7 @@ def test_run_agent_tool_error_feeds_back(monkeypatch):
             "provider": "ollama",
         }
 
-    def fake_chat_message(url_base, payload, headers, timeout=90):
+    async def fake_chat_message(url_base, payload, headers, timeout=90):
         calls["n"] += 1
         if calls["n"] == 1:
             return {
@@ -270,7 +341,7 @@ def test_pa_ask_injects_journal_memory(client, monkeypatch):
 
     seen = {}
 
-    def fake_answer(question, ctx):
+    async def fake_answer(question, ctx):
         seen["ctx"] = ctx
         return "yes"
 
@@ -307,7 +378,7 @@ def test_brief_email_sent_when_enabled(client, monkeypatch):
     monkeypatch.setenv("PA_BRIEF_EMAIL", "1")
     monkeypatch.setenv("PA_BRIEF_RECIPIENT", "sandra@example.at")
     monkeypatch.setattr(
-        pa_agent, "generate_brief", lambda ctx: "## Brief\n\nAll good today."
+        pa_agent, "generate_brief", _returns("## Brief\n\nAll good today.")
     )
     monkeypatch.setattr(pa_agent, "resolve_llm", lambda: None)
     monkeypatch.setattr(email_routes, "_em", fake_em)
@@ -330,7 +401,7 @@ def test_brief_email_skipped_when_disabled(client, monkeypatch):
         return {"ok": True}
 
     monkeypatch.setenv("PA_BRIEF_EMAIL", "0")
-    monkeypatch.setattr(pa_agent, "generate_brief", lambda ctx: "brief")
+    monkeypatch.setattr(pa_agent, "generate_brief", _returns("brief"))
     monkeypatch.setattr(pa_agent, "resolve_llm", lambda: None)
     monkeypatch.setattr(email_routes, "_em", fake_em)
     client.post("/api/pa/refresh")
@@ -357,7 +428,7 @@ def test_run_agent_executes_fleet_call(monkeypatch):
             "provider": "ollama",
         }
 
-    def fake_chat_message(url_base, payload, headers, timeout=90):
+    async def fake_chat_message(url_base, payload, headers, timeout=90):
         calls["n"] += 1
         if calls["n"] == 1:
             return {
@@ -395,6 +466,281 @@ def test_run_agent_executes_fleet_call(monkeypatch):
     assert result["trace"][0]["tool"] == "fleet_call"
 
 
+def _fleet_turn_llm(calls_json: list[str]):
+    calls = {"n": 0}
+
+    async def fake_chat_message(url_base, payload, headers, timeout=90):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": f"call_{i}",
+                        "function": {"name": "fleet_call", "arguments": a},
+                    }
+                    for i, a in enumerate(calls_json)
+                ],
+            }
+        # Echo back what the loop sent so the test can inspect message order.
+        return {"role": "assistant", "content": json.dumps(payload["messages"][3:])}
+
+    return fake_chat_message
+
+
+def test_run_agent_runs_turn_tool_calls_concurrently(monkeypatch):
+    import asyncio
+    import time
+
+    from vienna_life_assistant import fleet_mcp
+
+    def slow_call_tool(server, tool, arguments):
+        time.sleep(arguments["delay"])
+        return {"success": True, "tool": tool}
+
+    delays = [0.3, 0.1, 0.2]
+    args = [
+        json.dumps({"server": "gtfs-mcp", "tool": f"t{i}", "arguments": {"delay": d}})
+        for i, d in enumerate(delays)
+    ]
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: _MOCK_LLM)
+    monkeypatch.setattr(pa_agent, "_chat_message", _fleet_turn_llm(args))
+    monkeypatch.setattr(fleet_mcp, "call_tool", slow_call_tool)
+
+    loop = asyncio.new_event_loop()
+    try:
+        t0 = time.perf_counter()
+        result = loop.run_until_complete(
+            pa_agent.run_agent([{"role": "user", "content": "x"}], max_iterations=2)
+        )
+        elapsed = time.perf_counter() - t0
+    finally:
+        loop.close()
+    assert elapsed < sum(delays)
+    tool_msgs = json.loads(result["response"])
+    assert [m["tool_call_id"] for m in tool_msgs] == ["call_0", "call_1", "call_2"]
+    assert [t["result"]["tool"] for t in result["trace"]] == ["t0", "t1", "t2"]
+    turn = result["turns"][0]
+    assert turn["tools"] == 3
+    assert turn["saved_ms"] > 100
+    assert turn["serial_ms"] >= 550
+
+
+def test_run_agent_tool_budget_times_out_stragglers(monkeypatch):
+    import asyncio
+    import time
+
+    from vienna_life_assistant import fleet_mcp
+
+    def call_tool(server, tool, arguments):
+        time.sleep(arguments["delay"])
+        return {"success": True}
+
+    args = [
+        json.dumps({"server": "gtfs-mcp", "tool": "fast", "arguments": {"delay": 0}}),
+        json.dumps({"server": "gtfs-mcp", "tool": "slow", "arguments": {"delay": 1}}),
+    ]
+    monkeypatch.setattr(pa_agent, "TOOL_BUDGET_S", 0.2)
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: _MOCK_LLM)
+    monkeypatch.setattr(pa_agent, "_chat_message", _fleet_turn_llm(args))
+    monkeypatch.setattr(fleet_mcp, "call_tool", call_tool)
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(
+            pa_agent.run_agent([{"role": "user", "content": "x"}], max_iterations=2)
+        )
+    finally:
+        loop.close()
+    assert result["trace"][0]["result"]["success"] is True
+    assert result["trace"][1]["result"]["success"] is False
+    assert "timed out" in result["trace"][1]["result"]["error"]
+
+
+def _fake_stream(turns: list[list[dict]]):
+    """_stream_chat stand-in: one list of chunk deltas per LLM call."""
+    calls = {"n": 0}
+
+    async def fake(url_base, payload, headers, timeout=90):
+        assert payload["stream"] is True
+        deltas = turns[min(calls["n"], len(turns) - 1)]
+        calls["n"] += 1
+        for delta in deltas:
+            yield {"choices": [{"delta": delta}]}
+
+    return fake
+
+
+def test_stream_agent_emits_tool_and_token_events(monkeypatch, db):
+    import asyncio
+
+    turns = [
+        [
+            # OpenAI-style: id/name first, arguments split across chunks
+            {
+                "tool_calls": [
+                    {
+                        "index": 0,
+                        "id": "c1",
+                        "function": {"name": "vienna_life__todo_add"},
+                    }
+                ]
+            },
+            {"tool_calls": [{"index": 0, "function": {"arguments": '{"title": "str'}}]},
+            {"tool_calls": [{"index": 0, "function": {"arguments": 'eamed todo"}'}}]},
+        ],
+        [{"content": "Todo "}, {"content": "added."}],
+    ]
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: _MOCK_LLM)
+    monkeypatch.setattr(pa_agent, "_stream_chat", _fake_stream(turns))
+
+    async def collect():
+        return [
+            e
+            async for e in pa_agent.stream_agent(
+                [{"role": "user", "content": "add a todo"}], max_iterations=3
+            )
+        ]
+
+    loop = asyncio.new_event_loop()
+    try:
+        events = loop.run_until_complete(collect())
+    finally:
+        loop.close()
+
+    types = [e["type"] for e in events]
+    assert types == ["start", "tool_start", "tool_result", "token", "token", "done"]
+    assert events[1]["tool"] == "vienna_life__todo_add"
+    assert events[2]["result"]["success"] is True
+    done = events[-1]
+    assert done["response"] == "Todo added."
+    assert done["trace"][0]["args"] == {"title": "streamed todo"}
+    assert done["timing"]["ttft_ms"] >= done["timing"]["ttfb_ms"] >= 0
+    titles = [t.title for t in life_db.list_rows(db, Todo)]
+    assert "streamed todo" in titles
+
+
+def test_stream_agent_cancels_tools_when_client_goes_away(monkeypatch):
+    import asyncio
+
+    turns = [
+        [
+            {
+                "tool_calls": [
+                    {"index": 0, "id": "c1", "function": {"name": "fast"}},
+                    {"index": 1, "id": "c2", "function": {"name": "slow"}},
+                ]
+            }
+        ]
+    ]
+    cancelled: list[str] = []
+
+    async def execute_tool(name, args):
+        try:
+            await asyncio.sleep(0 if name == "fast" else 30)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return {"success": True}
+
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: _MOCK_LLM)
+    monkeypatch.setattr(pa_agent, "_stream_chat", _fake_stream(turns))
+    monkeypatch.setattr(pa_agent, "execute_tool", execute_tool)
+
+    async def disconnect_after_first_result():
+        stream = pa_agent.stream_agent([{"role": "user", "content": "x"}])
+        async for event in stream:
+            if event["type"] == "tool_result":
+                break
+        await stream.aclose()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    loop = asyncio.new_event_loop()
+    try:
+        leftover = loop.run_until_complete(disconnect_after_first_result())
+    finally:
+        loop.close()
+    assert cancelled == ["slow"]
+    assert leftover == []
+
+
+def test_pa_chat_stream_endpoint_ndjson(client, monkeypatch):
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: _MOCK_LLM)
+    monkeypatch.setattr(
+        pa_agent, "_stream_chat", _fake_stream([[{"content": "Servus"}]])
+    )
+    with client.stream(
+        "POST", "/api/pa/chat/stream", json={"messages": [{"content": "hi"}]}
+    ) as r:
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in r.iter_lines() if line]
+    assert [e["type"] for e in events] == ["start", "token", "done"]
+    assert events[-1]["response"] == "Servus"
+
+
+def test_pa_chat_stream_without_llm_reports_error(client, monkeypatch):
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: None)
+    r = client.post("/api/pa/chat/stream", json={"messages": [{"content": "hi"}]})
+    events = [json.loads(line) for line in r.text.splitlines() if line]
+    assert events == [{"type": "error", "error": events[0]["error"]}]
+    assert "LLM" in events[0]["error"]
+
+
+def test_select_tools_subsets_by_message():
+    names = pa_agent.select_tools(
+        [{"role": "user", "content": "Add a todo for tomorrow"}]
+    )
+    assert "vienna_life__todo_add" in names
+    assert "vienna_email__send" not in names
+    assert "fleet_call" not in names
+
+    # follow-up keeps the previous user turn's context
+    follow = pa_agent.select_tools(
+        [
+            {"role": "user", "content": "Any Arzt appointments?"},
+            {"role": "assistant", "content": "One on Friday."},
+            {"role": "user", "content": "and after that?"},
+        ]
+    )
+    assert "vienna_health__visits" in follow
+
+    assert pa_agent.select_tools([{"role": "user", "content": "Servus!"}]) is None
+
+
+def test_tool_schemas_are_cached_and_subset(monkeypatch):
+    names = ("vienna_life__todo_add", "fritz_status")
+    assert pa_agent._tool_schemas(names) is pa_agent._tool_schemas(names)
+    assert [t["function"]["name"] for t in pa_agent._tool_schemas(names)] == list(names)
+    assert len(pa_agent._tool_schemas()) == len(pa_agent._TOOL_SPECS)
+    monkeypatch.setenv("VILIFE_TOOL_SUBSET", "0")
+    assert pa_agent.select_tools([{"content": "todo"}]) is None
+
+
+def test_run_agent_sends_only_selected_tools(monkeypatch):
+    import asyncio
+
+    seen = {}
+
+    async def fake_chat_message(url_base, payload, headers, timeout=90):
+        seen["tools"] = [t["function"]["name"] for t in payload["tools"]]
+        return {"role": "assistant", "content": "ok"}
+
+    monkeypatch.setattr(pa_agent, "resolve_llm", lambda: _MOCK_LLM)
+    monkeypatch.setattr(pa_agent, "_chat_message", fake_chat_message)
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(
+            pa_agent.run_agent([{"role": "user", "content": "is the WLAN down?"}])
+        )
+    finally:
+        loop.close()
+    assert seen["tools"] == ["vienna_life__life_brief", "fritz_status"]
+    assert result["tools_offered"] == 2
+
+
 def test_fleet_allowlist_enforced():
     import asyncio
 
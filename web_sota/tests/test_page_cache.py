@@ -0,0 +1,107 @@
+"""Disk page cache — persistence, ETag revalidation, stale-while-revalidate
+and failure fallback against a local stub site."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from vienna_life_assistant.page_cache import PageCache
+
+PAGE = "<html><body><h2>Donauinselfest</h2></body></html>"
+
+
+class _Site(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers)
+        if server.down:
+            self.send_error(503)
+            return
+        etag = f'"v{server.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f"{PAGE}<!-- v{server.version} -->".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    server.requests = []
+    server.version = 1
+    server.down = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}/news"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = PageCache(tmp_path / "pages.sqlite3")
+    yield cache
+    cache.close()
+
+
+def test_fresh_pages_come_from_disk_across_restarts(cache, site):
+    async def run():
+        text, outcome = await cache.get(site.url, max_age=60)
+        assert outcome == "miss"
+        assert await cache.get(site.url, max_age=60) == (text, "hit")
+        restarted = PageCache(cache.path)
+        try:
+            assert await restarted.get(site.url, max_age=60) == (text, "hit")
+        finally:
+            restarted.close()
+
+    asyncio.run(run())
+    assert len(site.requests) == 1
+
+
+def test_etag_revalidation_and_stale_copy_on_failure(cache, site):
+    async def run():
+        text, _ = await cache.get(site.url, max_age=0)
+        assert await cache.get(site.url, max_age=0) == (text, "revalidated")
+        site.down = True
+        assert await cache.get(site.url, max_age=0) == (text, "stale_error")
+
+    asyncio.run(run())
+    assert site.requests[1]["If-None-Match"] == '"v1"'
+    stats = cache.stats()
+    assert (stats["miss"], stats["revalidated"], stats["stale_error"]) == (1, 1, 1)
+    assert stats["hit_rate"] == round(2 / 3, 3)
+
+
+def test_stale_while_revalidate_keeps_the_callers_headers(cache, site):
+    async def run():
+        await cache.get(site.url, max_age=0)
+        site.version = 2
+        async with httpx.AsyncClient(headers={"User-Agent": "ViLife/1.0"}) as client:
+            text, outcome = await cache.get(
+                site.url, max_age=0, stale_while_revalidate=60, client=client
+            )
+        assert outcome == "stale"
+        assert "v1" in text
+        await asyncio.gather(*cache._revalidating.values())
+        return await cache.get(site.url, max_age=60)
+
+    text, outcome = asyncio.run(run())
+    assert (outcome, "v2" in text) == ("hit", True)
+    assert site.requests[-1]["User-Agent"] == "ViLife/1.0"
+    assert cache.stats()["background"] == {"revalidated": 0, "miss": 1, "error": 0}
@@ -0,0 +1,255 @@
+"""Scrape engine — concurrent sources, per-host limits, partial results,
+single-flight cold reads, refresh-ahead and the disk page cache, against a
+local stub site."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from vienna_life_assistant import vienna_scraper
+from vienna_life_assistant.page_cache import PageCache
+from vienna_life_assistant.scrape_engine import Feature, ScrapeEngine, Source
+
+ORF = """<html><body>
+<h2><a href="/stories/1">U2-Verlängerung: Neue Station eröffnet</a></h2>
+<h2><a href="/stories/2">Kurz</a></h2>
+<h2><a href="/stories/3">Donauinselfest 2026 mit Rekordbesuch</a></h2>
+</body></html>"""
+
+
+class _Site(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        delay = float(parse_qs(url.query).get("ms", ["0"])[0]) / 1000
+        with server.lock:
+            server.hits.append(url.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(delay)
+            if self.headers.get("If-None-Match") == '"orf-1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            status = 500 if url.path == "/broken" else 200
+            body = ORF.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"orf-1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    server.lock = threading.Lock()
+    server.hits = []
+    server.active = server.max_active = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    server.alias = f"http://localhost:{server.server_port}"  # a second "host"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pages(tmp_path):
+    """An empty disk page cache of its own."""
+    cache = PageCache(tmp_path / "pages.sqlite3")
+    yield cache
+    cache.close()
+
+
+def _orf(url: str, timeout: float = 5.0, name: str | None = None) -> Source:
+    return Source(
+        name or url,
+        vienna_scraper._html_source(url, vienna_scraper._parse_orf),
+        timeout,
+    )
+
+
+def test_parse_orf_keeps_real_headlines():
+    items = vienna_scraper._parse_orf(ORF)
+    assert [i["url"] for i in items] == ["/stories/1", "/stories/3"]
+    assert items[0]["source"] == "ORF Wien"
+
+
+def test_every_feed_is_a_feature():
+    assert set(vienna_scraper.engine.features) == {
+        "performances",
+        "exhibitions",
+        "news",
+        "press",
+        "lunch",
+    }
+
+
+def test_sources_run_concurrently(site):
+    engine = ScrapeEngine(
+        [
+            Feature(
+                "news",
+                600,
+                [_orf(f"{site.url}/a?ms=400"), _orf(f"{site.alias}/b?ms=400")],
+            )
+        ]
+    )
+    started = time.perf_counter()
+    items = asyncio.run(engine.get("news"))
+    assert time.perf_counter() - started < 0.75  # not 2 × 400 ms
+    assert len(items) == 4
+    assert site.max_active == 2
+
+
+def test_per_host_limit(site):
+    sources = [_orf(f"{site.url}/{i}?ms=150") for i in range(3)]
+    engine = ScrapeEngine([Feature("news", 600, sources)], per_host=1)
+    asyncio.run(engine.get("news"))
+    assert site.max_active == 1
+
+
+def test_partial_results_on_timeout_and_error(site):
+    slow = _orf(f"{site.url}/slow?ms=0", timeout=0.3, name="slow")
+    engine = ScrapeEngine(
+        [
+            Feature(
+                "news",
+                600,
+                [
+                    _orf(f"{site.url}/fast", name="fast"),
+                    slow,
+                    _orf(f"{site.url}/broken", name="broken"),
+                ],
+            )
+        ]
+    )
+    assert len(asyncio.run(engine.refresh("news"))) == 4  # fast + slow, broken has none
+
+    slow.fetch = vienna_scraper._html_source(
+        f"{site.url}/slow?ms=1500", vienna_scraper._parse_orf
+    )
+    started = time.perf_counter()
+    items = asyncio.run(engine.refresh("news"))
+    assert time.perf_counter() - started < 1.0
+    assert len(items) == 4  # slow's last good items are reused
+    report = engine.status()["news"]["sources"]
+    assert report["fast"]["status"] == "ok"
+    assert report["slow"] == {**report["slow"], "status": "timeout", "stale": True}
+    assert report["broken"]["status"] == "error"
+    assert "500" in report["broken"]["error"]
+
+
+def test_cold_reads_share_one_scrape(site):
+    engine = ScrapeEngine([Feature("news", 600, [_orf(f"{site.url}/n?ms=200")])])
+
+    async def reads():
+        first, second = await asyncio.gather(engine.get("news"), engine.get("news"))
+        assert first == second
+        assert site.hits == ["/n"]
+        await engine.get("news")  # warm: served from cache
+
+    asyncio.run(reads())
+    assert site.hits == ["/n"]
+
+
+def test_refresh_loop_scrapes_before_expiry(site, monkeypatch):
+    monkeypatch.delenv("VILIFE_SCRAPE_REFRESH")
+    engine = ScrapeEngine([Feature("news", 0.5, [_orf(f"{site.url}/n")])])
+
+    async def run_loop():
+        loop = asyncio.create_task(engine.refresh_loop(tick=0.05))
+        await asyncio.sleep(1.2)
+        loop.cancel()
+
+    asyncio.run(run_loop())
+    assert 2 <= len(site.hits) <= 3  # initial + one per 0.4 s (80% of the TTL)
+    assert engine.status()["news"]["age_s"] < 0.5
+
+
+def test_refresh_loop_disabled():
+    engine = ScrapeEngine([Feature("news", 1, [])])
+    asyncio.run(asyncio.wait_for(engine.refresh_loop(), 1))  # returns at once
+    assert engine.status()["news"]["age_s"] is None
+
+
+def test_news_endpoint_reads_the_engine(client, site, monkeypatch):
+    feature = vienna_scraper.engine.features["news"]
+    monkeypatch.setattr(feature, "sources", [_orf(f"{site.url}/orf")])
+    vienna_scraper.engine.clear()
+    try:
+        assert len(client.get("/api/vienna/news").json()) == 2
+        assert len(client.get("/api/vienna/news").json()) == 2
+        assert site.hits == ["/orf"]
+        status = client.get("/api/vienna/sources").json()
+        assert status["news"]["items"] == 2
+        assert status["performances"]["age_s"] is None
+    finally:
+        vienna_scraper.engine.clear()
+
+
+def test_restart_reads_pages_from_disk(site, pages):
+    feature = Feature("news", 600, [_orf(f"{site.url}/n")])
+    assert len(asyncio.run(ScrapeEngine([feature], cache=pages).get("news"))) == 2
+
+    restarted = type(pages)(pages.path)  # new process, same file
+    engine = ScrapeEngine([feature], cache=restarted)
+    assert len(asyncio.run(engine.get("news"))) == 2
+    assert site.hits == ["/n"]
+    assert engine.cache_stats()["hit"] == 1
+    restarted.close()
+
+
+def test_refresh_revalidates_with_etag(site, pages):
+    engine = ScrapeEngine([Feature("news", 0, [_orf(f"{site.url}/n")])], cache=pages)
+    asyncio.run(engine.refresh("news"))
+    assert len(asyncio.run(engine.refresh("news"))) == 2
+    assert site.hits == ["/n", "/n"]
+    stats = pages.stats()
+    assert (stats["miss"], stats["revalidated"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_cold_start_serves_disk_copy_and_rescrapes(site, pages):
+    feature = Feature("news", 10, [_orf(f"{site.url}/n?ms=300")])
+    asyncio.run(ScrapeEngine([feature], cache=pages).get("news"))
+    with pages._conn() as db:  # written 12 s ago: past max_age, within the TTL
+        db.execute("UPDATE pages SET validated_at = validated_at - 12")
+
+    engine = ScrapeEngine([feature], cache=pages)
+
+    async def cold_read():
+        started = time.perf_counter()
+        items = await engine.get("news")
+        assert time.perf_counter() - started < 0.25  # not waiting on the site
+        await asyncio.gather(*pages._revalidating.values())
+        return items
+
+    assert len(asyncio.run(cold_read())) == 2
+    assert engine._due("news")  # re-scraped on the next loop tick
+    assert site.hits == ["/n", "/n"]  # the background conditional GET
+    assert pages.stats()["background"]["revalidated"] == 1
+
+
+def test_cache_stats_endpoint(client, monkeypatch, pages):
+    monkeypatch.setattr(vienna_scraper.engine, "_disk", pages)
+    monkeypatch.setattr(vienna_scraper.engine, "_disk_resolved", True)
+    body = client.get("/api/vienna/sources/cache").json()
+    assert body["entries"] == 0
+    assert body["hit_rate"] is None
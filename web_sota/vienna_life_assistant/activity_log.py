@@ -1,4 +1,10 @@
-"""In-memory event log for ViLife web dashboard."""
+"""In-memory event log for ViLife web dashboard.
+
+Entries live in an indexed ring (``_LogStore``) with monotonic integer ids;
+``after_id`` polling, level/kind filters and paging never copy the buffer.
+With ``VILIFE_LOG_SPOOL=1`` every entry is also spooled to JSONL segments on
+disk (see log_spool.py) so history survives restarts.
+"""
 
 from __future__ import annotations
 
@@ -7,11 +13,18 @@ import io
 import json
 import logging
 import os
-from collections import deque
+import threading
+import traceback
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
 from datetime import UTC, datetime
+from itertools import islice
+from queue import Empty, SimpleQueue
 from threading import Lock
 from typing import Any, Literal
 
+from vienna_life_assistant.log_spool import LogSpool, spool_enabled
+
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 SortOrder = Literal["asc", "desc"]
 
@@ -22,32 +35,386 @@ _max_entries = max(
     100, min(int(os.environ.get("VILIFE_LOG_MAX_ENTRIES", str(_DEFAULT_MAX))), 50_000)
 )
 _lock = Lock()
-_entries: deque[dict[str, Any]] = deque(maxlen=_max_entries)
 
 
-def log_activity(
+class _SeqIndex:
+    """Ascending sequence ids for one level or kind.
+
+    Evictions only ever remove the oldest id, so they advance ``head``
+    instead of shifting the list; the dead prefix is compacted once it
+    outgrows the live part (amortized O(1)).
+    """
+
+    __slots__ = ("head", "seqs")
+
+    def __init__(self) -> None:
+        self.seqs: list[int] = []
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.seqs) - self.head
+
+    def append(self, seq: int) -> None:
+        self.seqs.append(seq)
+
+    def evict(self) -> None:
+        self.head += 1
+        if self.head > 64 and self.head * 2 > len(self.seqs):
+            del self.seqs[: self.head]
+            self.head = 0
+
+    def range_from(self, lo: int) -> tuple[int, int]:
+        """(start, stop) list slice covering ids >= lo — binary search."""
+        return bisect_left(self.seqs, lo, self.head), len(self.seqs)
+
+
+class _LogStore:
+    """Fixed-size ring of entries keyed by a monotonic sequence id.
+
+    Slot for seq ``s`` is ``s % maxlen``; live ids are ``[first, next)``,
+    so lookup by id is O(1) and ``after_id`` is a bound, not a scan. Each
+    slot keeps the entry, its level rank and a precomputed lowercase search
+    haystack, and per-level / per-kind indices narrow filtered queries to
+    just the matching ids.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen = maxlen
+        self._entries: list[dict[str, Any] | None] = [None] * maxlen
+        self._ranks: list[int] = [0] * maxlen
+        self._hay: list[str] = [""] * maxlen
+        self.first = 1
+        self.next = 1
+        self.by_level: dict[str, _SeqIndex] = {}
+        self.by_kind: dict[str, _SeqIndex] = {}
+
+    def __len__(self) -> int:
+        return self.next - self.first
+
+    def append(self, entry: dict[str, Any], hay: str) -> int:
+        if len(self) == self.maxlen:
+            self._evict_oldest()
+        seq = self.next
+        slot = seq % self.maxlen
+        level = entry["level"]
+        self._entries[slot] = entry
+        self._ranks[slot] = _LEVEL_RANK.get(level, 0)
+        self._hay[slot] = hay
+        self.by_level.setdefault(level, _SeqIndex()).append(seq)
+        self.by_kind.setdefault(entry["kind"], _SeqIndex()).append(seq)
+        self.next = seq + 1
+        return seq
+
+    def _evict_oldest(self) -> None:
+        slot = self.first % self.maxlen
+        entry = self._entries[slot]
+        assert entry is not None
+        for index, key in (
+            (self.by_level, entry["level"]),
+            (self.by_kind, entry["kind"]),
+        ):
+            idx = index[key]
+            idx.evict()
+            if not idx:
+                del index[key]
+        self._entries[slot] = None
+        self._hay[slot] = ""
+        self.first += 1
+
+    def clear(self) -> None:
+        # Keep ``next`` — clients polling with after_id must never see ids reused.
+        self._entries = [None] * self.maxlen
+        self._hay = [""] * self.maxlen
+        self.first = self.next
+        self.by_level.clear()
+        self.by_kind.clear()
+
+    def rebase(self, start: int) -> None:
+        """Empty the ring and continue numbering at ``start``."""
+        self.clear()
+        self.first = self.next = start
+
+    def entry(self, seq: int) -> dict[str, Any]:
+        return self._entries[seq % self.maxlen]  # type: ignore[return-value]
+
+    def oldest(self) -> dict[str, Any] | None:
+        return self.entry(self.first) if len(self) else None
+
+    def newest(self) -> dict[str, Any] | None:
+        return self.entry(self.next - 1) if len(self) else None
+
+    def candidates(
+        self, lo: int, min_rank: int, kind: str | None
+    ) -> tuple[Sequence[int], bool]:
+        """Ascending candidate ids >= lo, and whether they still need a rank check.
+
+        Picks the narrowest source: the kind index, the union of qualifying
+        level indices, or the plain id range.
+        """
+        if kind is not None:
+            idx = self.by_kind.get(kind)
+            if idx is None:
+                return (), False
+            start, stop = idx.range_from(lo)
+            return _ListSlice(idx.seqs, start, stop), min_rank > 0
+        if min_rank > 0:
+            levels = [
+                idx
+                for name, idx in self.by_level.items()
+                if _LEVEL_RANK.get(name, 0) >= min_rank
+            ]
+            if len(levels) == 1:
+                start, stop = levels[0].range_from(lo)
+                return _ListSlice(levels[0].seqs, start, stop), False
+            merged: list[int] = []
+            for idx in levels:
+                start, stop = idx.range_from(lo)
+                merged.extend(idx.seqs[start:stop])
+            merged.sort()
+            return merged, False
+        return range(max(lo, self.first), self.next), False
+
+    def rank(self, seq: int) -> int:
+        return self._ranks[seq % self.maxlen]
+
+    def hay(self, seq: int) -> str:
+        return self._hay[seq % self.maxlen]
+
+
+class _ListSlice(Sequence[int]):
+    """Read-only view of list[start:stop] — no copy for index-backed pages."""
+
+    __slots__ = ("_items", "_start", "_stop")
+
+    def __init__(self, items: list[int], start: int, stop: int) -> None:
+        self._items, self._start, self._stop = items, start, stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self._items[self._start + j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._items[self._start + i]
+
+
+_store = _LogStore(_max_entries)
+
+
+def _haystack(kind: str, detail: str, meta: dict[str, Any]) -> str:
+    meta_text = json.dumps(meta, default=str) if meta else "{}"
+    return f"{kind} {detail} {meta_text}".lower()
+
+
+def _make_entry(
     kind: str,
     detail: str,
-    *,
-    level: str | None = None,
-    meta: dict[str, Any] | None = None,
-) -> dict[str, Any]:
+    level: str | None,
+    meta: dict[str, Any] | None,
+    when: datetime | None = None,
+) -> tuple[dict[str, Any], str]:
+    meta = meta or {}
     entry = {
-        "id": f"{datetime.now(UTC).timestamp():.6f}",
-        "timestamp": datetime.now(UTC).isoformat(),
+        "id": "",
+        "timestamp": (when or datetime.now(UTC)).isoformat(),
         "level": (level or "INFO").upper(),
         "kind": kind,
         "detail": detail,
-        "meta": meta or {},
+        "meta": meta,
     }
+    return entry, _haystack(kind, detail, meta)
+
+
+def _append_entries(batch: list[tuple[dict[str, Any], str]]) -> None:
+    """Insert prepared (entry, haystack) pairs under a single lock hold."""
     with _lock:
-        _entries.appendleft(entry)
+        for entry, hay in batch:
+            entry["id"] = str(_store.append(entry, hay))
+            if _spool is not None:
+                _spool.append(entry)
+
+
+def log_activity(
+    kind: str,
+    detail: str,
+    *,
+    level: str | None = None,
+    meta: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    entry, hay = _make_entry(kind, detail, level, meta)
+    _append_entries([(entry, hay)])
     return entry
 
 
 def clear_logs() -> None:
+    """Empty the in-memory ring. Spooled history on disk is kept."""
     with _lock:
-        _entries.clear()
+        _store.clear()
+
+
+# --- Durable spool (optional) ------------------------------------------------
+
+_spool: LogSpool | None = None
+
+
+def install_log_spool(spool: LogSpool | None = None) -> LogSpool | None:
+    """Attach the on-disk spool (when VILIFE_LOG_SPOOL is set or one is passed).
+
+    Resumes the id counter after the newest spooled entry so ids stay
+    monotonic across restarts — history and ring never share an id.
+    """
+    global _spool
+    if spool is None:
+        if _spool is not None or not spool_enabled():
+            return _spool
+        spool = LogSpool()
+    resume = spool.last_seq() + 1
+    with _lock:
+        if resume > _store.next:
+            pending = [_store.entry(seq) for seq in range(_store.first, _store.next)]
+            _store.rebase(resume)
+            for entry in pending:
+                entry["id"] = str(
+                    _store.append(
+                        entry,
+                        _haystack(entry["kind"], entry["detail"], entry["meta"]),
+                    )
+                )
+        for seq in range(_store.first, _store.next):
+            spool.append(_store.entry(seq))
+        _spool = spool
+    spool.start()
+    return spool
+
+
+def uninstall_log_spool() -> None:
+    global _spool
+    with _lock:
+        spool, _spool = _spool, None
+    if spool is not None:
+        spool.stop()
+
+
+def _entry_matcher(
+    level: str | None, kind: str | None, search: str | None
+) -> Callable[[dict[str, Any]], bool] | None:
+    """Dict predicate equivalent to the ring filters — for spooled entries."""
+    min_rank = _LEVEL_RANK.get(level.upper(), 0) if level else 0
+    needle = search.lower() if search else ""
+    if not (min_rank or kind or needle):
+        return None
+
+    def match(entry: dict[str, Any]) -> bool:
+        if min_rank and _LEVEL_RANK.get(entry.get("level", ""), 0) < min_rank:
+            return False
+        if kind and entry.get("kind") != kind:
+            return False
+        return not needle or needle in _haystack(
+            entry.get("kind", ""), entry.get("detail", ""), entry.get("meta") or {}
+        )
+
+    return match
+
+
+# --- Queries -----------------------------------------------------------------
+
+
+def _parse_after(after_id: str | None) -> int:
+    if not after_id:
+        return 0
+    try:
+        return int(after_id)
+    except ValueError:
+        return 0
+
+
+def _matching_ids(
+    *,
+    level: str | None,
+    kind: str | None,
+    search: str | None,
+    after_seq: int = 0,
+) -> tuple[Sequence[int], Callable[[int], bool] | None]:
+    """Candidate ids (ascending) plus a residual predicate, if one is needed.
+
+    Must be called with ``_lock`` held.
+    """
+    min_rank = _LEVEL_RANK.get(level.upper(), 0) if level else 0
+    ids, check_rank = _store.candidates(after_seq + 1, min_rank, kind)
+    needle = search.lower() if search else ""
+    if not check_rank and not needle:
+        return ids, None
+
+    rank, hay = _store.rank, _store.hay
+
+    def keep(seq: int) -> bool:
+        if check_rank and rank(seq) < min_rank:
+            return False
+        return not needle or needle in hay(seq)
+
+    return ids, keep
+
+
+def _ring_page(
+    *,
+    level: str | None,
+    kind: str | None,
+    search: str | None,
+    after_seq: int,
+    sort: SortOrder,
+    offset: int,
+    limit: int,
+) -> tuple[int, list[dict[str, Any]]]:
+    with _lock:
+        ids, keep = _matching_ids(
+            level=level, kind=kind, search=search, after_seq=after_seq
+        )
+        ordered = reversed(ids) if sort == "desc" else iter(ids)
+        if keep is None:
+            # Pure index/range hit: total is a length, the page a short walk.
+            total = len(ids)
+            page_ids = list(islice(ordered, offset, offset + limit))
+        else:
+            total = 0
+            page_ids = []
+            for seq in ordered:
+                if keep(seq):
+                    if offset <= total < offset + limit:
+                        page_ids.append(seq)
+                    total += 1
+        return total, [_store.entry(seq) for seq in page_ids]
+
+
+def _spool_page(
+    spool: LogSpool,
+    match: Callable[[dict[str, Any]], bool] | None,
+    *,
+    before_seq: int,
+    after_seq: int,
+    sort: SortOrder,
+    offset: int,
+    limit: int,
+) -> tuple[int, list[dict[str, Any]], bool]:
+    """Matches counted, the page and whether more follow.
+
+    Stops one match past the page instead of counting the whole spool, so a
+    page costs O(offset + limit) reads.
+    """
+    counted = 0
+    page: list[dict[str, Any]] = []
+    for entry in spool.iter_entries(
+        reverse=sort == "desc", before_seq=before_seq, after_seq=after_seq, match=match
+    ):
+        if counted >= offset + limit:
+            return counted, page, True
+        if counted >= offset:
+            page.append(entry)
+        counted += 1
+    return counted, page, False
 
 
 def query_logs(
@@ -59,58 +426,163 @@ def query_logs(
     search: str | None = None,
     sort: SortOrder = "desc",
     after_id: str | None = None,
+    history: bool = False,
 ) -> dict[str, Any]:
+    """One page of entries; ``history`` extends the ring with the disk spool.
+
+    ``has_more`` tells whether entries follow the page. With ``history``,
+    ``total`` is None while ``has_more`` is set: counting the rest of the
+    spool would read all of it.
+    """
     limit = max(1, min(limit, 500))
     offset = max(0, offset)
+    after_seq = _parse_after(after_id)
+    spool = _spool if history else None
 
-    with _lock:
-        rows = list(_entries)
+    def ring(off: int, lim: int) -> tuple[int, list[dict[str, Any]]]:
+        return _ring_page(
+            level=level,
+            kind=kind,
+            search=search,
+            after_seq=after_seq,
+            sort=sort,
+            offset=off,
+            limit=lim,
+        )
 
-    if after_id:
-        try:
-            after_ts = float(after_id)
-            rows = [row for row in rows if float(row["id"]) > after_ts]
-        except ValueError:
-            pass
-
-    def matches(entry: dict[str, Any]) -> bool:
-        if level:
-            min_rank = _LEVEL_RANK.get(level.upper(), 0)
-            if _LEVEL_RANK.get(str(entry.get("level", "INFO")), 0) < min_rank:
-                return False
-        if kind and entry.get("kind") != kind:
-            return False
-        if search:
-            needle = search.lower()
-            hay = f"{entry.get('kind', '')} {entry.get('detail', '')} {json.dumps(entry.get('meta', {}))}".lower()
-            if needle not in hay:
-                return False
-        return True
-
-    filtered = [row for row in rows if matches(row)]
-    filtered.sort(key=lambda row: row.get("timestamp", ""), reverse=(sort == "desc"))
-    total = len(filtered)
-    page = filtered[offset : offset + limit]
+    total: int | None
+    if spool is None:
+        total, page = ring(offset, limit)
+        has_more = offset + len(page) < total
+    else:
+        with _lock:
+            boundary = _store.first
+        match = _entry_matcher(level, kind, search)
+
+        def ring_part(off: int, lim: int) -> tuple[int, list[dict[str, Any]], bool]:
+            counted, part = ring(off, lim)
+            return counted, part, counted > off + lim
+
+        def disk(off: int, lim: int) -> tuple[int, list[dict[str, Any]], bool]:
+            return _spool_page(
+                spool,
+                match,
+                before_seq=boundary,
+                after_seq=after_seq,
+                sort=sort,
+                offset=off,
+                limit=lim,
+            )
+
+        # Newest entries live in the ring, older ones only on disk.
+        counted, page, has_more = 0, [], False
+        for source in (ring_part, disk) if sort == "desc" else (disk, ring_part):
+            part_count, part, has_more = source(
+                max(0, offset - counted), limit - len(page)
+            )
+            counted += part_count
+            page += part
+            if has_more:
+                break
+        total = None if has_more else counted
 
     return {
         "entries": page,
         "total": total,
         "limit": limit,
         "offset": offset,
+        "has_more": has_more,
         "max_entries": _max_entries,
         "sort": sort,
+        "history": spool is not None,
     }
 
 
+def _iter_ring(
+    *,
+    level: str | None,
+    kind: str | None,
+    search: str | None,
+    sort: SortOrder,
+    after_seq: int,
+    chunk: int = 500,
+) -> Iterator[dict[str, Any]]:
+    """Matching ring entries, fetched ``chunk`` at a time.
+
+    The lock is held per chunk, not for the whole walk, so a slow export
+    download never stalls logging.
+    """
+    hi: int | None = None
+    lo = after_seq
+    while True:
+        with _lock:
+            ids, keep = _matching_ids(
+                level=level, kind=kind, search=search, after_seq=lo
+            )
+            batch: list[dict[str, Any]] = []
+            if sort == "desc":
+                i = (bisect_left(ids, hi) if hi is not None else len(ids)) - 1
+                while i >= 0 and len(batch) < chunk:
+                    seq = ids[i]
+                    if keep is None or keep(seq):
+                        batch.append(_store.entry(seq))
+                    hi = seq
+                    i -= 1
+                done = i < 0
+            else:
+                i = 0
+                while i < len(ids) and len(batch) < chunk:
+                    seq = ids[i]
+                    if keep is None or keep(seq):
+                        batch.append(_store.entry(seq))
+                    lo = seq
+                    i += 1
+                done = i >= len(ids)
+        yield from batch
+        if done:
+            return
+
+
+def iter_logs(
+    *,
+    level: str | None = None,
+    kind: str | None = None,
+    search: str | None = None,
+    sort: SortOrder = "desc",
+) -> Iterator[dict[str, Any]]:
+    """Every matching entry, ring plus spooled history — the export read path."""
+    spool = _spool
+    if spool is None:
+        yield from _iter_ring(
+            level=level, kind=kind, search=search, sort=sort, after_seq=0
+        )
+        return
+    with _lock:
+        boundary = _store.first
+    ring = _iter_ring(
+        level=level, kind=kind, search=search, sort=sort, after_seq=boundary - 1
+    )
+    disk = spool.iter_entries(
+        reverse=sort == "desc",
+        before_seq=boundary,
+        match=_entry_matcher(level, kind, search),
+    )
+    for part in (ring, disk) if sort == "desc" else (disk, ring):
+        yield from part
+
+
 def log_stats() -> dict[str, Any]:
     with _lock:
-        rows = list(_entries)
+        total = len(_store)
+        oldest, newest = _store.oldest(), _store.newest()
+    spool = _spool
     return {
-        "total": len(rows),
+        "total": total,
         "max_entries": _max_entries,
-        "rotation": "ring_buffer",
-        "oldest": rows[-1]["timestamp"] if rows else None,
-        "newest": rows[0]["timestamp"] if rows else None,
+        "rotation": "ring_buffer+spool" if spool else "ring_buffer",
+        "oldest": oldest["timestamp"] if oldest else None,
+        "newest": newest["timestamp"] if newest else None,
+        "spool": spool.stats() if spool else {"enabled": False},
     }
 
 
@@ -121,47 +593,149 @@ def export_logs(
     kind: str | None = None,
     search: str | None = None,
     sort: SortOrder = "desc",
-) -> tuple[str, str, str]:
-    payload = query_logs(
-        limit=_max_entries, offset=0, level=level, kind=kind, search=search, sort=sort
-    )
-    entries = payload["entries"]
+) -> tuple[Iterator[str], str, str]:
+    """Streamed export: (chunk iterator, media type, filename).
+
+    Chunks are produced lazily from iter_logs, so memory stays bounded no
+    matter how much spooled history matches.
+    """
+    entries = iter_logs(level=level, kind=kind, search=search, sort=sort)
     stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
     if format == "csv":
-        buffer = io.StringIO()
-        writer = csv.DictWriter(
-            buffer, fieldnames=["id", "timestamp", "level", "kind", "detail", "meta"]
+        return _csv_chunks(entries), "text/csv", f"vilife-logs-{stamp}.csv"
+    return _json_chunks(entries), "application/json", f"vilife-logs-{stamp}.json"
+
+
+_CSV_FIELDS = ["id", "timestamp", "level", "kind", "detail", "meta"]
+
+
+def _csv_chunks(entries: Iterator[dict[str, Any]], batch: int = 500) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_CSV_FIELDS)
+    writer.writeheader()
+    for n, row in enumerate(entries, 1):
+        writer.writerow(
+            {
+                "id": row.get("id"),
+                "timestamp": row.get("timestamp"),
+                "level": row.get("level"),
+                "kind": row.get("kind"),
+                "detail": row.get("detail"),
+                "meta": json.dumps(row.get("meta") or {}),
+            }
         )
-        writer.writeheader()
-        for row in entries:
-            writer.writerow(
-                {
-                    "id": row.get("id"),
-                    "timestamp": row.get("timestamp"),
-                    "level": row.get("level"),
-                    "kind": row.get("kind"),
-                    "detail": row.get("detail"),
-                    "meta": json.dumps(row.get("meta") or {}),
-                }
-            )
-        return buffer.getvalue(), "text/csv", f"vilife-logs-{stamp}.csv"
-    body = json.dumps(
-        {"exported_at": datetime.now(UTC).isoformat(), "entries": entries}, indent=2
-    )
-    return body, "application/json", f"vilife-logs-{stamp}.json"
+        if n % batch == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _json_chunks(entries: Iterator[dict[str, Any]], batch: int = 500) -> Iterator[str]:
+    exported_at = json.dumps(datetime.now(UTC).isoformat())
+    parts = [f'{{"exported_at": {exported_at}, "entries": [']
+    for n, row in enumerate(entries):
+        parts.append(("," if n else "") + "\n  " + json.dumps(row))
+        if len(parts) >= batch:
+            yield "".join(parts)
+            parts = []
+    parts.append("\n]}\n")
+    yield "".join(parts)
+
+
+_Queued = tuple[float, str, str, str]  # created, levelname, logger, detail
 
 
 class ActivityLogHandler(logging.Handler):
+    """Root-logger bridge into the activity log, off the request path.
+
+    ``emit`` formats the message and puts a tuple on a SimpleQueue — no
+    lock, no dict, no clock call. Formatting happens there, as in
+    QueueHandler.prepare, because the arguments may be mutated once the
+    caller moves on. A daemon consumer drains the queue in batches, builds
+    the entries and inserts each batch under one lock hold.
+    """
+
+    batch_size = 512
+
+    def __init__(self, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        self._queue: SimpleQueue[_Queued | threading.Event | None] = SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._consume, name="vilife-activity-log", daemon=True
+        )
+        self._thread.start()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # SimpleQueue.put is already thread-safe — skip Handler's per-call lock.
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
     def emit(self, record: logging.LogRecord) -> None:
+        msg, args = record.msg, record.args
         try:
-            log_activity(
-                kind="server",
-                detail=record.getMessage(),
-                level=record.levelname,
-                meta={"logger": record.name},
-            )
-        except Exception:
-            self.handleError(record)
+            detail = str(msg) % args if args else str(msg)
+        except Exception:  # noqa: BLE001 - bad format args must not drop the line
+            detail = f"{msg} {args!r}"
+        self._queue.put((record.created, record.levelname, record.name, detail))
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything emitted so far is in the store."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+        super().close()
+
+    def _consume(self) -> None:
+        queue = self._queue
+        while True:
+            item = queue.get()
+            batch: list[tuple[dict[str, Any], str]] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(self._prepare(item))
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = queue.get_nowait()
+                except Empty:
+                    break
+            if batch:
+                try:
+                    _append_entries(batch)
+                except Exception:  # noqa: BLE001 - never kill the consumer
+                    # Not logger.exception(): that would feed this same queue.
+                    traceback.print_exc()
+            for ev in waiters:
+                ev.set()
+            if stop:
+                return
+
+    @staticmethod
+    def _prepare(item: _Queued) -> tuple[dict[str, Any], str]:
+        created, levelname, name, detail = item
+        return _make_entry(
+            "server",
+            detail,
+            levelname,
+            {"logger": name},
+            datetime.fromtimestamp(created, UTC),
+        )
 
 
 def install_log_handler() -> None:
@@ -172,3 +746,10 @@ def install_log_handler() -> None:
     handler = ActivityLogHandler()
     handler.setLevel(logging.INFO)
     root.addHandler(handler)
+
+
+def flush_log_handler() -> None:
+    """Wait for queued log records to land in the store (tests, shutdown)."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, ActivityLogHandler):
+            handler.flush()
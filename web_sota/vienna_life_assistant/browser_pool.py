@@ -0,0 +1,265 @@
+"""One long-lived headless Chromium for the scrapers' JS-rendered pages.
+
+``vienna_scraper._render_spa`` used to start a whole Playwright Chromium per
+render and then sleep a fixed 5 s. The pool keeps the browser running and
+makes each render cheap:
+
+* **Persistent browser** — launched on first use on a private asyncio loop
+  thread, so sync scrapers and async handlers share it. Each render gets a
+  fresh incognito context (no cookies leak between sites); at most
+  ``VILIFE_BROWSER_CONTEXTS`` (default 2) render at once, the rest wait.
+* **Selector waits** — ``render(url, wait_for=...)`` returns as soon as the
+  selector (any Playwright selector, e.g. ``text=/\\d{2}:\\d{2}/``) appears;
+  without one it waits for network idle. A selector that never shows up
+  still returns the body after the timeout, like the old fixed sleep did.
+* **Resource blocking** — images, fonts, media and known trackers are
+  aborted; the scrapers only read text.
+* **Recycling** — the browser is replaced after
+  ``VILIFE_BROWSER_RESTART_AFTER`` (default 100) renders or when it
+  crashes, so a leaking renderer cannot grow without bound. In-flight
+  renders finish on the old browser.
+
+``stats`` reports launches, renders, blocked requests and render-time
+percentiles.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Coroutine
+from typing import Any
+from urllib.parse import urlsplit
+
+from vienna_life_assistant.stats import percentile
+
+logger = logging.getLogger("vienna-life-assistant.browser")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+POOL_SIZE = int(os.environ.get("VILIFE_BROWSER_CONTEXTS", "2"))
+RESTART_AFTER = int(os.environ.get("VILIFE_BROWSER_RESTART_AFTER", "100"))
+
+BLOCKED_TYPES = frozenset({"image", "font", "media"})
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "matomo.cloud",
+    "clarity.ms",
+    "cookiebot.com",
+    "usercentrics.eu",
+)
+
+
+def blocked(url: str, resource_type: str) -> bool:
+    """Whether a page request is skipped — the scrapers only need text."""
+    if resource_type in BLOCKED_TYPES:
+        return True
+    host = urlsplit(url).hostname or ""
+    return any(host == t or host.endswith("." + t) for t in TRACKER_HOSTS)
+
+
+class BrowserPool:
+    """A shared Chromium, a bounded number of concurrent contexts."""
+
+    def __init__(
+        self, size: int = POOL_SIZE, restart_after: int = RESTART_AFTER
+    ) -> None:
+        self.size = max(1, size)
+        self.restart_after = max(1, restart_after)
+        self._start_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        # Loop-thread state
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._uses = 0
+        self._inflight: dict[Any, int] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._launch_lock: asyncio.Lock | None = None
+        # Stats
+        self.launches = 0
+        self.renders = 0
+        self.failures = 0
+        self.blocked_requests = 0
+        self._render_ms: deque[float] = deque(maxlen=200)
+
+    # --- Public API ---
+
+    def render(
+        self, url: str, wait_for: str | None = None, timeout_ms: int = 25000
+    ) -> str | None:
+        """Body text of ``url`` after it rendered, or None on failure.
+
+        Blocks the calling thread; async callers use ``arender``.
+        """
+        future = self._submit(self._render(url, wait_for, timeout_ms))
+        try:
+            return future.result(timeout=2 * timeout_ms / 1000 + 30)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("spa render timed out for %s", url)
+            return None
+
+    async def arender(
+        self, url: str, wait_for: str | None = None, timeout_ms: int = 25000
+    ) -> str | None:
+        """``render`` for asyncio callers (does not block their loop)."""
+        future = self._submit(self._render(url, wait_for, timeout_ms))
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, Any]:
+        samples = list(self._render_ms)
+        return {
+            "running": self._browser is not None,
+            "contexts": self.size,
+            "restart_after": self.restart_after,
+            "launches": self.launches,
+            "renders": self.renders,
+            "failures": self.failures,
+            "blocked_requests": self.blocked_requests,
+            "uses_since_launch": self._uses,
+            "render_ms_p50": percentile(samples, 0.5),
+            "render_ms_p95": percentile(samples, 0.95),
+        }
+
+    def close(self) -> None:
+        """Close the browser and stop the loop thread (restartable)."""
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(30)
+            except Exception as e:  # noqa: BLE001 - best effort at exit
+                logger.debug("browser shutdown failed: %s", e)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+            loop.close()
+            self._loop = self._thread = None
+
+    # --- Loop thread ---
+
+    def _submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="browser-pool", daemon=True
+                )
+                self._thread.start()
+            return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _render(
+        self, url: str, wait_for: str | None, timeout_ms: int
+    ) -> str | None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            started = time.perf_counter()
+            try:
+                browser = await self._acquire()
+            except Exception as e:  # noqa: BLE001 - no browser, no render
+                self.failures += 1
+                logger.warning("browser unavailable for %s: %s", url, e)
+                return None
+            try:
+                body = await self._render_page(browser, url, wait_for, timeout_ms)
+            except Exception as e:  # noqa: BLE001 - scrapers treat None as "no data"
+                self.failures += 1
+                logger.warning("spa render failed for %s: %s", url, e)
+                return None
+            finally:
+                await self._release(browser)
+            self.renders += 1
+            self._render_ms.append((time.perf_counter() - started) * 1000)
+            return body
+
+    async def _render_page(
+        self, browser: Any, url: str, wait_for: str | None, timeout_ms: int
+    ) -> str:
+        context = await browser.new_context(
+            user_agent=USER_AGENT, service_workers="block"
+        )
+        try:
+            await context.route("**/*", self._filter)
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            try:
+                if wait_for:
+                    await page.wait_for_selector(wait_for, timeout=timeout_ms)
+                else:
+                    await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            except Exception as e:  # noqa: BLE001 - return what rendered so far
+                logger.info("wait on %s ended early: %s", url, e)
+            return await page.inner_text("body")
+        finally:
+            await context.close()
+
+    async def _filter(self, route: Any) -> None:
+        request = route.request
+        if blocked(request.url, request.resource_type):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire(self) -> Any:
+        """The current browser, (re)launched when missing, crashed or worn out."""
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            browser = self._browser
+            if browser is not None and (
+                self._uses >= self.restart_after or not browser.is_connected()
+            ):
+                logger.info("recycling browser after %d renders", self._uses)
+                self._browser = None
+                if not self._inflight.get(browser):
+                    await self._close_browser(browser)
+            if self._browser is None:
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._uses = 0
+                self.launches += 1
+            self._uses += 1
+            self._inflight[self._browser] = self._inflight.get(self._browser, 0) + 1
+            return self._browser
+
+    async def _release(self, browser: Any) -> None:
+        self._inflight[browser] -= 1
+        if browser is not self._browser and not self._inflight[browser]:
+            await self._close_browser(browser)
+
+    async def _close_browser(self, browser: Any) -> None:
+        self._inflight.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:  # noqa: BLE001 - already gone
+            logger.debug("browser close failed: %s", e)
+
+    async def _shutdown(self) -> None:
+        for browser in {*self._inflight, self._browser} - {None}:
+            await self._close_browser(browser)
+        self._browser = None
+        self._uses = 0
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._slots = self._launch_lock = None
+
+
+pool = BrowserPool()
+atexit.register(pool.close)
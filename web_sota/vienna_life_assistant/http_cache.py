@@ -0,0 +1,202 @@
+"""Conditional-GET + compression middleware for polled JSON read endpoints.
+
+The Dashboard polls a handful of aggregate endpoints that almost never
+change between polls. This layer makes an unchanged poll nearly free:
+
+* Versioned paths (``versions``) get their ETag from a cheap data-version
+  callable *before* the handler runs — a matching ``If-None-Match`` is
+  answered 304 without running the handler. The callable runs in a worker
+  thread, so its one DB read never blocks the event loop.
+* Every other buffered JSON GET falls back to hashing the body, which still
+  saves the transfer (and the client-side re-render) on a match.
+* Responses over ``min_compress`` bytes are brotli- (when installed) or
+  gzip-encoded according to ``Accept-Encoding``.
+
+Streaming responses (SSE, NDJSON, exports) carry no Content-Length and are
+passed through untouched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+try:  # pragma: no cover - exercised once brotli is installed
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore[assignment]
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+
+
+def _header(scope: Scope, name: bytes) -> str:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison per RFC 9110 §13.1.2 (``*`` matches anything)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def body_etag(body: bytes) -> str:
+    return 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def pick_encoding(accept_encoding: str) -> str | None:
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if part.strip() and not part.strip().endswith("q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)  # type: ignore[union-attr]
+    return gzip.compress(body, compresslevel=6)
+
+
+class ConditionalGetMiddleware:
+    """Pure ASGI middleware — ETag/304 plus response compression for GETs."""
+
+    def __init__(
+        self,
+        app: Any,
+        *,
+        versions: dict[str, Callable[[], str]] | None = None,
+        prefixes: tuple[str, ...] = ("/api/",),
+        min_compress: int = 1024,
+    ) -> None:
+        self.app = app
+        self.versions = versions or {}
+        self.prefixes = prefixes
+        self.min_compress = min_compress
+
+    async def __call__(self, scope: Scope, receive: Any, send: Any) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = _header(scope, b"if-none-match")
+        encoding = pick_encoding(_header(scope, b"accept-encoding"))
+
+        version_fn = self.versions.get(scope["path"])
+        etag = None
+        if version_fn is not None:
+            try:
+                etag = f'W/"v{await asyncio.to_thread(version_fn)}"'
+            except Exception:  # noqa: BLE001 - fall back to body hashing
+                etag = None
+            if etag and etag_matches(if_none_match, etag):
+                await _send_not_modified(send, etag)
+                return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                buffered = (
+                    message["status"] == 200
+                    and b"content-length" in headers
+                    and b"content-encoding" not in headers
+                    and headers.get(b"content-type", b"").startswith(
+                        b"application/json"
+                    )
+                )
+                if not buffered:
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+            if message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                assert start is not None
+                await self._finish(
+                    send, start, b"".join(chunks), etag, if_none_match, encoding
+                )
+                return
+            await send(message)
+
+        await self.app(scope, receive, wrapped_send)
+
+    async def _finish(
+        self,
+        send: Any,
+        start: Message,
+        body: bytes,
+        etag: str | None,
+        if_none_match: str,
+        encoding: str | None,
+    ) -> None:
+        etag = etag or body_etag(body)
+        if etag_matches(if_none_match, etag):
+            await _send_not_modified(send, etag)
+            return
+        headers = [
+            (k, v)
+            for k, v in start.get("headers", [])
+            if k.lower() not in (b"content-length", b"etag")
+        ]
+        if encoding and len(body) >= self.min_compress:
+            body = compress(body, encoding)
+            headers.append((b"content-encoding", encoding.encode()))
+        headers += _cache_headers(
+            etag,
+            cache_control=not any(k.lower() == b"cache-control" for k, _ in headers),
+        )
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def _cache_headers(etag: str, cache_control: bool = True) -> list[tuple[bytes, bytes]]:
+    # no-cache = store but revalidate every time: the browser replays the
+    # ETag on each poll and transparently serves its copy on a 304.
+    headers = [(b"etag", etag.encode("latin-1")), (b"vary", b"Accept-Encoding")]
+    if cache_control:
+        headers.append((b"cache-control", b"no-cache"))
+    return headers
+
+
+async def _send_not_modified(send: Any, etag: str) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 304,
+            "headers": _cache_headers(etag),
+        }
+    )
+    await send({"type": "http.response.body", "body": b""})
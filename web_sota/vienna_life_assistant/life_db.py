@@ -6,16 +6,20 @@ and REST routers both call into these functions — one behavior, two surfaces.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import date, timedelta
+import os
+import threading
+from datetime import date, datetime, timedelta
 from typing import Any, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import delete, event, func, insert, select
 from sqlalchemy.orm import Session
 
 from vienna_life_assistant.db import Base, SessionLocal
 from vienna_life_assistant.models import (
     CalendarEvent,
+    ChangeLogEntry,
     Contact,
     DoctorVisit,
     Expense,
@@ -31,6 +35,7 @@ from vienna_life_assistant.models import (
     Trip,
     Vitals,
     BaseMixin,
+    column_keys,
 )
 
 ModelT = TypeVar("ModelT", bound=BaseMixin)
@@ -55,6 +60,28 @@ def list_rows(
     return list(db.execute(stmt.limit(limit)).scalars().all())
 
 
+def list_dicts(
+    db: Session,
+    model: type[ModelT],
+    order_by=None,
+    limit: int = 200,
+    where=None,
+) -> list[dict[str, Any]]:
+    """Read-only twin of list_rows that selects plain column tuples.
+
+    Skips ORM entity construction and the identity map entirely — rows come
+    back as Core tuples and are zipped straight into JSON-ready dicts. Use it
+    for list endpoints and aggregations that never mutate what they read.
+    """
+    keys = column_keys(model)
+    stmt = select(*(getattr(model, k) for k in keys))
+    if where is not None:
+        stmt = stmt.where(where)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return [dict(zip(keys, row)) for row in db.execute(stmt.limit(limit))]
+
+
 def get_row(db: Session, model: type[ModelT], row_id: int) -> ModelT | None:
     return db.get(model, row_id)
 
@@ -100,26 +127,219 @@ def with_session(fn):
     return wrapper
 
 
+# --- Change feed -------------------------------------------------------------
+#
+# Every flush that touches a life table appends (table, row id, op) rows to
+# change_log inside the same transaction, so the feed can never disagree with
+# the data. Hooking the session (not add_row/update_row) also catches the MCP
+# toggles and onboarding writes that mutate ORM objects directly.
+
+_FEED_EXCLUDED = frozenset({"change_log", "journal_embeddings", "llm_calls"})
+_CHANGELOG_MAX = max(1000, int(os.environ.get("VILIFE_CHANGELOG_MAX_ENTRIES", "20000")))
+_PRUNE_EVERY = 500
+
+
+def _feed_model(obj: Any) -> bool:
+    return (
+        isinstance(obj, BaseMixin)
+        and getattr(obj, "__tablename__", "change_log") not in _FEED_EXCLUDED
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_changes(session: Session, flush_context) -> None:
+    stamp = datetime.now().isoformat(timespec="seconds")
+    upserts = [o for o in session.new if _feed_model(o)]
+    upserts += [
+        o
+        for o in session.dirty
+        if _feed_model(o) and session.is_modified(o, include_collections=False)
+    ]
+    rows = [
+        {"table_name": o.__tablename__, "row_id": o.id, "op": "upsert", "at": stamp}
+        for o in upserts
+    ]
+    rows += [
+        {"table_name": o.__tablename__, "row_id": o.id, "op": "delete", "at": stamp}
+        for o in session.deleted
+        if _feed_model(o)
+    ]
+    if not rows:
+        return
+    conn = session.connection()
+    conn.execute(insert(ChangeLogEntry), rows)
+    session.info["vilife_changed"] = True
+    version = conn.scalar(select(func.max(ChangeLogEntry.id))) or 0
+    if version // _PRUNE_EVERY != (version - len(rows)) // _PRUNE_EVERY:
+        conn.execute(
+            delete(ChangeLogEntry).where(ChangeLogEntry.id <= version - _CHANGELOG_MAX)
+        )
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _notify_changes(session: Session) -> None:
+    if session.info.pop("vilife_changed", False):
+        change_notifier.notify()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("vilife_changed", None)
+
+
+class ChangeNotifier:
+    """Wakes change-feed streams after a commit — thread-safe, loop-aware.
+
+    Commits happen on FastAPI's worker threads; SSE consumers wait on their
+    own event loop. ``seq`` lets a waiter detect a commit that landed between
+    its last read and the call to wait().
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self.seq = 0
+
+    def notify(self) -> None:
+        with self._lock:
+            self.seq += 1
+            waiters = list(self._waiters)
+        for loop, ev in waiters:
+            try:
+                loop.call_soon_threadsafe(ev.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    async def wait(self, seen_seq: int, timeout: float) -> int:
+        """Block until seq moves past seen_seq or timeout; return current seq."""
+        ev = asyncio.Event()
+        key = (asyncio.get_running_loop(), ev)
+        with self._lock:
+            if self.seq != seen_seq:
+                return self.seq
+            self._waiters.add(key)
+        try:
+            await asyncio.wait_for(ev.wait(), timeout)
+        except TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(key)
+        return self.seq
+
+
+change_notifier = ChangeNotifier()
+
+
+def current_version(db: Session) -> int:
+    return db.scalar(select(func.max(ChangeLogEntry.id))) or 0
+
+
+def data_version() -> str:
+    """Change-feed head + calendar day — the ETag seed for life aggregates.
+
+    Aggregates like the overview also depend on today's date (upcoming,
+    overdue), so a new day invalidates them even without writes.
+    """
+    with SessionLocal() as db:
+        return f"{current_version(db)}-{date.today().isoformat()}"
+
+
+def _models_by_table() -> dict[str, type]:
+    return {
+        m.class_.__tablename__: m.class_
+        for m in Base.registry.mappers
+        if m.class_.__tablename__ not in _FEED_EXCLUDED
+    }
+
+
+def changes_since(
+    db: Session,
+    since: int = 0,
+    limit: int = 1000,
+    tables: set[str] | None = None,
+) -> dict[str, Any]:
+    """Compacted deltas after version ``since``.
+
+    Reads up to ``limit`` log entries, keeps only the last op per (table, id),
+    and attaches the current row for upserts — a row deleted after its last
+    upsert in the window is reported as a delete. ``reset`` tells the client
+    its cursor predates retained history and it must refetch full lists.
+    """
+    oldest = db.scalar(select(func.min(ChangeLogEntry.id)))
+    stmt = (
+        select(
+            ChangeLogEntry.id,
+            ChangeLogEntry.table_name,
+            ChangeLogEntry.row_id,
+            ChangeLogEntry.op,
+        )
+        .where(ChangeLogEntry.id > since)
+        .order_by(ChangeLogEntry.id)
+        .limit(limit + 1)
+    )
+    entries = db.execute(stmt).all()
+    more = len(entries) > limit
+    entries = entries[:limit]
+    version = entries[-1][0] if entries else max(since, current_version(db))
+
+    latest: dict[tuple[str, int], tuple[int, str]] = {}
+    for ver, table, row_id, op in entries:
+        if tables is None or table in tables:
+            latest[(table, row_id)] = (ver, op)
+
+    models = _models_by_table()
+    wanted: dict[str, list[int]] = {}
+    for (table, row_id), (_, op) in latest.items():
+        if op == "upsert" and table in models:
+            wanted.setdefault(table, []).append(row_id)
+    current: dict[tuple[str, int], dict[str, Any]] = {}
+    for table, ids in wanted.items():
+        model = models[table]
+        for row in list_dicts(db, model, where=model.id.in_(ids), limit=len(ids)):
+            current[(table, row["id"])] = row
+
+    changes = []
+    for (table, row_id), (ver, op) in sorted(latest.items(), key=lambda kv: kv[1][0]):
+        item = current.get((table, row_id))
+        if op == "upsert" and item is None:
+            op = "delete"
+        change: dict[str, Any] = {
+            "table": table,
+            "id": row_id,
+            "op": op,
+            "version": ver,
+        }
+        if op == "upsert":
+            change["item"] = item
+        changes.append(change)
+
+    return {
+        "since": since,
+        "version": version,
+        "reset": bool(since and oldest is not None and since < oldest - 1),
+        "more": more,
+        "changes": changes,
+    }
+
+
 # --- Domain conveniences ----------------------------------------------------
 
 
 def upcoming_events(db: Session, days: int = 30) -> list[dict]:
     today = date.today().isoformat()
     horizon = (date.today() + timedelta(days=days)).isoformat()
-    rows = list_rows(
+    rows = list_dicts(
         db,
         CalendarEvent,
         order_by=CalendarEvent.date,
         where=CalendarEvent.date >= today,
     )
-    return [r.to_dict() for r in rows if r.date <= horizon and not r.done]
+    return [r for r in rows if r["date"] <= horizon and not r["done"]]
 
 
 def active_medications(db: Session) -> list[dict]:
-    return [
-        r.to_dict()
-        for r in list_rows(db, Medication, where=Medication.active.is_(True))
-    ]
+    return list_dicts(db, Medication, where=Medication.active.is_(True))
 
 
 def upcoming_birthdays(db: Session, days: int = 30) -> list[dict]:
@@ -153,26 +373,23 @@ def upcoming_birthdays(db: Session, days: int = 30) -> list[dict]:
 
 def next_trips(db: Session, limit: int = 5) -> list[dict]:
     today = date.today().isoformat()
-    return [
-        r.to_dict()
-        for r in list_rows(
-            db, Trip, order_by=Trip.start_date, where=Trip.start_date >= today
-        )[:limit]
-    ]
+    return list_dicts(
+        db, Trip, order_by=Trip.start_date, where=Trip.start_date >= today
+    )[:limit]
 
 
 def expiring_documents(db: Session, days: int = 120) -> list[dict]:
     today = date.today().isoformat()
     horizon = (date.today() + timedelta(days=days)).isoformat()
     return [
-        r.to_dict()
-        for r in list_rows(
+        r
+        for r in list_dicts(
             db,
             TravelDocument,
             order_by=TravelDocument.expiry_date,
             where=TravelDocument.expiry_date >= today,
         )
-        if r.expiry_date <= horizon
+        if r["expiry_date"] <= horizon
     ]
 
 
@@ -180,23 +397,23 @@ def renewals_soon(db: Session, days: int = 30) -> list[dict]:
     today = date.today().isoformat()
     horizon = (date.today() + timedelta(days=days)).isoformat()
     return [
-        r.to_dict()
-        for r in list_rows(
+        r
+        for r in list_dicts(
             db,
             Subscription,
             order_by=Subscription.renewal_date,
             where=Subscription.renewal_date >= today,
         )
-        if r.renewal_date <= horizon
+        if r["renewal_date"] <= horizon
     ]
 
 
 def overdue_home_tasks(db: Session) -> list[dict]:
     today = date.today().isoformat()
     return [
-        r.to_dict()
-        for r in list_rows(db, HomeTask, order_by=HomeTask.due_date)
-        if r.due_date <= today and not r.done
+        r
+        for r in list_dicts(db, HomeTask, order_by=HomeTask.due_date)
+        if r["due_date"] <= today and not r["done"]
     ]
 
 
@@ -7,13 +7,17 @@ include the same convenience aggregations the MCP tools expose.
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from vienna_life_assistant.db import get_db
+from vienna_life_assistant.db import SessionLocal, get_db
 from vienna_life_assistant import life_db
+from vienna_life_assistant.fast_json import FastJSONResponse, dumps_str
 from vienna_life_assistant.models import (
     CalendarEvent,
     Contact,
@@ -43,13 +47,15 @@ def crud_router(
 
     router = APIRouter(prefix=prefix, tags=[tag])
 
-    @router.get("")
+    @router.get("", response_class=FastJSONResponse)
     def list_rows(
         limit: int = Query(200, ge=1, le=1000),
         db: Session = Depends(get_db),
-    ) -> dict[str, Any]:
-        rows = life_db.list_rows(db, model, order_by=order_by, limit=limit)
-        return {"ok": True, "count": len(rows), "items": [r.to_dict() for r in rows]}
+    ) -> FastJSONResponse:
+        # Core read path: column tuples → dicts → orjson, no ORM objects and
+        # no response-model re-validation of every row.
+        items = life_db.list_dicts(db, model, order_by=order_by, limit=limit)
+        return FastJSONResponse({"ok": True, "count": len(items), "items": items})
 
     @router.get("/{row_id}")
     def get_row(row_id: int, db: Session = Depends(get_db)) -> dict[str, Any]:
@@ -111,6 +117,77 @@ def life_overview(
     }
 
 
+# --- Change feed (delta sync for web_sota + the Tauri shell) -----------------
+
+_SSE_KEEPALIVE_S = 15.0
+
+
+def _table_filter(tables: str) -> set[str] | None:
+    names = {t.strip() for t in tables.split(",") if t.strip()}
+    return names or None
+
+
+@router.get("/changes", response_class=FastJSONResponse)
+def life_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    tables: str = Query("", description="Comma-separated table names"),
+    db: Session = Depends(get_db),
+) -> FastJSONResponse:
+    """Compacted deltas after version ``since`` — poll with the returned version."""
+    payload = life_db.changes_since(db, since, limit, _table_filter(tables))
+    return FastJSONResponse({"ok": True, **payload})
+
+
+async def change_events(
+    since: int | None,
+    tables: set[str] | None,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keepalive_s: float = _SSE_KEEPALIVE_S,
+) -> AsyncIterator[str]:
+    """SSE frames for the change feed; ``since=None`` starts at the head."""
+
+    def read(cursor: int) -> dict[str, Any]:
+        with SessionLocal() as db:
+            return life_db.changes_since(db, cursor, 1000, tables)
+
+    def head() -> int:
+        with SessionLocal() as db:
+            return life_db.current_version(db)
+
+    cursor = since if since is not None else await asyncio.to_thread(head)
+    yield f"retry: 3000\nid: {cursor}\nevent: hello\ndata: {dumps_str({'version': cursor})}\n\n"
+    while not await is_disconnected():
+        seq = life_db.change_notifier.seq
+        payload = await asyncio.to_thread(read, cursor)
+        cursor = payload["version"]
+        if payload["changes"] or payload["reset"]:
+            yield f"id: {cursor}\nevent: changes\ndata: {dumps_str(payload)}\n\n"
+            if payload["more"]:
+                continue
+        # Writes from other processes (the stdio MCP server) never notify —
+        # the keepalive timeout doubles as their polling interval.
+        if await life_db.change_notifier.wait(seq, keepalive_s) == seq:
+            yield ": keepalive\n\n"
+
+
+@router.get("/changes/stream")
+async def life_changes_stream(
+    request: Request,
+    since: int | None = Query(None, ge=0),
+    tables: str = Query("", description="Comma-separated table names"),
+) -> StreamingResponse:
+    """Server-sent events push of the change feed (resumes from Last-Event-ID)."""
+    last_id = request.headers.get("last-event-id", "")
+    if last_id.isdigit():
+        since = int(last_id)
+    return StreamingResponse(
+        change_events(since, _table_filter(tables), request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 life_routes = crud_router(
     "/api/life/calendar", CalendarEvent, "life-calendar", CalendarEvent.date
 )
@@ -161,13 +238,13 @@ def calendar_today_route(db: Session = Depends(get_db)) -> dict[str, Any]:
     """Today's calendar events — DB-backed (replaces static mock)."""
     from datetime import date
 
-    rows = life_db.list_rows(
+    rows = life_db.list_dicts(
         db,
         CalendarEvent,
         order_by=CalendarEvent.time,
         where=CalendarEvent.date == date.today().isoformat(),
     )
-    return {"ok": True, "count": len(rows), "events": [r.to_dict() for r in rows]}
+    return {"ok": True, "count": len(rows), "events": rows}
 
 
 # --- Journal aggregations (defined before the CRUD router so /today,
@@ -178,13 +255,13 @@ def calendar_today_route(db: Session = Depends(get_db)) -> dict[str, Any]:
 def journal_today(db: Session = Depends(get_db)) -> dict[str, Any]:
     from datetime import date
 
-    rows = life_db.list_rows(
+    rows = life_db.list_dicts(
         db,
         JournalEntry,
         order_by=JournalEntry.time,
         where=JournalEntry.date == date.today().isoformat(),
     )
-    return {"ok": True, "count": len(rows), "entries": [r.to_dict() for r in rows]}
+    return {"ok": True, "count": len(rows), "entries": rows}
 
 
 @router.get("/logs/streak")
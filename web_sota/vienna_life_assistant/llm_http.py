@@ -0,0 +1,273 @@
+"""Pooled async HTTP transport for LLM calls (Ollama, LM Studio, OpenAI).
+
+One ``httpx.AsyncClient`` per provider origin keeps TCP (and TLS) connections
+alive across agent iterations instead of reconnecting for every completion.
+Everything is plain ``async`` — cancelling the calling task closes the
+upstream request, so an abandoned chat stops burning GPU time.
+
+Timeouts are split the way local models behave:
+
+* ``VILIFE_LLM_CONNECT_TIMEOUT`` (5s) — the server is not there at all.
+* ``VILIFE_LLM_TTFT_TIMEOUT`` (120s) — first byte of the answer; covers a
+  cold model load, which can take a minute on a big GGUF.
+* ``VILIFE_LLM_IDLE_TIMEOUT`` (60s) — max gap between streamed chunks once
+  tokens flow.
+* ``VILIFE_LLM_TOTAL_TIMEOUT`` (300s) — hard cap for the whole call.
+
+Each completion first takes a slot from the LLM scheduler
+(llm_scheduler.py; queue time is not counted against the timeouts above)
+and is then timed into the performance ledger (llm_ledger.py). The ledger
+task defaults to ``llm_ledger.current_task``, else "agent" for calls that
+offer tools and "chat" otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from vienna_life_assistant import llm_ledger
+from vienna_life_assistant.llm_scheduler import scheduler
+
+CONNECT_TIMEOUT = float(os.environ.get("VILIFE_LLM_CONNECT_TIMEOUT", "5"))
+TTFT_TIMEOUT = float(os.environ.get("VILIFE_LLM_TTFT_TIMEOUT", "120"))
+IDLE_TIMEOUT = float(os.environ.get("VILIFE_LLM_IDLE_TIMEOUT", "60"))
+TOTAL_TIMEOUT = float(os.environ.get("VILIFE_LLM_TOTAL_TIMEOUT", "300"))
+
+_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+
+# origin -> (loop, client). Connections belong to the loop that opened them,
+# so a client is rebuilt when it is used from a different event loop.
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def client_for(url: str) -> httpx.AsyncClient:
+    """Shared keep-alive client for the provider serving ``url``."""
+    loop = asyncio.get_running_loop()
+    origin = _origin(url)
+    entry = _clients.get(origin)
+    if entry is None or entry[0] is not loop or entry[1].is_closed:
+        client = httpx.AsyncClient(
+            limits=_LIMITS,
+            timeout=httpx.Timeout(
+                connect=CONNECT_TIMEOUT, read=IDLE_TIMEOUT, write=30, pool=30
+            ),
+        )
+        _clients[origin] = (loop, client)
+        return client
+    return entry[1]
+
+
+async def aclose_clients() -> None:
+    """Close every pooled client owned by the running loop (lifespan exit)."""
+    loop = asyncio.get_running_loop()
+    for origin, (owner, client) in list(_clients.items()):
+        if owner is loop:
+            await client.aclose()
+        _clients.pop(origin, None)
+
+
+async def post_json(
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None = None,
+    *,
+    total_timeout: float | None = None,
+) -> dict[str, Any]:
+    """POST JSON, return the decoded JSON body; raises on HTTP errors.
+
+    A non-streamed completion sends nothing until it is done, so only the
+    connect and total budgets apply.
+    """
+    async with asyncio.timeout(total_timeout or TOTAL_TIMEOUT):
+        resp = await client_for(url).post(
+            url,
+            json=payload,
+            headers=headers,
+            timeout=httpx.Timeout(CONNECT_TIMEOUT, read=None),
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+
+async def stream_lines(
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None = None,
+    *,
+    ttft_timeout: float | None = None,
+    idle_timeout: float | None = None,
+    total_timeout: float | None = None,
+) -> AsyncIterator[str]:
+    """POST JSON and yield the response body line by line as it arrives.
+
+    The first line (headers included) gets the TTFT budget, every later
+    line the idle budget, all bounded by the total deadline. Deadlines are
+    checked per read rather than with a timeout scope around the ``yield``s,
+    which would fire into whatever the consumer is doing at the time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (total_timeout or TOTAL_TIMEOUT)
+    ttft = ttft_timeout or TTFT_TIMEOUT
+    idle = idle_timeout or IDLE_TIMEOUT
+
+    def budget(limit: float) -> float:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise TimeoutError("LLM stream exceeded its total timeout")
+        return min(limit, remaining)
+
+    first_deadline = loop.time() + ttft
+    client = client_for(url)
+    request = client.build_request(
+        "POST",
+        url,
+        json=payload,
+        headers=headers,
+        timeout=httpx.Timeout(CONNECT_TIMEOUT, read=None),
+    )
+    resp = await asyncio.wait_for(client.send(request, stream=True), budget(ttft))
+    try:
+        resp.raise_for_status()
+        lines = resp.aiter_lines()
+        limit = max(0.0, first_deadline - loop.time())
+        while True:
+            try:
+                line = await asyncio.wait_for(anext(lines), budget(limit))
+            except StopAsyncIteration:
+                return
+            limit = idle
+            yield line
+    finally:
+        await resp.aclose()
+
+
+# --- OpenAI-compatible /chat/completions --------------------------------------
+
+
+def _slot(url: str, payload: dict[str, Any]):
+    return scheduler.slot(payload.get("model") or _origin(url))
+
+
+def _meter(url: str, payload: dict[str, Any]) -> llm_ledger.CallMeter:
+    tools = payload.get("tools") and not llm_ledger.current_task.get()
+    return llm_ledger.CallMeter(
+        payload.get("model"), _origin(url), "agent" if tools else None
+    )
+
+
+async def chat_completion(
+    url_base: str, payload: dict[str, Any], headers: dict[str, str], **timeouts: Any
+) -> dict[str, Any]:
+    """Non-streamed completion; returns ``choices[0].message``."""
+    async with _slot(url_base, payload):
+        meter = _meter(url_base, payload)
+        try:
+            data = await post_json(
+                f"{url_base.rstrip('/')}/chat/completions",
+                {**payload, "stream": False},
+                headers,
+                **timeouts,
+            )
+        except Exception as e:
+            meter.fail(e)
+            raise
+    usage = data.get("usage") or {}
+    meter.done(
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+    )
+    return (data.get("choices") or [{}])[0].get("message") or {}
+
+
+async def stream_chat_completion(
+    url_base: str, payload: dict[str, Any], headers: dict[str, str], **timeouts: Any
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the ``chat.completion.chunk`` objects of a streamed completion.
+
+    The scheduler slot is held until the stream ends or is closed.
+    """
+    async with _slot(url_base, payload):
+        meter = _meter(url_base, payload)
+        usage: dict[str, Any] = {}
+        try:
+            async for line in stream_lines(
+                f"{url_base.rstrip('/')}/chat/completions",
+                {**payload, "stream": True},
+                headers,
+                **timeouts,
+            ):
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                usage = chunk.get("usage") or usage
+                delta = (chunk.get("choices") or [{}])[0].get("delta") or {}
+                if delta.get("content") or delta.get("tool_calls"):
+                    meter.token()
+                yield chunk
+        except Exception as e:
+            meter.fail(e)
+            raise
+    meter.done(
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+    )
+
+
+# --- Ollama native /api/chat --------------------------------------------------
+
+
+async def ollama_chat(
+    base: str, payload: dict[str, Any], **timeouts: Any
+) -> dict[str, Any]:
+    """Non-streamed Ollama /api/chat; returns the full response object."""
+    async with _slot(base, payload):
+        meter = _meter(base, payload)
+        try:
+            data = await post_json(
+                f"{base.rstrip('/')}/api/chat",
+                {**payload, "stream": False},
+                {"Content-Type": "application/json"},
+                **timeouts,
+            )
+        except Exception as e:
+            meter.fail(e)
+            raise
+    meter.done(**ollama_timings(data))
+    return data
+
+
+def ollama_timings(data: dict[str, Any]) -> dict[str, Any]:
+    """Ledger fields from Ollama's native timing counters (nanoseconds).
+
+    Server-side time to first token is model load + prompt evaluation.
+    """
+    ns = 1e6
+    load = data.get("load_duration")
+    prefill = data.get("prompt_eval_duration")
+    eval_ns = data.get("eval_duration")
+    eval_count = data.get("eval_count")
+    return {
+        "prompt_tokens": data.get("prompt_eval_count"),
+        "completion_tokens": eval_count,
+        "load_ms": load / ns if load is not None else None,
+        "ttft_ms": ((load or 0) + prefill) / ns if prefill is not None else None,
+        "tok_s": eval_count / (eval_ns / 1e9) if eval_count and eval_ns else None,
+    }
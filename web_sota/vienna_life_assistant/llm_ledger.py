@@ -0,0 +1,299 @@
+"""Persistent LLM performance ledger and per-task model selection.
+
+Every call that goes through llm_http is recorded in the ``llm_calls`` table:
+time to first token, tokens per second, model load time (when the server
+reports it), token counts and outcome. ``summaries`` aggregates the recent
+window per model; ``pick_model`` uses the same numbers to choose, for a task
+type, the fastest installed model whose quality tier is good enough.
+
+Quality tiers are 1 (small, <= 4B parameters), 2 (<= 20B) and 3 (larger or
+hosted). The tier is read from the parameter count in the tag unless
+``VILIFE_MODEL_TIERS`` overrides it (``"gemma4:12b=3,phi4=2"``).
+``VILIFE_TASK_TIERS`` sets the minimum tier per task in the same format.
+
+Rows are buffered in memory and written in batches by ``flush`` (the server
+runs ``flush_loop``), so recording never puts a DB write on the call path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select
+
+from vienna_life_assistant.db import SessionLocal
+from vienna_life_assistant.models import LlmCall
+from vienna_life_assistant.stats import percentile
+
+logger = logging.getLogger("vienna-life-assistant.llm_ledger")
+
+# Minimum quality tier per task type; unknown tasks need tier 2.
+TASK_TIERS: dict[str, int] = {
+    "agent": 2,  # tool calling needs a capable model
+    "chat": 2,
+    "brief": 2,
+    "answer": 2,
+    "summary": 1,  # folding old chat turns — any model will do
+    "probe": 1,
+    "chat_small": 1,  # model router: short single-topic turns
+    "chat_large": 3,  # model router: planning and multi-topic turns
+}
+MIN_SAMPLES = 3  # calls before a model's numbers are trusted
+MAX_ERROR_RATE = 0.25
+TYPICAL_ANSWER_TOKENS = 300  # expected latency = ttft + this many tokens
+WINDOW_DAYS = float(os.environ.get("VILIFE_LLM_LEDGER_DAYS", "7"))
+RETENTION_DAYS = float(os.environ.get("VILIFE_LLM_LEDGER_RETENTION_DAYS", "30"))
+STATS_TTL = 60.0
+
+_SIZE_RE = re.compile(r"[:\-_](\d+(?:\.\d+)?)b\b", re.IGNORECASE)
+_HOSTED = ("gpt-", "o3", "o4", "claude", "gemini")
+
+current_task: ContextVar[str | None] = ContextVar("llm_task", default=None)
+
+_pending: list[dict[str, Any]] = []
+_pending_lock = threading.Lock()
+_stats: dict[str, Any] = {"expires": 0.0, "value": {}}
+
+
+@contextmanager
+def task(name: str) -> Iterator[None]:
+    """Attribute the LLM calls made inside the block to task ``name``."""
+    token = current_task.set(name)
+    try:
+        yield
+    finally:
+        current_task.reset(token)
+
+
+# --- Recording ----------------------------------------------------------------
+
+
+class CallMeter:
+    """Times one LLM call; ``done`` / ``fail`` queue its ledger row."""
+
+    def __init__(self, model: str | None, endpoint: str, task: str | None) -> None:
+        self.model = model or "?"
+        self.endpoint = endpoint
+        self.task = task or current_task.get() or "chat"
+        self.started = time.perf_counter()
+        self.first: float | None = None
+        self.chunks = 0
+
+    def token(self) -> None:
+        """A streamed content (or tool-call) chunk arrived."""
+        if self.first is None:
+            self.first = time.perf_counter()
+        self.chunks += 1
+
+    def done(
+        self,
+        *,
+        prompt_tokens: int | None = None,
+        completion_tokens: int | None = None,
+        ttft_ms: float | None = None,
+        load_ms: float | None = None,
+        tok_s: float | None = None,
+    ) -> None:
+        end = time.perf_counter()
+        total_ms = (end - self.started) * 1000
+        if ttft_ms is None and self.first is not None:
+            ttft_ms = (self.first - self.started) * 1000
+        completion = completion_tokens or self.chunks or None
+        if tok_s is None and completion:
+            # Streamed: decode rate after the first token. Non-streamed: the
+            # whole call, prefill included — a lower bound.
+            gen_s = end - (self.first or self.started)
+            if self.first is not None and completion > 1 and gen_s > 0:
+                tok_s = (completion - 1) / gen_s
+            elif self.first is None and total_ms > 0:
+                tok_s = completion / (total_ms / 1000)
+        self._queue(
+            ok=True,
+            total_ms=total_ms,
+            ttft_ms=ttft_ms,
+            load_ms=load_ms,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion,
+            tok_s=tok_s,
+        )
+
+    def fail(self, error: BaseException | str) -> None:
+        self._queue(
+            ok=False,
+            total_ms=(time.perf_counter() - self.started) * 1000,
+            error=str(error)[:300] or type(error).__name__,
+        )
+
+    def _queue(self, **row: Any) -> None:
+        record(model=self.model, endpoint=self.endpoint, task=self.task, **row)
+
+
+def record(**row: Any) -> None:
+    """Queue one ledger row — O(1), no I/O."""
+    row.setdefault("at", datetime.now().isoformat(timespec="seconds"))
+    for key in ("ttft_ms", "total_ms", "load_ms", "tok_s"):
+        if row.get(key) is not None:
+            row[key] = round(row[key], 1)
+    with _pending_lock:
+        _pending.append(row)
+
+
+def flush() -> int:
+    """Write queued rows and prune ones past the retention window."""
+    with _pending_lock:
+        rows = _pending[:]
+        _pending.clear()
+    if not rows:
+        return 0
+    cutoff = (datetime.now() - timedelta(days=RETENTION_DAYS)).isoformat()
+    try:
+        with SessionLocal() as db:
+            db.add_all(LlmCall(**row) for row in rows)
+            db.execute(delete(LlmCall).where(LlmCall.at < cutoff))
+            db.commit()
+    except Exception as e:  # noqa: BLE001 — the ledger must never break a call
+        logger.warning("LLM ledger flush failed (%d rows dropped): %s", len(rows), e)
+        return 0
+    _stats["expires"] = 0.0
+    return len(rows)
+
+
+async def flush_loop(interval: float = 10.0) -> None:
+    """Background writer started by the server lifespan."""
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(flush)
+
+
+# --- Aggregation --------------------------------------------------------------
+
+
+def _aggregate(rows: list[LlmCall]) -> dict[str, Any]:
+    ok = [r for r in rows if r.ok]
+    loads = [r.load_ms for r in ok if r.load_ms is not None]
+    ttfts = [r.ttft_ms for r in ok if r.ttft_ms is not None]
+    return {
+        "calls": len(rows),
+        "errors": len(rows) - len(ok),
+        "error_rate": round((len(rows) - len(ok)) / len(rows), 3),
+        "ttft_ms_p50": percentile(ttfts, 0.5),
+        "ttft_ms_p95": percentile(ttfts, 0.95),
+        "tok_s_p50": percentile([r.tok_s for r in ok if r.tok_s], 0.5),
+        "total_ms_p50": percentile([r.total_ms for r in ok], 0.5),
+        "load_ms_avg": round(sum(loads) / len(loads), 1) if loads else None,
+        "last_at": max(r.at for r in rows),
+    }
+
+
+def _rows(days: float) -> list[LlmCall]:
+    flush()
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    with SessionLocal() as db:
+        return list(db.scalars(select(LlmCall).where(LlmCall.at >= cutoff)))
+
+
+def summaries(days: float | None = None, by_task: bool = False) -> list[dict[str, Any]]:
+    """Per-model (or per model and task) performance over the last ``days``."""
+    groups: dict[tuple[str, str], list[LlmCall]] = {}
+    for row in _rows(days or WINDOW_DAYS):
+        groups.setdefault((row.model, row.task if by_task else ""), []).append(row)
+    out = []
+    for (model, task_name), rows in sorted(groups.items()):
+        entry = {"model": model, "tier": quality_tier(model)}
+        if by_task:
+            entry["task"] = task_name
+        out.append({**entry, **_aggregate(rows)})
+    return out
+
+
+def model_stats() -> dict[str, dict[str, Any]]:
+    """Per-model aggregates for selection, cached for ``STATS_TTL`` seconds."""
+    now = time.monotonic()
+    if now >= _stats["expires"]:
+        try:
+            _stats["value"] = {s["model"]: s for s in summaries()}
+        except Exception as e:  # noqa: BLE001 — select without numbers instead
+            logger.warning("LLM ledger read failed: %s", e)
+            _stats["value"] = {}
+        _stats["expires"] = now + STATS_TTL
+    return _stats["value"]
+
+
+# --- Selection ----------------------------------------------------------------
+
+
+def _env_map(name: str) -> dict[str, int]:
+    pairs = (p.split("=", 1) for p in os.environ.get(name, "").split(",") if "=" in p)
+    return {k.strip(): int(v) for k, v in pairs if v.strip().isdigit()}
+
+
+def quality_tier(model: str) -> int:
+    """1 small / 2 mid / 3 large — ``VILIFE_MODEL_TIERS`` overrides."""
+    overrides = _env_map("VILIFE_MODEL_TIERS")
+    if model in overrides:
+        return overrides[model]
+    if model.split(":")[0] in overrides:
+        return overrides[model.split(":")[0]]
+    if model.lower().startswith(_HOSTED) or ":cloud" in model:
+        return 3
+    if m := _SIZE_RE.search(model):
+        size = float(m.group(1))
+        return 1 if size <= 4 else 2 if size <= 20 else 3
+    return 2
+
+
+def task_tier(task_name: str) -> int:
+    return {**TASK_TIERS, **_env_map("VILIFE_TASK_TIERS")}.get(task_name, 2)
+
+
+def expected_ms(stats: dict[str, Any]) -> float:
+    """Latency of a typical answer: first token + TYPICAL_ANSWER_TOKENS."""
+    ttft = stats.get("ttft_ms_p50") or stats.get("total_ms_p50") or 0.0
+    tok_s = stats.get("tok_s_p50")
+    return ttft + (TYPICAL_ANSWER_TOKENS / tok_s * 1000 if tok_s else 60_000)
+
+
+def pick_model(
+    installed: Iterable[str], task_name: str, preferred: Iterable[str] = ()
+) -> str | None:
+    """Fastest installed model that meets ``task_name``'s quality tier.
+
+    Models with fewer than MIN_SAMPLES recent calls, or too many errors,
+    are not ranked; when none qualifies the first ``preferred`` model that
+    meets the tier wins, then the smallest adequate one. If nothing meets
+    the tier, the most capable installed model is used; with only hosted
+    (``:cloud``) tags, the first of those.
+    """
+    installed = list(installed)
+    names = [m for m in installed if ":cloud" not in m and "embed" not in m]
+    if not names:
+        return installed[0] if installed else None
+    need = task_tier(task_name)
+    able = [m for m in names if quality_tier(m) >= need]
+    if not able:
+        best = max(quality_tier(m) for m in names)
+        able = [m for m in names if quality_tier(m) == best]
+    stats = model_stats()
+    measured = [
+        m
+        for m in able
+        if m in stats
+        and stats[m]["calls"] - stats[m]["errors"] >= MIN_SAMPLES
+        and stats[m]["error_rate"] <= MAX_ERROR_RATE
+    ]
+    if measured:
+        return min(measured, key=lambda m: expected_ms(stats[m]))
+    for m in preferred:
+        if m in able:
+            return m
+    return min(able, key=lambda m: (quality_tier(m), ":latest" in m))
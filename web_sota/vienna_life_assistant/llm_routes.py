@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from typing import Any
@@ -10,6 +11,13 @@ from urllib.request import Request, urlopen
 
 from fastapi import APIRouter
 
+from vienna_life_assistant import (
+    llm_http,
+    llm_ledger,
+    llm_scheduler,
+    model_router,
+    pa_agent,
+)
 from vienna_life_assistant.vienna_context import (
     CHAT_PREPROMPTS,
     VIENNA_SYSTEM_PREPROMPT,
@@ -87,16 +95,13 @@ def _openai_headers(api_key: str | None = None) -> dict[str, str]:
     return headers
 
 
-def _chat_completions(
+async def _chat_completions(
     url_base: str, payload: dict, headers: dict[str, str], timeout: int = 120
 ) -> str:
-    body = json.dumps(payload).encode()
-    req = Request(
-        f"{url_base.rstrip('/')}/chat/completions", data=body, headers=headers
+    message = await llm_http.chat_completion(
+        url_base, payload, headers, total_timeout=timeout
     )
-    with urlopen(req, timeout=timeout) as resp:
-        data = json.loads(resp.read())
-    return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+    return message.get("content", "")
 
 
 @router.get("/providers")
@@ -329,6 +334,64 @@ async def llm_models(
     }
 
 
+@router.get("/ledger")
+async def llm_ledger_summary(days: float = 7, by_task: bool = False) -> dict[str, Any]:
+    """Recorded LLM performance per model, plus the model picked per task."""
+    models = await asyncio.to_thread(llm_ledger.summaries, days, by_task)
+    selection: dict[str, str] = {}
+    if await pa_agent.aresolve_llm() is not None:
+        for task in llm_ledger.TASK_TIERS:
+            llm = await pa_agent.llm_for(task)
+            if llm is not None:
+                selection[task] = llm["model"]
+    return {"ok": True, "days": days, "models": models, "selection": selection}
+
+
+@router.get("/router")
+async def llm_router_stats() -> dict[str, Any]:
+    """Chat routing: turns, models and latency per route (small/standard/large)."""
+    return {"ok": True, **model_router.router_stats.stats()}
+
+
+@router.get("/scheduler")
+async def llm_scheduler_stats() -> dict[str, Any]:
+    """Slots in use, queue depth per priority class and queue wait times."""
+    return {"ok": True, **llm_scheduler.scheduler.stats()}
+
+
+@router.post("/ledger/probe")
+async def llm_ledger_probe(rounds: int = 3) -> dict[str, Any]:
+    """Time a short completion on every installed Ollama model.
+
+    Fills the ledger so model selection has numbers before real traffic
+    has touched each model. Models run one after another — loading several
+    at once would measure the GPU contention, not the model.
+    """
+    llm = await pa_agent.aresolve_llm()
+    if llm is None or not llm.get("installed"):
+        return {"ok": False, "error": "Probing needs a reachable Ollama"}
+    payload = {
+        "messages": [{"role": "user", "content": "Say hello in German, briefly."}],
+        "max_tokens": 32,
+    }
+    probed: dict[str, Any] = {}
+    for model in llm["installed"]:
+        if ":cloud" in model or "embed" in model:
+            continue
+        errors = 0
+        for _ in range(max(1, min(rounds, 10))):
+            try:
+                with llm_ledger.task("probe"), llm_scheduler.priority("standard"):
+                    await llm_http.chat_completion(
+                        llm["url_base"], {**payload, "model": model}, llm["headers"]
+                    )
+            except Exception:  # noqa: BLE001 — recorded in the ledger
+                errors += 1
+        probed[model] = {"errors": errors}
+    await asyncio.to_thread(llm_ledger.flush)
+    return {"ok": True, "probed": probed}
+
+
 @router.get("/preprompts")
 async def llm_preprompts() -> dict[str, Any]:
     return {"preprompts": CHAT_PREPROMPTS}
@@ -353,21 +416,18 @@ async def llm_chat(body: dict[str, Any]) -> dict[str, Any]:
     messages.append({"role": "user", "content": message})
 
     if provider == "ollama":
-        model = body.get("model") or os.environ.get("OLLAMA_MODEL", "qwen3.5:27b")
+        model = body.get("model") or os.environ.get("OLLAMA_MODEL")
+        if not model:
+            llm = await pa_agent.llm_for("chat")
+            ollama = llm is not None and llm["provider"] == "ollama"
+            model = llm["model"] if ollama else "qwen3.5:27b"
         url = body.get("ollama_url") or os.environ.get(
             "OLLAMA_URL", "http://127.0.0.1:11434"
         )
-        payload = json.dumps(
-            {"model": model, "messages": messages, "stream": False}
-        ).encode()
         try:
-            req = Request(
-                f"{url}/api/chat",
-                data=payload,
-                headers={"Content-Type": "application/json"},
+            data = await llm_http.ollama_chat(
+                url, {"model": model, "messages": messages}, total_timeout=120
             )
-            with urlopen(req, timeout=120) as resp:
-                data = json.loads(resp.read())
             return {"ok": True, "response": data.get("message", {}).get("content", "")}
         except Exception as exc:
             return {"ok": False, "error": str(exc)}
@@ -378,7 +438,7 @@ async def llm_chat(body: dict[str, Any]) -> dict[str, Any]:
             "LMSTUDIO_URL", "http://127.0.0.1:1234/v1"
         )
         try:
-            content = _chat_completions(
+            content = await _chat_completions(
                 url,
                 {"model": model, "messages": messages, "max_tokens": 2048},
                 {"Content-Type": "application/json"},
@@ -394,7 +454,7 @@ async def llm_chat(body: dict[str, Any]) -> dict[str, Any]:
         model = body.get("model") or os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
         url = body.get("openai_base_url") or _openai_base()
         try:
-            content = _chat_completions(
+            content = await _chat_completions(
                 url,
                 {"model": model, "messages": messages, "max_tokens": 2048},
                 _openai_headers(api_key),
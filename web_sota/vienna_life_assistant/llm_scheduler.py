@@ -0,0 +1,288 @@
+"""In-process scheduler in front of every LLM and embedding call.
+
+Live chat, the daily brief, RAG indexing and the MCP tools all share one
+Ollama. Without coordination a background brief holds the GPU while a chat
+token stream waits behind it. Every call therefore takes a slot here first:
+
+* **Per-model concurrency** — ``VILIFE_LLM_SLOTS`` (default 2) concurrent
+  calls per model, ``VILIFE_LLM_MODEL_SLOTS`` overrides per model
+  (``"qwen2.5:32b=1,nomic-embed-text=4"``). With two or more slots,
+  background work may use all but one, so a chat never waits behind it.
+* **Priority classes** — ``interactive`` (someone is waiting on the answer,
+  the default), ``standard`` (user-triggered, not watched token by token)
+  and ``background`` (scheduled briefs, reindexing). Callers set the class
+  with ``with llm_scheduler.priority("background"):``.
+* **Fair queueing** — FIFO within a class. Waiters age up one class every
+  ``AGING_S`` seconds, so a flood of chats cannot starve background work.
+* **Deadlines and backpressure** — a request that cannot start within its
+  deadline fails with ``SchedulerTimeout``. A class whose queue is full
+  rejects new requests straight away with ``SchedulerBusy``.
+
+Slots work for asyncio callers (``slot``) and for threads (``slot_sync``,
+used by the urllib embedding calls). ``stats`` reports queue depth, active
+calls and wait-time percentiles per model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from vienna_life_assistant.stats import percentile
+
+PRIORITIES: dict[str, int] = {"interactive": 0, "standard": 1, "background": 2}
+# Longest a request may wait in the queue before it gives up.
+DEADLINE_S: dict[str, float] = {
+    "interactive": 60.0,
+    "standard": 300.0,
+    "background": 1800.0,
+}
+MAX_QUEUED: dict[str, int] = {"interactive": 32, "standard": 16, "background": 8}
+AGING_S = 15.0
+
+current_priority: ContextVar[str] = ContextVar("llm_priority", default="interactive")
+
+
+class SchedulerBusy(RuntimeError):
+    """The priority class's queue is full — retry later."""
+
+
+class SchedulerTimeout(TimeoutError):
+    """The request did not get a slot before its deadline."""
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Run the LLM calls made inside the block in priority class ``name``."""
+    if name not in PRIORITIES:
+        raise ValueError(f"unknown priority class: {name}")
+    token = current_priority.set(name)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("cls", "enqueued", "granted", "seq", "wake")
+
+    def __init__(self, cls: str, seq: int, wake: Callable[[], None]) -> None:
+        self.cls = cls
+        self.seq = seq
+        self.wake = wake
+        self.enqueued = time.monotonic()
+        self.granted = False
+
+
+class _Lane:
+    """Slots, queue and counters for one model."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self.active_background = 0
+        self.waiters: list[_Waiter] = []
+        self.granted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.waits: dict[str, deque[float]] = {c: deque(maxlen=500) for c in PRIORITIES}
+
+
+def _env_slots() -> dict[str, int]:
+    pairs = (
+        p.split("=", 1)
+        for p in os.environ.get("VILIFE_LLM_MODEL_SLOTS", "").split(",")
+        if "=" in p
+    )
+    return {k.strip(): int(v) for k, v in pairs if v.strip().isdigit()}
+
+
+class LLMScheduler:
+    """Priority queue with per-model concurrency limits (see module doc)."""
+
+    def __init__(
+        self,
+        slots: int | None = None,
+        model_slots: dict[str, int] | None = None,
+        aging_s: float = AGING_S,
+    ) -> None:
+        self.slots = slots or int(os.environ.get("VILIFE_LLM_SLOTS", "2"))
+        self.model_slots = model_slots if model_slots is not None else _env_slots()
+        self.aging_s = aging_s
+        self._lanes: dict[str, _Lane] = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    # --- Core (call with the lock held) -----------------------------------
+
+    def _lane(self, model: str) -> _Lane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            lane = _Lane(max(1, self.model_slots.get(model, self.slots)))
+            self._lanes[model] = lane
+        return lane
+
+    def _fits(self, lane: _Lane, cls: str) -> bool:
+        if lane.active >= lane.limit:
+            return False
+        # Keep one slot free of background work when there is more than one.
+        return cls != "background" or lane.active_background < max(1, lane.limit - 1)
+
+    def _rank(self, waiter: _Waiter, now: float) -> tuple[int, int]:
+        aged = int((now - waiter.enqueued) / self.aging_s) if self.aging_s else 0
+        return max(0, PRIORITIES[waiter.cls] - aged), waiter.seq
+
+    def _grant(self, lane: _Lane) -> None:
+        """Hand free slots to the best-ranked waiters that fit."""
+        now = time.monotonic()
+        while lane.waiters and lane.active < lane.limit:
+            ready = [w for w in lane.waiters if self._fits(lane, w.cls)]
+            if not ready:
+                return
+            waiter = min(ready, key=lambda w: self._rank(w, now))
+            lane.waiters.remove(waiter)
+            self._start(lane, waiter, now)
+            waiter.wake()
+
+    def _start(self, lane: _Lane, waiter: _Waiter, now: float) -> None:
+        waiter.granted = True
+        lane.active += 1
+        if waiter.cls == "background":
+            lane.active_background += 1
+        lane.granted += 1
+        lane.waits[waiter.cls].append((now - waiter.enqueued) * 1000)
+
+    def _enqueue(self, model: str, cls: str, wake: Callable[[], None]) -> _Waiter:
+        if cls not in PRIORITIES:
+            raise ValueError(f"unknown priority class: {cls}")
+        with self._lock:
+            lane = self._lane(model)
+            self._seq += 1
+            waiter = _Waiter(cls, self._seq, wake)
+            if not lane.waiters and self._fits(lane, cls):
+                self._start(lane, waiter, waiter.enqueued)
+                return waiter
+            if sum(w.cls == cls for w in lane.waiters) >= MAX_QUEUED[cls]:
+                lane.rejected += 1
+                raise SchedulerBusy(f"LLM queue for {model} is full ({cls})")
+            lane.waiters.append(waiter)
+            self._grant(lane)
+            return waiter
+
+    def _abandon(self, model: str, waiter: _Waiter, timed_out: bool) -> bool:
+        """Drop a waiter that gave up; True if it was granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            lane = self._lanes[model]
+            lane.waiters.remove(waiter)
+            if timed_out:
+                lane.timed_out += 1
+            self._grant(lane)  # a background waiter may fit now
+            return False
+
+    def release(self, model: str, cls: str) -> None:
+        with self._lock:
+            lane = self._lanes[model]
+            lane.active -= 1
+            if cls == "background":
+                lane.active_background -= 1
+            self._grant(lane)
+
+    # --- Public API -------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        model: str,
+        priority: str | None = None,
+        deadline_s: float | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold one of ``model``'s slots for the duration of the block."""
+        cls = priority or current_priority.get()
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: ready.done() or ready.set_result(None))
+
+        waiter = self._enqueue(model, cls, wake)
+        if not waiter.granted:
+            timeout = deadline_s if deadline_s is not None else DEADLINE_S[cls]
+            try:
+                await asyncio.wait({ready}, timeout=timeout)
+            except asyncio.CancelledError:
+                if self._abandon(model, waiter, timed_out=False):
+                    self.release(model, cls)
+                raise
+            if not ready.done() and not self._abandon(model, waiter, timed_out=True):
+                raise SchedulerTimeout(
+                    f"no {model} slot within {timeout:.0f}s ({cls} queue)"
+                )
+        try:
+            yield
+        finally:
+            self.release(model, cls)
+
+    @contextmanager
+    def slot_sync(
+        self,
+        model: str,
+        priority: str | None = None,
+        deadline_s: float | None = None,
+    ) -> Iterator[None]:
+        """``slot`` for blocking callers (worker threads, urllib)."""
+        cls = priority or current_priority.get()
+        event = threading.Event()
+        waiter = self._enqueue(model, cls, event.set)
+        if not waiter.granted:
+            timeout = deadline_s if deadline_s is not None else DEADLINE_S[cls]
+            if not event.wait(timeout) and not self._abandon(
+                model, waiter, timed_out=True
+            ):
+                raise SchedulerTimeout(
+                    f"no {model} slot within {timeout:.0f}s ({cls} queue)"
+                )
+        try:
+            yield
+        finally:
+            self.release(model, cls)
+
+    def stats(self) -> dict[str, Any]:
+        """Per-model slots, queue depth per class and wait-time percentiles."""
+        with self._lock:
+            models = {}
+            for model, lane in sorted(self._lanes.items()):
+                queued = {c: sum(w.cls == c for w in lane.waiters) for c in PRIORITIES}
+                waits = {
+                    c: {
+                        "p50_ms": percentile(list(lane.waits[c]), 0.5),
+                        "p95_ms": percentile(list(lane.waits[c]), 0.95),
+                    }
+                    for c in PRIORITIES
+                    if lane.waits[c]
+                }
+                models[model] = {
+                    "limit": lane.limit,
+                    "active": lane.active,
+                    "queued": queued,
+                    "granted": lane.granted,
+                    "rejected": lane.rejected,
+                    "timed_out": lane.timed_out,
+                    "wait": waits,
+                }
+            return {
+                "models": models,
+                "queued": sum(sum(m["queued"].values()) for m in models.values()),
+                "active": sum(m["active"] for m in models.values()),
+            }
+
+
+scheduler = LLMScheduler()
@@ -0,0 +1,238 @@
+"""Append-only JSONL segment spool behind the in-memory activity log.
+
+Off by default; ``VILIFE_LOG_SPOOL=1`` turns it on. Entries are handed over
+from the logging hot path as dicts and written by a background flush thread,
+one JSON object per line, into ``activity-<first id>.jsonl`` segments under
+``VILIFE_LOG_SPOOL_DIR`` (default web_sota/data/logs).
+
+Segments rotate on size (``VILIFE_LOG_SEGMENT_MB``) or age
+(``VILIFE_LOG_SEGMENT_HOURS``) and are deleted after
+``VILIFE_LOG_RETENTION_DAYS``. Readers mmap segments and walk lines forwards
+or backwards, so history queries and exports never load a whole file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from vienna_life_assistant.fast_json import dumps
+
+logger = logging.getLogger("vienna-life-assistant.log_spool")
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "logs"
+_SEGMENT_RE = re.compile(r"^activity-(\d+)\.jsonl$")
+
+
+def spool_enabled() -> bool:
+    return os.environ.get("VILIFE_LOG_SPOOL", "").lower() in ("1", "true", "yes")
+
+
+class LogSpool:
+    """Segmented JSONL writer + mmap reader for activity-log entries."""
+
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        *,
+        segment_bytes: int | None = None,
+        segment_age_s: float | None = None,
+        retention_s: float | None = None,
+        flush_interval_s: float = 1.0,
+    ) -> None:
+        self.dir = Path(
+            directory or os.environ.get("VILIFE_LOG_SPOOL_DIR", str(_DEFAULT_DIR))
+        )
+        self.segment_bytes = segment_bytes or int(
+            float(os.environ.get("VILIFE_LOG_SEGMENT_MB", "8")) * 1024 * 1024
+        )
+        self.segment_age_s = segment_age_s or (
+            float(os.environ.get("VILIFE_LOG_SEGMENT_HOURS", "24")) * 3600
+        )
+        self.retention_s = retention_s or (
+            float(os.environ.get("VILIFE_LOG_RETENTION_DAYS", "14")) * 86400
+        )
+        self.flush_interval_s = flush_interval_s
+        self._pending: list[dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._fh = None
+        self._fh_path: Path | None = None
+        self._fh_opened = 0.0
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    # --- Write side ----------------------------------------------------------
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """Queue one entry — O(1), no I/O; the flush thread does the write."""
+        with self._pending_lock:
+            self._pending.append(entry)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="vilife-log-spool", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+        with self._write_lock:
+            self._close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # a full disk must not kill logging
+                logger.exception("Log spool flush failed")
+
+    def flush(self) -> int:
+        """Write every pending entry; returns how many were written."""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        with self._write_lock:
+            for entry in batch:
+                fh = self._segment_for(int(entry["id"]))
+                fh.write(dumps(entry) + b"\n")
+            if self._fh is not None:
+                self._fh.flush()
+        return len(batch)
+
+    def _segment_for(self, seq: int):
+        now = time.time()
+        if self._fh is not None and (
+            self._fh.tell() >= self.segment_bytes
+            or now - self._fh_opened >= self.segment_age_s
+        ):
+            self._close()
+            self._prune(now)
+        if self._fh is None:
+            self._fh_path = self.dir / f"activity-{seq:012d}.jsonl"
+            self._fh = open(self._fh_path, "ab")  # noqa: SIM115 - long-lived handle
+            self._fh_opened = now
+        return self._fh
+
+    def _close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._fh_path = None
+
+    def _prune(self, now: float) -> None:
+        for path in self.segments()[:-1]:
+            try:
+                if now - path.stat().st_mtime > self.retention_s:
+                    path.unlink()
+            except OSError:
+                pass
+
+    # --- Read side -----------------------------------------------------------
+
+    def segments(self) -> list[Path]:
+        """Segment files, oldest first (ordered by their first entry id)."""
+        found = []
+        for path in self.dir.glob("activity-*.jsonl"):
+            m = _SEGMENT_RE.match(path.name)
+            if m:
+                found.append((int(m.group(1)), path))
+        return [p for _, p in sorted(found)]
+
+    def last_seq(self) -> int:
+        """Highest entry id on disk — the restart point for the id counter."""
+        for path in reversed(self.segments()):
+            for entry in self._read_segment(path, reverse=True):
+                return int(entry["id"])
+        return 0
+
+    def iter_entries(
+        self,
+        *,
+        reverse: bool = False,
+        before_seq: int | None = None,
+        after_seq: int = 0,
+        match: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream spooled entries with ``after_seq < id < before_seq``."""
+        self.flush()
+        paths = self.segments()
+        for path in reversed(paths) if reverse else paths:
+            for entry in self._read_segment(path, reverse=reverse):
+                seq = int(entry["id"])
+                if before_seq is not None and seq >= before_seq:
+                    continue
+                if seq <= after_seq:
+                    if reverse:
+                        return
+                    continue
+                if match is None or match(entry):
+                    yield entry
+
+    def _read_segment(self, path: Path, *, reverse: bool) -> Iterator[dict[str, Any]]:
+        try:
+            fh = open(path, "rb")  # noqa: SIM115 - closed in finally
+        except OSError:
+            return
+        try:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in _lines(mm, reverse):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:  # torn last line after a crash
+                        continue
+        finally:
+            fh.close()
+
+    def stats(self) -> dict[str, Any]:
+        paths = self.segments()
+        return {
+            "enabled": True,
+            "dir": str(self.dir),
+            "segments": len(paths),
+            "bytes": sum(p.stat().st_size for p in paths if p.exists()),
+        }
+
+
+def _lines(mm: mmap.mmap, reverse: bool) -> Iterator[bytes]:
+    size = len(mm)
+    if not reverse:
+        pos = 0
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                end = size
+            if end > pos:
+                yield mm[pos:end]
+            pos = end + 1
+        return
+    end = size
+    while end > 0:
+        start = mm.rfind(b"\n", 0, end - 1) + 1 if end > 1 else 0
+        line = mm[start:end].rstrip(b"\n")
+        if line:
+            yield line
+        end = start
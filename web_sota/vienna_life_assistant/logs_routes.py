@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Literal
 
 from fastapi import APIRouter, Query
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 
 from vienna_life_assistant.activity_log import (
     clear_logs,
@@ -21,7 +21,7 @@ router = APIRouter(prefix="/api/logs", tags=["logs"])
 
 
 @router.get("")
-async def logs_query(
+def logs_query(  # sync: a history page reads the spool from disk
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
     level: str | None = None,
@@ -29,6 +29,7 @@ async def logs_query(
     search: str | None = None,
     sort: SortOrder = "desc",
     after_id: str | None = None,
+    history: bool = Query(False, description="Include spooled on-disk history"),
 ):
     return query_logs(
         limit=limit,
@@ -38,6 +39,7 @@ async def logs_query(
         search=search,
         sort=sort,
         after_id=after_id,
+        history=history,
     )
 
 
@@ -54,15 +56,15 @@ async def logs_export(
     search: str | None = None,
     sort: SortOrder = "desc",
 ):
-    body, media_type, filename = export_logs(
+    chunks, media_type, filename = export_logs(
         format=format,
         level=level,
         kind=kind,
         search=search,
         sort=sort,
     )
-    return Response(
-        content=body,
+    return StreamingResponse(
+        chunks,
         media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
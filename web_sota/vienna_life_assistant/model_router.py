@@ -0,0 +1,172 @@
+"""Model routing for PA chat turns — small, standard or large model per request.
+
+Every agent turn used to go to the one model the ledger picks for "agent".
+``route`` reads cheap signals off the latest user message — its length in
+tokens, how many tool groups it touches, planning / comparison cues and the
+number of sentences — and sends short single-topic turns ("what's on
+today?") to a small resident model, planning and multi-topic requests to the
+largest adequate model and everything else to the standard agent model.
+
+Routes map to ledger tasks (``chat_small``, ``agent``, ``chat_large``), so
+``llm_ledger.pick_model`` still chooses the fastest installed model of the
+tier. A conversation can pin a model (``model`` in the chat body), which
+skips routing. ``VILIFE_MODEL_ROUTER=0`` sends every turn to the standard
+route; ``VILIFE_ROUTER_SMALL_TOKENS`` / ``VILIFE_ROUTER_LARGE_TOKENS`` move
+the length thresholds. Decisions are logged and ``stats`` reports turns,
+models and latency per route (GET /api/llm/router).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from collections import Counter, deque
+from typing import Any
+
+from vienna_life_assistant import chat_memory
+from vienna_life_assistant.stats import percentile
+
+logger = logging.getLogger("vienna-life-assistant.router")
+
+SMALL_MAX_TOKENS = int(os.environ.get("VILIFE_ROUTER_SMALL_TOKENS", "24"))
+LARGE_MIN_TOKENS = int(os.environ.get("VILIFE_ROUTER_LARGE_TOKENS", "160"))
+ROUTE_TASKS = {"small": "chat_small", "standard": "agent", "large": "chat_large"}
+
+# Requests that need reasoning over several items, not a single lookup
+_COMPLEX = re.compile(
+    r"\b(plan|planning|compare|comparison|step by step|analy[sz]e|summari[sz]e"
+    r"|organi[sz]e|strategy|prioriti[sz]e|pros and cons|itinerary|vergleich\w*"
+    r"|planen|plane|analysier\w*|zusammenfass\w*|schritt für schritt"
+    r"|organisier\w*)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"[.!?](\s|$)")
+
+
+def enabled() -> bool:
+    return os.environ.get("VILIFE_MODEL_ROUTER", "1") != "0"
+
+
+def _decision(route: str, reason: str, signals: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "route": route,
+        "task": ROUTE_TASKS.get(route, "agent"),
+        "reason": reason,
+        "signals": signals,
+    }
+
+
+def route(text: str, tool_groups: int = 0) -> dict[str, Any]:
+    """Route for a user message touching ``tool_groups`` tool groups.
+
+    Returns ``{route, task, reason, signals}``; ``task`` is the ledger task
+    whose tier the model must meet.
+    """
+    signals = {
+        "tokens": chat_memory.count_tokens(text),
+        "tool_groups": tool_groups,
+        "sentences": max(1, len(_SENTENCE_END.findall(text.strip()))),
+        "complex_cue": bool(_COMPLEX.search(text)),
+    }
+    if not enabled():
+        return _decision("standard", "router disabled", signals)
+    if signals["complex_cue"]:
+        return _decision("large", "planning/comparison request", signals)
+    if signals["tokens"] >= LARGE_MIN_TOKENS:
+        return _decision("large", f"long prompt ({signals['tokens']} tokens)", signals)
+    if tool_groups >= 3:
+        return _decision("large", f"{tool_groups} tool groups", signals)
+    if signals["sentences"] >= 4:
+        return _decision("large", f"{signals['sentences']} sentences", signals)
+    if (
+        signals["tokens"] <= SMALL_MAX_TOKENS
+        and tool_groups <= 1
+        and signals["sentences"] == 1
+    ):
+        return _decision("small", "short single-topic request", signals)
+    return _decision("standard", "default", signals)
+
+
+def pinned(model: str) -> dict[str, Any]:
+    """Decision for a conversation that pinned ``model``."""
+    return {
+        "route": "pinned",
+        "task": "agent",
+        "reason": f"pinned to {model}",
+        "signals": {},
+    }
+
+
+class RouterStats:
+    """Turns, models and latency per route since start."""
+
+    def __init__(self, window: int = 500) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._turns: Counter[str] = Counter()
+        self._models: dict[str, Counter[str]] = {}
+        self._total_ms: dict[str, deque[float]] = {}
+        self._ttft_ms: dict[str, deque[float]] = {}
+
+    def decided(self, decision: dict[str, Any], model: str) -> None:
+        """Count and log one routing decision."""
+        name = decision["route"]
+        with self._lock:
+            self._turns[name] += 1
+            self._models.setdefault(name, Counter())[model] += 1
+        logger.info(
+            "chat route=%s model=%s (%s) %s",
+            name,
+            model,
+            decision["reason"],
+            decision["signals"],
+        )
+
+    def observe(
+        self, route_name: str, total_ms: float, ttft_ms: float | None = None
+    ) -> None:
+        """Record the latency of one finished turn."""
+        with self._lock:
+            self._total_ms.setdefault(route_name, deque(maxlen=self.window)).append(
+                total_ms
+            )
+            if ttft_ms is not None:
+                self._ttft_ms.setdefault(route_name, deque(maxlen=self.window)).append(
+                    ttft_ms
+                )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = sum(self._turns.values())
+            routes = {}
+            for name, turns in self._turns.items():
+                latencies = list(self._total_ms.get(name, ()))
+                ttft = list(self._ttft_ms.get(name, ()))
+                routes[name] = {
+                    "turns": turns,
+                    "share": round(turns / total, 3),
+                    "models": dict(self._models.get(name, {})),
+                    "total_ms_p50": percentile(latencies, 0.5),
+                    "total_ms_p95": percentile(latencies, 0.95),
+                    "ttft_ms_p50": percentile(ttft, 0.5),
+                    "samples": len(latencies),
+                }
+        return {
+            "enabled": enabled(),
+            "small_max_tokens": SMALL_MAX_TOKENS,
+            "large_min_tokens": LARGE_MIN_TOKENS,
+            "tasks": ROUTE_TASKS,
+            "routes": routes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns.clear()
+            self._models.clear()
+            self._total_ms.clear()
+            self._ttft_ms.clear()
+
+
+router_stats = RouterStats()
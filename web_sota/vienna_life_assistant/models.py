@@ -6,22 +6,59 @@ personal app, timezone-safe at the call site, JSON-native for REST and MCP.
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import date
+from operator import attrgetter
+from typing import Any, ClassVar
 
 from sqlalchemy import Boolean, Float, Integer, String, Text, inspect
 from sqlalchemy.orm import Mapped, mapped_column
 
 from vienna_life_assistant.db import Base
 
+_COLUMN_KEYS: dict[type, tuple[str, ...]] = {}
+_SERIALIZERS: dict[type, Callable[[Any], dict]] = {}
+
+
+def column_keys(model: type) -> tuple[str, ...]:
+    """Mapped column attribute keys of a model, in declaration order (cached)."""
+    keys = _COLUMN_KEYS.get(model)
+    if keys is None:
+        keys = tuple(c.key for c in inspect(model).column_attrs)
+        _COLUMN_KEYS[model] = keys
+    return keys
+
+
+def row_serializer(model: type) -> Callable[[Any], dict]:
+    """Compiled obj → dict function for one model.
+
+    Column keys are resolved once per class and read with a single
+    attrgetter call per row instead of a mapper walk per row.
+    """
+    fn = _SERIALIZERS.get(model)
+    if fn is None:
+        keys = column_keys(model)
+        getter = attrgetter(*keys)
+        if len(keys) == 1:
+            key = keys[0]
+
+            def fn(obj: Any) -> dict:
+                return {key: getter(obj)}
+
+        else:
+
+            def fn(obj: Any) -> dict:
+                return dict(zip(keys, getter(obj)))
+
+        _SERIALIZERS[model] = fn
+    return fn
+
 
 class BaseMixin:
     """Row → dict serializer shared by every model."""
 
     def to_dict(self) -> dict:
-        state = inspect(self)
-        if state is None:
-            return {}
-        return {c.key: getattr(self, c.key) for c in state.mapper.column_attrs}
+        return row_serializer(type(self))(self)
 
 
 class CalendarEvent(Base, BaseMixin):
@@ -244,3 +281,40 @@ class UserProfile(Base, BaseMixin):
     pet_name: Mapped[str] = mapped_column(String(80), default="")
     onboarded: Mapped[bool] = mapped_column(Boolean, default=False)
     onboarded_at: Mapped[str] = mapped_column(String(19), default="")
+
+
+class ChangeLogEntry(Base, BaseMixin):
+    """One write to a life table — the id is the monotonic change-feed version.
+
+    AUTOINCREMENT keeps versions strictly increasing even after old entries
+    are pruned, so a client's ``since`` cursor never aliases a reused id.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__: ClassVar[dict[str, Any]] = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(60), index=True)
+    row_id: Mapped[int] = mapped_column(Integer)
+    op: Mapped[str] = mapped_column(String(10))  # upsert | delete
+    at: Mapped[str] = mapped_column(String(19), default="")  # ISO datetime
+
+
+class LlmCall(Base, BaseMixin):
+    """One LLM call in the performance ledger (see llm_ledger.py)."""
+
+    __tablename__ = "llm_calls"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    at: Mapped[str] = mapped_column(String(19), index=True)  # ISO datetime
+    model: Mapped[str] = mapped_column(String(120), index=True)
+    endpoint: Mapped[str] = mapped_column(String(200), default="")  # origin
+    task: Mapped[str] = mapped_column(String(40), default="chat")
+    ok: Mapped[bool] = mapped_column(Boolean, default=True)
+    ttft_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_ms: Mapped[float] = mapped_column(Float, default=0.0)
+    load_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tok_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    error: Mapped[str] = mapped_column(String(300), default="")
@@ -4,6 +4,7 @@ Two surfaces:
 - Single-shot: generate_brief / answer_question (PA engine).
 - Agent loop: run_agent — the LLM decides vienna_* tool calls, the loop
   executes them locally (same functions the MCP tools expose) and reflects.
+  stream_agent is the same loop as an event stream (tokens, tool events).
 
 Works with any OpenAI-compatible chat-completions endpoint (Ollama /v1,
 LM Studio, OpenAI). If no LLM is reachable, every function degrades
@@ -12,19 +13,30 @@ gracefully to structured text so the PA never hard-fails.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
 import os
+import re
+import threading
+import time
+from collections.abc import AsyncIterator
 from typing import Any
 from urllib.request import Request, urlopen
 
+from vienna_life_assistant import chat_memory, llm_http, llm_ledger, model_router
 from vienna_life_assistant.vienna_context import VIENNA_SYSTEM_PREPROMPT
 
 logger = logging.getLogger("vienna-life-assistant.pa")
 
 MAX_AGENT_ITERATIONS = 5
-LLM_TIMEOUT = 90
+LLM_TIMEOUT = 300  # whole-call cap; first-token budget lives in llm_http
+# Wall-clock budget for all tool calls of one agent turn; stragglers are
+# reported back to the LLM as timed out.
+TOOL_BUDGET_S = float(os.environ.get("VILIFE_TOOL_BUDGET_S", "30"))
 
+# First choice per task until the ledger has numbers (see llm_ledger.pick_model)
 _PREFERRED_LOCAL_MODELS = [
     "gemma4:12b",
     "gemma4:26b",
@@ -44,23 +56,16 @@ def _ollama_tags(base: str) -> list[str]:
         return []
 
 
-def _pick_ollama_model(models: list[str]) -> str:
-    for preferred in _PREFERRED_LOCAL_MODELS:
-        if preferred in models:
-            return preferred
-    local = [m for m in models if ":cloud" not in m and ":latest" not in m]
-    return local[0] if local else models[0]
-
-
 # --- Provider resolution -----------------------------------------------------
 
 
-def resolve_llm() -> dict[str, Any] | None:
-    """Resolve the active provider to an OpenAI-compatible endpoint.
+def _resolve_uncached() -> dict[str, Any] | None:
+    """Probe and resolve the active provider to an OpenAI-compatible endpoint.
 
     Avoids llm_routes._detect_ollama (it force-sets OLLAMA_MODEL to the first
-    tag, which may be a reasoning model that returns empty content). We pick
-    a known-good local model ourselves.
+    tag, which may be a reasoning model that returns empty content). The
+    Ollama model is chosen from the performance ledger (llm_for picks per
+    task); ``installed`` keeps the tags for that.
     """
     provider = os.environ.get("LLM_PROVIDER", "")
 
@@ -77,14 +82,18 @@ def resolve_llm() -> dict[str, Any] | None:
 
     if provider == "ollama":
         base = os.environ.get("OLLAMA_URL", "http://127.0.0.1:11434").rstrip("/")
-        model = os.environ.get("OLLAMA_MODEL", "") or _pick_ollama_model(
-            _ollama_tags(base)
+        installed = _ollama_tags(base)
+        model = os.environ.get("OLLAMA_MODEL", "") or llm_ledger.pick_model(
+            installed, "chat", _PREFERRED_LOCAL_MODELS
         )
+        if not model:
+            return None
         return {
             "url_base": f"{base}/v1",
             "model": model,
             "headers": {"Content-Type": "application/json"},
             "provider": "ollama",
+            "installed": installed,
         }
 
     if provider == "lmstudio":
@@ -118,17 +127,160 @@ def resolve_llm() -> dict[str, Any] | None:
     return None
 
 
-def _chat_message(
+# Resolution probes Ollama /api/tags (and maybe LM Studio /models) — seconds
+# when a provider is down. Cache the answer, including "nothing reachable",
+# keyed on the settings that feed it so an env change is never served stale.
+LLM_CACHE_TTL = float(os.environ.get("VILIFE_LLM_CACHE_TTL", "120"))
+LLM_NEGATIVE_TTL = float(os.environ.get("VILIFE_LLM_NEGATIVE_TTL", "15"))
+
+_SETTINGS_ENV = (
+    "LLM_PROVIDER",
+    "OLLAMA_URL",
+    "OLLAMA_MODEL",
+    "LMSTUDIO_URL",
+    "LMSTUDIO_MODEL",
+    "OPENAI_BASE_URL",
+    "OPENAI_MODEL",
+    "OPENAI_API_KEY",
+    "LOCAL_LLM_KEY",
+)
+
+_llm_cache: dict[str, Any] = {"key": None, "value": None, "expires": 0.0}
+_llm_lock = threading.Lock()
+_MISS = object()
+
+
+def _settings_key() -> tuple[str, ...]:
+    return tuple(os.environ.get(k, "") for k in _SETTINGS_ENV)
+
+
+def invalidate_llm_cache() -> None:
+    """Drop the cached provider — call after the LLM settings change."""
+    with _llm_lock:
+        _llm_cache.update(key=None, value=None, expires=0.0)
+
+
+def llm_cache_info() -> dict[str, Any]:
+    value = _llm_cache["value"]
+    return {
+        "cached": _llm_cache["key"] is not None,
+        "provider": value["provider"] if value else None,
+        "model": value["model"] if value else None,
+        "expires_in_s": round(max(0.0, _llm_cache["expires"] - time.monotonic()), 1),
+    }
+
+
+def resolve_llm(refresh: bool = False) -> dict[str, Any] | None:
+    """Cached provider resolution (see _resolve_uncached).
+
+    Successful lookups live ``LLM_CACHE_TTL`` seconds, failed ones
+    ``LLM_NEGATIVE_TTL`` so a down provider is not re-probed per request.
+    Concurrent callers on a cold cache wait for one probe instead of each
+    running their own.
+    """
+    if not refresh:
+        hit = _cached_llm()
+        if hit is not _MISS:
+            return hit
+    with _llm_lock:
+        if not refresh:
+            hit = _cached_llm()
+            if hit is not _MISS:
+                return hit
+        value = _resolve_uncached()
+        ttl = LLM_CACHE_TTL if value is not None else LLM_NEGATIVE_TTL
+        # Key on the settings *after* the probe: LM Studio detection writes
+        # LLM_PROVIDER / LMSTUDIO_MODEL into the environment.
+        _llm_cache.update(
+            key=_settings_key(), value=value, expires=time.monotonic() + ttl
+        )
+        return value
+
+
+def _cached_llm() -> Any:
+    if (
+        _llm_cache["key"] != _settings_key()
+        or time.monotonic() >= _llm_cache["expires"]
+    ):
+        return _MISS
+    return _llm_cache["value"]
+
+
+async def aresolve_llm() -> dict[str, Any] | None:
+    """resolve_llm for async callers — a cold cache probes on a worker thread."""
+    if _cached_llm() is _MISS:
+        return await asyncio.to_thread(resolve_llm)
+    return resolve_llm()
+
+
+async def llm_for(task: str) -> dict[str, Any] | None:
+    """Resolved provider with the model the ledger picks for ``task``.
+
+    Only Ollama offers a choice (its installed tags); an explicit
+    OLLAMA_MODEL always wins.
+    """
+    llm = await aresolve_llm()
+    if llm is None or not llm.get("installed") or os.environ.get("OLLAMA_MODEL"):
+        return llm
+    model = llm_ledger.pick_model(llm["installed"], task, _PREFERRED_LOCAL_MODELS)
+    return {**llm, "model": model} if model else llm
+
+
+async def llm_for_turn(
+    messages: list[dict[str, Any]], model: str | None = None
+) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+    """Provider + model for one agent turn, and the routing decision.
+
+    ``model`` pins the conversation's model; otherwise model_router picks a
+    small, standard or large model from the latest user message.
+    """
+    if model:
+        decision = model_router.pinned(model)
+        llm = await aresolve_llm()
+        llm = {**llm, "model": model} if llm is not None else None
+    else:
+        text = next(
+            (
+                str(m.get("content") or "")
+                for m in reversed(messages)
+                if m.get("role", "user") == "user"
+            ),
+            "",
+        )
+        decision = model_router.route(text, len(_tool_groups(messages)))
+        llm = await llm_for(decision["task"])
+    if llm is not None:
+        model_router.router_stats.decided(decision, llm["model"])
+    return llm, decision
+
+
+async def llm_refresher_loop(interval: float | None = None) -> None:
+    """Keep the resolved provider warm so requests never pay for the probe.
+
+    ``VILIFE_LLM_REFRESH_S`` sets the period (default: 80% of the TTL);
+    ``0`` disables the loop.
+    """
+    if interval is None:
+        interval = float(
+            os.environ.get("VILIFE_LLM_REFRESH_S", str(LLM_CACHE_TTL * 0.8))
+        )
+    if interval <= 0:
+        return
+    while True:
+        try:
+            await asyncio.to_thread(resolve_llm, True)
+        except Exception as e:  # noqa: BLE001 — refresher must survive
+            logger.warning("LLM provider refresh failed: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def _chat_message(
     url_base: str, payload: dict, headers: dict[str, str], timeout: int = LLM_TIMEOUT
 ) -> dict[str, Any]:
     """Full chat-completions response message (content + tool_calls)."""
-    body = json.dumps(payload).encode()
-    req = Request(
-        f"{url_base.rstrip('/')}/chat/completions", data=body, headers=headers
+    return await llm_http.chat_completion(
+        url_base, payload, headers, total_timeout=timeout
     )
-    with urlopen(req, timeout=timeout) as resp:
-        data = json.loads(resp.read())
-    return data.get("choices", [{}])[0].get("message", {})
 
 
 # --- Tool surface (curated subset of the vienna_* portmanteaus) --------------
@@ -465,17 +617,129 @@ _DATA_KEYS: dict[str, list[str]] = {
 
 _FUNCS: dict[str, Any] = {}
 
+# Portmanteaus whose bodies make synchronous HTTP calls to sibling services
+# (email-mcp, onenote-mcp) — they run on a worker thread's own event loop so
+# a slow bridge never stalls the server. SQLite-backed tools stay inline.
+_BLOCKING_RUNS = frozenset({"vienna_email", "vienna_notes"})
+
 
-def _tool_schemas() -> list[dict[str, Any]]:
+@functools.lru_cache(maxsize=64)
+def _tool_schemas(names: tuple[str, ...] | None = None) -> list[dict[str, Any]]:
+    """OpenAI tool schemas for ``names`` (all tools when None), built once."""
+    wanted = set(names) if names is not None else None
     return [
         {
             "type": "function",
             "function": {k: s[k] for k in ("name", "description", "parameters")},
         }
         for s in _TOOL_SPECS
+        if wanted is None or s["name"] in wanted
     ]
 
 
+# --- Tool selection -----------------------------------------------------------
+# Every schema costs prompt tokens the local model re-reads on each turn, so
+# the agent only offers the tool groups a message plausibly needs. Keywords
+# are English + German; a cheap false positive just adds one group back.
+
+_TOOL_KEYWORDS: dict[str, re.Pattern[str]] = {
+    group: re.compile(pattern)
+    for group, pattern in {
+        "vienna_life": (
+            r"todo|task|remind|calendar|event|appointment|schedule|today|tomorrow"
+            r"|week|plan|expense|spent|paid|cost|eur|€|brief|termin|aufgabe|heute"
+            r"|morgen|ausgabe|bezahlt|kalender"
+        ),
+        "vienna_health": (
+            r"health|doctor|dr\.|med|pill|dose|refill|visit|sick|pain|arzt|ärztin"
+            r"|gesund|tablette|rezept|krank"
+        ),
+        "vienna_log": r"journal|diary|log|mood|feel|felt|tagebuch|stimmung",
+        "vienna_email": r"mail|inbox|send|reply|message|nachricht",
+        "vienna_travel": (
+            r"trip|travel|flight|train|hotel|vacation|holiday|reise|urlaub|flug"
+            r"|zug|öbb"
+        ),
+        "vienna_contacts": (
+            r"contact|birthday|phone|friend|family|mum|mom|dad|geburtstag|kontakt"
+            r"|telefon"
+        ),
+        "vienna_household": (
+            r"subscription|renewal|home|house|clean|repair|pet|dog|benny|vet|abo"
+            r"|wohnung|haushalt|putzen|hund"
+        ),
+        "vienna_notes": r"onenote|export|notebook",
+        "fleet": (
+            r"plex|movie|film|show|watch|book|calibre|read|tram|bus|u-?bahn"
+            r"|departure|transit|wiener linien|news|headline|camera|fleet|server"
+            r"|mcp|abfahrt|nachrichten"
+        ),
+        "fritz_status": r"internet|wifi|wlan|router|fritz|network|online|offline|netz",
+    }.items()
+}
+_CORE_TOOLS = ("vienna_life__life_brief",)
+
+
+def _tool_group(name: str) -> str:
+    if name in ("fleet_tools", "fleet_call"):
+        return "fleet"
+    return name.split("__", 1)[0]
+
+
+def _tool_groups(messages: list[dict[str, Any]]) -> set[str]:
+    """Tool groups the last two user messages mention."""
+    user_turns = [m for m in messages if m.get("role", "user") == "user"]
+    text = " ".join(str(m.get("content") or "") for m in user_turns[-2:]).lower()
+    return {g for g, pattern in _TOOL_KEYWORDS.items() if pattern.search(text)}
+
+
+def select_tools(messages: list[dict[str, Any]]) -> tuple[str, ...] | None:
+    """Tool names relevant to the latest user turns; None = offer everything.
+
+    Looks at the last two user messages (so "and tomorrow?" keeps its
+    context). No keyword hit means an open question — all tools are offered.
+    ``VILIFE_TOOL_SUBSET=0`` disables selection.
+    """
+    if os.environ.get("VILIFE_TOOL_SUBSET", "1") == "0":
+        return None
+    groups = _tool_groups(messages)
+    if not groups:
+        return None
+    return tuple(
+        s["name"]
+        for s in _TOOL_SPECS
+        if _tool_group(s["name"]) in groups or s["name"] in _CORE_TOOLS
+    )
+
+
+def _fleet_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
+    from vienna_life_assistant import fleet_mcp
+
+    if name == "fleet_tools":
+        tools = fleet_mcp.list_tools(args.get("server", ""))
+        if not tools:
+            return {
+                "success": False,
+                "error": f"server '{args.get('server', '')}' offline or not allowlisted",
+            }
+        return {
+            "success": True,
+            "server": args.get("server"),
+            "tools": [
+                {
+                    "name": t.get("name"),
+                    "description": (t.get("description") or "")[:200],
+                }
+                for t in tools[:40]
+            ],
+        }
+    if name == "fritz_status":
+        return fleet_mcp.fritz_status()
+    return fleet_mcp.call_tool(
+        args.get("server", ""), args.get("tool", ""), args.get("arguments") or {}
+    )
+
+
 async def execute_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
     """Run one vienna_* tool locally. Returns the tool's result dict."""
     global _FUNCS
@@ -507,31 +771,8 @@ async def execute_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
         return {"success": False, "error": f"unknown tool {name}"}
 
     if spec["run"] == "fleet":
-        from vienna_life_assistant import fleet_mcp
-
-        if name == "fleet_tools":
-            tools = fleet_mcp.list_tools(args.get("server", ""))
-            if not tools:
-                return {
-                    "success": False,
-                    "error": f"server '{args.get('server', '')}' offline or not allowlisted",
-                }
-            return {
-                "success": True,
-                "server": args.get("server"),
-                "tools": [
-                    {
-                        "name": t.get("name"),
-                        "description": (t.get("description") or "")[:200],
-                    }
-                    for t in tools[:40]
-                ],
-            }
-        if name == "fritz_status":
-            return fleet_mcp.fritz_status()
-        return fleet_mcp.call_tool(
-            args.get("server", ""), args.get("tool", ""), args.get("arguments") or {}
-        )
+        # fleet_mcp is blocking HTTP — keep it off the event loop.
+        return await asyncio.to_thread(_fleet_tool, name, args)
 
     fn = _FUNCS[spec["run"]]
     kwargs: dict[str, Any] = {"operation": spec["op"]}
@@ -542,7 +783,10 @@ async def execute_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
     if data:
         kwargs["data"] = data
     try:
-        result = await fn(**kwargs)
+        if spec["run"] in _BLOCKING_RUNS:
+            result = await asyncio.to_thread(asyncio.run, fn(**kwargs))
+        else:
+            result = await fn(**kwargs)
         return (
             result
             if isinstance(result, dict)
@@ -556,28 +800,150 @@ async def execute_tool(name: str, args: dict[str, Any]) -> dict[str, Any]:
 # --- Agent loop ---------------------------------------------------------------
 
 
+async def _run_tool_calls(
+    tool_calls: list[dict[str, Any]],
+    budget_s: float,
+    completed: asyncio.Queue | None = None,
+) -> list[dict[str, Any]]:
+    """Execute one turn's tool calls concurrently within ``budget_s``.
+
+    Returns one ``{name, args, result, ms}`` per call, in call order. Calls
+    still running when the budget runs out are cancelled and reported as
+    timed out (a fleet call already in its thread finishes unobserved).
+    ``completed`` receives ``(index, entry)`` as each call finishes.
+    """
+
+    async def one(i: int, tc: dict[str, Any]) -> dict[str, Any]:
+        fn = tc.get("function", {})
+        name = fn.get("name", "")
+        try:
+            args = json.loads(fn.get("arguments") or "{}")
+        except json.JSONDecodeError:
+            args = {}
+        t0 = time.perf_counter()
+        result = await execute_tool(name, args)
+        entry = {
+            "name": name,
+            "args": args,
+            "result": result,
+            "ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+        if completed is not None:
+            completed.put_nowait((i, entry))
+        return entry
+
+    tasks = [asyncio.ensure_future(one(i, tc)) for i, tc in enumerate(tool_calls)]
+    started = time.perf_counter()
+    try:
+        await asyncio.wait(tasks, timeout=budget_s)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    out: list[dict[str, Any]] = []
+    for tc, task in zip(tool_calls, tasks, strict=True):
+        if task.done() and not task.cancelled() and task.exception() is None:
+            out.append(task.result())
+            continue
+        task.cancel()
+        fn = tc.get("function", {})
+        error = (
+            f"tool timed out after {budget_s:g}s"
+            if not task.done()
+            else f"tool failed: {task.exception()}"
+        )
+        out.append(
+            {
+                "name": fn.get("name", ""),
+                "args": {},
+                "result": {"success": False, "error": error},
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        )
+    return out
+
+
+def _agent_messages(
+    messages: list[dict[str, str]], system_prompt: str | None
+) -> list[dict[str, Any]]:
+    return [
+        {"role": "system", "content": system_prompt or VIENNA_SYSTEM_PREPROMPT},
+        *[
+            {"role": m.get("role", "user"), "content": m.get("content", "")}
+            for m in messages
+            if m.get("content")
+        ],
+    ]
+
+
+def _short_result(result: Any) -> Any:
+    return (
+        {k: v for k, v in result.items() if k != "items"}
+        if isinstance(result, dict)
+        else result
+    )
+
+
+def _record_turn(
+    content: str,
+    tool_calls: list[dict[str, Any]],
+    results: list[dict[str, Any]],
+    wall_ms: float,
+    msgs: list[dict[str, Any]],
+    trace: list[dict[str, Any]],
+    turns: list[dict[str, Any]],
+) -> None:
+    """Append a finished tool turn to the conversation, trace and timings."""
+    msgs.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
+    for tc, r in zip(tool_calls, results, strict=True):
+        trace.append(
+            {
+                "tool": r["name"],
+                "args": r["args"],
+                "result": _short_result(r["result"]),
+                "ms": r["ms"],
+            }
+        )
+        msgs.append(
+            {
+                "role": "tool",
+                "tool_call_id": tc.get("id", ""),
+                "content": json.dumps(r["result"], default=str)[:4000],
+            }
+        )
+    serial_ms = sum(r["ms"] for r in results)
+    turns.append(
+        {
+            "tools": len(results),
+            "wall_ms": round(wall_ms, 1),
+            "serial_ms": round(serial_ms, 1),
+            "saved_ms": round(max(0.0, serial_ms - wall_ms), 1),
+        }
+    )
+
+
 async def run_agent(
     messages: list[dict[str, str]],
     system_prompt: str | None = None,
     max_iterations: int = MAX_AGENT_ITERATIONS,
+    model: str | None = None,
 ) -> dict[str, Any]:
-    """Chat with tool execution. Returns {ok, response, trace, tool_calls}."""
-    llm = resolve_llm()
+    """Chat with tool execution. Returns {ok, response, trace, tool_calls, turns}.
+
+    ``model`` pins the model; otherwise model_router picks one per turn.
+    """
+    started = time.perf_counter()
+    llm, decision = await llm_for_turn(messages, model)
     if llm is None:
         return {
             "ok": False,
             "error": "No LLM configured/reachable — start Ollama or set a provider in Settings",
         }
 
-    msgs: list[dict[str, Any]] = [
-        {"role": "system", "content": system_prompt or VIENNA_SYSTEM_PREPROMPT},
-        *[
-            {"role": m.get("role", "user"), "content": m.get("content", "")}
-            for m in messages
-            if m.get("content")
-        ],
-    ]
+    msgs = _agent_messages(messages, system_prompt)
+    tools = _tool_schemas(select_tools(messages))
     trace: list[dict[str, Any]] = []
+    turns: list[dict[str, Any]] = []
     final = ""
 
     for _ in range(max_iterations):
@@ -586,15 +952,11 @@ async def run_agent(
             "messages": msgs,
             "max_tokens": 2048,
             "stream": False,
-            "tools": _tool_schemas(),
+            "tools": tools,
             "tool_choice": "auto",
         }
         try:
-            import asyncio as _asyncio
-
-            message = await _asyncio.to_thread(
-                _chat_message, llm["url_base"], payload, llm["headers"]
-            )
+            message = await _chat_message(llm["url_base"], payload, llm["headers"])
         except Exception as e:  # noqa: BLE001
             logger.warning("agent LLM call failed: %s", e)
             return {"ok": False, "error": f"LLM call failed: {e}"}
@@ -605,45 +967,224 @@ async def run_agent(
         if not tool_calls:
             break
 
-        msgs.append(
-            {
-                "role": "assistant",
-                "content": message.get("content") or "",
-                "tool_calls": tool_calls,
-            }
+        # Calls within one turn are independent — run them concurrently and
+        # append the tool messages in the order the model issued them.
+        turn_started = time.perf_counter()
+        results = await _run_tool_calls(tool_calls, TOOL_BUDGET_S)
+        wall_ms = (time.perf_counter() - turn_started) * 1000
+        _record_turn(
+            message.get("content") or "",
+            tool_calls,
+            results,
+            wall_ms,
+            msgs,
+            trace,
+            turns,
         )
+
+    if not final:
+        final = "…" if trace else "No response."
+    total_ms = round((time.perf_counter() - started) * 1000, 1)
+    model_router.router_stats.observe(decision["route"], total_ms)
+    return {
+        "ok": True,
+        "response": final,
+        "trace": trace,
+        "tool_calls": len(trace),
+        "turns": turns,
+        "tools_offered": len(tools),
+        "model": llm["model"],
+        "route": decision["route"],
+    }
+
+
+# --- Streaming agent ----------------------------------------------------------
+
+
+def _stream_chat(
+    url_base: str, payload: dict, headers: dict[str, str], timeout: int = LLM_TIMEOUT
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the ``chat.completion.chunk`` objects of a streamed completion."""
+    return llm_http.stream_chat_completion(
+        url_base, payload, headers, total_timeout=timeout
+    )
+
+
+def _merge_tool_call_delta(calls: dict[int, dict[str, Any]], delta: dict) -> None:
+    """Fold one streamed ``tool_calls`` fragment into the per-index call.
+
+    OpenAI sends id + name once and the arguments string in pieces; Ollama
+    sends each call whole (sometimes with arguments as an object).
+    """
+    index = delta.get("index", len(calls))
+    slot = calls.setdefault(
+        index, {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
+    )
+    if delta.get("id"):
+        slot["id"] = delta["id"]
+    fn = delta.get("function") or {}
+    if fn.get("name"):
+        slot["function"]["name"] = fn["name"]
+    args = fn.get("arguments")
+    if args:
+        slot["function"]["arguments"] += (
+            args if isinstance(args, str) else json.dumps(args)
+        )
+
+
+async def stream_agent(
+    messages: list[dict[str, str]],
+    system_prompt: str | None = None,
+    max_iterations: int = MAX_AGENT_ITERATIONS,
+    model: str | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """run_agent as an event stream.
+
+    Yields ``start``, then per iteration ``token`` events (content deltas as
+    the model produces them), ``tool_start`` / ``tool_result`` as tools
+    launch and finish, and finally ``done`` — the run_agent result plus
+    ``timing`` (ttfb_ms: first byte from the LLM, ttft_ms: first content
+    token, total_ms) — or ``error``.
+    """
+    started = time.perf_counter()
+
+    def elapsed() -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    llm, decision = await llm_for_turn(messages, model)
+    if llm is None:
+        yield {
+            "type": "error",
+            "error": "No LLM configured/reachable — start Ollama or set a provider in Settings",
+        }
+        return
+    yield {
+        "type": "start",
+        "provider": llm["provider"],
+        "model": llm["model"],
+        "route": decision["route"],
+    }
+
+    msgs = _agent_messages(messages, system_prompt)
+    tools = _tool_schemas(select_tools(messages))
+    trace: list[dict[str, Any]] = []
+    turns: list[dict[str, Any]] = []
+    timing: dict[str, float | None] = {"ttfb_ms": None, "ttft_ms": None}
+    final = ""
+
+    for iteration in range(max_iterations):
+        payload: dict[str, Any] = {
+            "model": llm["model"],
+            "messages": msgs,
+            "max_tokens": 2048,
+            "stream": True,
+            "tools": tools,
+            "tool_choice": "auto",
+        }
+        parts: list[str] = []
+        calls: dict[int, dict[str, Any]] = {}
+        try:
+            async for chunk in _stream_chat(llm["url_base"], payload, llm["headers"]):
+                if timing["ttfb_ms"] is None:
+                    timing["ttfb_ms"] = elapsed()
+                delta = (chunk.get("choices") or [{}])[0].get("delta") or {}
+                if text := delta.get("content"):
+                    if timing["ttft_ms"] is None:
+                        timing["ttft_ms"] = elapsed()
+                    parts.append(text)
+                    yield {"type": "token", "iteration": iteration, "text": text}
+                for d in delta.get("tool_calls") or []:
+                    _merge_tool_call_delta(calls, d)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("agent LLM stream failed: %s", e)
+            yield {"type": "error", "error": f"LLM call failed: {e}"}
+            return
+
+        content = "".join(parts)
+        if content:
+            final = content
+        tool_calls = [calls[i] for i in sorted(calls)]
+        if not tool_calls:
+            break
+
         for tc in tool_calls:
-            fn = tc.get("function", {})
-            name = fn.get("name", "")
-            try:
-                args = json.loads(fn.get("arguments") or "{}")
-            except json.JSONDecodeError:
-                args = {}
-            result = await execute_tool(name, args)
-            short = (
-                {k: v for k, v in result.items() if k != "items"}
-                if isinstance(result, dict)
-                else result
-            )
-            trace.append({"tool": name, "args": args, "result": short})
-            msgs.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": tc.get("id", ""),
-                    "content": json.dumps(result, default=str)[:4000],
-                }
-            )
+            yield {
+                "type": "tool_start",
+                "id": tc["id"],
+                "tool": tc["function"]["name"],
+                "arguments": tc["function"]["arguments"],
+            }
+        completed: asyncio.Queue = asyncio.Queue()
+        turn_started = time.perf_counter()
+        runner = asyncio.ensure_future(
+            _run_tool_calls(tool_calls, TOOL_BUDGET_S, completed)
+        )
+        reported: set[int] = set()
+        getter: asyncio.Future | None = None
+        try:
+            while len(reported) < len(tool_calls):
+                getter = asyncio.ensure_future(completed.get())
+                await asyncio.wait(
+                    {getter, runner}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getter.done():
+                    break
+                i, entry = getter.result()
+                reported.add(i)
+                yield _tool_result_event(tool_calls[i], entry)
+            results = await runner
+            for i, entry in enumerate(results):  # budget stragglers
+                if i not in reported:
+                    yield _tool_result_event(tool_calls[i], entry)
+        finally:  # also runs when the client disconnects mid-turn
+            for task in (getter, runner):
+                if task is not None and not task.done():
+                    task.cancel()
+        _record_turn(
+            content,
+            tool_calls,
+            results,
+            (time.perf_counter() - turn_started) * 1000,
+            msgs,
+            trace,
+            turns,
+        )
 
     if not final:
         final = "…" if trace else "No response."
-    return {"ok": True, "response": final, "trace": trace, "tool_calls": len(trace)}
+    total_ms = elapsed()
+    model_router.router_stats.observe(decision["route"], total_ms, timing["ttft_ms"])
+    yield {
+        "type": "done",
+        "ok": True,
+        "response": final,
+        "trace": trace,
+        "tool_calls": len(trace),
+        "turns": turns,
+        "tools_offered": len(tools),
+        "model": llm["model"],
+        "route": decision["route"],
+        "timing": {**timing, "total_ms": total_ms},
+    }
+
+
+def _tool_result_event(tc: dict[str, Any], entry: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "type": "tool_result",
+        "id": tc.get("id", ""),
+        "tool": entry["name"],
+        "result": _short_result(entry["result"]),
+        "ms": entry["ms"],
+    }
 
 
 # --- Single-shot PA calls -----------------------------------------------------
 
 
-def _completion(system: str, user: str, max_tokens: int = 1200) -> str | None:
-    llm = resolve_llm()
+async def _completion(
+    system: str, user: str, max_tokens: int = 1200, task: str = "answer"
+) -> str | None:
+    llm = await llm_for(task)
     if llm is None:
         return None
     payload = {
@@ -656,28 +1197,40 @@ def _completion(system: str, user: str, max_tokens: int = 1200) -> str | None:
         "stream": False,
     }
     try:
-        message = _chat_message(llm["url_base"], payload, llm["headers"])
+        with llm_ledger.task(task):
+            message = await _chat_message(llm["url_base"], payload, llm["headers"])
         return (message.get("content") or "").strip() or None
     except Exception as e:  # noqa: BLE001
         logger.warning("PA completion failed: %s", e)
         return None
 
 
-def generate_brief(context_md: str) -> str | None:
+async def summarize_turns(previous: str, messages: list[dict[str, Any]]) -> str | None:
+    """Fold chat turns into the rolling conversation summary."""
+    return await _completion(
+        chat_memory.SUMMARY_PROMPT,
+        chat_memory.summary_request(previous, messages),
+        max_tokens=500,
+        task="summary",
+    )
+
+
+async def generate_brief(context_md: str) -> str | None:
     """LLM morning brief over real life context."""
-    return _completion(
+    return await _completion(
         "You are ViLife, Sandra's personal assistant in Vienna (Alsergrund). "
         "Produce a warm, practical morning brief from the life context. Use headings, "
         "keep it under 30 lines: what matters today (calendar, health, trips), what to "
         "watch (renewals, birthdays, refills), one small suggestion. Plain markdown.",
         f"Life context:\n\n{context_md}",
         max_tokens=1500,
+        task="brief",
     )
 
 
-def answer_question(question: str, context_md: str) -> str | None:
+async def answer_question(question: str, context_md: str) -> str | None:
     """NL question over life data."""
-    return _completion(
+    return await _completion(
         "You are ViLife, Sandra's personal assistant in Vienna. Answer the question "
         "using ONLY the life context provided. If the answer is not in the context, say "
         "so and suggest the closest tool that could fetch it. Be concise.",
@@ -16,10 +16,12 @@ from pathlib import Path
 from typing import Any
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from vienna_life_assistant import life_db, pa_agent
+from vienna_life_assistant import chat_memory, life_db, llm_scheduler, pa_agent
 from vienna_life_assistant.db import SessionLocal, get_db
+from vienna_life_assistant.fast_json import dumps
 from vienna_life_assistant.models import CalendarEvent, DoctorVisit, Subscription, Todo
 from vienna_life_assistant.vienna_context import VIENNA_SYSTEM_PREPROMPT
 
@@ -301,12 +303,12 @@ def save_state(state: dict[str, Any]) -> None:
 async def regenerate_brief(db: Session) -> dict[str, Any]:
     """Generate the daily brief: rule alerts + LLM prose (fallback = alerts).
 
-    The LLM call runs in a thread — a blocking urlopen on the event loop
-    would stall every request for the model-load duration.
+    The LLM call is async (pooled httpx) — it never blocks the event loop
+    for the model-load duration.
     """
     alerts = pa_alerts(db)
     ctx_md = context_markdown(db)
-    brief = await asyncio.to_thread(pa_agent.generate_brief, ctx_md)
+    brief = await pa_agent.generate_brief(ctx_md)
     if not brief:
         brief = (
             "## ViLife brief\n\n"
@@ -376,7 +378,8 @@ async def pa_get_state() -> dict[str, Any]:
 
 @router.post("/refresh")
 async def pa_refresh(db: Session = Depends(get_db)) -> dict[str, Any]:
-    state = await regenerate_brief(db)
+    with llm_scheduler.priority("standard"):
+        state = await regenerate_brief(db)
     return {"ok": True, **state}
 
 
@@ -391,7 +394,7 @@ async def pa_ask(body: dict[str, Any], db: Session = Depends(get_db)) -> dict[st
     try:
         from vienna_life_assistant import rag
 
-        memory = rag.semantic_search(db, question, limit=3)
+        memory = await asyncio.to_thread(rag.semantic_search, db, question, 3)
         if memory:
             lines = ["\n## Journal memory (semantic matches)"]
             lines += [
@@ -401,7 +404,7 @@ async def pa_ask(body: dict[str, Any], db: Session = Depends(get_db)) -> dict[st
             ctx += "\n" + "\n".join(lines)
     except Exception as e:  # noqa: BLE001 — RAG is best-effort
         logger.warning("journal memory injection failed: %s", e)
-    answer = await asyncio.to_thread(pa_agent.answer_question, question, ctx)
+    answer = await pa_agent.answer_question(question, ctx)
     if answer is None:
         return {
             "ok": False,
@@ -414,7 +417,7 @@ async def pa_ask(body: dict[str, Any], db: Session = Depends(get_db)) -> dict[st
 async def pa_rag_search(q: str, db: Session = Depends(get_db)) -> dict[str, Any]:
     from vienna_life_assistant import rag
 
-    hits = rag.semantic_search(db, q, limit=5)
+    hits = await asyncio.to_thread(rag.semantic_search, db, q, 5)
     return {"ok": True, "count": len(hits), "entries": hits}
 
 
@@ -422,17 +425,12 @@ async def pa_rag_search(q: str, db: Session = Depends(get_db)) -> dict[str, Any]
 async def pa_rag_reindex(db: Session = Depends(get_db)) -> dict[str, Any]:
     from vienna_life_assistant import rag
 
-    n = rag.reindex_all(db)
+    with llm_scheduler.priority("background"):
+        n = await asyncio.to_thread(rag.reindex_all, db)
     return {"ok": True, "reindexed": n}
 
 
-@router.post("/chat")
-async def pa_chat(body: dict[str, Any]) -> dict[str, Any]:
-    """Agent chat: LLM + tool execution over life data."""
-    messages = body.get("messages") or []
-    if not messages or not messages[-1].get("content"):
-        return {"ok": False, "error": "messages with content required"}
-
+def _chat_system(body: dict[str, Any], summary: str = "") -> str:
     personality = body.get("personality") or {}
     custom_prompt = body.get("custom_prompt") or ""
     if custom_prompt:
@@ -442,11 +440,71 @@ async def pa_chat(body: dict[str, Any]) -> dict[str, Any]:
         if personality.get("prompt"):
             system += f"\n\n## Role\n{personality['prompt']}"
     system += f"\n\n## Life context (live data — trust this over memory)\n{context_markdown_memo()}"
+    if summary:
+        system += f"\n\n## Earlier in this conversation (summary)\n{summary}"
+    return system
+
+
+async def _bounded_chat(
+    body: dict[str, Any],
+) -> tuple[list[dict[str, Any]], str] | None:
+    """Validated messages trimmed to the model's history budget + system prompt.
 
-    result = await pa_agent.run_agent(messages, system_prompt=system)
+    Older turns are folded into a rolling summary that rides in the system
+    prompt, so the prompt stays flat however long the session gets.
+    """
+    messages = body.get("messages") or []
+    if not messages or not messages[-1].get("content"):
+        return None
+    llm = await pa_agent.aresolve_llm()
+    summary, recent = await chat_memory.bounded_history(
+        messages, llm["model"] if llm else None, pa_agent.summarize_turns
+    )
+    return recent, _chat_system(body, summary)
+
+
+@router.post("/chat")
+async def pa_chat(body: dict[str, Any]) -> dict[str, Any]:
+    """Agent chat: LLM + tool execution over life data.
+
+    The model is routed per turn by request complexity (model_router);
+    ``model`` in the body pins one for the conversation.
+    """
+    bounded = await _bounded_chat(body)
+    if bounded is None:
+        return {"ok": False, "error": "messages with content required"}
+    messages, system = bounded
+    result = await pa_agent.run_agent(
+        messages, system_prompt=system, model=body.get("model")
+    )
     return result
 
 
+@router.post("/chat/stream", response_model=None)
+async def pa_chat_stream(body: dict[str, Any]) -> StreamingResponse | dict[str, Any]:
+    """Agent chat as NDJSON events — tokens and tool progress as they happen.
+
+    One JSON object per line: start, token, tool_start, tool_result, then
+    done (the /chat result + timing) or error.
+    """
+    bounded = await _bounded_chat(body)
+    if bounded is None:
+        return {"ok": False, "error": "messages with content required"}
+    messages, system = bounded
+
+    async def generate():
+        async for event in pa_agent.stream_agent(
+            messages, system_prompt=system, model=body.get("model")
+        ):
+            yield dumps(event) + b"\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # context_markdown needs a session; keep a light memo per request via lru-free helper
 def context_markdown_memo() -> str:
     from vienna_life_assistant.db import SessionLocal
@@ -470,7 +528,7 @@ async def scheduler_loop() -> None:
                 today = date.today().isoformat()
                 if state.get("date") != today:
                     async with _REFRESH_LOCK:
-                        with SessionLocal() as db:
+                        with SessionLocal() as db, llm_scheduler.priority("background"):
                             await regenerate_brief(db)
                     logger.info("PA brief regenerated for %s", today)
         except Exception as e:  # noqa: BLE001 — scheduler must survive
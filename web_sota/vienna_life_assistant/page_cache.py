@@ -0,0 +1,267 @@
+"""Disk-backed cache of scraped pages with conditional revalidation.
+
+Pages live in one SQLite file (``VILIFE_HTTP_CACHE_PATH``, default
+``~/.cache/vienna-life-assistant/http_cache.sqlite3``) together with the
+``ETag`` and ``Last-Modified`` the site sent, so a restart or a second
+worker reads pages from disk instead of fetching every site again. The
+backend's Spar/Billa scrapers keep the same table in the same default file
+(backend/services/http_cache.py); this copy exists because the MCPB bundle
+ships without the backend, so keep the schema in step with it.
+
+``get(url, max_age=..., stale_while_revalidate=...)``:
+
+* younger than ``max_age`` — served from disk, no request (hit)
+* within the stale window — served from disk at once while a background
+  task revalidates it (stale)
+* older — a conditional GET (``If-None-Match`` / ``If-Modified-Since``);
+  304 renews the stored page without transferring it (revalidated), 200
+  replaces it (miss)
+* a failed refetch of a stored page serves the old copy (stale_error)
+
+Another process may hold the file's write lock (up to the 5 s busy
+timeout), so the async paths run their SQLite calls in a worker thread.
+``stats`` is synchronous; call it from sync route handlers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger("vienna-life-assistant.page-cache")
+
+DEFAULT_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "vienna-life-assistant"
+    / "http_cache.sqlite3"
+)
+MAX_ENTRIES = 500
+MAX_BODY_BYTES = 5_000_000
+OUTCOMES = ("hit", "stale", "revalidated", "miss", "stale_error", "error")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    encoding TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    validated_at REAL NOT NULL
+)
+"""
+
+
+class PageCache:
+    """Pages on disk, revalidated with conditional GETs."""
+
+    def __init__(
+        self, path: str | Path | None = None, max_entries: int = MAX_ENTRIES
+    ) -> None:
+        self.path = Path(
+            path or os.environ.get("VILIFE_HTTP_CACHE_PATH") or DEFAULT_PATH
+        )
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._counts: Counter[str] = Counter()
+        self._background: Counter[str] = Counter()  # not lookups
+        self._bytes_saved = 0
+        self._revalidating: dict[str, asyncio.Task] = {}
+
+    # --- Storage ---
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")  # backend + web_sota at once
+            db.execute(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def _load(self, url: str) -> sqlite3.Row | None:
+        with self._lock:
+            return (
+                self._conn()
+                .execute("SELECT * FROM pages WHERE url = ?", (url,))
+                .fetchone()
+            )
+
+    def _store(self, url: str, response: httpx.Response) -> None:
+        with self._lock, self._conn() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.content,
+                    response.encoding,
+                    response.headers.get("etag"),
+                    response.headers.get("last-modified"),
+                    time.time(),
+                ),
+            )
+            db.execute(
+                "DELETE FROM pages WHERE url NOT IN "
+                "(SELECT url FROM pages ORDER BY validated_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def _touch(self, url: str) -> None:
+        with self._lock, self._conn() as db:
+            db.execute(
+                "UPDATE pages SET validated_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    @staticmethod
+    def _text(entry: sqlite3.Row) -> str:
+        return bytes(entry["body"]).decode(entry["encoding"] or "utf-8", "replace")
+
+    def _count(
+        self,
+        outcome: str,
+        entry: sqlite3.Row | None = None,
+        background: bool = False,
+    ) -> None:
+        with self._lock:
+            (self._background if background else self._counts)[outcome] += 1
+            if entry is not None:
+                self._bytes_saved += len(entry["body"])
+
+    # --- Fetching ---
+
+    async def get(
+        self,
+        url: str,
+        *,
+        max_age: float,
+        stale_while_revalidate: float = 0.0,
+        headers: dict[str, str] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> tuple[str, str]:
+        """Body of ``url`` and how it was served (one of ``OUTCOMES``).
+
+        Raises httpx.HTTPError only when the fetch fails and nothing is
+        stored for ``url``.
+        """
+        entry = await asyncio.to_thread(self._load, url)
+        if entry is not None:
+            age = time.time() - entry["validated_at"]
+            if age < max_age:
+                self._count("hit", entry)
+                return self._text(entry), "hit"
+            if age < max_age + stale_while_revalidate:
+                self._count("stale", entry)
+                # the caller's client (and its User-Agent) is gone by then
+                inherited = dict(client.headers) if client is not None else {}
+                self._revalidate_later(url, {**inherited, **(headers or {})})
+                return self._text(entry), "stale"
+        try:
+            return await self._fetch(url, entry, headers, client)
+        except httpx.HTTPError as e:
+            if entry is None:
+                self._count("error")
+                raise
+            logger.warning("refetch of %s failed, serving cached copy: %s", url, e)
+            self._count("stale_error", entry)
+            return self._text(entry), "stale_error"
+
+    async def _fetch(
+        self,
+        url: str,
+        entry: sqlite3.Row | None,
+        headers: dict[str, str] | None,
+        client: httpx.AsyncClient | None,
+        background: bool = False,
+    ) -> tuple[str, str]:
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        if client is None:
+            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as own:
+                response = await own.get(url, headers=request_headers)
+        else:
+            response = await client.get(url, headers=request_headers)
+
+        if response.status_code == 304 and entry is not None:
+            await asyncio.to_thread(self._touch, url)
+            self._count("revalidated", entry, background)
+            return self._text(entry), "revalidated"
+        response.raise_for_status()
+        self._count("miss", background=background)
+        cacheable = "no-store" not in response.headers.get("cache-control", "")
+        if cacheable and len(response.content) <= MAX_BODY_BYTES:
+            await asyncio.to_thread(self._store, url, response)
+        return response.text, "miss"
+
+    def _revalidate_later(self, url: str, headers: dict[str, str] | None) -> None:
+        """Background conditional GET, one per URL at a time."""
+        loop = asyncio.get_running_loop()
+        task = self._revalidating.get(url)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._revalidating[url] = loop.create_task(self._revalidate(url, headers))
+
+    async def _revalidate(self, url: str, headers: dict[str, str] | None) -> None:
+        try:
+            entry = await asyncio.to_thread(self._load, url)
+            await self._fetch(url, entry, headers, None, background=True)
+        except Exception as e:  # noqa: BLE001 — the stale copy stays
+            self._count("error", background=True)
+            logger.warning("background revalidation of %s failed: %s", url, e)
+
+    # --- Reporting ---
+
+    def stats(self) -> dict[str, Any]:
+        """Lookup outcome counts since start, hit rate and bytes not downloaded.
+
+        Background revalidations are reported separately under
+        ``background``; the stale lookup that started one is the lookup.
+        """
+        with self._lock:
+            entries = self._conn().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            counts = {name: self._counts[name] for name in OUTCOMES}
+            background = {
+                name: self._background[name]
+                for name in ("revalidated", "miss", "error")
+            }
+            saved = self._bytes_saved
+        lookups = sum(counts.values())
+        from_cache = lookups - counts["miss"] - counts["error"]
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            **counts,
+            "hit_rate": round(from_cache / lookups, 3) if lookups else None,
+            "bytes_saved": saved,
+            "background": background,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared: PageCache | None = None
+
+
+def shared() -> PageCache:
+    """The process-wide cache (``VILIFE_HTTP_CACHE_PATH``)."""
+    global _shared
+    if _shared is None:
+        _shared = PageCache()
+    return _shared
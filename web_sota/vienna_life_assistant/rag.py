@@ -20,6 +20,7 @@ from sqlalchemy import delete as sa_delete
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from vienna_life_assistant.llm_scheduler import scheduler
 from vienna_life_assistant.models import JournalEmbedding, JournalEntry
 
 logger = logging.getLogger("vienna-life-assistant.rag")
@@ -31,7 +32,12 @@ _MAX_ENTRIES = 500
 
 
 def embed(text: str) -> list[float] | None:
-    """Embed text via Ollama /v1/embeddings; None when unavailable."""
+    """Embed text via Ollama /v1/embeddings; None when unavailable.
+
+    Waits for a slot on the LLM scheduler like every other Ollama call. The
+    wait and the request block the thread, so async callers run this (or
+    ``semantic_search`` / ``reindex_all``) via ``asyncio.to_thread``.
+    """
     try:
         payload = json.dumps({"model": EMBED_MODEL, "input": text[:4000]}).encode()
         req = Request(
@@ -39,7 +45,10 @@ def embed(text: str) -> list[float] | None:
             data=payload,
             headers={"Content-Type": "application/json"},
         )
-        with urlopen(req, timeout=EMBED_TIMEOUT) as resp:
+        with (
+            scheduler.slot_sync(EMBED_MODEL),
+            urlopen(req, timeout=EMBED_TIMEOUT) as resp,
+        ):
             data = json.loads(resp.read())
         vectors = data.get("data") or []
         if not vectors:
@@ -0,0 +1,317 @@
+"""Async scraping engine: concurrent sources, per-host limits, refresh-ahead.
+
+A *feature* (performances, news, …) is a list of *sources*. Each source is
+a coroutine that fetches and parses one site into a list of items.
+
+* **Concurrent** — all sources of a feature run at once on one shared
+  ``httpx.AsyncClient``; the feature's items are the sources' items in
+  source order.
+* **Per-host limits** — at most ``VILIFE_SCRAPE_PER_HOST`` (default 2)
+  requests to the same host at a time, however many features refresh.
+* **Partial results** — a source that errors or exceeds its timeout does not
+  sink the feature: its last good items are reused (marked ``stale`` in
+  ``status``) and the other sources' items are returned as usual.
+* **Refresh-ahead** — ``refresh_loop`` (app lifespan) re-scrapes a feature
+  once it is ``REFRESH_AT`` (80%) through its TTL, so handlers read a warm
+  cache. ``get`` only waits on a scrape when nothing was cached yet (cold
+  start), and then joins the refresh already in flight instead of starting
+  another. ``VILIFE_SCRAPE_REFRESH=0`` disables the loop.
+* **Disk cache** — pages go through ``page_cache`` (by default the same
+  SQLite file as the backend's Spar/Billa scrapers), so a restart or a
+  second worker reads pages from disk and refreshes revalidate with
+  conditional GETs. On a cold start a page up to one TTL past due is served
+  from disk at once and the feature is re-scraped on the next loop tick.
+  With ``VILIFE_SCRAPE_DISK_CACHE=0`` pages are fetched directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from vienna_life_assistant import page_cache
+from vienna_life_assistant.page_cache import PageCache
+
+logger = logging.getLogger("vienna-life-assistant.scrape")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+PER_HOST = int(os.environ.get("VILIFE_SCRAPE_PER_HOST", "2"))
+SOURCE_TIMEOUT_S = float(os.environ.get("VILIFE_SCRAPE_TIMEOUT_S", "15"))
+REFRESH_AT = 0.8  # fraction of the TTL after which the scheduler re-scrapes
+
+
+def disk_cache() -> PageCache | None:
+    """The shared disk page cache, or None when it is switched off."""
+    if os.environ.get("VILIFE_SCRAPE_DISK_CACHE", "1") == "0":
+        return None
+    return page_cache.shared()
+
+
+class Fetcher:
+    """Shared HTTP client for one refresh, with per-host concurrency limits.
+
+    With a ``cache``, pages younger than ``max_age`` come from disk and older
+    ones are revalidated; ``stale_s`` > 0 serves them up to that much older
+    without waiting (``served_stale`` is then set).
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limits: dict[str, asyncio.Semaphore],
+        per_host: int,
+        cache: PageCache | None = None,
+        max_age: float = 0.0,
+        stale_s: float = 0.0,
+    ) -> None:
+        self.client = client
+        self._limits = limits
+        self._per_host = per_host
+        self.cache = cache
+        self.max_age = max_age
+        self.stale_s = stale_s
+        self.served_stale = False
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self._limits:
+            self._limits[host] = asyncio.Semaphore(self._per_host)
+        return self._limits[host]
+
+    async def text(self, url: str) -> str:
+        """Body of ``url``; raises on network errors and non-2xx answers."""
+        async with self.host_slot(url):
+            if self.cache is None:
+                resp = await self.client.get(url)
+                resp.raise_for_status()
+                return resp.text
+            text, outcome = await self.cache.get(
+                url,
+                max_age=self.max_age,
+                stale_while_revalidate=self.stale_s,
+                client=self.client,
+            )
+            self.served_stale |= outcome == "stale"
+            return text
+
+
+SourceFn = Callable[[Fetcher], Awaitable[list]]
+
+
+class Source:
+    __slots__ = ("fetch", "name", "timeout")
+
+    def __init__(
+        self, name: str, fetch: SourceFn, timeout: float = SOURCE_TIMEOUT_S
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.timeout = timeout
+
+
+class Feature:
+    __slots__ = ("key", "sources", "ttl")
+
+    def __init__(self, key: str, ttl: float, sources: list[Source]) -> None:
+        self.key = key
+        self.ttl = ttl
+        self.sources = sources
+
+
+class _Entry:
+    __slots__ = ("fetched_at", "items", "report")
+
+    def __init__(self, items: list, report: dict[str, dict[str, Any]]) -> None:
+        self.fetched_at = time.time()
+        self.items = items
+        self.report = report
+
+
+class ScrapeEngine:
+    """Cache of scraped features, refreshed concurrently and ahead of expiry."""
+
+    def __init__(
+        self,
+        features: list[Feature],
+        per_host: int = PER_HOST,
+        cache: PageCache | None = None,
+    ) -> None:
+        self.features = {f.key: f for f in features}
+        self.per_host = max(1, per_host)
+        self._disk = cache  # resolved to ``disk_cache()`` on first scrape
+        self._disk_resolved = cache is not None
+        self._cache: dict[str, _Entry] = {}
+        self._last_good: dict[tuple[str, str], list] = {}
+        # Loop-bound state, reset when used from a new event loop
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._limits: dict[str, asyncio.Semaphore] = {}
+
+    # --- Reading ---
+
+    async def get(self, key: str) -> list:
+        """Cached items of ``key``; only waits on a scrape on a cold cache."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return await self.refresh(key)
+        if self._due(key):
+            self._spawn(key)  # stale-while-revalidate if the loop is not running
+        return entry.items
+
+    def get_sync(self, key: str) -> list:
+        """``get`` for callers outside an event loop (scripts, CLI)."""
+        entry = self._cache.get(key)
+        if (
+            entry is not None
+            and time.time() - entry.fetched_at < self.features[key].ttl
+        ):
+            return entry.items
+        return asyncio.run(self.refresh(key))
+
+    def status(self) -> dict[str, Any]:
+        """Age, TTL and per-source outcome of the last scrape per feature."""
+        now = time.time()
+        out: dict[str, Any] = {}
+        for key, feature in self.features.items():
+            entry = self._cache.get(key)
+            task = self._inflight.get(key)
+            out[key] = {
+                "ttl_s": feature.ttl,
+                "age_s": round(now - entry.fetched_at, 1) if entry else None,
+                "items": len(entry.items) if entry else 0,
+                "refreshing": task is not None and not task.done(),
+                "sources": entry.report if entry else {},
+            }
+        return out
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        """Hit rate of the disk page cache, None when scraping without it."""
+        disk = self._disk_cache()
+        return disk.stats() if disk is not None else None
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._last_good.clear()
+
+    # --- Refreshing ---
+
+    async def refresh(self, key: str) -> list:
+        """Scrape ``key`` now, joining a refresh that is already running."""
+        return await asyncio.shield(self._spawn(key))
+
+    def _spawn(self, key: str) -> asyncio.Task:
+        self._bind_loop()
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._scrape(self.features[key]))
+            self._inflight[key] = task
+        return task
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._inflight = {}
+            self._limits = {}
+
+    def _disk_cache(self) -> PageCache | None:
+        if not self._disk_resolved:
+            self._disk = disk_cache()
+            self._disk_resolved = True
+        return self._disk
+
+    def _due(self, key: str) -> bool:
+        entry = self._cache.get(key)
+        if entry is None:
+            return True
+        return time.time() - entry.fetched_at >= self.features[key].ttl * REFRESH_AT
+
+    async def _scrape(self, feature: Feature) -> list:
+        started = time.perf_counter()
+        async with httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=SOURCE_TIMEOUT_S,
+            follow_redirects=True,
+        ) as client:
+            fetcher = Fetcher(
+                client,
+                self._limits,
+                self.per_host,
+                cache=self._disk_cache(),
+                max_age=feature.ttl * REFRESH_AT,
+                # cold start: show what is on disk now, re-scrape next tick
+                stale_s=feature.ttl if feature.key not in self._cache else 0.0,
+            )
+            outcomes = await asyncio.gather(
+                *(self._run_source(feature, s, fetcher) for s in feature.sources)
+            )
+        items: list = []
+        report: dict[str, dict[str, Any]] = {}
+        for source, (found, outcome) in zip(feature.sources, outcomes, strict=True):
+            items.extend(found)
+            report[source.name] = outcome
+        entry = self._cache[feature.key] = _Entry(items, report)
+        if fetcher.served_stale:
+            entry.fetched_at -= feature.ttl * REFRESH_AT  # due now
+        logger.info(
+            "%s: %d items from %d sources in %.0f ms",
+            feature.key,
+            len(items),
+            len(feature.sources),
+            (time.perf_counter() - started) * 1000,
+        )
+        return items
+
+    async def _run_source(
+        self, feature: Feature, source: Source, fetcher: Fetcher
+    ) -> tuple[list, dict[str, Any]]:
+        started = time.perf_counter()
+        slot = (feature.key, source.name)
+        try:
+            items = await asyncio.wait_for(source.fetch(fetcher), source.timeout)
+        except Exception as e:  # noqa: BLE001 — one bad source must not sink the feature
+            status = "timeout" if isinstance(e, TimeoutError) else "error"
+            logger.warning(
+                "%s/%s %s: %s", feature.key, source.name, status, e or type(e).__name__
+            )
+            stale = self._last_good.get(slot, [])
+            return stale, {
+                "status": status,
+                "error": str(e) or type(e).__name__,
+                "ms": round((time.perf_counter() - started) * 1000),
+                "items": len(stale),
+                "stale": bool(stale),
+            }
+        self._last_good[slot] = items
+        return items, {
+            "status": "ok",
+            "ms": round((time.perf_counter() - started) * 1000),
+            "items": len(items),
+        }
+
+    async def refresh_loop(self, tick: float = 30.0) -> None:
+        """Re-scrape every feature before it expires (app lifespan)."""
+        if os.environ.get("VILIFE_SCRAPE_REFRESH", "1") == "0":
+            return
+        while True:
+            due = [key for key in self.features if self._due(key)]
+            if due:
+                await asyncio.gather(
+                    *(self.refresh(k) for k in due), return_exceptions=True
+                )
+            await asyncio.sleep(min(tick, self._next_due_in()))
+
+    def _next_due_in(self) -> float:
+        now = time.time()
+        waits = [
+            entry.fetched_at + self.features[key].ttl * REFRESH_AT - now
+            for key, entry in self._cache.items()
+        ]
+        return max(1.0, min(waits, default=1.0))
@@ -15,12 +15,21 @@ from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from vienna_life_assistant.activity_log import install_log_handler, log_activity
+from vienna_life_assistant import llm_http, llm_ledger, pa_agent
+from vienna_life_assistant.activity_log import (
+    flush_log_handler,
+    install_log_handler,
+    install_log_spool,
+    log_activity,
+    uninstall_log_spool,
+)
 from vienna_life_assistant.capabilities import build_capabilities
 from vienna_life_assistant.db import init_db
 from vienna_life_assistant.email_routes import router as email_router
 from vienna_life_assistant.environment_routes import router as environment_router
 from vienna_life_assistant.fleet_overview import build_fleet_overview
+from vienna_life_assistant.http_cache import ConditionalGetMiddleware
+from vienna_life_assistant.life_db import data_version
 from vienna_life_assistant.life_db_routes import (
     condition_routes,
     contact_routes,
@@ -59,6 +68,7 @@ logger = logging.getLogger("vienna-life-assistant.server")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle management for the SOTA backend"""
+    install_log_spool()  # no-op unless VILIFE_LOG_SPOOL=1
     install_log_handler()
     log_activity("system", "ViLife backend starting", level="INFO")
     logger.info("Vienna SOTA Backend starting...")
@@ -94,17 +104,28 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error("Database initialization failed: %s", e)
 
-    # Start the PA daily-brief scheduler
+    # Start the PA daily-brief scheduler + keep the LLM provider choice warm
     _scheduler_task = asyncio.create_task(scheduler_loop())
+    _llm_refresher = asyncio.create_task(pa_agent.llm_refresher_loop())
+    _ledger_writer = asyncio.create_task(llm_ledger.flush_loop())
+    # Scrape Vienna feeds ahead of their TTL so handlers read a warm cache
+    from vienna_life_assistant.vienna_scraper import engine as scrape_engine
+
+    _scrape_refresher = asyncio.create_task(scrape_engine.refresh_loop())
 
     yield
     logger.info("Vienna SOTA Backend shutting down...")
 
-    _scheduler_task.cancel()
-    try:
-        await _scheduler_task
-    except (asyncio.CancelledError, Exception):  # noqa: BLE001
-        pass
+    for task in (_scheduler_task, _llm_refresher, _ledger_writer, _scrape_refresher):
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):  # noqa: BLE001
+            pass
+    await llm_http.aclose_clients()
+    llm_ledger.flush()
+    flush_log_handler()
+    uninstall_log_spool()
 
 
 _scheduler_task: asyncio.Task | None = None
@@ -116,6 +137,17 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Conditional GET + compression for polled reads. Added before CORS so CORS
+# stays outermost and 304s still carry Access-Control-* headers.
+app.add_middleware(
+    ConditionalGetMiddleware,
+    versions={
+        "/api/dashboard": data_version,
+        "/api/life/overview": data_version,
+        "/api/pa/context": data_version,
+    },
+)
+
 # CORS Middleware — fleet standard (Tauri + Tailscale + LAN + localhost)
 _tauri_desktop = os.environ.get("VIENNA_LIFE_ASSISTANT_TAURI", "").lower() in (
     "1",
@@ -243,6 +275,7 @@ async def api_update_llm_settings(body: dict):
             os.environ[env] = str(body[key])
     if body.get("openai_api_key"):
         os.environ["OPENAI_API_KEY"] = str(body["openai_api_key"])
+    pa_agent.invalidate_llm_cache()
     return {"ok": True, "message": "LLM settings saved for this session"}
 
 
@@ -427,8 +460,9 @@ async def get_coffee_houses():
 @app.get("/api/vienna/restaurants")
 async def get_restaurants():
     """Get favorite Vienna restaurants with today's lunch menus."""
-    from vienna_life_assistant.vienna_scraper import fetch_lunch_menus
+    from vienna_life_assistant.vienna_scraper import engine
 
+    lunch_menus = await engine.get("lunch")
     return {
         "restaurants": [
             {
@@ -450,16 +484,16 @@ async def get_restaurants():
             {"name": "Plachutta", "address": "Wollzeile 38, 1010 Wien"},
             {"name": "Meissl & Schadn", "address": "Mariahilfer Straße 64, 1070 Wien"},
         ],
-        "lunch_menus": fetch_lunch_menus(),
+        "lunch_menus": lunch_menus,
     }
 
 
 @app.get("/api/vienna/music", response_model=list[Concert])
 async def get_music_events():
     """Get scheduled performances from Burgtheater."""
-    from vienna_life_assistant.vienna_scraper import fetch_performances
+    from vienna_life_assistant.vienna_scraper import engine
 
-    events = fetch_performances()
+    events = await engine.get("performances")
     return [
         {
             "venue": e["venue"],
@@ -474,9 +508,9 @@ async def get_music_events():
 @app.get("/api/vienna/museums", response_model=list[Exhibition])
 async def get_museum_exhibitions():
     """Get current museum exhibitions — scraped live from museum websites."""
-    from vienna_life_assistant.vienna_scraper import fetch_exhibitions
+    from vienna_life_assistant.vienna_scraper import engine
 
-    exhibitions = fetch_exhibitions()
+    exhibitions = await engine.get("exhibitions")
     return [
         {"museum": e["museum"], "title": e["title"], "dates": e.get("dates", "Current")}
         for e in exhibitions
@@ -486,17 +520,33 @@ async def get_museum_exhibitions():
 @app.get("/api/vienna/news")
 async def get_vienna_news():
     """Vienna headlines from wien.ORF.at (public broadcaster)."""
-    from vienna_life_assistant.vienna_scraper import fetch_news
+    from vienna_life_assistant.vienna_scraper import engine
 
-    return fetch_news()
+    return await engine.get("news")
 
 
 @app.get("/api/vienna/press")
 async def get_vienna_press():
     """City government announcements from presse.wien.gv.at."""
-    from vienna_life_assistant.vienna_scraper import fetch_press
+    from vienna_life_assistant.vienna_scraper import engine
+
+    return await engine.get("press")
+
+
+@app.get("/api/vienna/sources")
+async def get_scrape_status():
+    """Age and per-source outcome of the cached Vienna feeds."""
+    from vienna_life_assistant.vienna_scraper import engine
+
+    return engine.status()
+
+
+@app.get("/api/vienna/sources/cache")
+def get_scrape_cache_stats():
+    """Hit rate of the disk page cache shared with the backend's store scrapers."""
+    from vienna_life_assistant.vienna_scraper import engine
 
-    return fetch_press()
+    return engine.cache_stats() or {"enabled": False}
 
 
 @app.get("/api/vienna/transport")
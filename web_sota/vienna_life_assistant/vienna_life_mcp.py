@@ -7,6 +7,7 @@ are editable through both MCP and REST. Seed data is loaded on first run.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import date
 from pathlib import Path
@@ -941,8 +942,9 @@ async def vienna_log(
             return _error_response("search_semantic requires query", "validation")
         from vienna_life_assistant import rag
 
+        # embed() waits for a scheduler slot and calls Ollama synchronously
         with SessionLocal() as db:
-            hits = rag.semantic_search(db, query)
+            hits = await asyncio.to_thread(rag.semantic_search, db, query)
         return {
             "success": True,
             "message": f"{len(hits)} semantic matches",
@@ -950,10 +952,10 @@ async def vienna_log(
         }
 
     if operation == "reindex":
-        from vienna_life_assistant import rag
+        from vienna_life_assistant import llm_scheduler, rag
 
-        with SessionLocal() as db:
-            n = rag.reindex_all(db)
+        with SessionLocal() as db, llm_scheduler.priority("background"):
+            n = await asyncio.to_thread(rag.reindex_all, db)
         return {
             "success": True,
             "message": f"Reindexed {n} journal entries",
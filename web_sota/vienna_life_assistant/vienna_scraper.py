@@ -2,83 +2,52 @@
 
 Sources:
 - Burgtheater: performances (server-rendered HTML, httpx)
-- Wiener Staatsoper: schedule (JS SPA, Playwright)
+- Wiener Staatsoper: schedule (JS SPA, shared Playwright browser pool)
 - Belvedere: exhibitions (server-rendered HTML, httpx)
 - Gasthaus Orlik: lunch menu (server-rendered HTML, httpx)
 - wien.ORF.at: local news headlines (server-rendered HTML, httpx)
 - presse.wien.gv.at: city government press releases (server-rendered HTML, httpx)
 
-Caches responses in-memory with configurable TTL.
+Each feature's sources are fetched concurrently by ``scrape_engine`` and
+kept in its cache, which ``refresh_loop`` renews before the TTL runs out.
+Async handlers read ``await engine.get(key)``; the ``fetch_*`` functions
+are the same for sync callers.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
-import time
 
-import httpx
 from bs4 import BeautifulSoup
 
-logger = logging.getLogger("vienna-life-assistant.scraper")
+from vienna_life_assistant import browser_pool
+from vienna_life_assistant.scrape_engine import Feature, Fetcher, ScrapeEngine, Source
 
-_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-_HTTP_TIMEOUT = 15.0
+logger = logging.getLogger("vienna-life-assistant.scraper")
 
-_cache: dict[str, tuple[float, list]] = {}
 _PERFORMANCE_TTL = 1800  # 30 min
 _EXHIBITION_TTL = 7200  # 2 hours
 
 
-def _cached(key: str, ttl: float):
-    entry = _cache.get(key)
-    if entry and (time.time() - entry[0]) < ttl:
-        return entry[1]
-    return None
-
-
-def _set_cache(key: str, data: list) -> None:
-    _cache[key] = (time.time(), data)
-
-
-def _fetch_html(url: str) -> str | None:
-    try:
-        resp = httpx.get(
-            url,
-            headers={"User-Agent": _USER_AGENT},
-            timeout=_HTTP_TIMEOUT,
-            follow_redirects=True,
-        )
-        resp.raise_for_status()
-        return resp.text
-    except Exception as e:
-        logger.warning("fetch failed for %s: %s", url, e)
-        return None
-
+async def _render_spa(
+    url: str, wait_for: str | None = None, timeout_ms: int = 25000
+) -> str | None:
+    """Body text of a JS SPA page, rendered in the shared headless browser.
 
-def _render_spa(url: str, timeout_ms: int = 25000) -> str | None:
-    """Render a JS SPA page with Playwright headless Chromium (sync API —
-    safe to call from FastAPI async handlers where asyncio.run() would raise)."""
+    Returns once ``wait_for`` (a Playwright selector) appears, or at network
+    idle without one. None if Playwright/Chromium is unavailable or the
+    render fails.
+    """
     try:
-        from playwright.sync_api import sync_playwright
+        import playwright  # noqa: F401
     except ImportError:
         logger.warning("playwright not installed")
         return None
-
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            try:
-                ctx = browser.new_context(user_agent=_USER_AGENT)
-                page = ctx.new_page()
-                page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-                page.wait_for_timeout(5000)
-                return page.inner_text("body")
-            finally:
-                browser.close()
-    except Exception as e:
-        logger.warning("spa render failed for %s: %s", url, e)
-        return None
+    return await browser_pool.pool.arender(
+        url, wait_for=wait_for, timeout_ms=timeout_ms
+    )
 
 
 # --- Performances ---
@@ -92,10 +61,7 @@ def _clean_burg_date(raw: str) -> str:
     return re.sub(r"(\d{2}:\d{2})(\d{2}:\d{2})", r"\1 \2", raw)
 
 
-def _scrape_burgtheater() -> list[dict[str, str]]:
-    html = _fetch_html("https://www.burgtheater.at/spielplan")
-    if not html:
-        return []
+def _parse_burgtheater(html: str) -> list[dict[str, str]]:
     soup = BeautifulSoup(html, "lxml")
     seen: set[str] = set()
     results: list[dict[str, str]] = []
@@ -121,10 +87,11 @@ def _scrape_burgtheater() -> list[dict[str, str]]:
     return results
 
 
-def _scrape_staatsoper() -> list[dict[str, str]]:
-    body = _render_spa("https://www.wiener-staatsoper.at/kalender/")
-    if not body:
-        return []
+# A performance slot ("19:00—22:15") means the calendar has rendered.
+_STAATSOPER_READY = r"text=/\d{2}:\d{2}—\d{2}:\d{2}/"
+
+
+def _parse_staatsoper(body: str) -> list[dict[str, str]]:
     lines = [ln.strip() for ln in body.split("\n")]
     seen: set[str] = set()
     results: list[dict[str, str]] = []
@@ -153,82 +120,41 @@ def _scrape_staatsoper() -> list[dict[str, str]]:
     return results
 
 
-def fetch_performances() -> list[dict[str, str]]:
-    """Aggregate scheduled performances from all sources."""
-    cached = _cached("performances", _PERFORMANCE_TTL)
-    if cached is not None:
-        return cached
-    all_events: list[dict[str, str]] = []
-    all_events.extend(_scrape_burgtheater())
-    all_events.extend(_scrape_staatsoper())
-    logger.info("total %d performances", len(all_events))
-    _set_cache("performances", all_events)
-    return all_events
-
-
 # --- News ---
 
 _NEWS_TTL = 600  # 10 min
 
 
-def fetch_news() -> list[dict[str, str]]:
-    """Fetch Vienna headlines from wien.ORF.at (public broadcaster)."""
-    cached = _cached("news", _NEWS_TTL)
-    if cached is not None:
-        return cached
-
+def _parse_orf(html: str) -> list[dict[str, str]]:
     headlines: list[dict[str, str]] = []
-    html = _fetch_html("https://wien.orf.at")
-    if html:
-        soup = BeautifulSoup(html, "lxml")
-        for a in soup.select("h2 a"):
-            text = a.get_text(strip=True)
-            href = str(a.get("href", "") or "")
-            if text and len(text) > 10:
-                headlines.append({"title": text, "url": href, "source": "ORF Wien"})
-
+    soup = BeautifulSoup(html, "lxml")
+    for a in soup.select("h2 a"):
+        text = a.get_text(strip=True)
+        href = str(a.get("href", "") or "")
+        if text and len(text) > 10:
+            headlines.append({"title": text, "url": href, "source": "ORF Wien"})
     logger.info("news: %d headlines from ORF", len(headlines))
-    _set_cache("news", headlines)
     return headlines
 
 
-def fetch_press() -> list[dict[str, str]]:
-    """Fetch city government press releases from presse.wien.gv.at."""
-    cached = _cached("press", _NEWS_TTL)
-    if cached is not None:
-        return cached
-
+def _parse_press(html: str) -> list[dict[str, str]]:
     releases: list[dict[str, str]] = []
-    html = _fetch_html("https://presse.wien.gv.at")
-    if html:
-        soup = BeautifulSoup(html, "lxml")
-        for h2 in soup.select("article h2"):
-            a = h2.find("a")
-            text = a.get_text(strip=True) if a else h2.get_text(strip=True)
-            href = str(a.get("href", "") or "") if a else ""
-            if text and len(text) > 10:
-                releases.append(
-                    {"title": text, "url": href, "source": "Stadt Wien Presse"}
-                )
-
+    soup = BeautifulSoup(html, "lxml")
+    for h2 in soup.select("article h2"):
+        a = h2.find("a")
+        text = a.get_text(strip=True) if a else h2.get_text(strip=True)
+        href = str(a.get("href", "") or "") if a else ""
+        if text and len(text) > 10:
+            releases.append({"title": text, "url": href, "source": "Stadt Wien Presse"})
     logger.info("press: %d releases from Stadt Wien", len(releases))
-    _set_cache("press", releases)
     return releases
 
 
 # --- Exhibitions ---
 
 
-def fetch_exhibitions() -> list[dict[str, str]]:
-    """Fetch current exhibitions from Belvedere website."""
-    cached = _cached("exhibitions", _EXHIBITION_TTL)
-    if cached is not None:
-        return cached
+def _parse_belvedere(html: str) -> list[dict[str, str]]:
     exhibitions: list[dict[str, str]] = []
-    html = _fetch_html("https://www.belvedere.at/en/exhibitions")
-    if not html:
-        _set_cache("exhibitions", exhibitions)
-        return exhibitions
     soup = BeautifulSoup(html, "lxml")
     seen: set[str] = set()
     for a in soup.select("a.link--full"):
@@ -247,7 +173,6 @@ def fetch_exhibitions() -> list[dict[str, str]]:
         dates = dates.replace("to", " - ", 1) if "to" in dates else dates
         exhibitions.append({"museum": "Belvedere", "title": title, "dates": dates})
     logger.info("belvedere: %d exhibitions", len(exhibitions))
-    _set_cache("exhibitions", exhibitions)
     return exhibitions
 
 
@@ -256,18 +181,8 @@ def fetch_exhibitions() -> list[dict[str, str]]:
 _LUNCH_TTL = 3600  # 1 hour
 
 
-def fetch_lunch_menus() -> list[dict[str, str | list[str]]]:
-    """Fetch daily lunch menus from Gasthaus Orlik."""
-    cached = _cached("lunch", _LUNCH_TTL)
-    if cached is not None:
-        return cached
-
+def _parse_orlik(html: str) -> list[dict[str, str | list[str]]]:
     menus: list[dict[str, str | list[str]]] = []
-    html = _fetch_html("https://gasthaus-orlik.at/mittagmenues.html")
-    if not html:
-        _set_cache("lunch", menus)
-        return menus
-
     soup = BeautifulSoup(html, "lxml")
     items: list[str] = []
     # Extract menu items between "Tagessuppe" markers
@@ -299,5 +214,103 @@ def fetch_lunch_menus() -> list[dict[str, str | list[str]]]:
         menus.append({"restaurant": "Gasthaus Orlik", "items": items})
 
     logger.info("orlik: %d menu groups", len(menus))
-    _set_cache("lunch", menus)
     return menus
+
+
+# --- Sources and features ---
+
+
+def _html_source(url: str, parse):
+    """Source that fetches ``url`` and parses it off the event loop."""
+
+    async def fetch(http: Fetcher) -> list:
+        return await asyncio.to_thread(parse, await http.text(url))
+
+    return fetch
+
+
+async def _staatsoper(http: Fetcher) -> list[dict[str, str]]:
+    body = await _render_spa(
+        "https://www.wiener-staatsoper.at/kalender/", wait_for=_STAATSOPER_READY
+    )
+    if body is None:
+        raise RuntimeError("render failed")
+    return _parse_staatsoper(body)
+
+
+engine = ScrapeEngine(
+    [
+        Feature(
+            "performances",
+            _PERFORMANCE_TTL,
+            [
+                Source(
+                    "burgtheater",
+                    _html_source(
+                        "https://www.burgtheater.at/spielplan", _parse_burgtheater
+                    ),
+                ),
+                Source("staatsoper", _staatsoper, timeout=60),
+            ],
+        ),
+        Feature(
+            "exhibitions",
+            _EXHIBITION_TTL,
+            [
+                Source(
+                    "belvedere",
+                    _html_source(
+                        "https://www.belvedere.at/en/exhibitions", _parse_belvedere
+                    ),
+                )
+            ],
+        ),
+        Feature(
+            "news",
+            _NEWS_TTL,
+            [Source("orf", _html_source("https://wien.orf.at", _parse_orf))],
+        ),
+        Feature(
+            "press",
+            _NEWS_TTL,
+            [Source("presse", _html_source("https://presse.wien.gv.at", _parse_press))],
+        ),
+        Feature(
+            "lunch",
+            _LUNCH_TTL,
+            [
+                Source(
+                    "orlik",
+                    _html_source(
+                        "https://gasthaus-orlik.at/mittagmenues.html", _parse_orlik
+                    ),
+                )
+            ],
+        ),
+    ]
+)
+
+
+def fetch_performances() -> list[dict[str, str]]:
+    """Aggregate scheduled performances from all sources."""
+    return engine.get_sync("performances")
+
+
+def fetch_news() -> list[dict[str, str]]:
+    """Fetch Vienna headlines from wien.ORF.at (public broadcaster)."""
+    return engine.get_sync("news")
+
+
+def fetch_press() -> list[dict[str, str]]:
+    """Fetch city government press releases from presse.wien.gv.at."""
+    return engine.get_sync("press")
+
+
+def fetch_exhibitions() -> list[dict[str, str]]:
+    """Fetch current exhibitions from Belvedere website."""
+    return engine.get_sync("exhibitions")
+
+
+def fetch_lunch_menus() -> list[dict[str, str | list[str]]]:
+    """Fetch daily lunch menus from Gasthaus Orlik."""
+    return engine.get_sync("lunch")